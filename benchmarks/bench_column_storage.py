@@ -0,0 +1,126 @@
+"""
+benchmark the single channel get latency of asammdf for record and column
+oriented files
+
+The record oriented 4.10 file is converted to a 4.20 file with column storage;
+the records are transposed block by block so the conversion does not build the
+*Signal* objects. A channel of a column oriented file is stored in its own
+channel group, so the get call only reads the data blocks of that channel
+instead of the records of the whole group.
+"""
+import gc
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import numpy as np
+
+from asammdf import MDF, Signal
+
+from bench_utils import cmd_line_parser, print_environment
+
+
+def generate_file(path, channels, cycles):
+    """write a 4.10 file with a single group of *channels* channels"""
+    rng = np.random.default_rng(0)
+    timestamps = np.arange(cycles, dtype="<f8") * 0.001
+
+    with MDF(version="4.10") as mdf:
+        mdf.append(
+            [
+                Signal(
+                    rng.integers(0, 1000, cycles).astype("<i4"),
+                    timestamps,
+                    name=f"Channel_{i}",
+                    conversion={"a": 0.1, "b": float(i)},
+                )
+                for i in range(channels)
+            ],
+            common_timebase=True,
+        )
+        mdf.save(path, overwrite=True)
+
+
+def convert_file(path, output):
+    """convert the record oriented file to 4.20 column storage and return the
+    conversion time"""
+    gc.collect()
+    start = perf_counter()
+    with MDF(path) as mdf:
+        converted = mdf.convert("4.20", column_storage=True)
+    elapsed = perf_counter() - start
+    converted.save(output, overwrite=True, compression=0)
+    converted.close()
+
+    return elapsed
+
+
+def get_channels(path, names, repeat):
+    """best of *repeat* runs for the mean latency of the get calls"""
+    best = None
+
+    with MDF(path) as mdf:
+        for _ in range(repeat):
+            gc.collect()
+
+            start = perf_counter()
+            for name in names:
+                mdf.get(name)
+            elapsed = (perf_counter() - start) / len(names)
+
+            if best is None or elapsed < best:
+                best = elapsed
+
+    return best
+
+
+def main(channels, cycles, used, repeat):
+    print_environment()
+
+    names = [f"Channel_{(i * 7) % channels}" for i in range(min(used, channels))]
+
+    with TemporaryDirectory() as tmpdir:
+        rows = Path(tmpdir) / "rows.mf4"
+        columns = Path(tmpdir) / "columns.mf4"
+
+        generate_file(rows, channels, cycles)
+        converted = convert_file(rows, columns)
+
+        print(
+            f"{channels} channels, {cycles} cycles; {len(names)} channels read; "
+            f"conversion to column storage {converted * 1000:.1f} ms\n"
+        )
+
+        print("======= ========= ============")
+        print("Layout  File [KB] Get [ms/ch]")
+        print("======= ========= ============")
+
+        for layout, path in (("record", rows), ("column", columns)):
+            elapsed = get_channels(path, names, repeat)
+            print(
+                f"{layout:>7} {path.stat().st_size // 1024:>9} "
+                f"{elapsed * 1000:>12.2f}"
+            )
+
+        print("======= ========= ============")
+
+
+def _cmd_line_parser():
+    """
+    return a command line parser. It is used when generating the documentation
+    """
+
+    return cmd_line_parser(
+        channels=(200, "number of channels in the group"),
+        cycles=(100_000, "number of cycles of the group"),
+        used=(20, "number of channels that are read"),
+        repeat=(3, "number of runs for each layout; the best run is reported"),
+    )
+
+
+if __name__ == "__main__":
+    cmd_parser = _cmd_line_parser()
+    args = cmd_parser.parse_args(sys.argv[1:])
+
+    main(args.channels, args.cycles, args.used, args.repeat)
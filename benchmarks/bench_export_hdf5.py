@@ -0,0 +1,147 @@
+"""
+benchmark the HDF5 export of asammdf
+
+The "fragments" rows are *export(fmt="hdf5")*: the chunked datasets are
+written fragment by fragment while the channel groups are decoded, in the
+calling thread (workers=0) or in worker threads. The "groups" row is the
+reference that loads each complete channel group with *select* and creates
+the datasets from the full arrays. Each case runs in a new process and the
+peak memory is the peak of the allocations traced by *tracemalloc* (this
+includes the numpy arrays); the resident memory is not used since the pages of
+the memory mapped file are also counted.
+"""
+import multiprocessing
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import tracemalloc
+
+import h5py
+import numpy as np
+
+from asammdf import MDF, Signal
+
+from bench_utils import cmd_line_parser, print_environment
+
+
+def generate_file(path, groups, channels, cycles):
+    """write a file with *groups* channel groups of *channels* channels"""
+    rng = np.random.default_rng(0)
+
+    with MDF(version="4.10") as mdf:
+        for group in range(groups):
+            timestamps = np.arange(cycles, dtype="<f8") * 0.01 + group * 0.001
+            mdf.append(
+                [
+                    Signal(rng.random(cycles), timestamps, name=f"Channel_{group}_{i}")
+                    for i in range(channels)
+                ],
+                common_timebase=True,
+            )
+        mdf.save(path, overwrite=True)
+
+
+def export_groups(mdf, output, compression):
+    """write each complete channel group"""
+    with h5py.File(output, "w") as hdf:
+        for i, group_index in enumerate(mdf.virtual_groups):
+            channels = mdf.included_channels(group_index)[group_index]
+            signals = mdf.select(
+                [
+                    (None, gp_index, ch_index)
+                    for gp_index, channel_indexes in channels.items()
+                    for ch_index in channel_indexes
+                ]
+            )
+            group = hdf.create_group(f"ChannelGroup_{i}")
+            group.create_dataset(
+                "time", data=signals[0].timestamps, compression=compression
+            )
+            for sig in signals:
+                group.create_dataset(
+                    sig.name, data=sig.samples, compression=compression
+                )
+            del signals
+
+
+def export(path, output, mode, workers, compression, queue):
+    """export in a new process; the time and the peak memory are sent back"""
+    with MDF(path) as mdf:
+        tracemalloc.start()
+        start = perf_counter()
+        if mode == "groups":
+            export_groups(mdf, output, compression)
+        else:
+            mdf.export("hdf5", output, compression=compression, workers=workers)
+        elapsed = perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    queue.put((elapsed, peak))
+
+
+def main(groups, channels, cycles, workers, compression):
+    print_environment(h5py)
+
+    context = multiprocessing.get_context("spawn")
+
+    with TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "bench_export_hdf5.mf4"
+        generate_file(path, groups, channels, cycles)
+
+        print(
+            f"{groups} groups x {channels} channels, {cycles} cycles, "
+            f"{path.stat().st_size // 1024} KB file; "
+            f"{compression or 'no'} compression\n"
+        )
+
+        print("========= ======= ========= ============ ==========")
+        print("Mode      Workers Time [ms] Peak mem [MB] File [KB]")
+        print("========= ======= ========= ============ ==========")
+
+        cases = [("groups", 0), ("fragments", 0)]
+        cases.extend(("fragments", count) for count in workers if count)
+
+        for mode, count in cases:
+            output = Path(tmpdir) / f"{mode}_{count}.hdf"
+            queue = context.Queue()
+            process = context.Process(
+                target=export,
+                args=(path, output, mode, count, compression, queue),
+            )
+            process.start()
+            elapsed, peak = queue.get()
+            process.join()
+
+            size = output.with_suffix(".hdf").stat().st_size
+            print(
+                f"{mode:>9} {count:>7} {elapsed * 1000:>9.1f} {peak // 1024 // 1024:>12} "
+                f"{size // 1024:>10}"
+            )
+
+        print("========= ======= ========= ============ ==========")
+
+
+def _cmd_line_parser():
+    """
+    return a command line parser. It is used when generating the documentation
+    """
+
+    return cmd_line_parser(
+        groups=4,
+        channels=50,
+        cycles=200_000,
+        workers=([2, 4], "number of decoding threads for each threaded case"),
+        compression=(
+            "gzip",
+            'HDF5 compression filter; use "" to disable the compression',
+        ),
+    )
+
+
+if __name__ == "__main__":
+    cmd_parser = _cmd_line_parser()
+    args = cmd_parser.parse_args(sys.argv[1:])
+
+    main(args.groups, args.channels, args.cycles, args.workers, args.compression)
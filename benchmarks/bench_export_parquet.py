@@ -0,0 +1,122 @@
+"""
+benchmark the parquet export of asammdf
+
+The "stream" row is *export(fmt="parquet")*: the channels are converted to
+Arrow record batches chunk by chunk and each batch is written as a row group,
+while the next batch is decoded in a worker thread. The "dataframe" row is
+the reference that builds the full dataframe with *to_dataframe* and writes it
+in one go. Each case runs in a new process so that the peak resident memory
+can be reported.
+"""
+import multiprocessing
+from pathlib import Path
+import resource
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from asammdf import MDF, Signal
+
+from bench_utils import cmd_line_parser, print_environment
+
+
+def generate_file(path, groups, channels, cycles):
+    """write a file with *groups* channel groups of *channels* channels"""
+    rng = np.random.default_rng(0)
+
+    with MDF(version="4.10") as mdf:
+        for group in range(groups):
+            timestamps = np.arange(cycles, dtype="<f8") * 0.01 + group * 0.001
+            mdf.append(
+                [
+                    Signal(rng.random(cycles), timestamps, name=f"Channel_{group}_{i}")
+                    for i in range(channels)
+                ],
+                common_timebase=True,
+            )
+        mdf.save(path, overwrite=True)
+
+
+def export(path, output, mode, chunk_ram_size, queue):
+    """export in a new process; the time and the peak RSS are sent back"""
+    start = perf_counter()
+    with MDF(path) as mdf:
+        if mode == "dataframe":
+            df = mdf.to_dataframe(use_display_names=True, numeric_1D_only=True)
+            pq.write_table(pa.Table.from_pandas(df), output, compression="SNAPPY")
+        else:
+            mdf.export(
+                "parquet",
+                output,
+                compression="SNAPPY",
+                chunk_ram_size=chunk_ram_size,
+            )
+    elapsed = perf_counter() - start
+
+    # ru_maxrss is in KB on linux
+    queue.put((elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+
+def main(groups, channels, cycles, chunk_ram_size):
+    print_environment(pa)
+
+    context = multiprocessing.get_context("spawn")
+
+    with TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "bench_export_parquet.mf4"
+        generate_file(path, groups, channels, cycles)
+
+        print(
+            f"{groups} groups x {channels} channels, {cycles} cycles, "
+            f"{path.stat().st_size // 1024} KB file; "
+            f"{chunk_ram_size // 1024} KB row groups\n"
+        )
+
+        print("========= ========= ============ ========== ==========")
+        print("Mode      Time [ms] Peak RSS [MB] Row groups File [KB]")
+        print("========= ========= ============ ========== ==========")
+
+        for mode in ("dataframe", "stream"):
+            output = Path(tmpdir) / f"{mode}.parquet"
+            queue = context.Queue()
+            process = context.Process(
+                target=export, args=(path, output, mode, chunk_ram_size, queue)
+            )
+            process.start()
+            elapsed, peak = queue.get()
+            process.join()
+
+            row_groups = pq.ParquetFile(output).metadata.num_row_groups
+            print(
+                f"{mode:>9} {elapsed * 1000:>9.1f} {peak // 1024:>12} "
+                f"{row_groups:>10} {output.stat().st_size // 1024:>10}"
+            )
+
+        print("========= ========= ============ ========== ==========")
+
+
+def _cmd_line_parser():
+    """
+    return a command line parser. It is used when generating the documentation
+    """
+
+    return cmd_line_parser(
+        groups=4,
+        channels=50,
+        cycles=200_000,
+        chunk_ram_size=(
+            32 * 1024 * 1024,
+            "row group size in bytes for the streaming export",
+        ),
+    )
+
+
+if __name__ == "__main__":
+    cmd_parser = _cmd_line_parser()
+    args = cmd_parser.parse_args(sys.argv[1:])
+
+    main(args.groups, args.channels, args.cycles, args.chunk_ram_size)
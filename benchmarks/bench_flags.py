@@ -0,0 +1,122 @@
+"""
+benchmark append and extend of asammdf for groups with many boolean flags
+
+The records are built by the C extension in a single pass: consecutive bool
+channels are packed in the same record bytes and the invalidation bits are
+packed together with the channel samples. The byte sized channels give the
+reference for the same number of unpacked channels.
+"""
+import gc
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from asammdf import MDF, Signal
+
+from bench_utils import cmd_line_parser, print_environment
+
+
+def make_signals(kind, channels, cycles, invalidation):
+    """*channels* bool or uint8 signals; every fourth signal has invalidation
+    bits if *invalidation* is set"""
+    rng = np.random.default_rng(0)
+    timestamps = np.arange(cycles, dtype="<f8") * 0.001
+
+    signals = []
+    for i in range(channels):
+        samples = rng.integers(0, 2, cycles).astype(kind)
+        if invalidation and not i % 4:
+            invalidation_bits = rng.integers(0, 2, cycles).astype(bool)
+        else:
+            invalidation_bits = None
+        signals.append(
+            Signal(
+                samples,
+                timestamps,
+                name=f"Flag_{i}",
+                invalidation_bits=invalidation_bits,
+            )
+        )
+
+    return signals
+
+
+def run(kind, channels, cycles, calls, invalidation, repeat):
+    """best of *repeat* runs for the append of the signals and for *calls*
+    extend calls with the same samples"""
+    signals = make_signals(kind, channels, cycles, invalidation)
+    timestamps = signals[0].timestamps
+    extension = [(signal.samples, signal.invalidation_bits) for signal in signals]
+
+    best_append = best_extend = None
+    record_size = 0
+
+    for _ in range(repeat):
+        gc.collect()
+        with MDF(version="4.10") as mdf:
+            start = perf_counter()
+            mdf.append(signals, common_timebase=True)
+            appended = perf_counter() - start
+
+            start = perf_counter()
+            for i in range(calls):
+                mdf.extend(0, [(timestamps + i + 1, None)] + extension)
+            extended = perf_counter() - start
+
+            channel_group = mdf.groups[0].channel_group
+            record_size = (
+                channel_group.samples_byte_nr + channel_group.invalidation_bytes_nr
+            )
+
+        if best_append is None or appended < best_append:
+            best_append = appended
+        if best_extend is None or extended < best_extend:
+            best_extend = extended
+
+    return best_append, best_extend, record_size
+
+
+def main(channels, cycles, calls, repeat):
+    print_environment()
+
+    print(
+        f"{channels} channels, {cycles} cycles appended "
+        f"and extended {calls} times with {cycles} cycles\n"
+    )
+
+    print("======= ============ =========== =========== ============")
+    print("Samples Invalidation Append [ms] Extend [ms] Record bytes")
+    print("======= ============ =========== =========== ============")
+
+    for kind in ("uint8", "bool"):
+        for invalidation in (False, True):
+            appended, extended, record_size = run(
+                kind, channels, cycles, calls, invalidation, repeat
+            )
+            print(
+                f"{kind:>7} {str(invalidation):>12} {appended * 1000:>11.1f} "
+                f"{extended * 1000:>11.1f} {record_size:>12}"
+            )
+
+    print("======= ============ =========== =========== ============")
+
+
+def _cmd_line_parser():
+    """
+    return a command line parser. It is used when generating the documentation
+    """
+
+    return cmd_line_parser(
+        channels=(256, "number of flag channels in the group"),
+        cycles=(10_000, "number of cycles of the appended and extended samples"),
+        calls=(20, "number of extend calls"),
+        repeat=3,
+    )
+
+
+if __name__ == "__main__":
+    cmd_parser = _cmd_line_parser()
+    args = cmd_parser.parse_args(sys.argv[1:])
+
+    main(args.channels, args.cycles, args.calls, args.repeat)
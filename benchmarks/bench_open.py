@@ -0,0 +1,138 @@
+"""
+benchmark the open time of asammdf for the "full" and "lazy" metadata modes
+
+The test file has many channels with units, conversions, sources and XML
+comments that hold display names. The "lazy" mode only parses the channel
+names and the record layout when the file is opened; the remaining metadata
+of the channels that are actually used is read by the get calls. The "peek"
+mode (*MDF.peek*) only reads the metadata needed to catalog the file and never
+reads the data blocks, so the samples cannot be read afterwards.
+"""
+import gc
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import numpy as np
+
+from asammdf import MDF, Signal
+from asammdf.blocks.source_utils import Source
+
+from bench_utils import cmd_line_parser, print_environment
+
+
+def generate_file(path, groups, channels, cycles):
+    """write a file with *groups* channel groups of *channels* channels"""
+    timestamps = np.arange(cycles, dtype="<f8") * 0.01
+    samples = np.arange(cycles, dtype="<i4")
+
+    with MDF(version="4.10") as mdf:
+        for group in range(groups):
+            mdf.append(
+                [
+                    Signal(
+                        samples,
+                        timestamps,
+                        name=f"Channel_{group}_{i}",
+                        unit="V",
+                        conversion={"a": 1.0 + i, "b": float(group)},
+                        source=Source(f"ECU_{i % 10}", "path", "comment", 0, 0),
+                        comment=(
+                            f"<CNcomment><TX>channel {i} of group {group}</TX>"
+                            f"<names><display>Display_{group}_{i}</display>"
+                            "</names></CNcomment>"
+                        ),
+                    )
+                    for i in range(channels)
+                ]
+            )
+        mdf.save(path, overwrite=True)
+
+
+def open_file(path, metadata, names, repeat):
+    """best of *repeat* runs for the open time and for the time needed to get
+    the *names* channels afterwards"""
+    best_open = best_get = None
+
+    for _ in range(repeat):
+        gc.collect()
+
+        if metadata == "peek":
+            start = perf_counter()
+            mdf = MDF.peek(path)
+            opened = perf_counter() - start
+            mdf.close()
+
+            if best_open is None or opened < best_open:
+                best_open = opened
+            continue
+
+        start = perf_counter()
+        mdf = MDF(path, metadata=metadata)
+        opened = perf_counter() - start
+
+        for name in names:
+            mdf.get(name)
+            mdf.get_channel_unit(name)
+            mdf.get_channel_comment(name)
+        got = perf_counter() - start - opened
+
+        mdf.close()
+
+        if best_open is None or opened < best_open:
+            best_open = opened
+        if best_get is None or got < best_get:
+            best_get = got
+
+    return best_open, best_get
+
+
+def main(groups, channels, cycles, used, repeat):
+    print_environment()
+
+    names = [
+        f"Channel_{i % groups}_{(i * 7) % channels}"
+        for i in range(min(used, groups * channels))
+    ]
+
+    with TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "bench_open.mf4"
+        generate_file(path, groups, channels, cycles)
+
+        print(
+            f"{groups} groups x {channels} channels, {cycles} cycles, "
+            f"{path.stat().st_size // 1024} KB file; {len(names)} channels used\n"
+        )
+
+        print("======== ========= ========")
+        print("Metadata Open [ms] Get [ms]")
+        print("======== ========= ========")
+
+        for metadata in ("full", "lazy", "peek"):
+            opened, got = open_file(path, metadata, names, repeat)
+            got = "-" if got is None else f"{got * 1000:.1f}"
+            print(f"{metadata:>8} {opened * 1000:>9.1f} {got:>8}")
+
+        print("======== ========= ========")
+
+
+def _cmd_line_parser():
+    """
+    return a command line parser. It is used when generating the documentation
+    """
+
+    return cmd_line_parser(
+        groups=50,
+        channels=1000,
+        cycles=100,
+        used=(20, "number of channels that are read after the file is opened"),
+        repeat=(3, "number of runs for each metadata mode; the best run is reported"),
+    )
+
+
+if __name__ == "__main__":
+    cmd_parser = _cmd_line_parser()
+    args = cmd_parser.parse_args(sys.argv[1:])
+
+    main(args.groups, args.channels, args.cycles, args.used, args.repeat)
@@ -0,0 +1,98 @@
+"""
+benchmark the channel bytes extraction of asammdf using multiple threads
+
+The C extension releases the GIL while the channel bytes are copied so the
+extraction of many channels should scale with the number of threads.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from asammdf.blocks.cutils import get_channel_raw_bytes
+
+from bench_utils import cmd_line_parser, print_environment
+
+
+def extract_channels(data, record_size, channels):
+    """extract the raw bytes of the (byte offset, byte count) channels"""
+    for byte_offset, byte_count in channels:
+        get_channel_raw_bytes(data, record_size, byte_offset, byte_count)
+
+
+def run(data, record_size, channels, threads, repeat):
+    """best of *repeat* runs of the extraction of all channels using the given
+    number of threads"""
+    chunks = [channels[i::threads] for i in range(threads)]
+
+    best = None
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in range(repeat):
+            start = perf_counter()
+            futures = [
+                executor.submit(extract_channels, data, record_size, chunk)
+                for chunk in chunks
+            ]
+            for future in futures:
+                future.result()
+            elapsed = perf_counter() - start
+
+            if best is None or elapsed < best:
+                best = elapsed
+
+    return best
+
+
+def main(channels_count, records, max_threads, repeat):
+    channels = [(i * 8, 8) for i in range(channels_count)]
+    record_size = channels_count * 8
+
+    data = np.random.randint(
+        0, 255, size=record_size * records, dtype=np.uint8
+    ).tobytes()
+
+    print_environment()
+    print(
+        f"get_channel_raw_bytes for {channels_count} channels, "
+        f"{records} records, {len(data) // 1024 // 1024} MB data block\n"
+    )
+
+    print("======= ========= =======")
+    print("Threads Time [ms] Speedup")
+    print("======= ========= =======")
+
+    threads = 1
+    reference = None
+    while threads <= max_threads:
+        elapsed = run(data, record_size, channels, threads, repeat)
+        if reference is None:
+            reference = elapsed
+        print(f"{threads:>7} {elapsed * 1000:>9.1f} {reference / elapsed:>7.2f}")
+        threads *= 2
+
+    print("======= ========= =======")
+
+
+def _cmd_line_parser():
+    """
+    return a command line parser. It is used when generating the documentation
+    """
+
+    return cmd_line_parser(
+        channels=(200, "number of 8 bytes channels in each record"),
+        records=(100_000, "number of records in the data block"),
+        threads=(
+            os.cpu_count() or 1,
+            "maximum number of threads; the thread count is doubled starting from 1",
+        ),
+        repeat=(3, "number of runs for each thread count; the best run is reported"),
+    )
+
+
+if __name__ == "__main__":
+    cmd_parser = _cmd_line_parser()
+    args = cmd_parser.parse_args(sys.argv[1:])
+
+    main(args.channels, args.records, args.threads, args.repeat)
@@ -0,0 +1,94 @@
+"""
+benchmark the common timebase of asammdf for many channel groups
+
+*merge_timebases* concatenates the masters and sorts them once in place. The
+"union1d" row is the reference that reduces the masters with *np.union1d*,
+which sorts the growing union again for each master; the "unique" row is
+*np.unique* of the concatenated masters, which sorts a second copy.
+"""
+from functools import reduce
+import gc
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from asammdf.blocks.utils import merge_timebases
+
+from bench_utils import cmd_line_parser, print_environment
+
+METHODS = {
+    "union1d": lambda timebases: reduce(np.union1d, timebases),
+    "unique": lambda timebases: np.unique(np.concatenate(timebases)),
+    "merge": merge_timebases,
+}
+
+
+def make_timebases(groups, cycles):
+    """*groups* sorted masters with different rates and jitter"""
+    rng = np.random.default_rng(0)
+
+    timebases = []
+    for i in range(groups):
+        period = 0.001 * (1 + i % 10)
+        jitter = rng.random(cycles) * period * 0.1
+        timebases.append(np.arange(cycles, dtype="<f8") * period + jitter)
+
+    return timebases
+
+
+def run(method, timebases, repeat):
+    """best of *repeat* runs; also returns the size of the common timebase"""
+    best = None
+
+    for _ in range(repeat):
+        gc.collect()
+        start = perf_counter()
+        timebase = METHODS[method](timebases)
+        elapsed = perf_counter() - start
+
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best, len(timebase)
+
+
+def main(groups, cycles, repeat):
+    print_environment()
+
+    print("====== ======= ========= ========= ==========")
+    print("Groups Method  Time [ms] Speed-up  Timestamps")
+    print("====== ======= ========= ========= ==========")
+
+    for count in groups:
+        timebases = make_timebases(count, cycles)
+        reference = None
+        for method in METHODS:
+            elapsed, size = run(method, timebases, repeat)
+            if reference is None:
+                reference = elapsed
+            print(
+                f"{count:>6} {method:>7} {elapsed * 1000:>9.1f} "
+                f"{reference / elapsed:>9.2f} {size:>10}"
+            )
+
+    print("====== ======= ========= ========= ==========")
+
+
+def _cmd_line_parser():
+    """
+    return a command line parser. It is used when generating the documentation
+    """
+
+    return cmd_line_parser(
+        groups=([2, 10, 50, 200], "number of channel groups for each case"),
+        cycles=50_000,
+        repeat=(3, "number of runs for each method; the best run is reported"),
+    )
+
+
+if __name__ == "__main__":
+    cmd_parser = _cmd_line_parser()
+    args = cmd_parser.parse_args(sys.argv[1:])
+
+    main(args.groups, args.cycles, args.repeat)
@@ -0,0 +1,135 @@
+"""
+benchmark the Apache Arrow output of asammdf
+
+The "arrow" row builds the table with *to_arrow*: the numeric samples are used
+without copy, the value to text conversions give dictionary arrays and the
+string channels give string arrays built from offsets and data buffers. The
+"pandas" row is the reference that builds the dataframe with *to_dataframe*
+and converts it with *pyarrow.Table.from_pandas*.
+"""
+import gc
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import numpy as np
+import pyarrow as pa
+
+from asammdf import MDF, Signal
+
+from bench_utils import cmd_line_parser, print_environment
+
+STATES = {
+    "val_0": 0,
+    "text_0": b"Off",
+    "val_1": 1,
+    "text_1": b"Standby",
+    "val_2": 2,
+    "text_2": b"Running",
+    "default": b"Error",
+}
+
+
+def generate_file(path, groups, channels, cycles):
+    """write a file with *groups* channel groups; each group has *channels*
+    float channels, a value to text channel and a string channel"""
+    rng = np.random.default_rng(0)
+    labels = np.array([f"label {i}".encode() for i in range(100)])
+
+    with MDF(version="4.10") as mdf:
+        for group in range(groups):
+            timestamps = np.arange(cycles, dtype="<f8") * 0.01 * (group + 1)
+            signals = [
+                Signal(
+                    rng.random(cycles),
+                    timestamps,
+                    name=f"Float_{group}_{i}",
+                )
+                for i in range(channels)
+            ]
+            signals.append(
+                Signal(
+                    rng.integers(0, 4, cycles).astype("u1"),
+                    timestamps,
+                    name=f"State_{group}",
+                    conversion=STATES,
+                )
+            )
+            signals.append(
+                Signal(
+                    labels[rng.integers(0, len(labels), cycles)],
+                    timestamps,
+                    name=f"Label_{group}",
+                    encoding="utf-8",
+                )
+            )
+            mdf.append(signals, common_timebase=True)
+        mdf.save(path, overwrite=True)
+
+
+def run(path, mode, repeat):
+    """best of *repeat* runs; also returns the size of the table"""
+    best = None
+
+    with MDF(path) as mdf:
+        for _ in range(repeat):
+            gc.collect()
+
+            start = perf_counter()
+            if mode == "pandas":
+                table = pa.Table.from_pandas(mdf.to_dataframe())
+            else:
+                table = mdf.to_arrow()
+            elapsed = perf_counter() - start
+
+            if best is None or elapsed < best:
+                best = elapsed
+
+    return best, table.nbytes, table.shape
+
+
+def main(groups, channels, cycles, repeat):
+    print_environment(pa)
+
+    with TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "bench_to_arrow.mf4"
+        generate_file(path, groups, channels, cycles)
+
+        print(
+            f"{groups} groups x ({channels} float, 1 value to text and 1 string "
+            f"channels), {cycles} cycles, {path.stat().st_size // 1024} KB file\n"
+        )
+
+        print("====== ========= ========== ==========")
+        print("Mode   Time [ms] Table [KB] Shape")
+        print("====== ========= ========== ==========")
+
+        for mode in ("pandas", "arrow"):
+            elapsed, size, shape = run(path, mode, repeat)
+            print(
+                f"{mode:>6} {elapsed * 1000:>9.1f} {size // 1024:>10} "
+                f"{shape[0]}x{shape[1]}"
+            )
+
+        print("====== ========= ========== ==========")
+
+
+def _cmd_line_parser():
+    """
+    return a command line parser. It is used when generating the documentation
+    """
+
+    return cmd_line_parser(
+        groups=3,
+        channels=(20, "number of float channels in each channel group"),
+        cycles=100_000,
+        repeat=(3, "number of runs for each mode; the best run is reported"),
+    )
+
+
+if __name__ == "__main__":
+    cmd_parser = _cmd_line_parser()
+    args = cmd_parser.parse_args(sys.argv[1:])
+
+    main(args.groups, args.channels, args.cycles, args.repeat)
@@ -0,0 +1,139 @@
+"""
+benchmark to_dataframe of asammdf for a subset of the channels of a file
+
+The selected channels are read group by group from the measurement; the
+"filter" row is the reference that first copies the channels in a new
+measurement with *filter*, which writes all the selected samples in a
+temporary file before they are read back. The bytes written in the temporary
+files of all the measurements are counted for each case.
+"""
+import gc
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import numpy as np
+
+from asammdf import MDF, Signal
+from asammdf.blocks import mdf_v4
+
+from bench_utils import cmd_line_parser, print_environment
+
+TEMPORARY_BYTES = [0]
+
+
+class CountingFile:
+    """temporary file wrapper that counts the written bytes"""
+
+    def __init__(self, file):
+        self._file = file
+
+    def write(self, data):
+        TEMPORARY_BYTES[0] += memoryview(data).nbytes
+        return self._file.write(data)
+
+    def __getattr__(self, item):
+        return getattr(self._file, item)
+
+
+def counting_temporary_file(*args, **kwargs):
+    return CountingFile(temporary_file(*args, **kwargs))
+
+
+temporary_file = mdf_v4.temporary_file
+mdf_v4.temporary_file = counting_temporary_file
+
+
+def generate_file(path, groups, channels, cycles):
+    """write a file with *groups* channel groups of *channels* channels"""
+    timestamps = np.arange(cycles, dtype="<f8") * 0.01
+    samples = np.arange(cycles, dtype="<f8")
+
+    with MDF(version="4.10") as mdf:
+        for group in range(groups):
+            mdf.append(
+                [
+                    Signal(samples + i, timestamps, name=f"Channel_{group}_{i}")
+                    for i in range(channels)
+                ],
+                common_timebase=True,
+            )
+        mdf.save(path, overwrite=True)
+
+
+def run(path, names, mode, repeat):
+    """best of *repeat* runs; also returns the bytes written in temporary
+    files by the last run"""
+    best = None
+
+    with MDF(path) as mdf:
+        for _ in range(repeat):
+            gc.collect()
+            TEMPORARY_BYTES[0] = 0
+
+            start = perf_counter()
+            if mode == "filter":
+                filtered = mdf.filter(names)
+                df = filtered.to_dataframe()
+                filtered.close()
+            else:
+                df = mdf.to_dataframe(channels=names)
+            elapsed = perf_counter() - start
+
+            if best is None or elapsed < best:
+                best = elapsed
+
+    return best, TEMPORARY_BYTES[0], df.shape
+
+
+def main(groups, channels, cycles, used, repeat):
+    print_environment()
+
+    names = [
+        f"Channel_{i % groups}_{(i * 7) % channels}"
+        for i in range(min(used, groups * channels))
+    ]
+
+    with TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "bench_to_dataframe.mf4"
+        generate_file(path, groups, channels, cycles)
+
+        print(
+            f"{groups} groups x {channels} channels, {cycles} cycles, "
+            f"{path.stat().st_size // 1024} KB file; {len(names)} channels used\n"
+        )
+
+        print("========= ========= ============== ==========")
+        print("Mode      Time [ms] Temporary [KB] Shape")
+        print("========= ========= ============== ==========")
+
+        for mode in ("channels", "filter"):
+            elapsed, written, shape = run(path, names, mode, repeat)
+            print(
+                f"{mode:>9} {elapsed * 1000:>9.1f} {written // 1024:>14} "
+                f"{shape[0]}x{shape[1]}"
+            )
+
+        print("========= ========= ============== ==========")
+
+
+def _cmd_line_parser():
+    """
+    return a command line parser. It is used when generating the documentation
+    """
+
+    return cmd_line_parser(
+        groups=10,
+        channels=100,
+        cycles=100_000,
+        used=(30, "number of channels in the data frame"),
+        repeat=(3, "number of runs for each mode; the best run is reported"),
+    )
+
+
+if __name__ == "__main__":
+    cmd_parser = _cmd_line_parser()
+    args = cmd_parser.parse_args(sys.argv[1:])
+
+    main(args.groups, args.channels, args.cycles, args.used, args.repeat)
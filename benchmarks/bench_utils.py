@@ -0,0 +1,61 @@
+"""
+helpers shared by the asammdf benchmark scripts
+"""
+import argparse
+import os
+import platform
+import sys
+
+import numpy as np
+
+from asammdf import __version__ as asammdf_version
+
+# help of the options that have the same meaning in all the benchmarks
+COMMON_HELP = {
+    "groups": "number of channel groups",
+    "channels": "number of channels in each channel group",
+    "cycles": "number of cycles in each channel group",
+    "repeat": "number of runs for each case; the best run is reported",
+}
+
+
+def print_environment(*modules):
+    """print the benchmark environment; the versions of the *modules* are
+    reported after numpy"""
+    print("\n\nBenchmark environment\n")
+    print(f"* {sys.version}")
+    print(f"* {platform.platform()}")
+    print(f"* {platform.processor()}")
+    print(f"* {os.cpu_count()} logical CPUs")
+    print(f"* numpy {np.__version__}")
+    for module in modules:
+        print(f"* {module.__name__} {module.__version__}")
+    print(f"* asammdf {asammdf_version}\n")
+
+
+def cmd_line_parser(**options):
+    """
+    return a command line parser with the benchmark options. Each keyword
+    argument adds the option with the same name (the underscores are replaced
+    by dashes); the value is the default value, or a (default, help) tuple for
+    the options that are not in *COMMON_HELP*. The type of the option is the
+    type of the default value and list defaults accept several values.
+    """
+
+    parser = argparse.ArgumentParser()
+    for name, value in options.items():
+        if isinstance(value, tuple):
+            default, help = value
+        else:
+            default, help = value, COMMON_HELP[name]
+
+        kwargs = {"default": default, "help": help}
+        if isinstance(default, list):
+            kwargs["type"] = type(default[0])
+            kwargs["nargs"] = "+"
+        else:
+            kwargs["type"] = type(default)
+
+        parser.add_argument(f"--{name.replace('_', '-')}", **kwargs)
+
+    return parser
@@ -103,6 +103,7 @@ setup(
             "fastparquet",
             "h5py",
             "hdf5storage>=0.1.17",
+            "pyarrow",
             "python-snappy",
         ],
         "export_matlab_v5": "scipy",
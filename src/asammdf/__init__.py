@@ -11,6 +11,7 @@ console.setLevel(logging.DEBUG)
 logger.addHandler(console)
 logger.setLevel(logging.ERROR)
 
+from .blocks.mdf_v4_writer import MDF4Writer
 from .blocks.options import get_global_option, set_global_option
 from .blocks.source_utils import Source
 from .gui import plot
@@ -31,6 +32,7 @@ __all__ = [
     "get_global_option",
     "set_global_option",
     "MDF",
+    "MDF4Writer",
     "plot",
     "Signal",
     "Source",
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""
+asammdf utility functions that build Apache Arrow arrays from channel samples
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+import numpy as np
+from numpy.typing import NDArray
+import pyarrow as pa
+
+from .utils import target_byte_order, UniqueDB
+
+__all__ = ["arrow_array", "arrow_components", "dictionary_array", "string_array"]
+
+
+def _native(samples: NDArray[Any]) -> NDArray[Any]:
+    if samples.dtype.byteorder not in target_byte_order:
+        samples = samples.byteswap().newbyteorder()
+    return samples
+
+
+def _mask(
+    invalidation_bits: NDArray[np.bool_] | None,
+) -> NDArray[np.bool_] | None:
+    if invalidation_bits is None or not invalidation_bits.any():
+        return None
+    return invalidation_bits
+
+
+def _validity_buffer(invalidation_bits: NDArray[np.bool_] | None) -> pa.Buffer | None:
+    invalidation_bits = _mask(invalidation_bits)
+    if invalidation_bits is None:
+        return None
+    return pa.py_buffer(np.packbits(~invalidation_bits, bitorder="little"))
+
+
+def string_array(
+    samples: NDArray[Any],
+    encoding: str | None = "utf-8",
+    invalidation_bits: NDArray[np.bool_] | None = None,
+) -> pa.Array:
+    """build an Arrow string array from the fixed size bytes samples; the
+    offsets and the data buffers are computed from the samples buffer, and
+    the trailing null bytes are removed like numpy does
+
+    Parameters
+    ----------
+    samples : np.array
+        bytes samples ("S" dtype)
+    encoding : str
+        samples encoding; *None* is handled like "utf-8". The UTF-8 samples
+        that cannot be decoded give a binary array
+    invalidation_bits : np.array
+        optional invalidation bits; the invalid samples are nulls
+
+    Returns
+    -------
+    array : pyarrow.Array
+        string array
+
+    """
+    size = len(samples)
+    width = samples.dtype.itemsize
+    mask = _mask(invalidation_bits)
+
+    if encoding in ("utf-16-le", "utf-16-be"):
+        # the padded samples are decoded since numpy also strips the null
+        # bytes of the last UTF-16 code unit
+        buffer = np.ascontiguousarray(samples).tobytes()
+        return pa.array(
+            [
+                buffer[i : i + width].decode(encoding).rstrip("\0")
+                for i in range(0, size * width, width)
+            ],
+            type=pa.string(),
+            mask=mask,
+        )
+
+    if not size or not width:
+        return pa.array([""] * size, type=pa.string(), mask=mask)
+
+    view = np.ascontiguousarray(samples).view(np.uint8).reshape(size, width)
+
+    # length of each sample without the trailing null bytes
+    nonzero = view != 0
+    lengths = width - np.argmax(nonzero[:, ::-1], axis=1)
+    # argmax gives 0 for the samples that only contain null bytes
+    lengths[(lengths == width) & ~nonzero[:, -1]] = 0
+    del nonzero
+
+    used = np.arange(width) < lengths[:, None]
+    data = view[used]
+
+    if encoding == "latin-1":
+        high = data >= 0x80
+        if high.any():
+            # each latin-1 byte above 0x7F is two bytes in UTF-8
+            lengths = lengths + (used & (view >= 0x80)).sum(axis=1)
+            positions = np.arange(len(data)) + np.cumsum(high) - high
+            utf8 = np.empty(len(data) + int(high.sum()), dtype=np.uint8)
+            utf8[positions] = np.where(high, 0xC0 | (data >> 6), data)
+            utf8[positions[high] + 1] = 0x80 | (data[high] & 0x3F)
+            data = utf8
+
+    if len(data) > np.iinfo(np.int32).max:
+        offsets = np.zeros(size + 1, dtype=np.int64)
+        string_type, binary_type = pa.large_string(), pa.large_binary()
+    else:
+        offsets = np.zeros(size + 1, dtype=np.int32)
+        string_type, binary_type = pa.string(), pa.binary()
+    np.cumsum(lengths, out=offsets[1:])
+
+    buffers = [
+        _validity_buffer(invalidation_bits),
+        pa.py_buffer(offsets),
+        pa.py_buffer(data),
+    ]
+    array = pa.Array.from_buffers(string_type, size, buffers)
+
+    if encoding != "latin-1":
+        try:
+            array.validate(full=True)
+        except pa.ArrowInvalid:
+            array = pa.Array.from_buffers(binary_type, size, buffers)
+
+    return array
+
+
+def dictionary_array(
+    indices: NDArray[Any],
+    texts: NDArray[Any],
+    encoding: str | None = "utf-8",
+    invalidation_bits: NDArray[np.bool_] | None = None,
+) -> pa.DictionaryArray:
+    """build an Arrow dictionary array for the value to text conversions
+
+    Parameters
+    ----------
+    indices : np.array
+        index of the text of each sample
+    texts : np.array
+        bytes texts used as dictionary
+    encoding : str
+        texts encoding
+    invalidation_bits : np.array
+        optional invalidation bits; the invalid samples are nulls
+
+    Returns
+    -------
+    array : pyarrow.DictionaryArray
+        dictionary array
+
+    """
+    return pa.DictionaryArray.from_arrays(
+        pa.array(indices.astype(np.int32, copy=False), mask=_mask(invalidation_bits)),
+        arrow_array(texts, encoding),
+    )
+
+
+def arrow_array(
+    samples: NDArray[Any],
+    encoding: str | None = None,
+    invalidation_bits: NDArray[np.bool_] | None = None,
+) -> pa.Array:
+    """build an Arrow array from the channel samples; the numeric samples
+    buffers are used without copy and the multidimensional samples give fixed
+    size list arrays
+
+    Parameters
+    ----------
+    samples : np.array
+        channel samples without structured dtype
+    encoding : str
+        encoding of the bytes samples
+    invalidation_bits : np.array
+        optional invalidation bits; the invalid samples are nulls
+
+    Returns
+    -------
+    array : pyarrow.Array
+        channel array
+
+    """
+    if samples.ndim > 1:
+        values = arrow_array(np.ascontiguousarray(samples).reshape(-1), encoding)
+        for size in reversed(samples.shape[2:]):
+            values = pa.FixedSizeListArray.from_arrays(values, size)
+
+        mask = _mask(invalidation_bits)
+        return pa.FixedSizeListArray.from_arrays(
+            values,
+            samples.shape[1],
+            mask=None if mask is None else pa.array(mask),
+        )
+
+    kind = samples.dtype.kind
+    if kind == "S":
+        return string_array(samples, encoding, invalidation_bits)
+    elif kind == "V":
+        return pa.array(
+            samples.tolist(),
+            type=pa.binary(samples.itemsize),
+            mask=_mask(invalidation_bits),
+        )
+    else:
+        return pa.array(
+            _native(samples),
+            mask=_mask(invalidation_bits),
+            from_pandas=kind == "O",
+        )
+
+
+def arrow_components(
+    channel: NDArray[Any],
+    channel_name: str,
+    unique_names: UniqueDB,
+    prefix: str = "",
+    only_basenames: bool = False,
+    invalidation_bits: NDArray[np.bool_] | None = None,
+) -> Iterator[tuple[str, pa.Array]]:
+    """yield the Arrow arrays and unique names of the structure and channel
+    array components; the names are the same as the ones used for the
+    dataframe columns (see *components*)
+
+    Parameters
+    ----------
+    channel : numpy.ndarray
+        channel samples with structured dtype
+    channel_name : str
+        channel name
+    unique_names : UniqueDB
+        unique names object
+    prefix : str
+        prefix used in case of nested recarrays
+    only_basenames (False) : bool
+        use just the field names, without prefix, for structures and channel
+        arrays
+    invalidation_bits : np.array
+        optional invalidation bits; the invalid samples are nulls
+
+    Returns
+    -------
+    name, array : (str, pyarrow.Array)
+        tuple of unique name and array
+    """
+    names = channel.dtype.names
+
+    # channel arrays
+    if names[0] == channel_name:
+        name = names[0]
+
+        if not only_basenames and prefix:
+            name_ = unique_names.get_unique_name(f"{prefix}.{name}")
+        else:
+            name_ = unique_names.get_unique_name(name)
+
+        yield name_, arrow_array(channel[name], invalidation_bits=invalidation_bits)
+
+        for name in names[1:]:
+            if not only_basenames:
+                axis_name = unique_names.get_unique_name(f"{name_}.{name}")
+            else:
+                axis_name = unique_names.get_unique_name(name)
+
+            yield axis_name, arrow_array(
+                channel[name], invalidation_bits=invalidation_bits
+            )
+
+    # structure composition
+    else:
+        for name in names:
+            values = channel[name]
+
+            if values.dtype.names:
+                yield from arrow_components(
+                    values,
+                    name,
+                    unique_names,
+                    prefix=f"{prefix}.{channel_name}" if prefix else f"{channel_name}",
+                    only_basenames=only_basenames,
+                    invalidation_bits=invalidation_bits,
+                )
+
+            else:
+                if not only_basenames:
+                    name_ = unique_names.get_unique_name(
+                        f"{prefix}.{channel_name}.{name}"
+                        if prefix
+                        else f"{channel_name}.{name}"
+                    )
+                else:
+                    name_ = unique_names.get_unique_name(name)
+
+                yield name_, arrow_array(values, invalidation_bits=invalidation_bits)
@@ -13,163 +13,191 @@
 
 char err_string[1024];
 
+static Py_ssize_t calc_size(char* buf)
+{
+    return (unsigned char) buf[3] << 24 |
+           (unsigned char) buf[2] << 16 |
+           (unsigned char) buf[1] << 8 |
+           (unsigned char) buf[0];
+}
+
 struct rec_info {
-    unsigned long id;
-    unsigned long size;
+    unsigned long long id;
+    unsigned long long size;
     PyObject* mlist;
-}; 
+};
 
-struct node {
-    struct node * next;
-    struct rec_info info;
+struct rec_entry {
+    struct rec_info * info;
+    unsigned long long offset;
+    unsigned long long length;
 };
 
 
+static int rec_info_compare(const void * a, const void * b)
+{
+    unsigned long long id_a = ((const struct rec_info *) a)->id;
+    unsigned long long id_b = ((const struct rec_info *) b)->id;
+
+    return (id_a > id_b) - (id_a < id_b);
+}
+
+
+static struct rec_info * find_rec_info(struct rec_info * infos, Py_ssize_t count, unsigned long long id)
+{
+    Py_ssize_t low = 0, high = count - 1, middle;
+
+    while (low <= high) {
+        middle = low + (high - low) / 2;
+        if (infos[middle].id == id) return &infos[middle];
+        else if (infos[middle].id < id) low = middle + 1;
+        else high = middle - 1;
+    }
+
+    return NULL;
+}
 
 
 static PyObject* sort_data_block(PyObject* self, PyObject* args)
 {
-    unsigned long long id_size=0, position=0, size;
-    unsigned long rec_size, length, rec_id;
-    PyObject *signal_data, *partial_records, *record_size, *optional, *mlist;
+    unsigned long long id_size=0, position=0, size, rec_id, length;
+    PyObject *signal_data, *partial_records, *record_size, *optional;
     PyObject *bts, *key, *value, *rem=NULL;
     unsigned char *buf, *end, *orig;
-    struct node * head = NULL, *last=NULL, *item;
-    
+    struct rec_info *infos=NULL, *info;
+    struct rec_entry *entries=NULL, *new_entries;
+    Py_ssize_t infos_count, entries_count=0, entries_capacity=1024, pos=0, i=0;
+    bool unknown_record=false, no_memory=false;
+
     if (!PyArg_ParseTuple(args, "OOOK|O", &signal_data, &partial_records, &record_size, &id_size, &optional))
     {
         return 0;
     }
     else
     {
-        Py_ssize_t pos = 0;
-		position = 0;
-       
-        while (PyDict_Next(record_size, &pos, &key, &value)) 
+        infos_count = PyDict_Size(record_size);
+        infos = (struct rec_info *) malloc((infos_count ? infos_count : 1) * sizeof(struct rec_info));
+        entries = (struct rec_entry *) malloc(entries_capacity * sizeof(struct rec_entry));
+        if (!infos || !entries) {
+            free(infos);
+            free(entries);
+            return PyErr_NoMemory();
+        }
+
+        while (PyDict_Next(record_size, &pos, &key, &value))
         {
-            item = malloc(sizeof(struct node));
-            item->info.id = PyLong_AsUnsignedLong(key);
-            item->info.size = PyLong_AsUnsignedLong(value);
-            item->info.mlist = PyDict_GetItem(partial_records, key);
-            item->next = NULL;
-            if (last)
-                last->next = item;
-            if (!head)
-                head = item;
-            last = item; 
-        }
- 
+            infos[i].id = PyLong_AsUnsignedLongLong(key);
+            infos[i].size = PyLong_AsUnsignedLongLong(value);
+            infos[i].mlist = PyDict_GetItem(partial_records, key);
+            i++;
+        }
+
+        if (PyErr_Occurred()) {
+            free(infos);
+            free(entries);
+            return NULL;
+        }
+
+        qsort(infos, infos_count, sizeof(struct rec_info), rec_info_compare);
+
         buf = (unsigned char *) PyBytes_AS_STRING(signal_data);
         orig = buf;
         size = (unsigned long long) PyBytes_GET_SIZE(signal_data);
         end = buf + size;
-        
+
+        // the records are only located here; the bytes objects are created
+        // after the GIL is acquired again
+        Py_BEGIN_ALLOW_THREADS
+
         while ((buf + id_size) < end)
         {
- 
-            rec_id = 0; 
-            for (unsigned char i=0; i<id_size; i++, buf++) {
-                rec_id += (*buf) << (i <<3);
-            }  
-
-            key = PyLong_FromUnsignedLong(rec_id);
-            value = PyDict_GetItem(record_size, key);
-
-            if (!value) {
-                rem = PyBytes_FromStringAndSize(NULL, 0);
-                Py_XDECREF(key);
-                return rem;
+            rec_id = 0;
+            for (unsigned char j=0; j<id_size; j++, buf++) {
+                rec_id += ((unsigned long long) *buf) << (j << 3);
             }
-            else {
-                rec_size = PyLong_AsUnsignedLong(value);
-            }
-
-            mlist = PyDict_GetItem(partial_records, key);
 
-            if (!mlist) {
-                rem = PyBytes_FromStringAndSize(NULL, 0);
-                Py_XDECREF(key);
-                return rem;
+            info = find_rec_info(infos, infos_count, rec_id);
+            if (!info || !info->mlist) {
+                unknown_record = true;
+                break;
             }
 
-            Py_XDECREF(key);
-            
-            if (rec_size)
+            if (info->size)
             {
-                if (rec_size + position + id_size > size) {
+                if (info->size + position + id_size > size) {
                     break;
                 }
-                bts = PyBytes_FromStringAndSize((const char *)buf, (Py_ssize_t) rec_size);
-                PyList_Append(
-                    mlist,
-                    bts
-                );
-                Py_XDECREF(bts);
-
-                buf += rec_size;
-
+                length = info->size;
             }
             else
             {
                 if (4 + position + id_size > size) {
                     break;
                 }
-                rec_size = (buf[3] << 24) + (buf[2] << 16) +(buf[1] << 8) + buf[0];
-                length = rec_size + 4;
+                length = (unsigned long long) calc_size((char *) buf) + 4;
                 if (position + length + id_size > size) {
                     break;
                 }
-                bts = PyBytes_FromStringAndSize((const char *)buf, (Py_ssize_t) length);
-                PyList_Append(mlist, bts);
-                Py_XDECREF(bts);
-                buf += length;
             }
 
+            if (entries_count == entries_capacity) {
+                new_entries = (struct rec_entry *) realloc(entries, 2 * entries_capacity * sizeof(struct rec_entry));
+                if (!new_entries) {
+                    no_memory = true;
+                    break;
+                }
+                entries = new_entries;
+                entries_capacity *= 2;
+            }
+
+            entries[entries_count].info = info;
+            entries[entries_count].offset = (unsigned long long) (buf - orig);
+            entries[entries_count].length = length;
+            entries_count++;
+
+            buf += length;
             position = (unsigned long long) (buf - orig);
-        } 
-        
-        while (head != NULL) {
-            item = head;
-            item->info.mlist = NULL;
-     
-            head = head->next;
-            item->next = NULL;
-            free(item);
-        }
-        
-        head = NULL;
-        last = NULL;
-        item = NULL;
-		mlist = NULL;
-		
-        rem = PyBytes_FromStringAndSize((const char *) (orig + position), (Py_ssize_t) (size - position));
-		
-		buf = NULL;
-		orig = NULL;
-		end = NULL;
-	
+        }
+
+        Py_END_ALLOW_THREADS
+
+        if (no_memory) {
+            free(infos);
+            free(entries);
+            return PyErr_NoMemory();
+        }
+
+        for (i=0; i<entries_count; i++) {
+            bts = PyBytes_FromStringAndSize((const char *) (orig + entries[i].offset), (Py_ssize_t) entries[i].length);
+            PyList_Append(entries[i].info->mlist, bts);
+            Py_XDECREF(bts);
+        }
+
+        free(infos);
+        free(entries);
+
+        if (unknown_record) {
+            rem = PyBytes_FromStringAndSize(NULL, 0);
+        }
+        else {
+            rem = PyBytes_FromStringAndSize((const char *) (orig + position), (Py_ssize_t) (size - position));
+        }
+
         return rem;
     }
 }
 
-static Py_ssize_t calc_size(char* buf)
-{
-    return (unsigned char) buf[3] << 24 |
-           (unsigned char) buf[2] << 16 |
-           (unsigned char) buf[1] << 8 |
-           (unsigned char) buf[0];
-}
-
 static PyObject* extract(PyObject* self, PyObject* args)
 {
-    int i=0, count, max=0, list_count;
-    long long int offset;
-    Py_ssize_t pos=0, size=0;
-    PyObject *signal_data, *is_byte_array, *offsets, *offsets_list=NULL;
+    Py_ssize_t i=0, count=0, max=0, pos=0, size=0, max_size=0, offsets_count=0;
+    long long offset;
+    PyObject *signal_data, *is_byte_array, *offsets;
     char *buf;
-    PyArrayObject *vals;
+    PyArrayObject *vals, *offsets_array=NULL;
     PyArray_Descr *descr;
     unsigned char * addr2;
+    long long *offsets_ptr=NULL;
+    int byte_array;
 
     if(!PyArg_ParseTuple(args, "OOO", &signal_data, &is_byte_array, &offsets))
     {
@@ -177,18 +205,25 @@ static PyObject* extract(PyObject* self, PyObject* args)
     }
     else
     {
-        Py_ssize_t max_size = 0;
         int retval = PyBytes_AsStringAndSize(signal_data, &buf, &max_size);
 
         if (retval == -1) {
             printf("PyBytes_AsStringAndSize error\n");
             return NULL;
         }
-        
-        count = 0;
-        pos = 0;
-        
-        if (offsets == Py_None) {
+
+        byte_array = PyObject_IsTrue(is_byte_array);
+
+        if (offsets != Py_None) {
+            offsets_array = (PyArrayObject *) PyArray_FROM_OTF(offsets, NPY_LONGLONG, NPY_ARRAY_IN_ARRAY | NPY_ARRAY_FORCECAST);
+            if (!offsets_array) return NULL;
+            offsets_count = PyArray_SIZE(offsets_array);
+            offsets_ptr = (long long *) PyArray_DATA(offsets_array);
+        }
+
+        Py_BEGIN_ALLOW_THREADS
+
+        if (offsets_ptr == NULL) {
             while ((pos + 4) <= max_size)
             {
                 size = calc_size(&buf[pos]);
@@ -201,80 +236,69 @@ static PyObject* extract(PyObject* self, PyObject* args)
             }
         }
         else {
-            offsets_list = PyObject_CallMethod(offsets, "tolist", NULL);
-            list_count = (int) PyList_Size(offsets_list);
-            for (i=0; i<list_count; i++) {
-                offset = (long long int) PyLong_AsLongLong(PyList_GET_ITEM(offsets_list, i));
-                if ((offset + 4) > max_size) break;
+            for (i=0; i<offsets_count; i++) {
+                offset = offsets_ptr[i];
+                if ((offset < 0) || ((offset + 4) > max_size)) break;
                 size = calc_size(&buf[offset]);
                 if ((offset+4+size) > max_size) break;
                 if (max < size) max = size;
                 count++;
-            } 
+            }
         }
 
-        if (PyObject_IsTrue(is_byte_array))
-        {
+        Py_END_ALLOW_THREADS
 
+        if (byte_array)
+        {
             npy_intp dims[2];
             dims[0] = count;
             dims[1] = max;
-            
+
             vals = (PyArrayObject *) PyArray_ZEROS(2, dims, NPY_UBYTE, 0);
-            
-            if (offsets == Py_None) {
-                pos = 0;
-                for (i=0; i<count; i++)
-                {
-                    addr2 = (unsigned char *) PyArray_GETPTR2(vals, i, 0);
-                    size = calc_size(&buf[pos]);
-                    pos += 4;
-                    memcpy(addr2, &buf[pos], size);
-                    pos += size;
-                }
-            }
-            else {
-                for (i=0; i<count; i++) {
-                    addr2 = (unsigned char *) PyArray_GETPTR2(vals, i, 0);
-                    offset = (long long int) PyLong_AsLongLong(PyList_GET_ITEM(offsets_list, i));
-                    size = calc_size(&buf[offset]);
-                    memcpy(addr2, &buf[offset+4], size);
-                }
-            }
         }
         else
         {
             npy_intp dims[1];
             dims[0] = count;
 
-            descr = PyArray_DescrFromType(NPY_STRING);
-            descr = PyArray_DescrNew(descr);
-            descr->elsize = max;
+            descr = PyArray_DescrNewFromType(NPY_STRING);
+            descr->elsize = (int) max;
 
             vals = (PyArrayObject *) PyArray_Zeros(1, dims, descr, 0);
-            
-            if (offsets == Py_None) {
-
-                pos = 0;
-                for (i=0; i<count; i++)
-                {
-                    addr2 = (unsigned char *) PyArray_GETPTR1(vals, i);
-                    size = calc_size(&buf[pos]);
-                    pos += 4;
-                    memcpy(addr2, &buf[pos], size);
-                    pos += size;
-                }
+        }
+
+        if (!vals) {
+            Py_XDECREF(offsets_array);
+            return NULL;
+        }
+
+        Py_BEGIN_ALLOW_THREADS
+
+        if (offsets_ptr == NULL) {
+            pos = 0;
+            for (i=0; i<count; i++)
+            {
+                if (byte_array) addr2 = (unsigned char *) PyArray_GETPTR2(vals, i, 0);
+                else addr2 = (unsigned char *) PyArray_GETPTR1(vals, i);
+                size = calc_size(&buf[pos]);
+                pos += 4;
+                memcpy(addr2, &buf[pos], size);
+                pos += size;
             }
-            else {
-                for (i=0; i<count; i++) {
-                    addr2 = (unsigned char *) PyArray_GETPTR1(vals, i);
-                    offset = (long long int) PyLong_AsLongLong(PyList_GET_ITEM(offsets_list, i));
-                    size = calc_size(&buf[offset]);
-                    memcpy(addr2, &buf[offset+4], size);
-                }
+        }
+        else {
+            for (i=0; i<count; i++) {
+                if (byte_array) addr2 = (unsigned char *) PyArray_GETPTR2(vals, i, 0);
+                else addr2 = (unsigned char *) PyArray_GETPTR1(vals, i);
+                offset = offsets_ptr[i];
+                size = calc_size(&buf[offset]);
+                memcpy(addr2, &buf[offset+4], size);
             }
         }
-        Py_XDECREF(offsets_list);
+
+        Py_END_ALLOW_THREADS
+
+        Py_XDECREF(offsets_array);
     }
 
     return (PyObject *) vals;
@@ -318,9 +342,9 @@ static PyObject* get_vlsd_offsets(PyObject* self, PyObject* args)
     npy_intp dim[1];
     PyArrayObject *values;
 
-    unsigned long long current_size = 0;
+    unsigned long long current_size = 0, item_size;
 
-    void *h_result;
+    unsigned long long *h_result;
 
     if(!PyArg_ParseTuple(args, "O", &lst))
     {
@@ -332,17 +356,30 @@ static PyObject* get_vlsd_offsets(PyObject* self, PyObject* args)
         count = PyList_Size(lst);
         dim[0] = (int) count;
         values = (PyArrayObject *) PyArray_SimpleNew(1, dim, NPY_ULONGLONG);
+        if (!values) return NULL;
+
+        h_result = (unsigned long long *) PyArray_DATA(values);
 
+        // the list items sizes can only be read while holding the GIL
         for (i=0; i<(int) count; i++)
         {
-            h_result = PyArray_GETPTR1(values, i);
             item = PyList_GetItem(lst, i);
-            *((unsigned long long*)h_result) = current_size;
-            current_size += (unsigned long long)PyBytes_GET_SIZE(item);
+            h_result[i] = (unsigned long long)PyBytes_GET_SIZE(item);
+        }
+
+        Py_BEGIN_ALLOW_THREADS
+
+        for (i=0; i<(int) count; i++)
+        {
+            item_size = h_result[i];
+            h_result[i] = current_size;
+            current_size += item_size;
         }
+
+        Py_END_ALLOW_THREADS
     }
 
-    result = PyTuple_Pack(2, values, PyLong_FromUnsignedLongLong(current_size));
+    result = Py_BuildValue("(NK)", values, current_size);
 
     return result;
 }
@@ -370,6 +407,8 @@ static PyObject* get_vlsd_max_sample_size(PyObject* self, PyObject* args)
         offsets_array = (unsigned long long*)PyArray_GETPTR1(offsets, 0);
         inptr = PyBytes_AsString(data);
 
+        Py_BEGIN_ALLOW_THREADS
+
         for (i = 0; i < count; i++, offsets_array++)
         {
             memcpy(&vlsd_size, inptr + *offsets_array, 4);
@@ -377,6 +416,8 @@ static PyObject* get_vlsd_max_sample_size(PyObject* self, PyObject* args)
                 max_size = vlsd_size;
             }
         }
+
+        Py_END_ALLOW_THREADS
     }
 
     return PyLong_FromUnsignedLongLong(max_size);
@@ -1103,6 +1144,8 @@ static PyObject* positions(PyObject* self, PyObject* args)
         step = PyLong_AsLong(step_obj);
         last = PyLong_AsLong(last_obj) - 1;
 
+        Py_BEGIN_ALLOW_THREADS
+
         if (kind[0] == 'u') {
             if (itemsize == 1) positions_unsigned_char(samples, timestamps, plot_samples, plot_timestamps, result, step, count, last);
             else if (itemsize == 2) positions_unsigned_short(samples, timestamps, plot_samples, plot_timestamps, result, step, count, last);
@@ -1120,6 +1163,8 @@ static PyObject* positions(PyObject* self, PyObject* args)
             else positions_double(samples, timestamps, plot_samples, plot_timestamps, result, step, count, last);
         }
 
+        Py_END_ALLOW_THREADS
+
         Py_INCREF(Py_None);
         return Py_None;
     }
@@ -1155,15 +1200,19 @@ static PyObject* get_channel_raw_bytes(PyObject* self, PyObject* args)
             inptr = PyBytes_AsString(data_block);
             
             inptr += byte_offset;
-            
-            for (int i=0; i<count; i++) {
+
+            Py_BEGIN_ALLOW_THREADS
+
+            for (Py_ssize_t i=0; i<count; i++) {
                 memcpy(outptr, inptr, actual_byte_count);
                 inptr += record_size;
                 outptr += actual_byte_count;
-                for (int j=0; j< delta; j++) {
+                for (Py_ssize_t j=0; j< delta; j++) {
                     *outptr++ = '\0';
                 }
             }
+
+            Py_END_ALLOW_THREADS
         }
         else {
             count = size / record_size;
@@ -1175,13 +1224,16 @@ static PyObject* get_channel_raw_bytes(PyObject* self, PyObject* args)
             inptr += byte_offset;
             
             delta = record_size - byte_count;
-            
-            for (int i=0; i<count; i++) {
+
+            Py_BEGIN_ALLOW_THREADS
+
+            for (Py_ssize_t i=0; i<count; i++) {
                 memcpy(outptr, inptr, byte_count);
                 inptr += record_size;
                 outptr += byte_count;
             }
-           
+
+            Py_END_ALLOW_THREADS
         }
    
         return out;
@@ -1189,61 +1241,316 @@ static PyObject* get_channel_raw_bytes(PyObject* self, PyObject* args)
 }
 
 
+struct channel_bytes {
+    Py_ssize_t byte_offset;
+    Py_ssize_t byte_count;
+    Py_ssize_t actual_byte_count;
+    char *outptr;
+};
+
+
+static PyObject* get_channels_raw_bytes(PyObject* self, PyObject* args)
+{
+    Py_ssize_t count, size, channels_count, record_size;
+    PyObject *data_block, *channels, *item, *out, *buffer;
+    Py_buffer data_view;
+    struct channel_bytes *channels_info;
+    char *inptr, *recptr;
+
+    if(!PyArg_ParseTuple(args, "OnO", &data_block, &record_size, &channels))
+    {
+        return 0;
+    }
+    else
+    {
+        // the fragments can be bytes, bytearray or memoryview objects
+        if (PyObject_GetBuffer(data_block, &data_view, PyBUF_SIMPLE) < 0) {
+            return NULL;
+        }
+
+        channels = PySequence_Fast(channels, "channels must be a sequence");
+        if (!channels) {
+            PyBuffer_Release(&data_view);
+            return NULL;
+        }
+
+        channels_count = PySequence_Fast_GET_SIZE(channels);
+        size = data_view.len;
+        count = record_size > 0 ? size / record_size : 0;
+
+        out = PyList_New(channels_count);
+        channels_info = (struct channel_bytes *) malloc((channels_count ? channels_count : 1) * sizeof(struct channel_bytes));
+        if (!out || !channels_info) {
+            Py_XDECREF(out);
+            Py_DECREF(channels);
+            free(channels_info);
+            PyBuffer_Release(&data_view);
+            return PyErr_NoMemory();
+        }
+
+        for (Py_ssize_t j=0; j<channels_count; j++) {
+            item = PySequence_Fast_GET_ITEM(channels, j);
+            if (!PyArg_ParseTuple(item, "nn", &channels_info[j].byte_offset, &channels_info[j].byte_count)) {
+                Py_DECREF(out);
+                Py_DECREF(channels);
+                free(channels_info);
+                PyBuffer_Release(&data_view);
+                return NULL;
+            }
+
+            if (channels_info[j].byte_offset < 0 || channels_info[j].byte_count < 0) {
+                PyErr_SetString(PyExc_ValueError, "the byte offset and byte count must not be negative");
+                Py_DECREF(out);
+                Py_DECREF(channels);
+                free(channels_info);
+                PyBuffer_Release(&data_view);
+                return NULL;
+            }
+
+            channels_info[j].actual_byte_count = record_size - channels_info[j].byte_offset;
+            if (channels_info[j].actual_byte_count > channels_info[j].byte_count) {
+                channels_info[j].actual_byte_count = channels_info[j].byte_count;
+            }
+            else if (channels_info[j].actual_byte_count < 0) {
+                channels_info[j].actual_byte_count = 0;
+            }
+
+            buffer = PyByteArray_FromStringAndSize(NULL, count * channels_info[j].byte_count);
+            if (!buffer) {
+                Py_DECREF(out);
+                Py_DECREF(channels);
+                free(channels_info);
+                PyBuffer_Release(&data_view);
+                return NULL;
+            }
+            channels_info[j].outptr = PyByteArray_AsString(buffer);
+            PyList_SET_ITEM(out, j, buffer);
+        }
+
+        Py_DECREF(channels);
+
+        inptr = (char *) data_view.buf;
+
+        // a single pass over the records scatters the bytes of all channels;
+        // the buffer export keeps the input alive and unresized meanwhile
+        Py_BEGIN_ALLOW_THREADS
+
+        for (Py_ssize_t i=0; i<count; i++) {
+            recptr = inptr + i * record_size;
+            for (Py_ssize_t j=0; j<channels_count; j++) {
+                memcpy(channels_info[j].outptr, recptr + channels_info[j].byte_offset, channels_info[j].actual_byte_count);
+                channels_info[j].outptr += channels_info[j].actual_byte_count;
+                for (Py_ssize_t k=channels_info[j].actual_byte_count; k<channels_info[j].byte_count; k++) {
+                    *channels_info[j].outptr++ = '\0';
+                }
+            }
+        }
+
+        Py_END_ALLOW_THREADS
+
+        PyBuffer_Release(&data_view);
+        free(channels_info);
+
+        return out;
+    }
+}
+
+
 struct dtype {
     unsigned char * data;
     long itemsize;
+    long bit_offset;
+    unsigned char bit_mask;
+    int bit_field;
 };
 
 
+// builds the records of a channel group from the samples of its channels
+//
+// data_blocks is a list of tuples; (samples, itemsize) copies itemsize bytes
+// per record and (samples, bit_count, bit_offset) stores the low bit_count
+// bits of a single byte sample at bit_offset. A bit field with a zero bit
+// offset starts a new record byte, the others are added to the last byte.
+//
+// the optional invalidation list holds a bool array for each invalidation bit
+// position; the bits are packed LSB first in the invalidation_bytes_nr bytes
+// that end each record
 static PyObject* data_block_from_arrays(PyObject* self, PyObject* args)
 {
-    Py_ssize_t size;
-    PyObject *data_blocks, *out, *item, *bytes, *itemsize;
+    Py_ssize_t size, inval_size=0, invalidation_bytes_nr=0, buffers_nr=0, item_size;
+    PyObject *data_blocks, *invalidation=NULL, *out=NULL, *item;
+
+    char *outptr;
+    unsigned char value, **inval_data=NULL;
+    unsigned long long record_size=0, cycles;
+    long bit_count;
 
-    char *outptr; 
-    unsigned long long total_size=0, cycles;
-    
     struct dtype * block_info=NULL;
+    Py_buffer *buffers=NULL;
 
-    if(!PyArg_ParseTuple(args, "OK", &data_blocks, &cycles))
+    if(!PyArg_ParseTuple(args, "OK|On", &data_blocks, &cycles, &invalidation, &invalidation_bytes_nr))
     {
-        return 0;
+        return NULL;
     }
-    else
-    {
-        size = PyList_GET_SIZE(data_blocks);
-        if (!size) {
-            out = PyBytes_FromStringAndSize(NULL, 0);
+
+    if (!PyList_Check(data_blocks)) {
+        PyErr_SetString(PyExc_TypeError, "data_blocks must be a list of tuples");
+        return NULL;
+    }
+    size = PyList_GET_SIZE(data_blocks);
+
+    if (invalidation && invalidation != Py_None) {
+        if (!PyList_Check(invalidation)) {
+            PyErr_SetString(PyExc_TypeError, "invalidation must be a list of arrays");
+            return NULL;
+        }
+        inval_size = PyList_GET_SIZE(invalidation);
+    }
+    else {
+        invalidation_bytes_nr = 0;
+    }
+
+    if (invalidation_bytes_nr < 0 || inval_size > invalidation_bytes_nr * 8) {
+        PyErr_SetString(PyExc_ValueError, "too many invalidation arrays for the invalidation bytes");
+        return NULL;
+    }
+
+    block_info = (struct dtype *) malloc((size + 1) * sizeof(struct dtype));
+    inval_data = (unsigned char **) malloc((inval_size + 1) * sizeof(unsigned char *));
+    buffers = (Py_buffer *) malloc((size + inval_size + 1) * sizeof(Py_buffer));
+    if (!block_info || !inval_data || !buffers) {
+        PyErr_NoMemory();
+        goto error;
+    }
+
+    for (Py_ssize_t i=0; i<size; i++) {
+        item = PyList_GET_ITEM(data_blocks, i);
+        if (!PyTuple_Check(item) || PyTuple_GET_SIZE(item) < 2 || PyTuple_GET_SIZE(item) > 3) {
+            PyErr_SetString(PyExc_TypeError, "data_blocks items must be (samples, itemsize) or (samples, bit_count, bit_offset) tuples");
+            goto error;
+        }
+
+        if (PyObject_GetBuffer(PyTuple_GET_ITEM(item, 0), &buffers[buffers_nr], PyBUF_SIMPLE) < 0) {
+            goto error;
+        }
+        buffers_nr++;
+
+        block_info[i].data = (unsigned char *) buffers[i].buf;
+
+        if (PyTuple_GET_SIZE(item) == 3) {
+            bit_count = PyLong_AsLong(PyTuple_GET_ITEM(item, 1));
+            block_info[i].bit_offset = PyLong_AsLong(PyTuple_GET_ITEM(item, 2));
+            if (PyErr_Occurred()) goto error;
+
+            if (bit_count < 1 || block_info[i].bit_offset < 0 || bit_count + block_info[i].bit_offset > 8) {
+                PyErr_SetString(PyExc_ValueError, "bit fields must fit in a single byte");
+                goto error;
+            }
+
+            block_info[i].bit_field = 1;
+            block_info[i].bit_mask = (unsigned char) ((1 << bit_count) - 1);
+            block_info[i].itemsize = block_info[i].bit_offset ? 0 : 1;
+            item_size = 1;
         }
         else {
-            
-            block_info = (struct dtype *) malloc(size * sizeof(struct dtype));
-            
-            for (int i=0; i< size; i++) {
-                item = PyList_GET_ITEM(data_blocks, i);
-                bytes = PyTuple_GET_ITEM(item, 0);
-                itemsize = PyTuple_GET_ITEM(item, 1);
-                block_info[i].data = (unsigned char *) PyBytes_AsString(bytes);
-                block_info[i].itemsize = PyLong_AsLong(itemsize);
-                total_size += (unsigned long long) block_info[i].itemsize;
+            block_info[i].itemsize = PyLong_AsLong(PyTuple_GET_ITEM(item, 1));
+            if (PyErr_Occurred()) goto error;
+
+            if (block_info[i].itemsize < 0) {
+                PyErr_SetString(PyExc_ValueError, "the itemsize cannot be negative");
+                goto error;
             }
-            
-            total_size *= cycles;
-            
-            out = PyByteArray_FromStringAndSize(NULL, total_size);             
-            outptr = PyByteArray_AsString(out);
-       
-            for (int i=0; i<cycles; i++) {
-                for (int j=0; j<size; j++) {
-                    memcpy(outptr, block_info[j].data, block_info[j].itemsize);
-                    outptr += block_info[j].itemsize;
-                    block_info[j].data += block_info[j].itemsize;
+
+            block_info[i].bit_field = 0;
+            item_size = block_info[i].itemsize;
+        }
+
+        if ((unsigned long long) buffers[i].len < cycles * item_size) {
+            PyErr_SetString(PyExc_ValueError, "the samples are shorter than the number of cycles");
+            goto error;
+        }
+
+        record_size += (unsigned long long) block_info[i].itemsize;
+    }
+
+    if (size && block_info[0].bit_field && block_info[0].bit_offset) {
+        PyErr_SetString(PyExc_ValueError, "the first field cannot continue a bit field");
+        goto error;
+    }
+
+    for (Py_ssize_t i=0; i<inval_size; i++) {
+        if (PyObject_GetBuffer(PyList_GET_ITEM(invalidation, i), &buffers[buffers_nr], PyBUF_SIMPLE) < 0) {
+            goto error;
+        }
+
+        if ((unsigned long long) buffers[buffers_nr].len < cycles) {
+            buffers_nr++;
+            PyErr_SetString(PyExc_ValueError, "the invalidation bits are shorter than the number of cycles");
+            goto error;
+        }
+
+        inval_data[i] = (unsigned char *) buffers[buffers_nr].buf;
+        buffers_nr++;
+    }
+
+    record_size += (unsigned long long) invalidation_bytes_nr;
+
+    out = PyByteArray_FromStringAndSize(NULL, record_size * cycles);
+    if (!out) {
+        goto error;
+    }
+    outptr = PyByteArray_AsString(out);
+
+    Py_BEGIN_ALLOW_THREADS
+
+    for (unsigned long long i=0; i<cycles; i++) {
+        for (Py_ssize_t j=0; j<size; j++) {
+            if (block_info[j].bit_field) {
+                value = (*block_info[j].data++ & block_info[j].bit_mask) << block_info[j].bit_offset;
+                if (block_info[j].bit_offset) {
+                    *(outptr - 1) |= value;
+                }
+                else {
+                    *outptr++ = value;
                 }
             }
+            else {
+                memcpy(outptr, block_info[j].data, block_info[j].itemsize);
+                outptr += block_info[j].itemsize;
+                block_info[j].data += block_info[j].itemsize;
+            }
+        }
+
+        if (invalidation_bytes_nr) {
+            memset(outptr, 0, invalidation_bytes_nr);
+            for (Py_ssize_t j=0; j<inval_size; j++) {
+                outptr[j >> 3] |= (inval_data[j][i] != 0) << (j & 7);
+            }
+            outptr += invalidation_bytes_nr;
         }
-   
-        return out;
     }
+
+    Py_END_ALLOW_THREADS
+
+    for (Py_ssize_t i=0; i<buffers_nr; i++) {
+        PyBuffer_Release(&buffers[i]);
+    }
+    free(buffers);
+    free(inval_data);
+    free(block_info);
+
+    return out;
+
+error:
+    for (Py_ssize_t i=0; i<buffers_nr; i++) {
+        PyBuffer_Release(&buffers[i]);
+    }
+    free(buffers);
+    free(inval_data);
+    free(block_info);
+    Py_XDECREF(out);
+
+    return NULL;
 }
 
 
@@ -1259,7 +1566,8 @@ static PyMethodDef myMethods[] =
     { "sort_data_block", sort_data_block, METH_VARARGS, "sort raw data group block" },
     { "positions", positions, METH_VARARGS, "positions" },
     { "get_channel_raw_bytes", get_channel_raw_bytes, METH_VARARGS, "get_channel_raw_bytes" },
-    { "data_block_from_arrays", data_block_from_arrays, METH_VARARGS, "data_block_from_arrays" },
+    { "get_channels_raw_bytes", get_channels_raw_bytes, METH_VARARGS, "get the raw bytes of several channels in a single pass" },
+    { "data_block_from_arrays", data_block_from_arrays, METH_VARARGS, "build the group records from the channel samples and invalidation bits" },
     
     { NULL, NULL, 0, NULL }
 };
@@ -5,8 +5,10 @@ ASAM MDF version 4 file format module
 from __future__ import annotations
 
 import logging
+from threading import local
 from typing import Any
 
+from numpy import searchsorted
 from numpy.typing import NDArray
 
 from .utils import MdfException
@@ -19,9 +21,94 @@ __all__ = ["MDF_Common"]
 class MDF_Common:
     """common methods for MDF objects"""
 
+    def _get_thread_state(self) -> local:
+        # the temporary data used while loading a channel group is kept per
+        # thread so that several channel groups can be read concurrently
+        try:
+            return self._thread_state
+        except AttributeError:
+            state = self._thread_state = local()
+            return state
+
+    @property
+    def _master(self) -> NDArray[Any] | None:
+        return getattr(self._get_thread_state(), "master", None)
+
+    @_master.setter
+    def _master(self, master: NDArray[Any] | None) -> None:
+        self._get_thread_state().master = master
+
+    def _set_temporary_channels_bytes(
+        self, index: int, channels_bytes: dict[int, bytearray] | None
+    ) -> None:
+        """set the already extracted raw bytes of the group channels for the
+        current fragment; the buffers are used once by the next calls to
+        *get* that use the same fragment
+
+        Parameters
+        ----------
+        index : int
+            group index
+        channels_bytes : dict | None
+            channel index to raw bytes mapping; use *None* to discard them
+
+        """
+        state = self._get_thread_state()
+        if channels_bytes is None:
+            state.channels_bytes = None
+        else:
+            state.channels_bytes = (index, channels_bytes)
+
+    def _pop_temporary_channel_bytes(
+        self, index: int, channel_index: int
+    ) -> bytearray | None:
+        channels_bytes = getattr(self._get_thread_state(), "channels_bytes", None)
+        if channels_bytes is not None and channels_bytes[0] == index:
+            return channels_bytes[1].pop(channel_index, None)
+        return None
+
     def _set_temporary_master(self, master: NDArray[Any] | None) -> None:
         self._master = master
 
+    def _get_records_range(
+        self,
+        index: int,
+        start: float | None = None,
+        stop: float | None = None,
+    ) -> tuple[int, int]:
+        """translate the time window into records for the given group. The
+        generic implementation searches the complete master channel
+
+        Parameters
+        ----------
+        index : int
+            group index
+        start : float | None
+            window start timestamp; default *None* means the start of the group
+        stop : float | None
+            window stop timestamp; default *None* means the end of the group
+
+        Returns
+        -------
+        record_offset, record_count : (int, int)
+            records of the group that have the timestamps in the closed
+            interval [*start*, *stop*]
+
+        """
+        timestamps = self.get_master(index)
+
+        if start is None:
+            first = 0
+        else:
+            first = int(searchsorted(timestamps, start, side="left"))
+
+        if stop is None:
+            last = len(timestamps)
+        else:
+            last = int(searchsorted(timestamps, stop, side="right"))
+
+        return first, max(last - first, 0)
+
     # @lru_cache(maxsize=1024)
     def _validate_channel_selection(
         self,
@@ -16,7 +16,6 @@ import mmap
 import os
 from pathlib import Path
 import sys
-from tempfile import TemporaryFile
 import time
 from traceback import format_exc
 from typing import Any, overload
@@ -33,6 +32,7 @@ from numpy import (
     float64,
     frombuffer,
     linspace,
+    ndarray,
     searchsorted,
     uint16,
     unique,
@@ -67,6 +67,7 @@ from .utils import (
     is_file_like,
     MdfException,
     TERMINATED,
+    temporary_file,
     UniqueDB,
     validate_version_argument,
     VirtualChannelGroup,
@@ -192,6 +193,9 @@ class MDF3(MDF_Common):
         self.temporary_folder = kwargs.get(
             "temporary_folder", get_global_option("temporary_folder")
         )
+        self._temporary_spool_size = kwargs.get(
+            "temporary_spool_size", get_global_option("temporary_spool_size")
+        )
 
         self.groups = []
         self.header = None
@@ -203,7 +207,9 @@ class MDF3(MDF_Common):
         self._master_channel_metadata = {}
         self._closed = False
 
-        self._tempfile = TemporaryFile(dir=self.temporary_folder)
+        self._tempfile = temporary_file(
+            self.temporary_folder, self._temporary_spool_size
+        )
         self._tempfile.write(b"\0")
         self._file = None
 
@@ -1097,7 +1103,7 @@ class MDF3(MDF_Common):
 
     def append(
         self,
-        signals: list[Signal] | Signal | DataFrame,
+        signals: list[Signal] | Signal | DataFrame | NDArray[Any],
         acq_name: str | None = None,
         acq_source: Source | None = None,
         comment: str = "Python",
@@ -1111,10 +1117,13 @@ class MDF3(MDF_Common):
 
         Parameters
         ----------
-        signals : list | Signal | pandas.DataFrame
+        signals : list | Signal | pandas.DataFrame | numpy.ndarray
             list of *Signal* objects, or a single *Signal* object, or a pandas
-            *DataFrame* object. All bytes columns in the pandas *DataFrame*
-            must be *latin-1* encoded
+            *DataFrame* object, or a numpy structured array whose first field
+            is the time master channel. All bytes columns in the pandas
+            *DataFrame* must be *latin-1* encoded
+
+            .. versionchanged:: 7.4.0 added numpy structured arrays
         acq_name : str
             channel group acquisition name
         acq_source : Source
@@ -1162,6 +1171,24 @@ class MDF3(MDF_Common):
         elif isinstance(signals, DataFrame):
             self._append_dataframe(signals, comment=comment, units=units)
             return
+        elif isinstance(signals, ndarray):
+            names = signals.dtype.names
+            if not names:
+                raise MdfException(
+                    "append expects a one dimensional numpy structured array"
+                )
+            units = units or {}
+            timestamps = signals[names[0]]
+            signals = [
+                Signal(
+                    signals[name],
+                    timestamps,
+                    name=name,
+                    unit=units.get(name, ""),
+                )
+                for name in names[1:]
+            ]
+            common_timebase = True
 
         version = self.version
         integer_interp_mode = self._integer_interpolation
@@ -3476,12 +3503,22 @@ class MDF3(MDF_Common):
     def start_time(self, timestamp: datetime) -> None:
         self.header.start_time = timestamp
 
+    def flush(self) -> None:
+        """does nothing for mdf version3; introduced here to share the same
+        API as mdf version 4 files
+
+        .. versionadded:: 7.4.0
+
+        """
+
     def save(
         self,
         dst: StrPathType,
         overwrite: bool = False,
         compression: CompressionType = 0,
         progress=None,
+        workers: int = 0,
+        compression_level: int | None = None,
     ) -> Path | None:
         """Save MDF to *dst*. If overwrite is *True* then the destination file
         is overwritten, otherwise the file name is appended with '.<cntr>',
@@ -3497,6 +3534,17 @@ class MDF3(MDF_Common):
         compression : int
             does nothing for mdf version3; introduced here to share the same
             API as mdf version 4 files
+        workers : int
+            does nothing for mdf version3; introduced here to share the same
+            API as mdf version 4 files
+
+            .. versionadded:: 7.4.0
+
+        compression_level : int | None
+            does nothing for mdf version3; introduced here to share the same
+            API as mdf version 4 files
+
+            .. versionadded:: 7.4.0
 
         Returns
         -------
@@ -3735,7 +3783,9 @@ class MDF3(MDF_Common):
             self.channels_db.clear()
             self.masters_db.clear()
 
-            self._tempfile = TemporaryFile(dir=self.temporary_folder)
+            self._tempfile = temporary_file(
+                self.temporary_folder, self._temporary_spool_size
+            )
             self._file = open(self.name, "rb")
             self._read()
 
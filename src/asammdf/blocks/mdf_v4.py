@@ -5,21 +5,28 @@ ASAM MDF version 4 file format module
 from __future__ import annotations
 
 import bisect
-from collections import defaultdict
+from collections import defaultdict, deque
 from collections.abc import Callable, Iterable, Iterator, Sequence, Sized
+from concurrent.futures import Future, ThreadPoolExecutor
+from copy import copy
+import copyreg
 from datetime import datetime
 from functools import lru_cache
 from hashlib import md5
 from io import BufferedReader, BytesIO
+from itertools import chain
+import json
 import logging
 from math import ceil, floor
 import mmap
 import os
 from pathlib import Path
+import pickle
 import shutil
 import sys
-from tempfile import gettempdir, TemporaryFile
-from time import sleep
+from tempfile import gettempdir
+from threading import Lock
+from time import perf_counter, sleep
 from traceback import format_exc
 from typing import Any, overload
 from zipfile import ZIP_DEFLATED, ZipFile
@@ -51,14 +58,12 @@ from numpy import (
     cumsum,
     dtype,
     empty,
-    fliplr,
     float32,
     float64,
     frombuffer,
     full,
     linspace,
     nonzero,
-    packbits,
     searchsorted,
     transpose,
     uint8,
@@ -100,6 +105,7 @@ from .utils import (
     count_channel_groups,
     DataBlockInfo,
     debug_channel,
+    ExtendBuffer,
     extract_display_names,
     extract_encryption_information,
     extract_xml_comment,
@@ -114,6 +120,7 @@ from .utils import (
     sanitize_xml,
     SignalDataBlockInfo,
     TERMINATED,
+    temporary_file,
     UINT8_uf,
     UINT16_uf,
     UINT32_p,
@@ -161,9 +168,45 @@ VALID_DATA_TYPES = v4c.VALID_DATA_TYPES
 
 EMPTY_TUPLE = tuple()
 
+# compression="auto" samples this many bytes of the first data block of each
+# channel group; the blocks are not compressed if the best codec saves less
+# than AUTO_COMPRESSION_MIN_GAIN of the size, and the faster codec is kept if
+# the smaller output is within AUTO_COMPRESSION_TIE of it
+AUTO_COMPRESSION_SAMPLE_SIZE = 1024 * 1024
+AUTO_COMPRESSION_MIN_GAIN = 0.1
+AUTO_COMPRESSION_TIE = 0.05
+
 # 100 extra steps for the sorting, 1 step after sorting and 1 step at finish
 SORT_STEPS = 102
 
+# the blocks copied verbatim by save are transferred in chunks of this size
+COPY_CHUNK_SIZE = 16 * 1024 * 1024
+
+# bump this when the layout of the pickled metadata index changes
+METADATA_INDEX_VERSION = 2
+METADATA_INDEX_SUFFIX = ".idx"
+# the index starts with this magic and a plain JSON line with the index key;
+# they are checked before the pickled metadata is loaded
+METADATA_INDEX_MAGIC = b"ASAMMDF-IDX\n"
+METADATA_INDEX_ATTRIBUTES = (
+    "identification",
+    "version",
+    "header",
+    "file_history",
+    "attachments",
+    "groups",
+    "channels_db",
+    "masters_db",
+    "virtual_groups",
+    "virtual_groups_map",
+    "events",
+    "bus_logging_map",
+    "file_limit",
+    "progress",
+    "_cg_map",
+    "_cn_data_map",
+)
+
 
 logger = logging.getLogger("asammdf")
 
@@ -174,6 +217,7 @@ from .cutils import (
     data_block_from_arrays,
     extract,
     get_channel_raw_bytes,
+    get_channels_raw_bytes,
     get_vlsd_max_sample_size,
     get_vlsd_offsets,
     lengths,
@@ -181,6 +225,173 @@ from .cutils import (
 )
 
 
+class _MetadataIndexPickler(pickle.Pickler):
+    """pickler used for the metadata index: the lazy channel attributes that
+    were not accessed yet are not resolved, so that writing the index does not
+    read all the channel conversions, sources and texts"""
+
+    def reducer_override(self, obj: Any) -> Any:
+        if type(obj) is Channel:
+            return copyreg.__newobj__, (Channel,), obj._loaded_state()
+        return NotImplemented
+
+
+def decompress_block(
+    data: bytes,
+    block_type: int,
+    original_size: int,
+    param: int,
+    block_limit: int | None = None,
+) -> bytes:
+    """get the raw bytes of a data block
+
+    Parameters
+    ----------
+    data : bytes
+        block bytes as stored in the file
+    block_type : int
+        DT or DZ block type
+    original_size : int
+        size of the uncompressed data
+    param : int
+        transposition columns for the transposed DZ blocks
+    block_limit : int | None
+        the uncompressed data is truncated to this size if not *None*
+
+    Returns
+    -------
+    data : bytes
+        uncompressed block bytes
+
+    """
+    if block_type == v4c.DZ_BLOCK_DEFLATE:
+        data = decompress(data, bufsize=original_size)
+    elif block_type == v4c.DZ_BLOCK_TRANSPOSED:
+        data = decompress(data, bufsize=original_size)
+        cols = param
+        lines = original_size // cols
+
+        nd = frombuffer(data[: lines * cols], dtype=uint8)
+        nd = nd.reshape((cols, lines))
+        data = nd.T.ravel().tobytes() + data[lines * cols :]
+    elif block_type == v4c.DZ_BLOCK_LZ:
+        data = lz_decompress(data)
+
+    if block_limit is not None:
+        data = data[:block_limit]
+
+    return data
+
+
+def map_blocks(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    pool: ThreadPoolExecutor | None = None,
+    max_pending: int = 0,
+) -> Iterator[Any]:
+    """apply *func* to the *items* and yield the results in the input order
+
+    Parameters
+    ----------
+    func : callable
+        function applied to each item; for example the data block encoding
+    items : iterable
+        input items
+    pool : ThreadPoolExecutor | None
+        if given, then the items ahead of the consumer are processed in
+        parallel
+    max_pending : int
+        maximum number of items submitted to the pool that were not yet
+        consumed; this bounds the memory used by the blocks in flight
+
+    Returns
+    -------
+    results : iterator
+        results in the order of the input items
+
+    """
+    if pool is None:
+        for item in items:
+            yield func(item)
+    else:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def select_compression(
+    data: bytes, record_size: int, level: int | None = None
+) -> tuple[int, float]:
+    """choose the compression of a channel group from a sample of its first
+    data block
+
+    Both deflate and transposition + deflate are tried on the sample. The
+    smaller result wins, but deflate is preferred when it is faster and the
+    transposition gains less than *AUTO_COMPRESSION_TIE*. If neither saves at
+    least *AUTO_COMPRESSION_MIN_GAIN* of the size the blocks are not
+    compressed at all, because the CPU time is not worth it for noisy data.
+
+    Parameters
+    ----------
+    data : bytes
+        raw records of the first data block
+    record_size : int
+        record size used for the transposition
+    level : int | None
+        zlib compression level
+
+    Returns
+    -------
+    compression, ratio : int, float
+        *save* compression argument (0, 1 or 2) and the compressed to
+        original size ratio of the sample
+
+    """
+    size = min(len(data), AUTO_COMPRESSION_SAMPLE_SIZE)
+    if record_size:
+        size = max(size // record_size * record_size, min(len(data), record_size))
+    if not size:
+        return 0, 1.0
+
+    sample = bytes(data[:size])
+
+    start = perf_counter()
+    deflate = DataZippedBlock(
+        data=sample, zip_type=v4c.FLAG_DZ_DEFLATE, param=0, level=level
+    )
+    deflate_time = perf_counter() - start
+    candidates = [(deflate.zip_size / size, deflate_time, 1)]
+
+    if record_size > 1:
+        start = perf_counter()
+        transposed = DataZippedBlock(
+            data=sample,
+            zip_type=v4c.FLAG_DZ_TRANPOSED_DEFLATE,
+            param=record_size,
+            level=level,
+        )
+        transposed_time = perf_counter() - start
+        candidates.append((transposed.zip_size / size, transposed_time, 2))
+
+    ratio, elapsed, compression = min(candidates)
+    for other_ratio, other_elapsed, other_compression in candidates:
+        if (
+            other_elapsed < elapsed
+            and other_ratio - ratio < AUTO_COMPRESSION_TIE * other_ratio
+        ):
+            ratio, elapsed, compression = other_ratio, other_elapsed, other_compression
+
+    if ratio > 1 - AUTO_COMPRESSION_MIN_GAIN:
+        return 0, 1.0
+
+    return compression, ratio
+
+
 class MDF4(MDF_Common):
     """The *header* attibute is a *HeaderBlock*.
 
@@ -222,12 +433,46 @@ class MDF4(MDF_Common):
 
     copy_on_get (True) : bool
         copy channel values (np.array) to avoid high memory usage
+    zero_copy (False) : bool
+        return read-only arrays over the mapped file from *get* when the
+        channel samples can be accessed in place
+
+        .. versionadded:: 7.4.0
+
     compact_vlsd (False) : bool
         use slower method to save the exact sample size for VLSD channels
     column_storage (True) : bool
         use column storage for MDF version >= 4.20
     password : bytes | str
         use this password to decode encrypted attachments
+    use_metadata_index (False) : bool
+        store the parsed metadata in a sidecar index file (*<file>.mf4.idx*)
+        and use it to skip the block parsing the next time the same file is
+        opened; the index is rebuilt automatically if the file changes. With
+        *metadata="lazy"* the channel attributes that were not accessed yet
+        are still read on first access after loading the index.
+
+        .. warning::
+
+            the index is a pickle file; loading it can execute arbitrary code,
+            so only enable this option for folders where untrusted users
+            cannot write files
+
+        .. versionadded:: 7.4.0
+
+    decompression_workers (0) : int
+        number of threads used to decompress the DZ blocks ahead of the
+        data consumer; 0 disables the parallel decompression
+
+        .. versionadded:: 7.4.0
+
+    metadata_only (False) : bool
+        only read the header, file history, attachments, events and the
+        channel tree of the file; the data blocks are never read, unsorted
+        files are not sorted and no temporary file is created, so the samples
+        cannot be accessed
+
+        .. versionadded:: 7.4.0
 
     Attributes
     ----------
@@ -306,6 +551,9 @@ class MDF4(MDF_Common):
         self._closed = False
 
         self.temporary_folder = kwargs.get("temporary_folder", None)
+        self._temporary_spool_size = kwargs.get(
+            "temporary_spool_size", get_global_option("temporary_spool_size")
+        )
 
         if channels is None:
             self.load_filter = set()
@@ -314,7 +562,14 @@ class MDF4(MDF_Common):
             self.load_filter = set(channels)
             self.use_load_filter = True
 
-        self._tempfile = TemporaryFile(dir=self.temporary_folder)
+        self._metadata_only = bool(name) and kwargs.get("metadata_only", False)
+
+        if self._metadata_only:
+            self._tempfile = None
+        else:
+            self._tempfile = temporary_file(
+                self.temporary_folder, self._temporary_spool_size
+            )
         self._file = None
 
         self._read_fragment_size = get_global_option("read_fragment_size")
@@ -343,6 +598,19 @@ class MDF4(MDF_Common):
         )
         self.copy_on_get = kwargs.get("copy_on_get", True)
         self.compact_vlsd = kwargs.get("compact_vlsd", False)
+        # the index would not hold the data blocks of the groups
+        self._use_metadata_index = not self._metadata_only and kwargs.get(
+            "use_metadata_index", get_global_option("use_metadata_index")
+        )
+        self._decompression_workers = kwargs.get(
+            "decompression_workers", get_global_option("decompression_workers")
+        )
+        self._decompression_pool = None
+        self._decompression_pool_workers = 0
+        self._read_lock = Lock()
+        self._metadata = kwargs.get("metadata", get_global_option("metadata"))
+        self._zero_copy = kwargs.get("zero_copy", get_global_option("zero_copy"))
+        self._metadata_index_info = None
 
         self.virtual_groups = {}  # master group 2 referencing groups
         self.virtual_groups_map = {}  # group index 2 master group
@@ -354,9 +622,18 @@ class MDF4(MDF_Common):
         self._master = None
 
         self.last_call_info = None
+        # indexes of the groups added by _transfer_group; their temporary file
+        # data holds complete copies of the blocks of the source file
+        self._transferred_groups = set()
+        self._compression_info = {}
+        self._buffered_extend = kwargs.get(
+            "buffered_extend", get_global_option("buffered_extend")
+        )
+        self._extend_buffers = {}
 
         # make sure no appended block has the address 0
-        self._tempfile.write(b"\0")
+        if self._tempfile is not None:
+            self._tempfile.write(b"\0")
 
         self._delete_on_close = False
         self._mapped_file = None
@@ -376,7 +653,7 @@ class MDF4(MDF_Common):
                     version = version.decode("utf-8").strip(" \n\t\0")
                     flags = identification["unfinalized_standard_flags"]
 
-                if version >= "4.10" and flags:
+                if version >= "4.10" and flags and not self._metadata_only:
                     tmpdir = Path(gettempdir())
                     self.name = tmpdir / Path(name).name
                     shutil.copy(name, self.name)
@@ -471,6 +748,9 @@ class MDF4(MDF_Common):
         self._mapped = mapped
         dg_cntr = 0
 
+        if self._use_metadata_index and self._load_metadata_index():
+            return
+
         stream.seek(0, 2)
         self.file_limit = stream.tell()
         stream.seek(0)
@@ -491,7 +771,7 @@ class MDF4(MDF_Common):
             # Check for finalization past version 4.10
             finalisation_flags = self._check_finalised()
 
-            if finalisation_flags:
+            if finalisation_flags and not self._metadata_only:
                 message = f"Attempting finalization of {self.name}"
                 logger.info(message)
                 self._finalize()
@@ -651,28 +931,33 @@ class MDF4(MDF_Common):
                 total_size = int(10**12)
                 inval_total_size = int(10**12)
 
-            data_blocks_info = self._get_data_blocks_info(
-                address=address,
-                stream=stream,
-                block_type=block_type,
-                mapped=mapped,
-                total_size=total_size,
-                inval_total_size=inval_total_size,
-            )
             data_blocks = []
-            uses_ld = self._uses_ld(
-                address=address,
-                stream=stream,
-                block_type=block_type,
-                mapped=mapped,
-            )
+            if self._metadata_only:
+                data_blocks_info = iter(EMPTY_TUPLE)
+                uses_ld = False
+            else:
+                data_blocks_info = self._get_data_blocks_info(
+                    address=address,
+                    stream=stream,
+                    block_type=block_type,
+                    mapped=mapped,
+                    total_size=total_size,
+                    inval_total_size=inval_total_size,
+                )
+                uses_ld = self._uses_ld(
+                    address=address,
+                    stream=stream,
+                    block_type=block_type,
+                    mapped=mapped,
+                )
 
             for grp in new_groups:
                 grp.data_location = v4c.LOCATION_ORIGINAL_FILE
                 grp.data_blocks_info_generator = data_blocks_info
                 grp.data_blocks = data_blocks
                 grp.uses_ld = uses_ld
-                self._prepare_record(grp)
+                if not self._metadata_only:
+                    self._prepare_record(grp)
 
             self.groups.extend(new_groups)
 
@@ -772,24 +1057,29 @@ class MDF4(MDF_Common):
                     else:
                         break
 
-        self._sort(
-            current_progress_index=current_cg_index,
-            max_progress_count=progress_steps,
-            progress=progress,
-        )
+        if not self._metadata_only:
+            self._sort(
+                current_progress_index=current_cg_index,
+                max_progress_count=progress_steps,
+                progress=progress,
+            )
         if progress is not None:
             if callable(progress):
                 progress(progress_steps - 1, progress_steps)  # second to last step now
 
-        for grp in self.groups:
-            channels = grp.channels
-            if (
-                len(channels) == 1
-                and channels[0].dtype_fmt.itemsize == grp.channel_group.samples_byte_nr
-            ):
-                grp.single_channel_dtype = channels[0].dtype_fmt
+        # the records layout and the bus logging channels are only needed
+        # to read the samples
+        if not self._metadata_only:
+            for grp in self.groups:
+                channels = grp.channels
+                if (
+                    len(channels) == 1
+                    and channels[0].dtype_fmt.itemsize
+                    == grp.channel_group.samples_byte_nr
+                ):
+                    grp.single_channel_dtype = channels[0].dtype_fmt
 
-        self._process_bus_logging()
+            self._process_bus_logging()
 
         # read events
         addr = self.header.first_event_addr
@@ -841,6 +1131,172 @@ class MDF4(MDF_Common):
 
         self.progress = cg_count, cg_count
 
+        if self._use_metadata_index:
+            self._save_metadata_index()
+
+    def _metadata_index_path(self) -> Path | None:
+        if self._from_filelike or self._delete_on_close:
+            return None
+        return self.name.with_name(self.name.name + METADATA_INDEX_SUFFIX)
+
+    def _metadata_index_key(self) -> bytes:
+        """the index is only valid for the exact same file contents and for
+        the same options that influence the metadata parsing; the key is a
+        JSON line so that it can be checked without unpickling"""
+        stat = os.stat(self.name)
+
+        stream = self._file
+        stream.seek(0)
+        header = stream.read(v4c.IDENTIFICATION_BLOCK_SIZE + v4c.HEADER_BLOCK_SIZE)
+
+        key = [
+            METADATA_INDEX_VERSION,
+            __version__,
+            stat.st_size,
+            stat.st_mtime_ns,
+            md5(header).hexdigest(),
+            self._use_display_names,
+            self._remove_source_from_channel_names,
+            self._metadata,
+            sorted(self.load_filter) if self.use_load_filter else None,
+        ]
+
+        return json.dumps(key).encode("utf-8") + b"\n"
+
+    def _load_metadata_index(self) -> bool:
+        """restore the parsed metadata from the sidecar index file
+
+        Returns
+        -------
+        loaded : bool
+            *True* if the index was valid and the metadata was restored
+
+        """
+        path = self._metadata_index_path()
+        if path is None:
+            return False
+
+        self._metadata_index_info = {
+            "path": str(path),
+            "loaded": False,
+            "load time": None,
+            "save time": None,
+        }
+
+        if not path.is_file():
+            return False
+
+        start = perf_counter()
+        key = self._metadata_index_key()
+        try:
+            with open(path, "rb") as index:
+                # only an index written for this exact file is unpickled
+                if (
+                    index.read(len(METADATA_INDEX_MAGIC)) != METADATA_INDEX_MAGIC
+                    or index.readline(len(key) + 1) != key
+                ):
+                    logger.info(
+                        f'Metadata index "{path}" is outdated and will be rebuilt'
+                    )
+                    return False
+
+                state = pickle.load(index)
+        except:
+            logger.info(f'Ignoring unreadable metadata index "{path}"')
+            return False
+
+        # the channels saved with metadata="lazy" read the missing attributes
+        # from the file on first access, like after a normal load
+        pending = [
+            channel
+            for grp in state["groups"]
+            for channel in grp.channels
+            if channel._has_pending_metadata()
+        ]
+        if pending:
+            if not self._mapped:
+                logger.info(
+                    f'Metadata index "{path}" needs a mapped file and will be rebuilt'
+                )
+                return False
+
+            lazy_metadata = (
+                self._file,
+                self._cc_map,
+                self._si_map,
+                self._interned_strings,
+                self._use_display_names,
+            )
+            for channel in pending:
+                channel._lazy_metadata = lazy_metadata
+
+        for attr in METADATA_INDEX_ATTRIBUTES:
+            setattr(self, attr, state[attr])
+
+        self._metadata_index_info["loaded"] = True
+        self._metadata_index_info["load time"] = perf_counter() - start
+
+        return True
+
+    def _save_metadata_index(self) -> None:
+        """write the parsed metadata to the sidecar index file. Files
+        that needed sorting or finalization keep their data in the temporary
+        file, so they are never indexed"""
+        path = self._metadata_index_path()
+        if path is None:
+            return
+
+        if self._metadata_index_info is None:
+            self._metadata_index_info = {
+                "path": str(path),
+                "loaded": False,
+                "load time": None,
+                "save time": None,
+            }
+
+        if self.identification["unfinalized_standard_flags"] or any(
+            grp.data_location != v4c.LOCATION_ORIGINAL_FILE for grp in self.groups
+        ):
+            return
+
+        start = perf_counter()
+
+        # the lazy block generators cannot be pickled; resolve all the data
+        # blocks now so that later loads don't have to walk the DL chains
+        for grp in self.groups:
+            for _ in grp.get_data_blocks():
+                pass
+            grp.data_blocks_info_generator = iter(EMPTY_TUPLE)
+
+            for i, signal_data in enumerate(grp.signal_data):
+                if signal_data is not None:
+                    for _ in grp.get_signal_data_blocks(i):
+                        pass
+                    grp.signal_data[i] = signal_data[0], iter(EMPTY_TUPLE)
+
+        state = {attr: getattr(self, attr) for attr in METADATA_INDEX_ATTRIBUTES}
+
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            with open(tmp_path, "wb") as index:
+                index.write(METADATA_INDEX_MAGIC)
+                index.write(self._metadata_index_key())
+                _MetadataIndexPickler(index, protocol=pickle.HIGHEST_PROTOCOL).dump(
+                    state
+                )
+            os.replace(tmp_path, path)
+        except:
+            logger.warning(
+                f'Failed to write the metadata index "{path}"\n{format_exc()}'
+            )
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        self._metadata_index_info["save time"] = perf_counter() - start
+
     def _read_channels(
         self,
         ch_addr: int,
@@ -854,6 +1310,21 @@ class MDF4(MDF_Common):
         filter_channels = self.use_load_filter
         use_display_names = self._use_display_names
 
+        # with metadata="lazy" the conversions, sources and texts are read on
+        # first access; otherwise they are parsed now, like for other streams
+        if mapped and not filter_channels and self._metadata == "lazy":
+            lazy_metadata = (
+                stream,
+                self._cc_map,
+                self._si_map,
+                self._interned_strings,
+                use_display_names,
+            )
+            lazy_strings = True
+        else:
+            lazy_metadata = None
+            lazy_strings = False
+
         channels = grp.channels
 
         dependencies = grp.channel_dependencies
@@ -997,6 +1468,8 @@ class MDF4(MDF_Common):
                     tx_map=self._interned_strings,
                     file_limit=self.file_limit,
                     parsed_strings=None,
+                    lazy_metadata=lazy_metadata,
+                    lazy_strings=lazy_strings,
                 )
 
             if channel.data_type not in VALID_DATA_TYPES:
@@ -1011,10 +1484,11 @@ class MDF4(MDF_Common):
 
             if self._remove_source_from_channel_names:
                 channel.name = channel.name.split(path_separator, 1)[0]
-                channel.display_names = {
-                    _name.split(path_separator, 1)[0]: val
-                    for _name, val in channel.display_names.items()
-                }
+                if not lazy_strings:
+                    channel.display_names = {
+                        _name.split(path_separator, 1)[0]: val
+                        for _name, val in channel.display_names.items()
+                    }
 
             entry = (dg_cntr, ch_cntr)
             self._ch_map[ch_addr] = entry
@@ -1024,8 +1498,11 @@ class MDF4(MDF_Common):
                 composition.append(entry)
                 composition_channels.append(channel)
 
-            for _name in channel.display_names:
-                self.channels_db.add(_name, entry)
+            # the display names are not indexed in the lazy metadata mode
+            # because they are stored in the channel comment
+            if not lazy_strings:
+                for _name in channel.display_names:
+                    self.channels_db.add(_name, entry)
             self.channels_db.add(channel.name, entry)
 
             # signal data
@@ -1142,6 +1619,15 @@ class MDF4(MDF_Common):
 
         return ch_cntr, composition, composition_dtype
 
+    def _check_samples_access(self) -> None:
+        """raise *MdfException* if the file was opened in the metadata only
+        mode"""
+        if self._metadata_only:
+            raise MdfException(
+                f'"{self.name}" was opened with metadata_only=True; '
+                "the samples are not available"
+            )
+
     def _load_signal_data(
         self,
         group: Group | None = None,
@@ -1165,6 +1651,7 @@ class MDF4(MDF_Common):
             signal data bytes
 
         """
+        self._check_samples_access()
 
         data = []
 
@@ -1173,37 +1660,12 @@ class MDF4(MDF_Common):
 
             if info_blocks is not None:
                 if start_offset is None and end_offset is None:
-                    for info in group.get_signal_data_blocks(index):
-                        address, original_size, compressed_size, block_type, param = (
-                            info.address,
-                            info.original_size,
-                            info.compressed_size,
-                            info.block_type,
-                            info.param,
-                        )
-
-                        if not info.original_size:
-                            continue
-                        if info.location == v4c.LOCATION_TEMPORARY_FILE:
-                            stream = self._tempfile
-                        else:
-                            stream = self._file
-
-                        stream.seek(address)
-                        new_data = stream.read(compressed_size)
-                        if block_type == v4c.DZ_BLOCK_DEFLATE:
-                            new_data = decompress(new_data, bufsize=original_size)
-                        elif block_type == v4c.DZ_BLOCK_TRANSPOSED:
-                            new_data = decompress(new_data, bufsize=original_size)
-                            cols = param
-                            lines = original_size // cols
-
-                            nd = frombuffer(new_data[: lines * cols], dtype=uint8)
-                            nd = nd.reshape((cols, lines))
-                            new_data = nd.T.ravel().tobytes() + new_data[lines * cols :]
-                        elif block_type == v4c.DZ_BLOCK_LZ:
-                            new_data = lz_decompress(new_data)
-
+                    blocks = (
+                        info
+                        for info in group.get_signal_data_blocks(index)
+                        if info.original_size
+                    )
+                    for info, new_data, _ in self._read_blocks(blocks):
                         data.append(new_data)
 
                 else:
@@ -1212,40 +1674,25 @@ class MDF4(MDF_Common):
 
                     current_offset = 0
 
-                    for info in group.get_signal_data_blocks(index):
-                        address, original_size, compressed_size, block_type, param = (
-                            info.address,
-                            info.original_size,
-                            info.compressed_size,
-                            info.block_type,
-                            info.param,
-                        )
+                    def needed_blocks():
+                        nonlocal current_offset
 
-                        if not info.original_size:
-                            continue
-                        if info.location == v4c.LOCATION_TEMPORARY_FILE:
-                            stream = self._tempfile
-                        else:
-                            stream = self._file
+                        blocks = group.get_signal_data_blocks(index)
+                        for info in blocks:
+                            if not info.original_size:
+                                continue
+                            if current_offset + info.original_size < start_offset:
+                                current_offset += info.original_size
+                                continue
+                            yield info
+                            break
 
-                        if current_offset + original_size < start_offset:
-                            current_offset += original_size
-                            continue
+                        for info in blocks:
+                            if info.original_size:
+                                yield info
 
-                        stream.seek(address)
-                        new_data = stream.read(compressed_size)
-                        if block_type == v4c.DZ_BLOCK_DEFLATE:
-                            new_data = decompress(new_data, bufsize=original_size)
-                        elif block_type == v4c.DZ_BLOCK_TRANSPOSED:
-                            new_data = decompress(new_data, bufsize=original_size)
-                            cols = param
-                            lines = original_size // cols
-
-                            nd = frombuffer(new_data[: lines * cols], dtype=uint8)
-                            nd = nd.reshape((cols, lines))
-                            new_data = nd.T.ravel().tobytes() + new_data[lines * cols :]
-                        elif block_type == v4c.DZ_BLOCK_LZ:
-                            new_data = lz_decompress(new_data)
+                    for info, new_data, _ in self._read_blocks(needed_blocks()):
+                        original_size = info.original_size
 
                         if current_offset + original_size > end_offset:
                             start_index = max(0, start_offset - current_offset)
@@ -1279,6 +1726,111 @@ class MDF4(MDF_Common):
 
         return data
 
+    def _get_decompression_pool(self) -> ThreadPoolExecutor | None:
+        # select can read several channel groups in concurrent threads, so the
+        # pool is created under the read lock to make sure that only one pool
+        # is created; the pool tasks never take the lock
+        with self._read_lock:
+            workers = self._decompression_workers
+            pool = self._decompression_pool
+
+            # the old pool is not shut down because other threads can still
+            # submit blocks to it; its threads exit once it is released
+            if pool is not None and self._decompression_pool_workers != workers:
+                pool = self._decompression_pool = None
+
+            if workers and pool is None:
+                pool = self._decompression_pool = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="asammdf_decompress"
+                )
+                self._decompression_pool_workers = workers
+
+            return pool
+
+    def _read_blocks(
+        self,
+        blocks: Iterable[DataBlockInfo | SignalDataBlockInfo],
+        stream: ReadableBufferType | None = None,
+        invalidation: bool = False,
+    ) -> Iterator[tuple[DataBlockInfo | SignalDataBlockInfo, bytes, bytes | None]]:
+        """read and decompress the blocks in the original order. If
+        decompression workers are configured, then the compressed blocks ahead
+        of the consumer are decompressed in parallel
+
+        Parameters
+        ----------
+        blocks : iterable
+            data blocks or signal data blocks information
+        stream : file handle
+            stream used for all blocks; default *None* and in this case the
+            block location selects the original file or the temporary file
+        invalidation : bool
+            also read the invalidation block of each data block; the
+            invalidation data is *None* for the blocks that are all valid
+
+        Returns
+        -------
+        blocks : iterator
+            (block info, block bytes, invalidation block bytes) tuples
+
+        """
+        pool = self._get_decompression_pool()
+
+        def read_block(stream, info):
+            with self._read_lock:
+                stream.seek(info.address)
+                data = stream.read(info.compressed_size)
+            args = (
+                data,
+                info.block_type,
+                info.original_size,
+                info.param,
+                getattr(info, "block_limit", None),
+            )
+
+            if pool is not None and info.block_type != v4c.DT_BLOCK:
+                return pool.submit(decompress_block, *args)
+            else:
+                return decompress_block(*args)
+
+        def result(data):
+            if isinstance(data, Future):
+                return data.result()
+            else:
+                return data
+
+        pending = deque()
+        max_pending = 2 * self._decompression_pool_workers
+
+        for info in blocks:
+            if stream is None:
+                if info.location == v4c.LOCATION_TEMPORARY_FILE:
+                    block_stream = self._tempfile
+                else:
+                    block_stream = self._file
+            else:
+                block_stream = stream
+
+            data = read_block(block_stream, info)
+
+            invalidation_data = None
+            if invalidation:
+                invalidation_info = info.invalidation_block
+                if not invalidation_info.all_valid:
+                    invalidation_data = read_block(block_stream, invalidation_info)
+
+            if pool is None:
+                yield info, data, invalidation_data
+            else:
+                pending.append((info, data, invalidation_data))
+                if len(pending) > max_pending:
+                    info, data, invalidation_data = pending.popleft()
+                    yield info, result(data), result(invalidation_data)
+
+        while pending:
+            info, data, invalidation_data = pending.popleft()
+            yield info, result(data), result(invalidation_data)
+
     def _load_data(
         self,
         group: Group,
@@ -1287,13 +1839,13 @@ class MDF4(MDF_Common):
         optimize_read: bool = False,
     ) -> Iterator[tuple[bytes, int, int, bytes | None]]:
         """get group's data block bytes"""
+        self._check_samples_access()
 
         offset = 0
         invalidation_offset = 0
         has_yielded = False
         _count = 0
         data_group = group.data_group
-        data_blocks_info_generator = group.data_blocks_info_generator
         channel_group = group.channel_group
 
         if group.data_location == v4c.LOCATION_ORIGINAL_FILE:
@@ -1301,9 +1853,6 @@ class MDF4(MDF_Common):
         else:
             stream = self._tempfile
 
-        read = stream.read
-        seek = stream.seek
-
         if group.uses_ld:
             samples_size = channel_group.samples_byte_nr
             invalidation_size = channel_group.invalidation_bytes_nr
@@ -1359,7 +1908,24 @@ class MDF4(MDF_Common):
             split_size = int(split_size)
             invalidation_split_size = int(invalidation_split_size)
 
-            blocks = iter(group.data_blocks)
+            if record_offset:
+                # jump directly to the first block that contains the
+                # requested record instead of scanning all the blocks
+                (
+                    blocks_end,
+                    invalidation_blocks_end,
+                ) = self._get_data_blocks_offsets(group)
+                start_index = int(searchsorted(blocks_end, record_offset, side="right"))
+                if start_index:
+                    offset = int(blocks_end[start_index - 1])
+                    if invalidation_blocks_end is not None:
+                        invalidation_offset = int(
+                            invalidation_blocks_end[start_index - 1]
+                        )
+
+                blocks = group.data_blocks[start_index:]
+            else:
+                blocks = group.get_data_blocks()
 
             cur_size = 0
             data = []
@@ -1367,55 +1933,15 @@ class MDF4(MDF_Common):
             cur_invalidation_size = 0
             invalidation_data = []
 
-            while True:
-                try:
-                    info = next(blocks)
-                    (
-                        address,
-                        original_size,
-                        compressed_size,
-                        block_type,
-                        param,
-                        block_limit,
-                    ) = (
-                        info.address,
-                        info.original_size,
-                        info.compressed_size,
-                        info.block_type,
-                        info.param,
-                        info.block_limit,
-                    )
-
-                    if rm and invalidation_size:
-                        invalidation_info = info.invalidation_block
-                    else:
-                        invalidation_info = None
-                except StopIteration:
-                    try:
-                        info = next(data_blocks_info_generator)
-                        (
-                            address,
-                            original_size,
-                            compressed_size,
-                            block_type,
-                            param,
-                            block_limit,
-                        ) = (
-                            info.address,
-                            info.original_size,
-                            info.compressed_size,
-                            info.block_type,
-                            info.param,
-                            info.block_limit,
-                        )
+            for info, new_data, new_invalidation_data in self._read_blocks(
+                blocks, stream=stream, invalidation=bool(rm and invalidation_size)
+            ):
+                original_size = info.original_size
 
-                        if rm and invalidation_size:
-                            invalidation_info = info.invalidation_block
-                        else:
-                            invalidation_info = None
-                        group.data_blocks.append(info)
-                    except StopIteration:
-                        break
+                if rm and invalidation_size:
+                    invalidation_info = info.invalidation_block
+                else:
+                    invalidation_info = None
 
                 if offset + original_size < record_offset + 1:
                     offset += original_size
@@ -1427,25 +1953,6 @@ class MDF4(MDF_Common):
                             invalidation_offset += invalidation_info.original_size
                     continue
 
-                seek(address)
-                new_data = read(compressed_size)
-
-                if block_type == v4c.DZ_BLOCK_DEFLATE:
-                    new_data = decompress(new_data, bufsize=original_size)
-                elif block_type == v4c.DZ_BLOCK_TRANSPOSED:
-                    new_data = decompress(new_data, bufsize=original_size)
-                    cols = param
-                    lines = original_size // cols
-
-                    nd = frombuffer(new_data[: lines * cols], dtype=uint8)
-                    nd = nd.reshape((cols, lines))
-                    new_data = nd.T.ravel().tobytes() + new_data[lines * cols :]
-                elif block_type == v4c.DZ_BLOCK_LZ:
-                    new_data = lz_decompress(new_data)
-
-                if block_limit is not None:
-                    new_data = new_data[:block_limit]
-
                 if len(data) > split_size - cur_size:
                     new_data = memoryview(new_data)
 
@@ -1454,35 +1961,6 @@ class MDF4(MDF_Common):
                         count = original_size // samples_size
                         new_invalidation_data = b"\0" * (count * invalidation_size)
 
-                    else:
-                        seek(invalidation_info.address)
-                        new_invalidation_data = read(invalidation_info.size)
-                        if invalidation_info.block_type == v4c.DZ_BLOCK_DEFLATE:
-                            new_invalidation_data = decompress(
-                                new_invalidation_data,
-                                bufsize=invalidation_info.original_size,
-                            )
-                        elif invalidation_info.block_type == v4c.DZ_BLOCK_TRANSPOSED:
-                            new_invalidation_data = decompress(
-                                new_invalidation_data,
-                                bufsize=invalidation_info.original_size,
-                            )
-                            cols = invalidation_info.param
-                            lines = invalidation_info.original_size // cols
-
-                            nd = frombuffer(
-                                new_invalidation_data[: lines * cols], dtype=uint8
-                            )
-                            nd = nd.reshape((cols, lines))
-                            new_invalidation_data = (
-                                nd.T.ravel().tobytes()
-                                + new_invalidation_data[lines * cols :]
-                            )
-                        if invalidation_info.block_limit is not None:
-                            new_invalidation_data = new_invalidation_data[
-                                : invalidation_info.block_limit
-                            ]
-
                     inv_size = len(new_invalidation_data)
 
                 if offset < record_offset:
@@ -1641,39 +2119,272 @@ class MDF4(MDF_Common):
                 else:
                     yield b"", 0, 0, None
 
-    def _prepare_record(self, group: Group) -> list:
-        """compute record
+    def _load_blocks_info(self, index: int, channels: Iterable[int] = ()) -> None:
+        """read all the data blocks information of the group and the signal
+        data blocks information of the given channels. After this the group
+        data can be loaded from several threads because the lazy block
+        generators no longer touch the file stream
 
         Parameters
         ----------
-        group : dict
-            MDF group dict
+        index : int
+            group index
+        channels : iterable
+            channel indexes
+
+        """
+        group = self.groups[index]
+        self._get_data_blocks_offsets(group)
+
+        for ch_index in channels:
+            for _ in group.get_signal_data_blocks(ch_index):
+                pass
+
+        if group.channel_group.flags & v4c.FLAG_CG_REMOTE_MASTER:
+            master_index = group.channel_group.cg_master_index
+            self._get_data_blocks_offsets(self.groups[master_index])
+
+    def _get_data_blocks_offsets(
+        self, group: Group
+    ) -> tuple[NDArray[Any], NDArray[Any] | None]:
+        """get the cumulative end offsets of the group's data blocks. The
+        offsets are cached in the group and rebuilt only if the data blocks
+        list changes.
+
+        Parameters
+        ----------
+        group : Group
+            data group
 
         Returns
         -------
-        record : list
-            mapping of channels to records fields, records fields dtype
+        offsets : tuple
+            (data blocks end offsets, invalidation blocks end offsets); the
+            invalidation offsets are *None* unless the group uses LD blocks with
+            invalidation bytes
 
         """
+        for _ in group.get_data_blocks():
+            pass
 
-        record = group.record
+        data_blocks = group.data_blocks
+        blocks_count = len(data_blocks)
 
-        if record is None:
-            channels = group.channels
+        cached = group.data_blocks_offsets
+        if (
+            cached is not None
+            and cached[0] is data_blocks
+            and cached[1] == blocks_count
+        ):
+            return cached[2], cached[3]
 
-            record = []
+        blocks_end = cumsum(
+            np.fromiter(
+                (info.original_size for info in data_blocks),
+                dtype=np.int64,
+                count=blocks_count,
+            )
+        )
 
-            for idx, new_ch in enumerate(channels):
-                start_offset = new_ch.byte_offset
-                bit_offset = new_ch.bit_offset
-                data_type = new_ch.data_type
-                bit_count = new_ch.bit_count
-                ch_type = new_ch.channel_type
-                dependency_list = group.channel_dependencies[idx]
+        channel_group = group.channel_group
+        invalidation_size = channel_group.invalidation_bytes_nr
+        if group.uses_ld and invalidation_size:
+            samples_size = channel_group.samples_byte_nr
+            invalidation_blocks_end = cumsum(
+                np.fromiter(
+                    (
+                        info.original_size // samples_size * invalidation_size
+                        if info.invalidation_block.all_valid
+                        else info.invalidation_block.original_size
+                        for info in data_blocks
+                    ),
+                    dtype=np.int64,
+                    count=blocks_count,
+                )
+            )
+        else:
+            invalidation_blocks_end = None
 
-                if ch_type not in v4c.VIRTUAL_TYPES and not dependency_list:
-                    # adjust size to 1, 2, 4 or 8 bytes
-                    size = bit_offset + bit_count
+        group.data_blocks_offsets = (
+            data_blocks,
+            blocks_count,
+            blocks_end,
+            invalidation_blocks_end,
+        )
+
+        return blocks_end, invalidation_blocks_end
+
+    def _get_records_range(
+        self,
+        index: int,
+        start: float | None = None,
+        stop: float | None = None,
+    ) -> tuple[int, int]:
+        """translate the time window into records for the given group. The
+        master channel is expected to be monotonous: only the data blocks
+        visited by the binary search are decoded, and their first and last
+        timestamps are cached in the group for the following searches
+
+        Parameters
+        ----------
+        index : int
+            group index
+        start : float | None
+            window start timestamp; default *None* means the start of the group
+        stop : float | None
+            window stop timestamp; default *None* means the end of the group
+
+        Returns
+        -------
+        record_offset, record_count : (int, int)
+            records of the group that have the timestamps in the closed
+            interval [*start*, *stop*]
+
+        """
+        group = self.groups[index]
+        channel_group = group.channel_group
+        if channel_group.flags & v4c.FLAG_CG_REMOTE_MASTER:
+            return self._get_records_range(channel_group.cg_master_index, start, stop)
+
+        cycles_nr = channel_group.cycles_nr
+        time_ch_nr = self.masters_db.get(index, None)
+
+        if time_ch_nr is None:
+            # the record index is used as time stamp
+            time_a, time_b = 1.0, 0.0
+        else:
+            time_ch = group.channels[time_ch_nr]
+            if time_ch.channel_type == v4c.CHANNEL_TYPE_VIRTUAL_MASTER:
+                time_a, time_b = time_ch.conversion["a"], time_ch.conversion["b"]
+            else:
+                time_a = time_b = None
+
+        if time_a:
+            if start is None:
+                first = 0
+            else:
+                first = min(max(ceil((start - time_b) / time_a), 0), cycles_nr)
+            if stop is None:
+                last = cycles_nr
+            else:
+                last = min(max(floor((stop - time_b) / time_a) + 1, 0), cycles_nr)
+        else:
+            if start is None:
+                first = 0
+            else:
+                first = self._search_timestamp(index, start, side="left")
+            if stop is None:
+                last = cycles_nr
+            else:
+                last = self._search_timestamp(index, stop, side="right")
+
+        return first, max(last - first, 0)
+
+    def _search_timestamp(
+        self, index: int, timestamp: float, side: Literal["left", "right"]
+    ) -> int:
+        """equivalent of *numpy.searchsorted* on the group's master channel
+        that uses the data blocks time ranges"""
+        group = self.groups[index]
+        channel_group = group.channel_group
+
+        if group.uses_ld:
+            samples_size = channel_group.samples_byte_nr
+        else:
+            samples_size = (
+                channel_group.samples_byte_nr + channel_group.invalidation_bytes_nr
+            )
+        cycles_nr = channel_group.cycles_nr
+
+        if not samples_size or not cycles_nr:
+            return 0
+
+        blocks_end, _ = self._get_data_blocks_offsets(group)
+        if not len(blocks_end):
+            return 0
+
+        # each block owns the records that start inside it
+        records_end = np.minimum(-(-blocks_end // samples_size), cycles_nr)
+        records_start = concatenate([[0], records_end[:-1]])
+        blocks = nonzero(records_end > records_start)[0]
+
+        cached = group.data_blocks_time_ranges
+        if cached is None or cached[0] is not group.data_blocks:
+            group.data_blocks_time_ranges = cached = (group.data_blocks, {})
+        time_ranges = cached[1]
+
+        masters = {}
+
+        def load_block_master(block_index):
+            first_record = int(records_start[block_index])
+            master = self.get_master(
+                index,
+                record_offset=first_record,
+                record_count=int(records_end[block_index]) - first_record,
+            )
+            masters[block_index] = master
+            if len(master):
+                time_ranges[block_index] = float(master[0]), float(master[-1])
+            return master
+
+        low, high = 0, len(blocks)
+        while low < high:
+            middle = (low + high) // 2
+            block_index = int(blocks[middle])
+            if block_index not in time_ranges:
+                load_block_master(block_index)
+            block_stop = time_ranges.get(block_index, (None, timestamp))[1]
+
+            if block_stop > timestamp or (side == "left" and block_stop == timestamp):
+                high = middle
+            else:
+                low = middle + 1
+
+        if low == len(blocks):
+            return int(records_end[-1])
+
+        block_index = int(blocks[low])
+        master = masters.get(block_index, None)
+        if master is None:
+            master = load_block_master(block_index)
+
+        return int(records_start[block_index]) + int(
+            searchsorted(master, timestamp, side=side)
+        )
+
+    def _prepare_record(self, group: Group) -> list:
+        """compute record
+
+        Parameters
+        ----------
+        group : dict
+            MDF group dict
+
+        Returns
+        -------
+        record : list
+            mapping of channels to records fields, records fields dtype
+
+        """
+
+        record = group.record
+
+        if record is None:
+            channels = group.channels
+
+            record = []
+
+            for idx, new_ch in enumerate(channels):
+                start_offset = new_ch.byte_offset
+                bit_offset = new_ch.bit_offset
+                data_type = new_ch.data_type
+                bit_count = new_ch.bit_count
+                ch_type = new_ch.channel_type
+                dependency_list = group.channel_dependencies[idx]
+
+                if ch_type not in v4c.VIRTUAL_TYPES and not dependency_list:
+                    # adjust size to 1, 2, 4 or 8 bytes
+                    size = bit_offset + bit_count
 
                     byte_size, rem = divmod(size, 8)
                     if rem:
@@ -2516,7 +3227,7 @@ class MDF4(MDF_Common):
 
     def append(
         self,
-        signals: list[Signal] | Signal | DataFrame,
+        signals: list[Signal] | Signal | DataFrame | NDArray[Any],
         acq_name: str | None = None,
         acq_source: Source | None = None,
         comment: str = "Python",
@@ -2531,10 +3242,20 @@ class MDF4(MDF_Common):
 
         Parameters
         ----------
-        signals : list | Signal | pandas.DataFrame
+        signals : list | Signal | pandas.DataFrame | numpy.ndarray
             list of *Signal* objects, or a single *Signal* object, or a pandas
-            *DataFrame* object. All bytes columns in the pandas *DataFrame*
-            must be *utf-8* encoded
+            *DataFrame* object, or a numpy structured array. All bytes columns
+            in the pandas *DataFrame* must be *utf-8* encoded.
+
+            For version 4.20 the numeric columns of the *DataFrame* are written
+            as column oriented groups straight from the column buffers.
+
+            The structured array is used as the record layout: the first field
+            is the time master channel and the other fields must be numeric
+            scalars. Its buffer is written to the data blocks without building
+            *Signal* objects or intermediate copies.
+
+            .. versionchanged:: 7.4.0 added numpy structured arrays
         acq_name : str
             channel group acquisition name
         acq_source : Source
@@ -2583,6 +3304,8 @@ class MDF4(MDF_Common):
             else acq_source
         )
 
+        self._check_samples_access()
+
         if isinstance(signals, Signal):
             signals = [signals]
         elif isinstance(signals, DataFrame):
@@ -2594,6 +3317,15 @@ class MDF4(MDF_Common):
                 units=units,
             )
             return
+        elif isinstance(signals, np.ndarray):
+            self._append_structured_array(
+                signals,
+                acq_name=acq_name,
+                acq_source=source_block,
+                comment=comment,
+                units=units,
+            )
+            return
 
         if not signals:
             return
@@ -2669,6 +3401,10 @@ class MDF4(MDF_Common):
         ch_cntr = 0
         offset = 0
 
+        # bits used in the record byte that ends at bit_field_end
+        bit_position = 0
+        bit_field_end = -1
+
         defined_texts = {}
         si_map = self._si_map
 
@@ -2799,7 +3535,7 @@ class MDF4(MDF_Common):
                                 iter(EMPTY_TUPLE),
                             )
                         )
-                        data.tofile(file)
+                        file.write(data)
                     else:
                         data_addr = 0
                         gp_sdata.append(
@@ -2888,6 +3624,27 @@ class MDF4(MDF_Common):
                     if sig_dtype.kind == "u" and signal.bit_count <= 4:
                         s_size = signal.bit_count
 
+                    # consecutive bool and small unsigned channels are packed
+                    # in the same record bytes
+                    bit_field = (
+                        s_size < 8
+                        and sig_dtype.itemsize == 1
+                        and len(sig_shape) == 1
+                        and not signal.flags & signal.Flags.stream_sync
+                    )
+                    byte_offset = offset
+                    bit_offset = 0
+                    if bit_field:
+                        gp_sig_types[-1] = v4c.SIGNAL_TYPE_BIT_FIELD
+                        if offset == bit_field_end and bit_position + s_size <= 8:
+                            byte_offset = offset - 1
+                            bit_offset = bit_position
+                            byte_size = 0
+                        else:
+                            bit_field_end = offset + 1
+
+                        bit_position = bit_offset + s_size
+
                     if signal.flags & signal.Flags.stream_sync:
                         channel_type = v4c.CHANNEL_TYPE_SYNC
                         if signal.attachment:
@@ -2920,8 +3677,8 @@ class MDF4(MDF_Common):
                         "channel_type": channel_type,
                         "sync_type": sync_type,
                         "bit_count": s_size,
-                        "byte_offset": offset,
-                        "bit_offset": 0,
+                        "byte_offset": byte_offset,
+                        "bit_offset": bit_offset,
                         "data_type": s_type,
                         "data_block_addr": data_block_addr,
                         "flags": 0,
@@ -2946,6 +3703,8 @@ class MDF4(MDF_Common):
                     else:
                         ch.dtype_fmt = sig_dtype
                     ch.attachment = attachment
+                    if bit_field:
+                        ch.standard_C_size = False
 
                     # conversions for channel
                     if signal.raw:
@@ -2977,14 +3736,19 @@ class MDF4(MDF_Common):
                         (
                             ch.dtype_fmt,
                             ch.dtype_fmt.itemsize,
-                            offset,
-                            0,
+                            byte_offset,
+                            bit_offset,
                         )
                     )
 
                     offset += byte_size
 
-                    fields.append((samples.tobytes(), byte_size))
+                    if bit_field:
+                        fields.append(
+                            (np.ascontiguousarray(samples), s_size, bit_offset)
+                        )
+                    else:
+                        fields.append((samples.tobytes(), byte_size))
 
                     gp_sdata.append(None)
                     entry = (dg_cntr, ch_cntr)
@@ -3407,7 +4171,7 @@ class MDF4(MDF_Common):
                                 iter(EMPTY_TUPLE),
                             )
                         )
-                        data.tofile(file)
+                        file.write(data)
                     else:
                         data_addr = 0
                         gp_sdata.append(
@@ -3491,24 +4255,14 @@ class MDF4(MDF_Common):
                 gp_dep.append(None)
 
         if invalidation_bytes_nr:
-            invalidation_bytes_nr = len(inval_bits)
-
-            for _ in range(8 - invalidation_bytes_nr % 8):
-                inval_bits.append(zeros(cycles_nr, dtype=bool))
-
-            inval_bits.reverse()
-            invalidation_bytes_nr = len(inval_bits) // 8
-
+            invalidation_bytes_nr = len(inval_bits) // 8 + 1
             gp.channel_group.invalidation_bytes_nr = invalidation_bytes_nr
 
-            inval_bits = fliplr(
-                packbits(array(inval_bits).T).reshape(
-                    (cycles_nr, invalidation_bytes_nr)
+            inval_bits = [np.ascontiguousarray(bits, dtype=bool) for bits in inval_bits]
+            if self.version >= "4.20":
+                inval_bits = data_block_from_arrays(
+                    [], cycles_nr, inval_bits, invalidation_bytes_nr
                 )
-            )
-
-            if self.version < "4.20":
-                fields.append((inval_bits.tobytes(), invalidation_bytes_nr))
 
         gp.channel_group.cycles_nr = cycles_nr
         gp.channel_group.samples_byte_nr = offset
@@ -3525,7 +4279,12 @@ class MDF4(MDF_Common):
 
         gp.sorted = True
 
-        samples = data_block_from_arrays(fields, cycles_nr)
+        if invalidation_bytes_nr and self.version < "4.20":
+            samples = data_block_from_arrays(
+                fields, cycles_nr, inval_bits, invalidation_bytes_nr
+            )
+        else:
+            samples = data_block_from_arrays(fields, cycles_nr)
         size = len(samples)
         samples = memoryview(samples)
 
@@ -3578,22 +4337,20 @@ class MDF4(MDF_Common):
                     )
                 )
 
-                if inval_bits is not None:
+                if invalidation_bytes_nr:
                     addr = tell()
-                    data = inval_bits.tobytes()
+                    data = inval_bits
                     raw_size = len(data)
                     data = lz_compress(data)
                     size = len(data)
                     self._tempfile.write(data)
 
-                    gp.data_blocks[-1].invalidation_block(
-                        InvalidationBlockInfo(
-                            address=addr,
-                            block_type=v4c.DZ_BLOCK_LZ,
-                            original_size=raw_size,
-                            compressed_size=size,
-                            param=None,
-                        )
+                    gp.data_blocks[-1].invalidation_block = InvalidationBlockInfo(
+                        address=addr,
+                        block_type=v4c.DZ_BLOCK_LZ,
+                        original_size=raw_size,
+                        compressed_size=size,
+                        param=None,
                     )
 
         gp.data_location = v4c.LOCATION_TEMPORARY_FILE
@@ -4292,7 +5049,7 @@ class MDF4(MDF_Common):
                             iter(EMPTY_TUPLE),
                         )
                     )
-                    data.tofile(file)
+                    file.write(data)
                 else:
                     data_addr = 0
                     gp_sdata.append(
@@ -4383,7 +5140,7 @@ class MDF4(MDF_Common):
             self.virtual_groups_map[dg_cntr] = cg_master_index
 
             virtual_group.record_size += offset
-            if signal.invalidation_bits:
+            if signal.invalidation_bits is not None:
                 virtual_group.record_size += 1
 
             dg_cntr += 1
@@ -4416,14 +5173,12 @@ class MDF4(MDF_Common):
                     size = len(data)
                     write(data)
 
-                    gp.data_blocks[-1].invalidation_block(
-                        InvalidationBlockInfo(
-                            address=addr,
-                            block_type=v4c.DZ_BLOCK_LZ,
-                            original_size=raw_size,
-                            compressed_size=size,
-                            param=None,
-                        )
+                    gp.data_blocks[-1].invalidation_block = InvalidationBlockInfo(
+                        address=addr,
+                        block_type=v4c.DZ_BLOCK_LZ,
+                        original_size=raw_size,
+                        compressed_size=size,
+                        param=None,
                     )
 
             gp.data_location = v4c.LOCATION_TEMPORARY_FILE
@@ -4453,6 +5208,20 @@ class MDF4(MDF_Common):
         sync_type = v4c.SYNC_TYPE_TIME
         time_unit = "s"
 
+        if self.version >= "4.20" and all(
+            isinstance(sig_dtype, np.dtype) and sig_dtype.kind in "biuf"
+            for signal, sig_dtype in df.dtypes.items()
+            if signal != index_name
+        ):
+            self._append_dataframe_column_oriented(
+                df,
+                acq_name=acq_name,
+                acq_source=acq_source,
+                comment=comment,
+                units=units,
+            )
+            return
+
         dg_cntr = len(self.groups)
 
         gp = Group(None)
@@ -4632,7 +5401,7 @@ class MDF4(MDF_Common):
                             iter(EMPTY_TUPLE),
                         )
                     )
-                    data.tofile(file)
+                    file.write(data)
                 else:
                     data_addr = 0
                     gp_sdata.append(
@@ -4701,109 +5470,366 @@ class MDF4(MDF_Common):
         types = dtype(types)
 
         gp.sorted = True
+        gp.data_location = v4c.LOCATION_TEMPORARY_FILE
 
-        if df.shape[0]:
-            samples = fromarrays(fields, dtype=types)
-        else:
-            samples = array([])
-
-        size = len(samples) * samples.itemsize
-        if size:
-            data_address = self._tempfile.tell()
-            gp.data_location = v4c.LOCATION_TEMPORARY_FILE
-
-            samples.tofile(self._tempfile)
-
-            self._tempfile.write(samples.tobytes())
+        if cycles_nr and offset:
+            # pack the records one fragment at a time to avoid a full copy
+            # of the data frame
+            fields = [np.asarray(field) for field in fields]
+            chunk = max(self._write_fragment_size // offset, 1)
 
-            gp.data_blocks.append(
-                DataBlockInfo(
-                    address=data_address,
-                    block_type=v4c.DT_BLOCK,
-                    original_size=size,
-                    compressed_size=size,
-                    param=0,
+            for start in range(0, cycles_nr, chunk):
+                samples = fromarrays(
+                    [field[start : start + chunk] for field in fields], dtype=types
                 )
-            )
-        else:
-            gp.data_location = v4c.LOCATION_TEMPORARY_FILE
+                self._append_raw_data_blocks(gp, samples, offset)
 
-    def _append_structure_composition(
+    def _append_dataframe_column_oriented(
         self,
-        grp: Group,
-        signal: Signal,
-        offset: int,
-        dg_cntr: int,
-        ch_cntr: int,
-        defined_texts: dict[str, int],
-        invalidation_bytes_nr: int,
-        inval_bits: list[NDArray[Any]],
-        inval_cntr: int,
-    ) -> tuple[
-        int,
-        int,
-        int,
-        tuple[int, int],
-        list[NDArray[Any]],
-        list[tuple[str, dtype[Any], tuple[int, ...]]],
-        int,
-    ]:
-        si_map = self._si_map
+        df: DataFrame,
+        acq_name: str | None = None,
+        acq_source: Source | None = None,
+        comment: str | None = None,
+        units: dict[str, str | bytes] | None = None,
+    ) -> None:
+        """
+        Appends the numeric columns of a Pandas data frame as column oriented
+        groups. The data blocks are written straight from the column buffers.
 
-        fields = []
+        """
+        units = units or {}
 
-        file = self._tempfile
-        seek = file.seek
-        seek(0, 2)
+        t = np.asarray(df.index)
+        index_name = df.index.name
+        time_name = index_name or "time"
+        cycles_nr = len(t)
 
-        gp = grp
-        gp_sdata = gp.signal_data
-        gp_channels = gp.channels
-        gp_dep = gp.channel_dependencies
-        record = gp.record
+        dg_cntr = cg_master_index = len(self.groups)
 
-        name = signal.name
-        names = signal.samples.dtype.names
+        # master group
+        gp = Group(None)
+        gp.signal_data = [None]
+        gp.channel_dependencies = [None]
+        gp.signal_types = [v4c.SIGNAL_TYPE_SCALAR]
+        gp.uses_ld = True
+        gp.data_group = DataGroup()
+        gp.sorted = True
+        gp.data_location = v4c.LOCATION_TEMPORARY_FILE
 
-        # first we add the structure channel
+        gp.channel_group = ChannelGroup(
+            cycles_nr=cycles_nr, samples_byte_nr=t.dtype.itemsize
+        )
+        gp.channel_group.acq_name = acq_name
+        gp.channel_group.acq_source = acq_source
+        gp.channel_group.comment = comment
 
-        if signal.attachment and signal.attachment[0]:
-            at_data, at_name, hash_sum = signal.attachment
-            if at_name is not None:
-                suffix = Path(at_name).suffix.lower().strip(".")
-            else:
-                suffix = "dbc"
-            if suffix == "a2l":
-                mime = "applciation/A2L"
-            else:
-                mime = f"application/x-{suffix}"
-            attachment_index = self.attach(
-                at_data, at_name, hash_sum=hash_sum, mime=mime
-            )
-            attachment = attachment_index
-        else:
-            attachment = None
+        t_type, t_size = fmt_to_datatype_v4(t.dtype, t.shape)
+        ch = Channel(
+            channel_type=v4c.CHANNEL_TYPE_MASTER,
+            data_type=t_type,
+            sync_type=v4c.SYNC_TYPE_TIME,
+            byte_offset=0,
+            bit_offset=0,
+            bit_count=t_size,
+        )
+        ch.unit = "s"
+        ch.name = time_name
+        ch.dtype_fmt = t.dtype
 
-        # add channel block
-        kwargs = {
-            "channel_type": v4c.CHANNEL_TYPE_VALUE,
-            "bit_count": signal.samples.dtype.itemsize * 8,
-            "byte_offset": offset,
-            "bit_offset": 0,
-            "data_type": v4c.DATA_TYPE_BYTEARRAY,
-            "precision": 0,
-        }
+        gp.channels = [ch]
+        gp.record = [(t.dtype, t.dtype.itemsize, 0, 0)]
 
-        if attachment is not None:
-            kwargs["attachment_addr"] = 0
+        self.groups.append(gp)
+        self.channels_db.add(time_name, (dg_cntr, 0))
+        self.masters_db[dg_cntr] = 0
 
-        source_bus = signal.source and signal.source.source_type == v4c.SOURCE_BUS
+        self._append_raw_data_blocks(gp, t, t.dtype.itemsize)
 
-        if source_bus:
-            kwargs["flags"] = v4c.FLAG_CN_BUS_EVENT
-            flags_ = v4c.FLAG_CN_BUS_EVENT
-            grp.channel_group.flags |= (
-                v4c.FLAG_CG_BUS_EVENT | v4c.FLAG_CG_PLAIN_BUS_EVENT
+        virtual_group = VirtualChannelGroup()
+        self.virtual_groups[cg_master_index] = virtual_group
+        self.virtual_groups_map[dg_cntr] = cg_master_index
+        virtual_group.groups.append(dg_cntr)
+        virtual_group.record_size = t.dtype.itemsize
+        virtual_group.cycles_nr = cycles_nr
+
+        for name in df:
+            if index_name == name:
+                continue
+
+            dg_cntr += 1
+
+            samples = df[name].to_numpy()
+            s_type, s_size = fmt_to_datatype_v4(samples.dtype, samples.shape)
+            byte_size = s_size // 8 or 1
+
+            gp = Group(None)
+            gp.signal_data = [None]
+            gp.channel_dependencies = [None]
+            gp.signal_types = [v4c.SIGNAL_TYPE_SCALAR]
+            gp.uses_ld = True
+            gp.data_group = DataGroup()
+            gp.sorted = True
+            gp.data_location = v4c.LOCATION_TEMPORARY_FILE
+
+            gp.channel_group = ChannelGroup(
+                cycles_nr=cycles_nr,
+                samples_byte_nr=byte_size,
+                flags=v4c.FLAG_CG_REMOTE_MASTER,
+            )
+            gp.channel_group.acq_name = acq_name
+            gp.channel_group.acq_source = acq_source
+            gp.channel_group.comment = comment
+            gp.channel_group.cg_master_index = cg_master_index
+
+            ch = Channel(
+                channel_type=v4c.CHANNEL_TYPE_VALUE,
+                sync_type=v4c.SYNC_TYPE_NONE,
+                bit_count=s_size,
+                byte_offset=0,
+                bit_offset=0,
+                data_type=s_type,
+                data_block_addr=0,
+                flags=0,
+            )
+            ch.name = name
+            ch.unit = units.get(name, "")
+            gp.single_channel_dtype = ch.dtype_fmt = samples.dtype
+
+            gp.channels = [ch]
+            gp.record = [(samples.dtype, samples.dtype.itemsize, 0, 0)]
+
+            self.groups.append(gp)
+            self.channels_db.add(name, (dg_cntr, 0))
+
+            self._append_raw_data_blocks(gp, samples, byte_size)
+
+            virtual_group.groups.append(dg_cntr)
+            self.virtual_groups_map[dg_cntr] = cg_master_index
+            virtual_group.record_size += byte_size
+
+    def _append_structured_array(
+        self,
+        samples: NDArray[Any],
+        acq_name: str | None = None,
+        acq_source: Source | None = None,
+        comment: str | None = None,
+        units: dict[str, str | bytes] | None = None,
+    ) -> None:
+        """
+        Appends a new data group from a numpy structured array. The first field
+        is the time master channel and the array buffer is written as the data
+        records.
+
+        """
+        units = units or {}
+
+        names = samples.dtype.names
+        if not names or samples.ndim != 1:
+            raise MdfException(
+                "append expects a one dimensional numpy structured array"
+            )
+
+        fields = samples.dtype.fields
+        for name in names:
+            field_dtype = fields[name][0]
+            if field_dtype.kind not in "biuf":
+                raise MdfException(
+                    f'The structured array field "{name}" must be a numeric '
+                    f"scalar and not {field_dtype}"
+                )
+
+        record_size = samples.dtype.itemsize
+        cycles_nr = len(samples)
+
+        dg_cntr = len(self.groups)
+
+        gp = Group(None)
+        gp.signal_data = gp_sdata = []
+        gp.channels = gp_channels = []
+        gp.channel_dependencies = gp_dep = []
+        gp.signal_types = gp_sig_types = []
+        gp.record = record = []
+        gp.data_group = DataGroup()
+        gp.sorted = True
+        gp.data_location = v4c.LOCATION_TEMPORARY_FILE
+
+        gp.channel_group = ChannelGroup(
+            cycles_nr=cycles_nr, samples_byte_nr=record_size
+        )
+        gp.channel_group.acq_name = acq_name
+        gp.channel_group.acq_source = acq_source
+        gp.channel_group.comment = comment
+
+        self.groups.append(gp)
+
+        virtual_group = VirtualChannelGroup()
+        self.virtual_groups[dg_cntr] = virtual_group
+        self.virtual_groups_map[dg_cntr] = dg_cntr
+        virtual_group.groups.append(dg_cntr)
+        virtual_group.record_size = record_size
+        virtual_group.cycles_nr = cycles_nr
+
+        for ch_cntr, name in enumerate(names):
+            field_dtype, byte_offset = fields[name][:2]
+            s_type, s_size = fmt_to_datatype_v4(field_dtype, ())
+
+            if ch_cntr:
+                ch = Channel(
+                    channel_type=v4c.CHANNEL_TYPE_VALUE,
+                    sync_type=v4c.SYNC_TYPE_NONE,
+                    bit_count=s_size,
+                    byte_offset=byte_offset,
+                    bit_offset=0,
+                    data_type=s_type,
+                    data_block_addr=0,
+                )
+                ch.unit = units.get(name, "")
+            else:
+                t = samples[name]
+                ch = Channel(
+                    channel_type=v4c.CHANNEL_TYPE_MASTER,
+                    data_type=s_type,
+                    sync_type=v4c.SYNC_TYPE_TIME,
+                    byte_offset=byte_offset,
+                    bit_offset=0,
+                    bit_count=s_size,
+                    min_raw_value=t[0] if cycles_nr else 0,
+                    max_raw_value=t[-1] if cycles_nr else 0,
+                    lower_limit=t[0] if cycles_nr else 0,
+                    upper_limit=t[-1] if cycles_nr else 0,
+                    flags=v4c.FLAG_PHY_RANGE_OK | v4c.FLAG_VAL_RANGE_OK,
+                )
+                ch.unit = units.get(name, "s")
+                self.masters_db[dg_cntr] = 0
+
+            ch.name = name
+            ch.dtype_fmt = field_dtype
+
+            gp_channels.append(ch)
+            gp_sdata.append(None)
+            gp_dep.append(None)
+            gp_sig_types.append(v4c.SIGNAL_TYPE_SCALAR)
+            record.append((field_dtype, field_dtype.itemsize, byte_offset, 0))
+
+            self.channels_db.add(name, (dg_cntr, ch_cntr))
+
+        self._append_raw_data_blocks(gp, samples, record_size)
+
+    def _append_raw_data_blocks(
+        self, gp: Group, samples: NDArray[Any], record_size: int
+    ) -> None:
+        """write the buffer of *samples* to the temporary file without copying
+        it and register it as DT blocks of at most *write_fragment_size* bytes
+
+        Parameters
+        ----------
+        gp : Group
+            appended group
+        samples : numpy.ndarray
+            one dimensional array that holds the group records
+        record_size : int
+            record size; the blocks hold whole records
+
+        """
+        data = np.ascontiguousarray(samples).view(uint8)
+        size = len(data)
+        if not size:
+            return
+
+        file = self._tempfile
+        file.seek(0, 2)
+        address = file.tell()
+        file.write(data)
+
+        chunk = max(self._write_fragment_size // record_size, 1) * record_size
+        for start in range(0, size, chunk):
+            block_size = min(chunk, size - start)
+            gp.data_blocks.append(
+                DataBlockInfo(
+                    address=address + start,
+                    block_type=v4c.DT_BLOCK,
+                    original_size=block_size,
+                    compressed_size=block_size,
+                    param=0,
+                )
+            )
+
+    def _append_structure_composition(
+        self,
+        grp: Group,
+        signal: Signal,
+        offset: int,
+        dg_cntr: int,
+        ch_cntr: int,
+        defined_texts: dict[str, int],
+        invalidation_bytes_nr: int,
+        inval_bits: list[NDArray[Any]],
+        inval_cntr: int,
+    ) -> tuple[
+        int,
+        int,
+        int,
+        tuple[int, int],
+        list[NDArray[Any]],
+        list[tuple[str, dtype[Any], tuple[int, ...]]],
+        int,
+    ]:
+        si_map = self._si_map
+
+        fields = []
+
+        file = self._tempfile
+        seek = file.seek
+        seek(0, 2)
+
+        gp = grp
+        gp_sdata = gp.signal_data
+        gp_channels = gp.channels
+        gp_dep = gp.channel_dependencies
+        record = gp.record
+
+        name = signal.name
+        names = signal.samples.dtype.names
+
+        # first we add the structure channel
+
+        if signal.attachment and signal.attachment[0]:
+            at_data, at_name, hash_sum = signal.attachment
+            if at_name is not None:
+                suffix = Path(at_name).suffix.lower().strip(".")
+            else:
+                suffix = "dbc"
+            if suffix == "a2l":
+                mime = "applciation/A2L"
+            else:
+                mime = f"application/x-{suffix}"
+            attachment_index = self.attach(
+                at_data, at_name, hash_sum=hash_sum, mime=mime
+            )
+            attachment = attachment_index
+        else:
+            attachment = None
+
+        # add channel block
+        kwargs = {
+            "channel_type": v4c.CHANNEL_TYPE_VALUE,
+            "bit_count": signal.samples.dtype.itemsize * 8,
+            "byte_offset": offset,
+            "bit_offset": 0,
+            "data_type": v4c.DATA_TYPE_BYTEARRAY,
+            "precision": 0,
+        }
+
+        if attachment is not None:
+            kwargs["attachment_addr"] = 0
+
+        source_bus = signal.source and signal.source.source_type == v4c.SOURCE_BUS
+
+        if source_bus:
+            kwargs["flags"] = v4c.FLAG_CN_BUS_EVENT
+            flags_ = v4c.FLAG_CN_BUS_EVENT
+            grp.channel_group.flags |= (
+                v4c.FLAG_CG_BUS_EVENT | v4c.FLAG_CG_PLAIN_BUS_EVENT
             )
         else:
             kwargs["flags"] = 0
@@ -5627,6 +6653,8 @@ class MDF4(MDF_Common):
         >>> mdf2.extend(0, [(t, None), (s1.samples, None), (s2.samples, None), (s3.samples, None)])
 
         """
+        self._check_samples_access()
+
         if self.version >= "4.20" and (self._column_storage or 1):
             return self._extend_column_oriented(index, signals)
         gp = self.groups[index]
@@ -5634,56 +6662,280 @@ class MDF4(MDF_Common):
             message = '"append" requires a non-empty list of Signal objects'
             raise MdfException(message)
 
+        samples, inval_bits, added_cycles = self._get_extend_records(gp, signals)
+        size = len(samples)
+        invalidation_bytes_nr = gp.channel_group.invalidation_bytes_nr
+
         stream = self._tempfile
 
-        fields = []
-        inval_bits = []
+        stream.seek(0, 2)
+        addr = stream.tell()
 
-        added_cycles = len(signals[0][0])
+        if size:
+            if self.version < "4.20":
+                if self._buffered_extend:
+                    self._buffer_records(index, samples)
+                else:
+                    gp.data_blocks.append(self._write_extend_block(samples))
 
-        invalidation_bytes_nr = gp.channel_group.invalidation_bytes_nr
-        for i, ((signal, invalidation_bits), sig_type) in enumerate(
-            zip(signals, gp.signal_types)
-        ):
-            # first add the signals in the simple signal list
-            if sig_type == v4c.SIGNAL_TYPE_SCALAR:
-                s_type, s_size = fmt_to_datatype_v4(signal.dtype, signal.shape)
-                byte_size = s_size // 8 or 1
+                gp.channel_group.cycles_nr += added_cycles
+                self.virtual_groups[index].cycles_nr += added_cycles
 
-                fields.append((signal.tobytes(), byte_size))
+            else:
+                data = samples
+                raw_size = size
+                data = lz_compress(data)
+                size = len(data)
+                stream.write(data)
 
-                if invalidation_bytes_nr and invalidation_bits is not None:
-                    inval_bits.append(invalidation_bits)
+                gp.data_blocks.append(
+                    DataBlockInfo(
+                        address=addr,
+                        block_type=v4c.DT_BLOCK_LZ,
+                        original_size=raw_size,
+                        compressed_size=size,
+                        param=0,
+                    )
+                )
 
-            elif sig_type == v4c.SIGNAL_TYPE_CANOPEN:
-                names = signal.dtype.names
+                gp.channel_group.cycles_nr += added_cycles
+                self.virtual_groups[index].cycles_nr += added_cycles
 
-                if names == v4c.CANOPEN_TIME_FIELDS:
-                    vals = signal.tobytes()
+                if invalidation_bytes_nr:
+                    addr = stream.tell()
 
-                    fields.append((vals, 6))
+                    data = inval_bits
+                    raw_size = len(data)
+                    data = lz_compress(data)
+                    size = len(data)
+                    stream.write(data)
 
-                else:
-                    vals = []
-                    for field in ("ms", "min", "hour", "day", "month", "year"):
-                        vals.append(signal[field])
-                    vals = fromarrays(vals).tobytes()
+                    gp.data_blocks[-1].invalidation_block = InvalidationBlockInfo(
+                        address=addr,
+                        block_type=v4c.DT_BLOCK_LZ,
+                        original_size=raw_size,
+                        compressed_size=size,
+                        param=None,
+                    )
 
-                    fields.append((vals, 7))
+    def _write_extend_block(self, records: bytes) -> DataBlockInfo:
+        """write the records to the temporary file as a lz4 compressed block"""
+        stream = self._tempfile
+        stream.seek(0, 2)
+        address = stream.tell()
 
-                if invalidation_bytes_nr and invalidation_bits is not None:
-                    inval_bits.append(invalidation_bits)
+        data = lz_compress(records)
+        stream.write(data)
 
-            elif sig_type == v4c.SIGNAL_TYPE_STRUCTURE_COMPOSITION:
-                if invalidation_bytes_nr and invalidation_bits is not None:
-                    inval_bits.append(invalidation_bits)
+        return DataBlockInfo(
+            address=address,
+            block_type=v4c.DZ_BLOCK_LZ,
+            original_size=len(records),
+            compressed_size=len(data),
+            param=0,
+        )
 
-                fields.append((signal.tobytes(), signal.dtype.itemsize))
+    def _buffer_records(self, index: int, records: bytes) -> None:
+        """copy the records in the extend buffer of the group; a data block is
+        written each time the buffer is full
 
-            elif sig_type == v4c.SIGNAL_TYPE_ARRAY:
-                names = signal.dtype.names
+        The pending records are written by *flush* or when the data blocks of
+        the group are read, because the group data blocks info generator is
+        replaced by one that flushes the buffer.
 
-                samples = signal[names[0]]
+        Parameters
+        ----------
+        index : int
+            group index
+        records : bytes
+            new records of the group
+
+        """
+        gp = self.groups[index]
+        buffer = self._extend_buffers.get(index, None)
+
+        if buffer is None:
+            # load the blocks info of the original file before the info
+            # generator is replaced
+            for _ in gp.get_data_blocks():
+                pass
+
+            record_size = (
+                gp.channel_group.samples_byte_nr
+                + gp.channel_group.invalidation_bytes_nr
+            )
+            capacity = max(self._write_fragment_size // record_size, 1) * record_size
+            buffer = self._extend_buffers[index] = ExtendBuffer(capacity)
+
+        data = buffer.data
+        capacity = len(data)
+        records = memoryview(records)
+        size = len(records)
+        offset = 0
+
+        while offset < size:
+            if not buffer.position and size - offset >= capacity:
+                # complete blocks are written without the buffer copy
+                gp.data_blocks.append(
+                    self._write_extend_block(records[offset : offset + capacity])
+                )
+                offset += capacity
+                continue
+
+            count = min(capacity - buffer.position, size - offset)
+            data[buffer.position : buffer.position + count] = records[
+                offset : offset + count
+            ]
+            buffer.position += count
+            offset += count
+
+            if buffer.position == capacity:
+                gp.data_blocks.append(self._write_extend_block(data))
+                buffer.position = 0
+
+        if buffer.position:
+            gp.data_blocks_info_generator = self._flush_on_read(index)
+        else:
+            gp.data_blocks_info_generator = iter(EMPTY_TUPLE)
+
+    def _flush_extend_buffer(self, index: int) -> DataBlockInfo | None:
+        """write the pending records of the group extend buffer"""
+        buffer = self._extend_buffers.get(index, None)
+        if buffer is None or not buffer.position:
+            return None
+
+        info = self._write_extend_block(memoryview(buffer.data)[: buffer.position])
+        buffer.position = 0
+        return info
+
+    def _flush_on_read(self, index: int) -> Iterator[DataBlockInfo]:
+        info = self._flush_extend_buffer(index)
+        if info is not None:
+            yield info
+
+    def flush(self) -> None:
+        """write the records that are buffered by *extend* as data blocks. This
+        is done automatically when the buffered groups are read or saved.
+
+        .. versionadded:: 7.4.0
+
+        """
+        for index in self._extend_buffers:
+            gp = self.groups[index]
+            info = self._flush_extend_buffer(index)
+            if info is not None:
+                gp.data_blocks.append(info)
+            gp.data_blocks_info_generator = iter(EMPTY_TUPLE)
+
+    def _get_extend_records(
+        self, gp: Group, signals: list[tuple[NDArray[Any], NDArray[Any] | None]]
+    ) -> tuple[bytes, NDArray[Any] | None, int]:
+        """build the data records for the new samples of a group; the VLSD
+        signal data is written to the temporary file
+
+        Parameters
+        ----------
+        gp : Group
+            extended group
+        signals : list
+            list of (numpy.ndarray, numpy.ndarray) objects; see *extend*
+
+        Returns
+        -------
+        records : bytes
+            the data records; for versions lower than 4.20 the invalidation
+            bytes are part of the records
+        invalidation_bytes : bytearray | None
+            the packed invalidation bytes for version 4.20 or *None* if they
+            are part of the records or the group has no invalidation bytes
+        cycles : int
+            number of new records
+
+        """
+        stream = self._tempfile
+
+        fields = []
+        inval_bits = []
+
+        added_cycles = len(signals[0][0])
+
+        invalidation_bytes_nr = gp.channel_group.invalidation_bytes_nr
+
+        if not invalidation_bytes_nr and gp.signal_types.count(
+            v4c.SIGNAL_TYPE_SCALAR
+        ) == len(gp.signal_types):
+            # plain numeric records: skip the per channel type dispatch
+            fields = [
+                (signal.tobytes(), signal.itemsize)
+                for signal, _ in signals
+                if signal.ndim == 1
+            ]
+            if len(fields) == len(signals):
+                samples = data_block_from_arrays(fields, added_cycles)
+                return samples, None, added_cycles
+
+            fields = []
+
+        for i, ((signal, invalidation_bits), sig_type) in enumerate(
+            zip(signals, gp.signal_types)
+        ):
+            # first add the signals in the simple signal list
+            if sig_type == v4c.SIGNAL_TYPE_SCALAR:
+                if signal.ndim == 1:
+                    # same as the fmt_to_datatype_v4 size, without the cache
+                    # lookup that depends on the number of samples
+                    byte_size = signal.itemsize
+                else:
+                    s_type, s_size = fmt_to_datatype_v4(signal.dtype, signal.shape)
+                    byte_size = s_size // 8 or 1
+
+                fields.append((signal.tobytes(), byte_size))
+
+                if invalidation_bytes_nr and invalidation_bits is not None:
+                    inval_bits.append(invalidation_bits)
+
+            elif sig_type == v4c.SIGNAL_TYPE_BIT_FIELD:
+                channel = gp.channels[i]
+                fields.append(
+                    (
+                        np.ascontiguousarray(signal),
+                        channel.bit_count,
+                        channel.bit_offset,
+                    )
+                )
+
+                if invalidation_bytes_nr and invalidation_bits is not None:
+                    inval_bits.append(invalidation_bits)
+
+            elif sig_type == v4c.SIGNAL_TYPE_CANOPEN:
+                names = signal.dtype.names
+
+                if names == v4c.CANOPEN_TIME_FIELDS:
+                    vals = signal.tobytes()
+
+                    fields.append((vals, 6))
+
+                else:
+                    vals = []
+                    for field in ("ms", "min", "hour", "day", "month", "year"):
+                        vals.append(signal[field])
+                    vals = fromarrays(vals).tobytes()
+
+                    fields.append((vals, 7))
+
+                if invalidation_bytes_nr and invalidation_bits is not None:
+                    inval_bits.append(invalidation_bits)
+
+            elif sig_type == v4c.SIGNAL_TYPE_STRUCTURE_COMPOSITION:
+                if invalidation_bytes_nr and invalidation_bits is not None:
+                    inval_bits.append(invalidation_bits)
+
+                fields.append((signal.tobytes(), signal.dtype.itemsize))
+
+            elif sig_type == v4c.SIGNAL_TYPE_ARRAY:
+                names = signal.dtype.names
+
+                samples = signal[names[0]]
 
                 shape = samples.shape[1:]
                 s_type, s_size = fmt_to_datatype_v4(samples.dtype, samples.shape, True)
@@ -5779,7 +7031,7 @@ class MDF4(MDF_Common):
                             location=v4c.LOCATION_TEMPORARY_FILE,
                         )
                         gp.signal_data[i][0].append(info)
-                        values.tofile(stream)
+                        stream.write(values)
 
                     offsets += cur_offset
                     fields.append((offsets.tobytes(), 8))
@@ -5788,93 +7040,25 @@ class MDF4(MDF_Common):
                     inval_bits.append(invalidation_bits)
 
         if invalidation_bytes_nr:
-            invalidation_bytes_nr = len(inval_bits)
-            cycles_nr = len(inval_bits[0])
-
-            for _ in range(8 - invalidation_bytes_nr % 8):
-                inval_bits.append(zeros(cycles_nr, dtype=bool))
-
-            inval_bits.reverse()
-
-            invalidation_bytes_nr = len(inval_bits) // 8
-
-            gp.channel_group.invalidation_bytes_nr = invalidation_bytes_nr
-
-            inval_bits = fliplr(
-                packbits(array(inval_bits).T).reshape(
-                    (cycles_nr, invalidation_bytes_nr)
-                )
-            )
-
-            if self.version < "4.20":
-                fields.append((inval_bits.tobytes(), invalidation_bytes_nr))
+            # the invalidation bits are packed in the same native pass as the
+            # channel samples
+            inval_bits = [np.ascontiguousarray(bits, dtype=bool) for bits in inval_bits]
 
-        samples = data_block_from_arrays(fields, added_cycles)
-        size = len(samples)
-
-        del fields
-
-        stream.seek(0, 2)
-        addr = stream.tell()
-
-        if size:
             if self.version < "4.20":
-                data = samples
-                raw_size = size
-                data = lz_compress(data)
-                size = len(data)
-                stream.write(data)
-                gp.data_blocks.append(
-                    DataBlockInfo(
-                        address=addr,
-                        block_type=v4c.DZ_BLOCK_LZ,
-                        original_size=raw_size,
-                        compressed_size=size,
-                        param=0,
-                    )
+                samples = data_block_from_arrays(
+                    fields, added_cycles, inval_bits, invalidation_bytes_nr
                 )
-
-                gp.channel_group.cycles_nr += added_cycles
-                self.virtual_groups[index].cycles_nr += added_cycles
-
+                return samples, None, added_cycles
             else:
-                data = samples
-                raw_size = size
-                data = lz_compress(data)
-                size = len(data)
-                stream.write(data)
-
-                gp.data_blocks.append(
-                    DataBlockInfo(
-                        address=addr,
-                        block_type=v4c.DT_BLOCK_LZ,
-                        original_size=raw_size,
-                        compressed_size=size,
-                        param=0,
-                    )
+                samples = data_block_from_arrays(fields, added_cycles)
+                inval_bits = data_block_from_arrays(
+                    [], added_cycles, inval_bits, invalidation_bytes_nr
                 )
+                return samples, inval_bits, added_cycles
 
-                gp.channel_group.cycles_nr += added_cycles
-                self.virtual_groups[index].cycles_nr += added_cycles
-
-                if invalidation_bytes_nr:
-                    addr = stream.tell()
-
-                    data = inval_bits.tobytes()
-                    raw_size = len(data)
-                    data = lz_compress(data)
-                    size = len(data)
-                    stream.write(data)
+        samples = data_block_from_arrays(fields, added_cycles)
 
-                    gp.data_blocks[-1].invalidation_block(
-                        InvalidationBlockInfo(
-                            address=addr,
-                            block_type=v4c.DT_BLOCK_LZ,
-                            original_size=raw_size,
-                            compressed_size=size,
-                            param=None,
-                        )
-                    )
+        return samples, None, added_cycles
 
     def _extend_column_oriented(
         self, index: int, signals: list[tuple[NDArray[Any], NDArray[Any] | None]]
@@ -5976,7 +7160,7 @@ class MDF4(MDF_Common):
                         original_size=block_size,
                         location=v4c.LOCATION_TEMPORARY_FILE,
                     )
-                    gp.signal_data[i][0].append(info)
+                    gp.signal_data[0][0].append(info)
                     write(values.tobytes())
 
                 offsets += cur_offset
@@ -6013,14 +7197,12 @@ class MDF4(MDF_Common):
                     size = len(data)
                     write(data)
 
-                    gp.data_blocks[-1].invalidation_block(
-                        InvalidationBlockInfo(
-                            address=addr,
-                            block_type=v4c.DZ_BLOCK_LZ,
-                            original_size=raw_size,
-                            compressed_size=size,
-                            param=None,
-                        )
+                    gp.data_blocks[-1].invalidation_block = InvalidationBlockInfo(
+                        address=addr,
+                        block_type=v4c.DZ_BLOCK_LZ,
+                        original_size=raw_size,
+                        compressed_size=size,
+                        param=None,
                     )
 
     def attach(
@@ -6175,10 +7357,19 @@ class MDF4(MDF_Common):
             self._closed = True
 
         self._parent = None
+        self._extend_buffers.clear()
+        if self._decompression_pool is not None:
+            self._decompression_pool.shutdown()
+            self._decompression_pool = None
         if self._tempfile is not None:
             self._tempfile.close()
         if not self._from_filelike and self._file is not None:
-            self._file.close()
+            try:
+                self._file.close()
+            except BufferError:
+                # the zero copy arrays returned by get still reference the
+                # mapped file; the mapping is released together with them
+                pass
 
         if self._mapped_file is not None:
             self._mapped_file.close()
@@ -6215,6 +7406,7 @@ class MDF4(MDF_Common):
         self.events.clear()
 
         self._ch_map.clear()
+        self._transferred_groups.clear()
         self._master_channel_metadata.clear()
         self._invalidation_cache.clear()
         self._external_dbc_cache.clear()
@@ -6356,6 +7548,8 @@ class MDF4(MDF_Common):
         record_offset: int = ...,
         record_count: int | None = ...,
         skip_channel_validation: bool = ...,
+        start: float | None = ...,
+        stop: float | None = ...,
     ) -> Signal:
         ...
 
@@ -6373,6 +7567,8 @@ class MDF4(MDF_Common):
         record_offset: int = ...,
         record_count: int | None = ...,
         skip_channel_validation: bool = ...,
+        start: float | None = ...,
+        stop: float | None = ...,
     ) -> tuple[NDArray[Any], NDArray[Any]]:
         ...
 
@@ -6389,6 +7585,8 @@ class MDF4(MDF_Common):
         record_offset: int = 0,
         record_count: int | None = None,
         skip_channel_validation: bool = False,
+        start: float | None = None,
+        stop: float | None = None,
     ) -> Signal | tuple[NDArray[Any], NDArray[Any]]:
         """Gets channel samples. The raw data group samples are not loaded to
         memory so it is advised to use ``filter`` or ``select`` instead of
@@ -6444,6 +7642,19 @@ class MDF4(MDF_Common):
 
             ..versionadded:: 7.0.0
 
+        start : float
+            if *data=None* only load the samples with timestamps greater or
+            equal to *start*; this is used instead of *record_offset* and
+            *record_count*. Default *None*
+
+            .. versionadded:: 7.4.0
+
+        stop : float
+            if *data=None* only load the samples with timestamps lower or equal
+            to *stop*; this is used instead of *record_offset* and
+            *record_count*. Default *None*
+
+            .. versionadded:: 7.4.0
 
         Returns
         -------
@@ -6526,6 +7737,7 @@ class MDF4(MDF_Common):
                 comment="">
 
         """
+        self._check_samples_access()
 
         if skip_channel_validation:
             gp_nr, ch_nr = group, index
@@ -6534,6 +7746,9 @@ class MDF4(MDF_Common):
 
         grp = self.groups[gp_nr]
 
+        if data is None and (start is not None or stop is not None):
+            record_offset, record_count = self._get_records_range(gp_nr, start, stop)
+
         # get the channel object
         channel = grp.channels[ch_nr]
         dependency_list = grp.channel_dependencies[ch_nr]
@@ -7228,6 +8443,28 @@ class MDF4(MDF_Common):
         gp_nr = group_index
         ch_nr = channel_index
 
+        if data is None and self._zero_copy and not raster:
+            block = self._get_view_data_block(grp)
+            if block is not None:
+                vals = self._get_channel_view(
+                    grp, ch_nr, block, record_offset, record_count
+                )
+                if vals is not None:
+                    if master_is_required:
+                        timestamps = self._get_master_view(
+                            gp_nr, block, record_offset, record_count
+                        )
+                        if timestamps is None:
+                            timestamps = self.get_master(
+                                gp_nr,
+                                record_offset=record_offset,
+                                record_count=record_count,
+                            )
+                    else:
+                        timestamps = None
+
+                    return vals, timestamps, None, None
+
         # get group data
         if data is None:
             data = self._load_data(
@@ -7366,19 +8603,21 @@ class MDF4(MDF_Common):
 
                 if info is not None:
                     dtype_, byte_size, byte_offset, bit_offset = info
-                    if (
-                        ch_nr == 0
-                        and len(grp.channels) == 1
-                        and channel.dtype_fmt.itemsize == record_size
-                    ):
-                        buffer = bytearray(data_bytes)
-                    else:
-                        buffer = get_channel_raw_bytes(
-                            data_bytes,
-                            record_size + channel_group.invalidation_bytes_nr,
-                            byte_offset,
-                            byte_size,
-                        )
+                    buffer = self._pop_temporary_channel_bytes(gp_nr, ch_nr)
+                    if buffer is None:
+                        if (
+                            ch_nr == 0
+                            and len(grp.channels) == 1
+                            and channel.dtype_fmt.itemsize == record_size
+                        ):
+                            buffer = bytearray(data_bytes)
+                        else:
+                            buffer = get_channel_raw_bytes(
+                                data_bytes,
+                                record_size + channel_group.invalidation_bytes_nr,
+                                byte_offset,
+                                byte_size,
+                            )
 
                     vals = frombuffer(buffer, dtype=dtype_)
 
@@ -7410,6 +8649,10 @@ class MDF4(MDF_Common):
                             if dtype(view) != vals.dtype:
                                 vals = vals.view(view)
 
+                        if channel_dtype.kind == "b":
+                            # bool channels packed in the record bytes by append
+                            vals = vals.view(bool)
+
                 else:
                     vals = self._get_not_byte_aligned_data(data_bytes, grp, ch_nr)
 
@@ -7506,6 +8749,10 @@ class MDF4(MDF_Common):
                     if not channel.standard_C_size:
                         size = dtype_.itemsize
 
+                        if not vals.flags.writeable:
+                            # a single fragment can be a view over the mapped file
+                            vals = vals.copy()
+
                         if channel_dtype.byteorder == "|" and data_type in (
                             v4c.DATA_TYPE_SIGNED_MOTOROLA,
                             v4c.DATA_TYPE_UNSIGNED_MOTOROLA,
@@ -7531,6 +8778,10 @@ class MDF4(MDF_Common):
                             if dtype(view) != vals.dtype:
                                 vals = vals.view(view)
 
+                        if channel_dtype.kind == "b":
+                            # bool channels packed in the record bytes by append
+                            vals = vals.view(bool)
+
                     if bit_count == 1 and self._single_bit_uint_as_bool:
                         vals = array(vals, dtype=bool)
 
@@ -7755,47 +9006,210 @@ class MDF4(MDF_Common):
 
         return vals, timestamps, invalidation_bits, encoding
 
-    def _get_not_byte_aligned_data(
-        self, data: bytes, group: Group, ch_nr: int
-    ) -> NDArray[Any]:
-        big_endian_types = (
-            v4c.DATA_TYPE_UNSIGNED_MOTOROLA,
-            v4c.DATA_TYPE_REAL_MOTOROLA,
-            v4c.DATA_TYPE_SIGNED_MOTOROLA,
-        )
-
-        if group.uses_ld:
-            record_size = group.channel_group.samples_byte_nr
-        else:
-            record_size = (
-                group.channel_group.samples_byte_nr
-                + group.channel_group.invalidation_bytes_nr
-            )
+    def _get_view_data_block(self, group: Group) -> DataBlockInfo | None:
+        """return the data block of the group if the records can be accessed
+        in place in the mapped file: the group must be stored in a single
+        uncompressed DT block of the original file, without separate
+        invalidation data
 
-        channel = group.channels[ch_nr]
+        Parameters
+        ----------
+        group : Group
+            channel group
 
-        bit_offset = channel.bit_offset
-        byte_offset = channel.byte_offset
-        bit_count = channel.bit_count
+        Returns
+        -------
+        block : DataBlockInfo | None
+            the single DT block of the group or *None*
 
-        if ch_nr >= 0:
-            dependencies = group.channel_dependencies[ch_nr]
-            if dependencies and isinstance(dependencies[0], ChannelArrayBlock):
-                ca_block = dependencies[0]
+        """
+        if (
+            not self._mapped
+            or group.data_location != v4c.LOCATION_ORIGINAL_FILE
+            or group.uses_ld
+        ):
+            return None
 
-                size = bit_count // 8
+        blocks = group.get_data_blocks()
+        block = next(blocks, None)
+        if (
+            block is None
+            or next(blocks, None) is not None
+            or block.block_type != v4c.DT_BLOCK
+            or block.invalidation_block is not None
+        ):
+            return None
 
-                shape = tuple(ca_block[f"dim_size_{i}"] for i in range(ca_block.dims))
-                if ca_block.byte_offset_base // size > 1 and len(shape) == 1:
-                    shape += (ca_block.byte_offset_base // size,)
-                dim = 1
-                for d in shape:
-                    dim *= d
-                size *= dim
-                bit_count = size * 8
+        return block
 
-        byte_size = bit_offset + bit_count
-        if byte_size % 8:
+    def _get_channel_view(
+        self,
+        group: Group,
+        ch_nr: int,
+        block: DataBlockInfo,
+        record_offset: int = 0,
+        record_count: int | None = None,
+    ) -> NDArray[Any] | None:
+        """return a read-only strided array over the mapped file for the raw
+        samples of a byte aligned integer or float channel
+
+        Parameters
+        ----------
+        group : Group
+            channel group
+        ch_nr : int
+            channel index
+        block : DataBlockInfo
+            the single DT block of the group
+        record_offset : int
+            record number offset
+        record_count : int
+            number of records; default *None* and in this case all the
+            available records are used
+
+        Returns
+        -------
+        vals : numpy.array | None
+            *None* if the channel samples cannot be accessed in place
+
+        """
+        channel = group.channels[ch_nr]
+        info = group.record[ch_nr]
+
+        if (
+            info is None
+            or not channel.standard_C_size
+            or channel.channel_type
+            not in (v4c.CHANNEL_TYPE_VALUE, v4c.CHANNEL_TYPE_MASTER)
+            or channel.data_type > v4c.DATA_TYPE_REAL_MOTOROLA
+            or channel.flags
+            & (v4c.FLAG_CN_ALL_INVALID | v4c.FLAG_CN_INVALIDATION_PRESENT)
+            or (channel.bit_count == 1 and self._single_bit_uint_as_bool)
+        ):
+            return None
+
+        dtype_, byte_size, byte_offset, bit_offset = info
+        if bit_offset:
+            return None
+
+        channel_group = group.channel_group
+        record_size = (
+            channel_group.samples_byte_nr + channel_group.invalidation_bytes_nr
+        )
+
+        size = block.original_size
+        if block.block_limit is not None:
+            size = min(size, block.block_limit)
+
+        cycles = size // record_size
+        start = min(record_offset, cycles)
+        if record_count is None:
+            stop = cycles
+        else:
+            stop = min(start + record_count, cycles)
+
+        return np.ndarray(
+            shape=(stop - start,),
+            dtype=dtype_,
+            # the array keeps the mapping exported while it is alive, so the
+            # mapped file cannot be closed under it
+            buffer=frombuffer(self._file, dtype=uint8),
+            offset=block.address + start * record_size + byte_offset,
+            strides=(record_size,),
+        )
+
+    def _get_master_view(
+        self,
+        index: int,
+        block: DataBlockInfo,
+        record_offset: int = 0,
+        record_count: int | None = None,
+    ) -> NDArray[Any] | None:
+        """return a read-only strided array over the mapped file for the
+        master channel of the group; this is only possible for float64 master
+        channels without conversion
+
+        Parameters
+        ----------
+        index : int
+            group index
+        block : DataBlockInfo
+            the single DT block of the group
+        record_offset : int
+            record number offset
+        record_count : int
+            number of records; default *None* and in this case all the
+            available records are used
+
+        Returns
+        -------
+        timestamps : numpy.array | None
+            *None* if the master samples cannot be accessed in place
+
+        """
+        if self._master is not None:
+            return None
+
+        group = self.groups[index]
+        time_ch_nr = self.masters_db.get(index, None)
+        if time_ch_nr is None or group.channel_group.flags & v4c.FLAG_CG_REMOTE_MASTER:
+            return None
+
+        time_ch = group.channels[time_ch_nr]
+        if time_ch.conversion:
+            return None
+
+        t = self._get_channel_view(
+            group, time_ch_nr, block, record_offset, record_count
+        )
+        if t is None or t.dtype != float64:
+            return None
+
+        self._master_channel_metadata[index] = (time_ch.name, time_ch.sync_type)
+
+        return t
+
+    def _get_not_byte_aligned_data(
+        self, data: bytes, group: Group, ch_nr: int
+    ) -> NDArray[Any]:
+        big_endian_types = (
+            v4c.DATA_TYPE_UNSIGNED_MOTOROLA,
+            v4c.DATA_TYPE_REAL_MOTOROLA,
+            v4c.DATA_TYPE_SIGNED_MOTOROLA,
+        )
+
+        if group.uses_ld:
+            record_size = group.channel_group.samples_byte_nr
+        else:
+            record_size = (
+                group.channel_group.samples_byte_nr
+                + group.channel_group.invalidation_bytes_nr
+            )
+
+        channel = group.channels[ch_nr]
+
+        bit_offset = channel.bit_offset
+        byte_offset = channel.byte_offset
+        bit_count = channel.bit_count
+
+        if ch_nr >= 0:
+            dependencies = group.channel_dependencies[ch_nr]
+            if dependencies and isinstance(dependencies[0], ChannelArrayBlock):
+                ca_block = dependencies[0]
+
+                size = bit_count // 8
+
+                shape = tuple(ca_block[f"dim_size_{i}"] for i in range(ca_block.dims))
+                if ca_block.byte_offset_base // size > 1 and len(shape) == 1:
+                    shape += (ca_block.byte_offset_base // size,)
+                dim = 1
+                for d in shape:
+                    dim *= d
+                size *= dim
+                bit_count = size * 8
+
+        byte_size = bit_offset + bit_count
+        if byte_size % 8:
             byte_size = (byte_size // 8) + 1
         else:
             byte_size //= 8
@@ -8137,6 +9551,32 @@ class MDF4(MDF_Common):
                 if not grp.single_channel_dtype:
                     self._prepare_record(grp)
 
+                if grp.record is not None and len(channels) > 1:
+                    # extract all the byte aligned channels in a single pass
+                    # over the fragment records
+                    aligned = [
+                        channel_index
+                        for channel_index in channels
+                        if grp.record[channel_index] is not None
+                    ]
+                    if len(aligned) > 1:
+                        channel_group = grp.channel_group
+                        buffers = get_channels_raw_bytes(
+                            fragment[0],
+                            channel_group.samples_byte_nr
+                            + channel_group.invalidation_bytes_nr,
+                            [
+                                (
+                                    grp.record[channel_index][2],
+                                    grp.record[channel_index][1],
+                                )
+                                for channel_index in aligned
+                            ],
+                        )
+                        self._set_temporary_channels_bytes(
+                            group_index, dict(zip(aligned, buffers))
+                        )
+
                 if idx == 0:
                     for channel_index in channels:
                         signal = self.get(
@@ -8164,6 +9604,8 @@ class MDF4(MDF_Common):
 
                         signals.append((signal, invalidation_bits))
 
+                self._set_temporary_channels_bytes(group_index, None)
+
                 if version < "4.00":
                     if idx == 0:
                         for sig, channel_index in zip(signals, channels):
@@ -8260,6 +9702,7 @@ class MDF4(MDF_Common):
             master channel samples
 
         """
+        self._check_samples_access()
 
         if raster is not None:
             PendingDeprecationWarning(
@@ -8294,8 +9737,9 @@ class MDF4(MDF_Common):
             data_bytes, offset, _count, invalidation_bytes = fragment
             cycles_nr = len(data_bytes) // record_size if record_size else 0
         else:
-            offset = 0
+            offset = record_offset
             _count = record_count
+            cycles_nr = max(min(cycles_nr, group.channel_group.cycles_nr - offset), 0)
 
         if time_ch_nr is None:
             if record_size:
@@ -8319,11 +9763,6 @@ class MDF4(MDF_Common):
                 t *= time_a
                 t += time_b
 
-                if record_count is None:
-                    t = t[record_offset:]
-                else:
-                    t = t[record_offset : record_offset + record_count]
-
             else:
                 # check if the channel group contains just the master channel
                 # and that there are no padding bytes
@@ -8998,14 +10437,48 @@ class MDF4(MDF_Common):
             inf["cycles"] = gp.channel_group.cycles_nr
             inf["comment"] = gp.channel_group.comment
             inf["channels count"] = len(gp.channels)
+
+            compression = self._get_compression_info(i)
+            if compression is not None:
+                inf["compression"], ratio = compression
+                inf["compression ratio"] = round(ratio, 3)
+
             for j, channel in enumerate(gp.channels):
                 name = channel.name
 
                 ch_type = v4c.CHANNEL_TYPE_TO_DESCRIPTION[channel.channel_type]
                 inf[f"channel {j}"] = f'name="{name}" type={ch_type}'
 
+        if self._metadata_index_info is not None:
+            info["metadata index"] = dict(self._metadata_index_info)
+
         return info
 
+    def _get_compression_info(self, index: int) -> tuple[str, float] | None:
+        """codec and compressed to original size ratio of the data blocks of
+        a channel group; after *save* the values of the saved file are
+        returned, otherwise the data blocks of the original file are used"""
+        if index in self._compression_info:
+            return self._compression_info[index]
+
+        group = self.groups[index]
+        if self._blocks_location(index) is None or group.uses_ld:
+            return None
+
+        codecs = []
+        original_size = compressed_size = 0
+        for info in group.get_data_blocks():
+            codec = v4c.DATA_BLOCK_TYPE_TO_DESCRIPTION[info.block_type]
+            if codec not in codecs:
+                codecs.append(codec)
+            original_size += info.original_size
+            compressed_size += info.compressed_size
+
+        if not original_size:
+            return None
+
+        return ", ".join(codecs), compressed_size / original_size
+
     @property
     def start_time(self) -> datetime:
         """getter and setter the measurement start timestamp
@@ -9023,131 +10496,1503 @@ class MDF4(MDF_Common):
     def start_time(self, timestamp: datetime) -> None:
         self.header.start_time = timestamp
 
-    def save(
-        self,
-        dst: WritableBufferType | StrPathType,
-        overwrite: bool = False,
-        compression: CompressionType = 0,
-        progress=None,
-    ) -> Path:
-        """Save MDF to *dst*. If overwrite is *True* then the destination file
-        is overwritten, otherwise the file name is appended with '.<cntr>', were
-        '<cntr>' is the first counter that produces a new file name
-        (that does not already exist in the filesystem)
+    def _can_transfer_group(self, other: MDF4, index: int) -> bool:
+        """check if the *index* channel group of *other* can be added to this
+        file without decoding its samples
+
+        The group must be stored sorted in the original file of *other* and
+        all the channels dependencies must reference the same group.
 
         Parameters
         ----------
-        dst : str
-            destination file name, Default ''
-        overwrite : bool
-            overwrite flag, default *False*
-        compression : int
-            use compressed data blocks, default 0; valid since version 4.10
-
-            * 0 - no compression
-            * 1 - deflate (slower, but produces smaller files)
-            * 2 - transposition + deflate (slowest, but produces
-              the smallest files)
+        other : MDF4
+            source file
+        index : int
+            group index in *other*
 
         Returns
         -------
-        output_file : pathlib.Path
-            path to saved file
+        can_transfer : bool
 
         """
+        if (
+            not isinstance(other, MDF4)
+            or other._file is None
+            or other._from_filelike
+            or not ("4.00" <= other.version < "4.20")
+            or not ("4.00" <= self.version < "4.20")
+        ):
+            return False
 
-        if is_file_like(dst):
-            dst_ = dst
-            file_like = True
-            if hasattr(dst, "name"):
-                dst = Path(dst.name)
-            else:
-                dst = Path("__file_like.mf4")
-            dst_.seek(0)
-            suffix = ".mf4"
-        else:
-            file_like = False
-            suffix = Path(dst).suffix.lower()
+        if self._tempfile is None:
+            return False
 
-            dst = Path(dst).with_suffix(".mf4")
+        group = other.groups[index]
+        channel_group = group.channel_group
 
-            destination_dir = dst.parent
-            destination_dir.mkdir(parents=True, exist_ok=True)
+        if (
+            group.data_location != v4c.LOCATION_ORIGINAL_FILE
+            or group.uses_ld
+            or group.data_group.record_id_len
+            or channel_group.flags & (v4c.FLAG_CG_VLSD | v4c.FLAG_CG_REMOTE_MASTER)
+            or other.virtual_groups[other.virtual_groups_map[index]].groups != [index]
+        ):
+            return False
 
-            if overwrite is False:
-                if dst.is_file():
-                    cntr = 0
-                    while True:
-                        name = dst.with_suffix(f".{cntr}.mf4")
-                        if not name.exists():
-                            break
-                        else:
-                            cntr += 1
-                    message = (
-                        f'Destination file "{dst}" already exists '
-                        f'and "overwrite" is False. Saving MDF file as "{name}"'
-                    )
-                    logger.warning(message)
-                    dst = name
+        # VLSD channel groups share the data group of the referencing group
+        if any(gp.channel_group.flags & v4c.FLAG_CG_VLSD for gp in other.groups):
+            return False
 
-            if dst == self.name:
-                destination = dst.with_suffix(".savetemp")
-            else:
-                destination = dst
+        for channel in group.channels:
+            if channel.attachment is not None:
+                return False
 
-            dst_ = open(destination, "wb+")
+        for i in range(len(group.channels)):
+            for info in group.get_signal_data_blocks(i):
+                if info.location != v4c.LOCATION_ORIGINAL_FILE:
+                    return False
 
-        if not self.file_history:
-            comment = "created"
-        else:
-            comment = "updated"
+        for dependencies in group.channel_dependencies:
+            if not dependencies:
+                continue
+            for dep in dependencies:
+                if isinstance(dep, ChannelArrayBlock):
+                    references = [
+                        *dep.axis_channels,
+                        *dep.dynamic_size_channels,
+                        *dep.input_quantity_channels,
+                        dep.output_quantity_channel,
+                        dep.comparison_quantity_channel,
+                    ]
+                else:
+                    references = [dep]
 
-        fh = FileHistory()
-        fh.comment = f"""<FHcomment>
-<TX>{comment}</TX>
-<tool_id>asammdf</tool_id>
-<tool_vendor>asammdf</tool_vendor>
-<tool_version>{__version__}</tool_version>
-</FHcomment>"""
+                for reference in references:
+                    if reference is not None and reference[0] != index:
+                        return False
 
-        self.file_history.append(fh)
+        return True
 
-        cg_map = {}
+    def _transfer_group(self, other: MDF4, index: int) -> int:
+        """add the *index* channel group of *other* without decoding its
+        samples; the blocks that hold the group data are copied byte for byte
+        to the temporary file and *save* copies them verbatim if the
+        compression matches. *_can_transfer_group* must be checked first
 
-        try:
-            defined_texts = {"": 0, b"": 0}
-            cc_map = {}
-            si_map = {}
+        Parameters
+        ----------
+        other : MDF4
+            source file
+        index : int
+            group index in *other*
 
-            groups_nr = len(self.groups)
+        Returns
+        -------
+        index : int
+            new group index
 
-            write = dst_.write
-            tell = dst_.tell
-            seek = dst_.seek
+        """
+        dg_cntr = len(self.groups)
+        source = other.groups[index]
+
+        def relocate(reference):
+            if reference is None:
+                return None
+            return dg_cntr, reference[1]
+
+        gp = copy(source)
+        gp.data_group = source.data_group.copy()
+        gp.channel_group = copy(source.channel_group)
+        if gp.channel_group.acq_source:
+            gp.channel_group.acq_source = gp.channel_group.acq_source.copy()
+
+        # the blocks referenced by the channels get new addresses when the
+        # file is saved so they are not shared with the source file
+        gp.channels = []
+        for channel in source.channels:
+            channel = copy(channel)
+            channel.conversion = conversion_transfer(
+                channel.conversion, version=4, copy=True
+            )
+            if channel.source:
+                channel.source = channel.source.copy()
+            gp.channels.append(channel)
 
-            blocks = []
+        gp.data_location = v4c.LOCATION_TEMPORARY_FILE
+        gp.data_blocks = self._copy_transferred_blocks(other, source.get_data_blocks())
+        gp.data_blocks_info_generator = iter(EMPTY_TUPLE)
+        gp.data_blocks_offsets = None
+        gp.data_blocks_time_ranges = None
+
+        gp.signal_data = []
+        for i, signal_data in enumerate(source.signal_data):
+            if signal_data is None:
+                gp.signal_data.append(None)
+            else:
+                gp.signal_data.append(
+                    (
+                        self._copy_transferred_blocks(
+                            other, source.get_signal_data_blocks(i)
+                        ),
+                        iter(EMPTY_TUPLE),
+                    )
+                )
 
-            write(bytes(self.identification))
+        gp.channel_dependencies = []
+        for dependencies in source.channel_dependencies:
+            if dependencies is None:
+                gp.channel_dependencies.append(None)
+                continue
 
-            self.header.to_blocks(dst_.tell(), blocks)
-            for block in blocks:
-                write(bytes(block))
+            relocated = []
+            for dep in dependencies:
+                if isinstance(dep, ChannelArrayBlock):
+                    dep = copy(dep)
+                    dep.axis_channels = [relocate(ref) for ref in dep.axis_channels]
+                    dep.dynamic_size_channels = [
+                        relocate(ref) for ref in dep.dynamic_size_channels
+                    ]
+                    dep.input_quantity_channels = [
+                        relocate(ref) for ref in dep.input_quantity_channels
+                    ]
+                    dep.output_quantity_channel = relocate(dep.output_quantity_channel)
+                    dep.comparison_quantity_channel = relocate(
+                        dep.comparison_quantity_channel
+                    )
+                    relocated.append(dep)
+                else:
+                    relocated.append(relocate(dep))
+            gp.channel_dependencies.append(relocated)
 
-            original_data_addresses = []
+        self.groups.append(gp)
 
-            if compression == 1:
-                zip_type = v4c.FLAG_DZ_DEFLATE
-            else:
-                zip_type = v4c.FLAG_DZ_TRANPOSED_DEFLATE
+        for ch_cntr, channel in enumerate(gp.channels):
+            entry = (dg_cntr, ch_cntr)
+            for name in channel.display_names:
+                self.channels_db.add(name, entry)
+            self.channels_db.add(channel.name, entry)
 
-            # write DataBlocks first
-            for gp_nr, gp in enumerate(self.groups):
-                original_data_addresses.append(gp.data_group.data_block_addr)
+            if channel.channel_type in MASTER_CHANNELS:
+                self.masters_db[dg_cntr] = ch_cntr
 
-                if gp.channel_group.flags & v4c.FLAG_CG_VLSD:
-                    continue
+        virtual_group = VirtualChannelGroup()
+        self.virtual_groups[dg_cntr] = virtual_group
+        self.virtual_groups_map[dg_cntr] = dg_cntr
+        virtual_group.groups.append(dg_cntr)
+        virtual_group.record_size = (
+            gp.channel_group.samples_byte_nr + gp.channel_group.invalidation_bytes_nr
+        )
+        virtual_group.cycles_nr = gp.channel_group.cycles_nr
 
-                address = tell()
+        self._transferred_groups.add(dg_cntr)
+
+        return dg_cntr
+
+    def _copy_transferred_blocks(
+        self,
+        other: MDF4,
+        blocks: Iterable[DataBlockInfo | SignalDataBlockInfo],
+    ) -> list[DataBlockInfo | SignalDataBlockInfo]:
+        """copy the complete DT, SD or DZ blocks of the original file of
+        *other* that hold the given data blocks to the temporary file
+
+        Parameters
+        ----------
+        other : MDF4
+            source file
+        blocks : iterable
+            data blocks or signal data blocks information of *other*
+
+        Returns
+        -------
+        blocks : list
+            block information with the addresses of the copies
+
+        """
+        stream = self._tempfile
+        stream.seek(0, 2)
+
+        copied = []
+        for info in blocks:
+            if info.block_type == v4c.DT_BLOCK:
+                header_size = COMMON_SIZE
+            else:
+                header_size = v4c.DZ_COMMON_SIZE
+
+            address = info.address - header_size
+            with other._read_lock:
+                other._file.seek(address)
+                _, block_len = COMMON_SHORT_u(other._file.read(COMMON_SHORT_SIZE))
+
+            block_address = stream.tell()
+            for chunk in other._read_raw_block(address, block_len):
+                stream.write(chunk)
+
+            info = copy(info)
+            info.address = block_address + header_size
+            if isinstance(info, SignalDataBlockInfo):
+                info.location = v4c.LOCATION_TEMPORARY_FILE
+            copied.append(info)
+
+        return copied
+
+    def _blocks_location(self, index: int) -> int | None:
+        """location of the complete blocks that hold the data of the *index*
+        group, or *None* if the group data is not stored as file blocks"""
+        if self.groups[index].data_location == v4c.LOCATION_ORIGINAL_FILE:
+            return v4c.LOCATION_ORIGINAL_FILE
+        elif index in self._transferred_groups:
+            return v4c.LOCATION_TEMPORARY_FILE
+        else:
+            return None
+
+    def _can_transpose_group(self, other: MDF4, index: int) -> bool:
+        """check if the *index* channel group of *other* can be added to this
+        4.20 file as column oriented groups by transposing its records
+
+        All the channels must be plain values stored in the record bytes,
+        without channel dependencies or attachments.
+
+        Parameters
+        ----------
+        other : MDF4
+            source file
+        index : int
+            group index in *other*
+
+        Returns
+        -------
+        can_transpose : bool
+
+        """
+        if not isinstance(other, MDF4) or self.version < "4.20":
+            return False
+
+        group = other.groups[index]
+        channel_group = group.channel_group
+
+        if (
+            group.uses_ld
+            or group.data_group.record_id_len
+            or channel_group.flags & (v4c.FLAG_CG_VLSD | v4c.FLAG_CG_REMOTE_MASTER)
+            or other.virtual_groups[other.virtual_groups_map[index]].groups != [index]
+        ):
+            return False
+
+        master_index = other.masters_db.get(index, None)
+        if (
+            master_index is None
+            or group.channels[master_index].channel_type != v4c.CHANNEL_TYPE_MASTER
+        ):
+            return False
+
+        record = other._prepare_record(group)
+        record_size = channel_group.samples_byte_nr
+
+        for i, channel in enumerate(group.channels):
+            if (
+                channel.channel_type
+                not in (v4c.CHANNEL_TYPE_VALUE, v4c.CHANNEL_TYPE_MASTER)
+                or channel.attachment is not None
+                or group.channel_dependencies[i]
+                or record[i] is None
+                or record[i][2] + record[i][1] > record_size
+            ):
+                return False
+
+        return True
+
+    def _transpose_group(self, other: MDF4, index: int, channels: Sequence[int]) -> int:
+        """add the *channels* of the *index* channel group of *other* as a
+        master group and one column group for each channel. The records are
+        transposed fragment by fragment, so the memory usage is bounded by a
+        few write fragments regardless of the group size.
+        *_can_transpose_group* must be checked first
+
+        Parameters
+        ----------
+        other : MDF4
+            source file
+        index : int
+            group index in *other*
+        channels : sequence
+            channel indexes in the group of *other*; the master channel is
+            always added
+
+        Returns
+        -------
+        index : int
+            index of the new master group
+
+        """
+        group = other.groups[index]
+        source_group = group.channel_group
+        record = other._prepare_record(group)
+        record_size = source_group.samples_byte_nr + source_group.invalidation_bytes_nr
+        master_index = other.masters_db[index]
+
+        file = self._tempfile
+        tell = file.tell
+        write = file.write
+
+        file.seek(0, 2)
+
+        dg_cntr = cg_master_index = len(self.groups)
+
+        virtual_group = VirtualChannelGroup()
+        self.virtual_groups[cg_master_index] = virtual_group
+
+        columns = []
+        selection = []
+
+        for ch_nr in [master_index, *(i for i in channels if i != master_index)]:
+            source = group.channels[ch_nr]
+            _dtype, byte_size, byte_offset, bit_offset = record[ch_nr]
+
+            channel = copy(source)
+            channel.byte_offset = 0
+            channel.conversion = conversion_transfer(
+                channel.conversion, version=4, copy=True
+            )
+            if channel.source:
+                channel.source = channel.source.copy()
+
+            # the flags select the block size of the channel group
+            if ch_nr == master_index:
+                flags = source_group.flags
+            else:
+                flags = v4c.FLAG_CG_REMOTE_MASTER
+
+            channel_group = ChannelGroup(
+                cycles_nr=0,
+                samples_byte_nr=byte_size,
+                flags=flags,
+                path_separator=source_group.path_separator,
+            )
+            channel_group.acq_name = source_group.acq_name
+            if source_group.acq_source:
+                channel_group.acq_source = source_group.acq_source.copy()
+            channel_group.comment = source_group.comment
+            if ch_nr != master_index:
+                channel_group.cg_master_index = cg_master_index
+
+            selection.append((byte_offset, byte_size))
+
+            # the invalidation bit of the channel becomes the first bit of the
+            # single invalidation byte of the column group
+            if (
+                source.flags & v4c.FLAG_CN_INVALIDATION_PRESENT
+                and source_group.invalidation_bytes_nr
+            ):
+                pos_byte, pos_offset = divmod(source.pos_invalidation_bit, 8)
+                selection.append((source_group.samples_byte_nr + pos_byte, 1))
+                channel.pos_invalidation_bit = 0
+                channel_group.invalidation_bytes_nr = 1
+                invalidation_offset = pos_offset
+            else:
+                invalidation_offset = None
+
+            gp = Group(None)
+            gp.channels = [channel]
+            gp.signal_data = [None]
+            gp.channel_dependencies = [None]
+            gp.signal_types = [v4c.SIGNAL_TYPE_SCALAR]
+            gp.channel_group = channel_group
+            gp.data_group = DataGroup()
+            gp.data_location = v4c.LOCATION_TEMPORARY_FILE
+            gp.sorted = True
+            gp.uses_ld = True
+            gp.single_channel_dtype = channel.dtype_fmt
+            gp.record = [(channel.dtype_fmt, byte_size, 0, bit_offset)]
+
+            self.groups.append(gp)
+
+            entry = (dg_cntr, 0)
+            self.channels_db.add(channel.name, entry)
+            for name in channel.display_names:
+                self.channels_db.add(name, entry)
+
+            if ch_nr == master_index:
+                self.masters_db[dg_cntr] = 0
+
+            virtual_group.groups.append(dg_cntr)
+            self.virtual_groups_map[dg_cntr] = cg_master_index
+            virtual_group.record_size += byte_size + channel_group.invalidation_bytes_nr
+
+            columns.append((gp, invalidation_offset))
+
+            dg_cntr += 1
+
+        # the column blocks are written once they reach the write fragment
+        # size, but the pending records never exceed a few write fragments
+        max_byte_size = max(byte_size for _, byte_size in selection)
+        block_limit = self._write_fragment_size
+        buffer_limit = max(8 * self._write_fragment_size, record_size)
+
+        pending = [[] for _ in selection]
+        pending_count = 0
+        cycles_nr = 0
+
+        def flush():
+            buffers = iter(pending)
+            for gp, invalidation_offset in columns:
+                data = b"".join(next(buffers))
+                raw_size = len(data)
+                data = lz_compress(data)
+                address = tell()
+                write(data)
+
+                gp.data_blocks.append(
+                    DataBlockInfo(
+                        address=address,
+                        block_type=v4c.DZ_BLOCK_LZ,
+                        original_size=raw_size,
+                        compressed_size=len(data),
+                        param=0,
+                    )
+                )
+
+                if invalidation_offset is not None:
+                    data = (
+                        (frombuffer(b"".join(next(buffers)), dtype=uint8))
+                        >> invalidation_offset
+                    ) & 1
+                    data = data.tobytes()
+                    raw_size = len(data)
+                    data = lz_compress(data)
+                    address = tell()
+                    write(data)
+
+                    gp.data_blocks[-1].invalidation_block = InvalidationBlockInfo(
+                        address=address,
+                        block_type=v4c.DZ_BLOCK_LZ,
+                        original_size=raw_size,
+                        compressed_size=len(data),
+                        param=None,
+                    )
+
+            for buffers in pending:
+                buffers.clear()
+
+        for fragment in other._load_data(group):
+            data_bytes = fragment[0]
+            count = len(data_bytes) // record_size
+            if not count:
+                continue
+
+            for buffers, raw_bytes in zip(
+                pending, get_channels_raw_bytes(data_bytes, record_size, selection)
+            ):
+                buffers.append(raw_bytes)
+
+            pending_count += count
+            cycles_nr += count
+
+            if (
+                pending_count * max_byte_size >= block_limit
+                or pending_count * record_size >= buffer_limit
+            ):
+                flush()
+                pending_count = 0
+
+        if pending_count:
+            flush()
+
+        for gp, _ in columns:
+            gp.channel_group.cycles_nr = cycles_nr
+        virtual_group.cycles_nr = cycles_nr
+
+        return cg_master_index
+
+    def _raw_blocks(
+        self,
+        blocks: Iterable[DataBlockInfo | SignalDataBlockInfo],
+        block_type: int,
+        original_type: bytes,
+        location: int = v4c.LOCATION_ORIGINAL_FILE,
+    ) -> list[tuple[int, int, int]] | None:
+        """locate the complete blocks that hold the given data blocks, if they
+        all have the *block_type* encoding
+
+        Parameters
+        ----------
+        blocks : iterable
+            data blocks or signal data blocks information
+        block_type : int
+            expected DT or DZ block type
+        original_type : bytes
+            expected block type of the uncompressed data (b"DT" or b"SD")
+        location : int
+            the blocks are in the original file or in the temporary file
+
+        Returns
+        -------
+        raw_blocks : list | None
+            (block address, block size, original data size) for each block or
+            *None* if the blocks cannot be copied verbatim
+
+        """
+        if location == v4c.LOCATION_ORIGINAL_FILE:
+            stream = self._file
+        else:
+            stream = self._tempfile
+        if stream is None:
+            return None
+
+        raw_blocks = []
+        with self._read_lock:
+            for info in blocks:
+                if (
+                    info.block_type != block_type
+                    or getattr(info, "block_limit", None) is not None
+                    or getattr(info, "location", location) != location
+                ):
+                    return None
+
+                if block_type == v4c.DT_BLOCK:
+                    address = info.address - COMMON_SIZE
+                    expected_id = b"##" + original_type
+                else:
+                    address = info.address - v4c.DZ_COMMON_SIZE
+                    expected_id = b"##DZ"
+
+                stream.seek(address)
+                header = stream.read(v4c.DZ_COMMON_SIZE)
+                id_, block_len = COMMON_SHORT_u(header[:COMMON_SHORT_SIZE])
+                if id_ != expected_id or (
+                    block_type != v4c.DT_BLOCK
+                    and header[COMMON_SIZE : COMMON_SIZE + 2] != original_type
+                ):
+                    return None
+
+                raw_blocks.append((address, block_len, info.original_size))
+
+        return raw_blocks
+
+    def _read_raw_block(
+        self, address: int, size: int, location: int = v4c.LOCATION_ORIGINAL_FILE
+    ) -> Iterator[bytes]:
+        """read a block of the original file or of the temporary file in
+        chunks"""
+        if location == v4c.LOCATION_ORIGINAL_FILE:
+            stream = self._file
+        else:
+            stream = self._tempfile
+        while size:
+            chunk_size = min(size, COPY_CHUNK_SIZE)
+            with self._read_lock:
+                stream.seek(address)
+                chunk = stream.read(chunk_size)
+            yield chunk
+            address += chunk_size
+            size -= chunk_size
+
+    @staticmethod
+    def _build_data_lists(
+        blocks: list[tuple[int, int]], address: int
+    ) -> list[DataList]:
+        """build the DL chain that references the (address, original size)
+        blocks; consecutive blocks with the same size share an equal length DL
+        block, the last block of each DL block can be shorter
+
+        Parameters
+        ----------
+        blocks : list
+            (block address, original data size) pairs
+        address : int
+            address of the first DL block; the DL blocks are consecutive
+
+        Returns
+        -------
+        data_lists : list
+            DL blocks with the addresses and the next DL links set
+
+        """
+        runs = []
+        run_size = 0
+        closed = True
+        for block_address, size in blocks:
+            if not closed and size <= run_size:
+                runs[-1][1].append(block_address)
+                closed = size < run_size
+            else:
+                runs.append((size, [block_address]))
+                run_size = size
+                closed = False
+
+        data_lists = []
+        for size, addresses in runs:
+            dl_block = DataList(
+                flags=v4c.FLAG_DL_EQUAL_LENGHT,
+                links_nr=len(addresses) + 1,
+                data_block_nr=len(addresses),
+                data_block_len=size,
+            )
+            for i, block_address in enumerate(addresses):
+                dl_block[f"data_block_addr{i}"] = block_address
+            dl_block.address = address
+            address += dl_block.block_len
+            if data_lists:
+                data_lists[-1].next_dl_addr = dl_block.address
+            data_lists.append(dl_block)
+
+        return data_lists
+
+    def _copy_data_blocks(
+        self,
+        group: Group,
+        dst_: WritableBufferType,
+        compression: CompressionType,
+        location: int | None,
+    ) -> tuple[int, int, int] | None:
+        """copy the data blocks of an unchanged group byte for byte from the
+        original or temporary file, if they already use the encoding requested
+        by *compression*; only the DL and HL blocks are written again to
+        relocate the links
+
+        Parameters
+        ----------
+        group : Group
+            channel group
+        dst_ : file handle
+            destination file
+        compression : int | str
+            compression argument of *save*; for "auto" the blocks are copied
+            if they are already compressed
+        location : int | None
+            location of the group blocks returned by *_blocks_location*
+
+        Returns
+        -------
+        result : tuple | None
+            (data block address, copied bytes, compression) or *None* if the
+            group data has to be encoded again
+
+        """
+        channel_group = group.channel_group
+
+        if location is None or group.uses_ld or group.data_group.record_id_len:
+            return None
+
+        if compression == "auto" and self.version >= "4.10":
+            for info in group.get_data_blocks():
+                if info.block_type == v4c.DZ_BLOCK_DEFLATE:
+                    compression = 1
+                elif info.block_type == v4c.DZ_BLOCK_TRANSPOSED:
+                    compression = 2
+                else:
+                    return None
+                break
+
+        if not compression or self.version < "4.10":
+            compression = 0
+            block_type = v4c.DT_BLOCK
+            zip_type = None
+        elif compression == 1:
+            block_type = v4c.DZ_BLOCK_DEFLATE
+            zip_type = v4c.FLAG_DZ_DEFLATE
+        else:
+            block_type = v4c.DZ_BLOCK_TRANSPOSED
+            zip_type = v4c.FLAG_DZ_TRANPOSED_DEFLATE
+
+        raw_blocks = self._raw_blocks(
+            group.get_data_blocks(), block_type, b"DT", location
+        )
+        if not raw_blocks:
+            return None
+
+        total_size = (
+            channel_group.samples_byte_nr + channel_group.invalidation_bytes_nr
+        ) * channel_group.cycles_nr
+        if sum(size for *_, size in raw_blocks) != total_size:
+            return None
+
+        write = dst_.write
+        tell = dst_.tell
+
+        copied = 0
+        addresses = []
+        for address, block_len, original_size in raw_blocks:
+            addresses.append((tell(), original_size))
+            for chunk in self._read_raw_block(address, block_len, location):
+                write(chunk)
+            align = block_len % 8
+            if align:
+                write(b"\0" * (8 - align))
+            copied += block_len
+
+        if len(addresses) == 1:
+            return addresses[0][0], copied, compression
+
+        data_lists = self._build_data_lists(addresses, tell())
+        for dl_block in data_lists:
+            write(bytes(dl_block))
+        address = data_lists[0].address
+
+        if zip_type is not None:
+            hl_block = HeaderList(
+                flags=v4c.FLAG_DL_EQUAL_LENGHT,
+                zip_type=zip_type,
+                first_dl_addr=address,
+            )
+            address = tell()
+            write(bytes(hl_block))
+
+        return address, copied, compression
+
+    def _copy_signal_data_blocks(
+        self,
+        group: Group,
+        index: int,
+        address: int,
+        blocks: list[Any],
+        compression: CompressionType,
+        location: int | None,
+    ) -> tuple[int, int, int] | None:
+        """queue the signal data blocks of a channel to be copied byte for byte
+        from the original or temporary file, if they already use the encoding
+        requested by *compression*
+
+        Parameters
+        ----------
+        group : Group
+            channel group
+        index : int
+            channel index
+        address : int
+            destination address of the next block
+        blocks : list
+            blocks written by *_write_metadata_blocks*
+        compression : int
+            compression argument of *save*
+        location : int | None
+            location of the group blocks returned by *_blocks_location*
+
+        Returns
+        -------
+        result : tuple | None
+            (signal data address, next block address, copied bytes) or *None*
+            if the signal data has to be encoded again
+
+        """
+        if location is None:
+            return None
+
+        compressed = bool(compression) and self.version > "4.00"
+        if compressed:
+            block_type = v4c.DZ_BLOCK_DEFLATE
+        else:
+            block_type = v4c.DT_BLOCK
+
+        raw_blocks = self._raw_blocks(
+            (
+                info
+                for info in group.get_signal_data_blocks(index)
+                if info.original_size
+            ),
+            block_type,
+            b"SD",
+            location,
+        )
+        if not raw_blocks:
+            return None
+
+        copied = 0
+        addresses = []
+        for block_address, block_len, original_size in raw_blocks:
+            addresses.append((address, original_size))
+            blocks.append(
+                b"".join(self._read_raw_block(block_address, block_len, location))
+            )
+            address += block_len
+            align = block_len % 8
+            if align:
+                blocks.append(b"\0" * (8 - align))
+                address += 8 - align
+            copied += block_len
+
+        if len(addresses) == 1:
+            return addresses[0][0], address, copied
+
+        data_lists = self._build_data_lists(addresses, address)
+        blocks.extend(data_lists)
+        data_address = data_lists[0].address
+        address = data_lists[-1].address + data_lists[-1].block_len
+
+        if compressed:
+            hl_block = HeaderList(
+                flags=v4c.FLAG_DL_EQUAL_LENGHT,
+                zip_type=v4c.FLAG_DZ_DEFLATE,
+                first_dl_addr=data_address,
+            )
+            hl_block.address = data_address = address
+            address += hl_block.block_len
+            blocks.append(hl_block)
+
+        return data_address, address, copied
+
+    def _write_metadata_blocks(
+        self,
+        dst_: WritableBufferType,
+        compression: CompressionType = 0,
+        progress=None,
+        stats: dict[str, int] | None = None,
+        compression_level: int | None = None,
+    ) -> None:
+        """write the metadata blocks after the data blocks and update the
+        header links; the data blocks of the groups must already be written
+        and the data group links must point to them
+
+        Parameters
+        ----------
+        dst_ : file handle
+            destination file; the identification and header blocks are at the
+            start of the file and the current position is at the end of the
+            data blocks
+        compression : int
+            compression used for the VLSD signal data blocks
+        progress : None
+            progress object used by the GUI
+        stats : dict | None
+            the sizes of the signal data blocks copied verbatim and of the
+            signal data encoded again are added to the "passed_through_bytes"
+            and "reencoded_bytes" counters
+        compression_level : int | None
+            zlib compression level of the signal data blocks
+
+        """
+        if stats is None:
+            stats = {"passed_through_bytes": 0, "reencoded_bytes": 0}
+
+        write = dst_.write
+        tell = dst_.tell
+        seek = dst_.seek
+
+        defined_texts = {"": 0, b"": 0}
+        cc_map = {}
+        si_map = {}
+        cg_map = {}
+
+        groups_nr = len(self.groups)
+
+        address = tell()
+
+        blocks = []
+
+        # file history blocks
+        for fh in self.file_history:
+            address = fh.to_blocks(address, blocks, defined_texts)
+
+        for i, fh in enumerate(self.file_history[:-1]):
+            fh.next_fh_addr = self.file_history[i + 1].address
+        self.file_history[-1].next_fh_addr = 0
+
+        # data groups
+        gp_rec_ids = []
+        valid_data_groups = []
+        for gp in self.groups:
+            if gp.channel_group.flags & v4c.FLAG_CG_VLSD:
+                continue
+
+            valid_data_groups.append(gp.data_group)
+            gp_rec_ids.append(gp.data_group.record_id_len)
+
+            address = gp.data_group.to_blocks(address, blocks, defined_texts)
+
+        if valid_data_groups:
+            for i, dg in enumerate(valid_data_groups[:-1]):
+                addr_ = valid_data_groups[i + 1].address
+                dg.next_dg_addr = addr_
+            valid_data_groups[-1].next_dg_addr = 0
+
+        # go through each data group and append the rest of the blocks
+        for i, gp in enumerate(self.groups):
+            channels = gp.channels
+
+            for j, channel in enumerate(channels):
+                if channel.attachment is not None:
+                    channel.attachment_addr = self.attachments[
+                        channel.attachment
+                    ].address
+                elif channel.attachment_nr:
+                    channel.attachment_addr = 0
+
+                address = channel.to_blocks(
+                    address, blocks, defined_texts, cc_map, si_map
+                )
+
+                if channel.channel_type == v4c.CHANNEL_TYPE_SYNC:
+                    if channel.attachment is not None:
+                        channel.data_block_addr = self.attachments[
+                            channel.attachment
+                        ].address
+                else:
+                    copied = self._copy_signal_data_blocks(
+                        gp, j, address, blocks, compression, self._blocks_location(i)
+                    )
+                    if copied is not None:
+                        channel.data_block_addr, address, size = copied
+                        stats["passed_through_bytes"] += size
+                        sdata = b""
+                    else:
+                        sdata = self._load_signal_data(group=gp, index=j)
+                        stats["reencoded_bytes"] += len(sdata)
+
+                    if sdata:
+                        split_size = self._write_fragment_size
+                        if self._write_fragment_size:
+                            chunks = float(len(sdata)) / split_size
+                            chunks = int(ceil(chunks))
+                        else:
+                            chunks = 1
+
+                        if chunks == 1:
+                            if compression and self.version > "4.00":
+                                signal_data = DataZippedBlock(
+                                    data=sdata,
+                                    zip_type=v4c.FLAG_DZ_DEFLATE,
+                                    original_type=b"SD",
+                                    level=compression_level,
+                                )
+                                signal_data.address = address
+                                address += signal_data.block_len
+                                blocks.append(signal_data)
+                                align = signal_data.block_len % 8
+                                if align:
+                                    blocks.append(b"\0" * (8 - align))
+                                    address += 8 - align
+                            else:
+                                signal_data = DataBlock(data=sdata, type="SD")
+                                signal_data.address = address
+                                address += signal_data.block_len
+                                blocks.append(signal_data)
+                                align = signal_data.block_len % 8
+                                if align:
+                                    blocks.append(b"\0" * (8 - align))
+                                    address += 8 - align
+
+                            channel.data_block_addr = signal_data.address
+                        else:
+                            kwargs = {
+                                "flags": v4c.FLAG_DL_EQUAL_LENGHT,
+                                "links_nr": chunks + 1,
+                                "data_block_nr": chunks,
+                                "data_block_len": self._write_fragment_size,
+                            }
+                            dl_block = DataList(**kwargs)
+
+                            for k in range(chunks):
+                                data_ = sdata[k * split_size : (k + 1) * split_size]
+                                if compression and self.version > "4.00":
+                                    zip_type = v4c.FLAG_DZ_DEFLATE
+                                    param = 0
+
+                                    kwargs = {
+                                        "data": data_,
+                                        "zip_type": zip_type,
+                                        "param": param,
+                                        "level": compression_level,
+                                        "original_type": b"SD",
+                                    }
+                                    block = DataZippedBlock(**kwargs)
+                                else:
+                                    block = DataBlock(data=data_, type="SD")
+                                blocks.append(block)
+                                block.address = address
+                                address += block.block_len
+
+                                align = block.block_len % 8
+                                if align:
+                                    blocks.append(b"\0" * (8 - align))
+                                    address += 8 - align
+                                dl_block[f"data_block_addr{k}"] = block.address
+
+                            dl_block.address = address
+                            blocks.append(dl_block)
+
+                            address += dl_block.block_len
+
+                            if compression and self.version > "4.00":
+                                kwargs = {
+                                    "flags": v4c.FLAG_DL_EQUAL_LENGHT,
+                                    "zip_type": v4c.FLAG_DZ_DEFLATE,
+                                    "first_dl_addr": dl_block.address,
+                                }
+                                hl_block = HeaderList(**kwargs)
+                                hl_block.address = address
+                                address += hl_block.block_len
+
+                                blocks.append(hl_block)
+
+                                channel.data_block_addr = hl_block.address
+                            else:
+                                channel.data_block_addr = dl_block.address
+
+                    elif copied is None:
+                        channel.data_block_addr = 0
+
+                dep_list = gp.channel_dependencies[j]
+                if dep_list:
+                    if all(isinstance(dep, ChannelArrayBlock) for dep in dep_list):
+                        for dep in dep_list:
+                            dep.address = address
+                            address += dep.block_len
+                            blocks.append(dep)
+                        for k, dep in enumerate(dep_list[:-1]):
+                            dep.composition_addr = dep_list[k + 1].address
+                        dep_list[-1].composition_addr = 0
+
+                        channel.component_addr = dep_list[0].address
+
+                    else:
+                        index = dep_list[0][1]
+                        addr_ = gp.channels[index].address
+
+            group_channels = gp.channels
+            if group_channels:
+                for j, channel in enumerate(group_channels[:-1]):
+                    channel.next_ch_addr = group_channels[j + 1].address
+                group_channels[-1].next_ch_addr = 0
+
+            # channel dependecies
+            j = len(channels) - 1
+            while j >= 0:
+                dep_list = gp.channel_dependencies[j]
+                if dep_list and all(isinstance(dep, tuple) for dep in dep_list):
+                    index = dep_list[0][1]
+                    channels[j].component_addr = channels[index].address
+                    index = dep_list[-1][1]
+                    channels[j].next_ch_addr = channels[index].next_ch_addr
+                    channels[index].next_ch_addr = 0
+
+                    for _, ch_nr in dep_list:
+                        channels[ch_nr].source_addr = 0
+                j -= 1
+
+            # channel group
+            if gp.channel_group.flags & v4c.FLAG_CG_VLSD:
+                continue
+
+            gp.channel_group.first_sample_reduction_addr = 0
+
+            if channels:
+                gp.channel_group.first_ch_addr = gp.channels[0].address
+            else:
+                gp.channel_group.first_ch_addr = 0
+            gp.channel_group.next_cg_addr = 0
+
+            address = gp.channel_group.to_blocks(address, blocks, defined_texts, si_map)
+            gp.data_group.first_cg_addr = gp.channel_group.address
+
+            cg_map[i] = gp.channel_group.address
+
+            if progress is not None:
+                progress.signals.setValue.emit(int(50 * (i + 1) / groups_nr) + 25)
+
+                if progress.stop:
+                    dst_.close()
+                    self.close()
+
+                    return TERMINATED
+
+        for gp in self.groups:
+            for dep_list in gp.channel_dependencies:
+                if dep_list:
+                    if all(isinstance(dep, ChannelArrayBlock) for dep in dep_list):
+                        for dep in dep_list:
+                            for i, (gp_nr, ch_nr) in enumerate(
+                                dep.dynamic_size_channels
+                            ):
+                                grp = self.groups[gp_nr]
+                                ch = grp.channels[ch_nr]
+                                dep[
+                                    f"dynamic_size_{i}_dg_addr"
+                                ] = grp.data_group.address
+                                dep[
+                                    f"dynamic_size_{i}_cg_addr"
+                                ] = grp.channel_group.address
+                                dep[f"dynamic_size_{i}_ch_addr"] = ch.address
+
+                            for i, (gp_nr, ch_nr) in enumerate(
+                                dep.input_quantity_channels
+                            ):
+                                grp = self.groups[gp_nr]
+                                ch = grp.channels[ch_nr]
+                                dep[
+                                    f"input_quantity_{i}_dg_addr"
+                                ] = grp.data_group.address
+                                dep[
+                                    f"input_quantity_{i}_cg_addr"
+                                ] = grp.channel_group.address
+                                dep[f"input_quantity_{i}_ch_addr"] = ch.address
+
+                            for i, conversion in enumerate(dep.axis_conversions):
+                                if conversion:
+                                    address = conversion.to_blocks(
+                                        address, blocks, defined_texts, cc_map
+                                    )
+                                    dep[f"axis_conversion_{i}"] = conversion.address
+                                else:
+                                    dep[f"axis_conversion_{i}"] = 0
+
+                            if dep.output_quantity_channel:
+                                gp_nr, ch_nr = dep.output_quantity_channel
+                                grp = self.groups[gp_nr]
+                                ch = grp.channels[ch_nr]
+                                dep[f"output_quantity_dg_addr"] = grp.data_group.address
+                                dep[
+                                    f"output_quantity_cg_addr"
+                                ] = grp.channel_group.address
+                                dep[f"output_quantity_ch_addr"] = ch.address
+
+                            if dep.comparison_quantity_channel:
+                                gp_nr, ch_nr = dep.comparison_quantity_channel
+                                grp = self.groups[gp_nr]
+                                ch = grp.channels[ch_nr]
+                                dep[
+                                    f"comparison_quantity_dg_addr"
+                                ] = grp.data_group.address
+                                dep[
+                                    f"comparison_quantity_cg_addr"
+                                ] = grp.channel_group.address
+                                dep[f"comparison_quantity_ch_addr"] = ch.address
+
+                            for i, (gp_nr, ch_nr) in enumerate(dep.axis_channels):
+                                grp = self.groups[gp_nr]
+                                ch = grp.channels[ch_nr]
+                                dep[f"scale_axis_{i}_dg_addr"] = grp.data_group.address
+                                dep[
+                                    f"scale_axis_{i}_cg_addr"
+                                ] = grp.channel_group.address
+                                dep[f"scale_axis_{i}_ch_addr"] = ch.address
+
+        position = tell()
+
+        for gp in self.groups:
+            gp.data_group.record_id_len = 0
+
+            cg_master_index = gp.channel_group.cg_master_index
+            if cg_master_index is not None:
+                gp.channel_group.cg_master_addr = cg_map[cg_master_index]
+                seek(gp.channel_group.address)
+                write(bytes(gp.channel_group))
+
+        seek(position)
+
+        ev_map = []
+
+        if self.events:
+            for event in self.events:
+                for i, ref in enumerate(event.scopes):
+                    try:
+                        dg_cntr, ch_cntr = ref
+                        event[f"scope_{i}_addr"] = (
+                            self.groups[dg_cntr].channels[ch_cntr].address
+                        )
+                    except TypeError:
+                        dg_cntr = ref
+                        event[f"scope_{i}_addr"] = self.groups[
+                            dg_cntr
+                        ].channel_group.address
+
+                blocks.append(event)
+                ev_map.append(address)
+                event.address = address
+                address += event.block_len
+
+                if event.name:
+                    tx_block = TextBlock(text=event.name)
+                    tx_block.address = address
+                    blocks.append(tx_block)
+                    address += tx_block.block_len
+                    event.name_addr = tx_block.address
+                else:
+                    event.name_addr = 0
+
+                if event.comment:
+                    meta = event.comment.startswith("<EVcomment")
+                    tx_block = TextBlock(text=event.comment, meta=meta)
+                    tx_block.address = address
+                    blocks.append(tx_block)
+                    address += tx_block.block_len
+                    event.comment_addr = tx_block.address
+                else:
+                    event.comment_addr = 0
+
+                if event.parent is not None:
+                    event.parent_ev_addr = ev_map[event.parent]
+                if event.range_start is not None:
+                    event.range_start_ev_addr = ev_map[event.range_start]
+
+            for i in range(len(self.events) - 1):
+                self.events[i].next_ev_addr = self.events[i + 1].address
+            self.events[-1].next_ev_addr = 0
+
+            self.header.first_event_addr = self.events[0].address
+
+        if progress is not None and progress.stop:
+            dst_.close()
+            self.close()
+            return TERMINATED
+
+        # attachments
+        at_map = {}
+        if self.attachments:
+            # put the attachment texts before the attachments
+            for at_block in self.attachments:
+                for text in (at_block.file_name, at_block.mime, at_block.comment):
+                    if text not in defined_texts:
+                        tx_block = TextBlock(text=str(text))
+                        defined_texts[text] = address
+                        tx_block.address = address
+                        address += tx_block.block_len
+                        blocks.append(tx_block)
+
+            for at_block in self.attachments:
+                address = at_block.to_blocks(address, blocks, defined_texts)
+
+            for i in range(len(self.attachments) - 1):
+                at_block = self.attachments[i]
+                at_block.next_at_addr = self.attachments[i + 1].address
+            self.attachments[-1].next_at_addr = 0
+
+            if self.events:
+                for event in self.events:
+                    for i in range(event.attachment_nr):
+                        key = f"attachment_{i}_addr"
+                        addr = event[key]
+                        event[key] = at_map[addr]
+
+            for i, gp in enumerate(self.groups):
+                for j, channel in enumerate(gp.channels):
+                    if channel.attachment is not None:
+                        channel.attachment_addr = self.attachments[
+                            channel.attachment
+                        ].address
+                    elif channel.attachment_nr:
+                        channel.attachment_addr = 0
+
+                    if (
+                        channel.channel_type == v4c.CHANNEL_TYPE_SYNC
+                        and channel.attachment is not None
+                    ):
+                        channel.data_block_addr = self.attachments[
+                            channel.attachment
+                        ].address
+
+        if progress is not None:
+            blocks_nr = len(blocks)
+            threshold = blocks_nr / 25
+            count = 1
+            for i, block in enumerate(blocks):
+                write(bytes(block))
+                if i >= threshold:
+                    progress.signals.setValue.emit(75 + count)
+
+                    count += 1
+                    threshold += blocks_nr / 25
+        else:
+            for block in blocks:
+                write(bytes(block))
+
+        for gp, rec_id in zip(self.groups, gp_rec_ids):
+            gp.data_group.record_id_len = rec_id
+
+        if valid_data_groups:
+            addr_ = valid_data_groups[0].address
+            self.header.first_dg_addr = addr_
+        else:
+            self.header.first_dg_addr = 0
+        self.header.file_history_addr = self.file_history[0].address
+        if self.attachments:
+            first_attachment = self.attachments[0]
+            addr_ = first_attachment.address
+            self.header.first_attachment_addr = addr_
+        else:
+            self.header.first_attachment_addr = 0
+
+        seek(v4c.IDENTIFICATION_BLOCK_SIZE)
+        write(bytes(self.header))
+
+        at_map = {value: key for key, value in at_map.items()}
+
+        for event in self.events:
+            for i in range(event.attachment_nr):
+                key = f"attachment_{i}_addr"
+                addr = event[key]
+                event[key] = at_map[addr]
+
+    def save(
+        self,
+        dst: WritableBufferType | StrPathType,
+        overwrite: bool = False,
+        compression: CompressionType = 0,
+        progress=None,
+        workers: int = 0,
+        compression_level: int | None = None,
+    ) -> Path:
+        """Save MDF to *dst*. If overwrite is *True* then the destination file
+        is overwritten, otherwise the file name is appended with '.<cntr>', were
+        '<cntr>' is the first counter that produces a new file name
+        (that does not already exist in the filesystem)
+
+        Parameters
+        ----------
+        dst : str
+            destination file name, Default ''
+        overwrite : bool
+            overwrite flag, default *False*
+        compression : int
+            use compressed data blocks, default 0; valid since version 4.10
+
+            * 0 - no compression
+            * 1 - deflate (slower, but produces smaller files)
+            * 2 - transposition + deflate (slowest, but produces
+              the smallest files)
+            * "auto" - choose one of the above for each channel group by
+              compressing a sample of its first data block; the signal data
+              blocks use deflate. The chosen codec and the compression ratio
+              of each group are reported by *info*
+
+              .. versionadded:: 7.4.0
+
+        workers : int
+            number of threads used to compress the data blocks of a channel
+            group; default 0 means the blocks are compressed in the calling
+            thread. The output file is identical to the one produced by the
+            serial compression. At most two blocks per worker are held in
+            memory ahead of the writer
+
+            .. versionadded:: 7.4.0
+
+        compression_level : int | None
+            zlib compression level of the compressed blocks; default *None*
+            uses the fastest level
+
+            .. versionadded:: 7.4.0
+
+        Returns
+        -------
+        output_file : pathlib.Path
+            path to saved file
+
+        """
+        self._check_samples_access()
+
+        if is_file_like(dst):
+            dst_ = dst
+            file_like = True
+            if hasattr(dst, "name"):
+                dst = Path(dst.name)
+            else:
+                dst = Path("__file_like.mf4")
+            dst_.seek(0)
+            suffix = ".mf4"
+        else:
+            file_like = False
+            suffix = Path(dst).suffix.lower()
+
+            dst = Path(dst).with_suffix(".mf4")
+
+            destination_dir = dst.parent
+            destination_dir.mkdir(parents=True, exist_ok=True)
+
+            if overwrite is False:
+                if dst.is_file():
+                    cntr = 0
+                    while True:
+                        name = dst.with_suffix(f".{cntr}.mf4")
+                        if not name.exists():
+                            break
+                        else:
+                            cntr += 1
+                    message = (
+                        f'Destination file "{dst}" already exists '
+                        f'and "overwrite" is False. Saving MDF file as "{name}"'
+                    )
+                    logger.warning(message)
+                    dst = name
+
+            if dst == self.name:
+                destination = dst.with_suffix(".savetemp")
+            else:
+                destination = dst
+
+            dst_ = open(destination, "wb+")
+
+        if not self.file_history:
+            comment = "created"
+        else:
+            comment = "updated"
+
+        fh = FileHistory()
+        fh.comment = f"""<FHcomment>
+<TX>{comment}</TX>
+<tool_id>asammdf</tool_id>
+<tool_vendor>asammdf</tool_vendor>
+<tool_version>{__version__}</tool_version>
+</FHcomment>"""
+
+        self.file_history.append(fh)
+
+        workers = int(workers or 0)
+        if compression and workers > 1:
+            pool = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="asammdf_compress"
+            )
+        else:
+            pool = None
+        max_pending = 2 * workers
+
+        stats = {"passed_through_bytes": 0, "reencoded_bytes": 0}
+
+        self.flush()
+
+        try:
+            groups_nr = len(self.groups)
+
+            write = dst_.write
+            tell = dst_.tell
+            seek = dst_.seek
+
+            blocks = []
+
+            write(bytes(self.identification))
+
+            self.header.to_blocks(dst_.tell(), blocks)
+            for block in blocks:
+                write(bytes(block))
+
+            original_data_addresses = []
+            requested_compression = compression
+            compression_info = {}
+
+            # the codecs that are actually written for each channel group; they
+            # can differ from the requested compression (for example the LD
+            # groups with single byte records use plain deflate)
+            codecs = []
+
+            def add_codec(block):
+                if isinstance(block, DataZippedBlock):
+                    if block.zip_type == v4c.FLAG_DZ_DEFLATE:
+                        block_type = v4c.DZ_BLOCK_DEFLATE
+                    else:
+                        block_type = v4c.DZ_BLOCK_TRANSPOSED
+                else:
+                    block_type = v4c.DT_BLOCK
+                codec = v4c.DATA_BLOCK_TYPE_TO_DESCRIPTION[block_type]
+                if codec not in codecs:
+                    codecs.append(codec)
+
+            # write DataBlocks first
+            for gp_nr, gp in enumerate(self.groups):
+                original_data_addresses.append(gp.data_group.data_block_addr)
+
+                if gp.channel_group.flags & v4c.FLAG_CG_VLSD:
+                    continue
+
+                address = group_start = tell()
+                codecs.clear()
 
                 total_size = (
                     gp.channel_group.samples_byte_nr
@@ -9155,6 +12000,20 @@ class MDF4(MDF_Common):
                 ) * gp.channel_group.cycles_nr
 
                 if total_size:
+                    copied = self._copy_data_blocks(
+                        gp, dst_, requested_compression, self._blocks_location(gp_nr)
+                    )
+                else:
+                    copied = None
+
+                if copied is not None:
+                    gp.data_group.data_block_addr, size, compression = copied
+                    stats["passed_through_bytes"] += size
+                    codecs.append(v4c.DATA_BLOCK_TYPE_TO_DESCRIPTION[compression])
+
+                elif total_size:
+                    stats["reencoded_bytes"] += total_size
+
                     if self._write_fragment_size:
                         samples_size = (
                             gp.channel_group.samples_byte_nr
@@ -9176,6 +12035,25 @@ class MDF4(MDF_Common):
 
                     data = self._load_data(gp)
 
+                    if self.version < "4.10":
+                        compression = 0
+                    elif requested_compression == "auto":
+                        fragment = next(data)
+                        data = chain((fragment,), data)
+                        record_size = gp.channel_group.samples_byte_nr
+                        if not gp.uses_ld:
+                            record_size += gp.channel_group.invalidation_bytes_nr
+                        compression, _ = select_compression(
+                            fragment[0], record_size, compression_level
+                        )
+                    else:
+                        compression = requested_compression
+
+                    if compression == 1:
+                        zip_type = v4c.FLAG_DZ_DEFLATE
+                    else:
+                        zip_type = v4c.FLAG_DZ_TRANPOSED_DEFLATE
+
                     if chunks == 1:
                         data_, _1, _2, inval_ = next(data)
                         if self.version >= "4.20" and gp.uses_ld:
@@ -9194,12 +12072,14 @@ class MDF4(MDF_Common):
                                     "data": data_,
                                     "zip_type": current_zip_type,
                                     "param": param,
+                                    "level": compression_level,
                                     "original_type": b"DV",
                                 }
                                 data_block = DataZippedBlock(**kwargs)
                             else:
                                 data_block = DataBlock(data=data_, type="DV")
                             write(bytes(data_block))
+                            add_codec(data_block)
                             data_address = address
 
                             align = data_block.block_len % 8
@@ -9217,12 +12097,14 @@ class MDF4(MDF_Common):
                                         "data": inval_,
                                         "zip_type": zip_type,
                                         "param": param,
+                                        "level": compression_level,
                                         "original_type": b"DI",
                                     }
                                     inval_block = DataZippedBlock(**kwargs)
                                 else:
                                     inval_block = DataBlock(data=inval_, type="DI")
                                 write(bytes(inval_block))
+                                add_codec(inval_block)
 
                                 align = inval_block.block_len % 8
                                 if align:
@@ -9264,11 +12146,13 @@ class MDF4(MDF_Common):
                                     "data": data_,
                                     "zip_type": zip_type,
                                     "param": param,
+                                    "level": compression_level,
                                 }
                                 data_block = DataZippedBlock(**kwargs)
                             else:
                                 data_block = DataBlock(data=data_)
                             write(bytes(data_block))
+                            add_codec(data_block)
 
                             align = data_block.block_len % 8
                             if align:
@@ -9283,9 +12167,9 @@ class MDF4(MDF_Common):
                             dv_addr = []
                             di_addr = []
                             block_size = 0
-                            for i, (data_, _1, _2, inval_) in enumerate(data):
-                                if i == 0:
-                                    block_size = len(data_)
+
+                            def make_blocks(fragment, gp=gp):
+                                data_, _1, _2, inval_ = fragment
                                 if compression:
                                     if compression == 1:
                                         param = 0
@@ -9295,17 +12179,12 @@ class MDF4(MDF_Common):
                                         "data": data_,
                                         "zip_type": zip_type,
                                         "param": param,
+                                        "level": compression_level,
                                         "original_type": b"DV",
                                     }
                                     data_block = DataZippedBlock(**kwargs)
                                 else:
                                     data_block = DataBlock(data=data_, type="DV")
-                                dv_addr.append(tell())
-                                write(bytes(data_block))
-
-                                align = data_block.block_len % 8
-                                if align:
-                                    write(b"\0" * (8 - align))
 
                                 if inval_ is not None:
                                     if compression:
@@ -9319,13 +12198,34 @@ class MDF4(MDF_Common):
                                             "data": inval_,
                                             "zip_type": zip_type,
                                             "param": param,
+                                            "level": compression_level,
                                             "original_type": b"DI",
                                         }
                                         inval_block = DataZippedBlock(**kwargs)
                                     else:
                                         inval_block = DataBlock(data=inval_, type="DI")
+                                else:
+                                    inval_block = None
+
+                                return data_block, inval_block, len(data_)
+
+                            for i, (data_block, inval_block, size) in enumerate(
+                                map_blocks(make_blocks, data, pool, max_pending)
+                            ):
+                                if i == 0:
+                                    block_size = size
+                                dv_addr.append(tell())
+                                write(bytes(data_block))
+                                add_codec(data_block)
+
+                                align = data_block.block_len % 8
+                                if align:
+                                    write(b"\0" * (8 - align))
+
+                                if inval_block is not None:
                                     di_addr.append(tell())
                                     write(bytes(inval_block))
+                                    add_codec(inval_block)
 
                                     align = inval_block.block_len % 8
                                     if align:
@@ -9374,8 +12274,8 @@ class MDF4(MDF_Common):
                             }
                             dl_block = DataList(**kwargs)
 
-                            for i, data__ in enumerate(data):
-                                data_ = data__[0]
+                            def make_block(fragment, gp=gp):
+                                data_ = fragment[0]
 
                                 if compression and self.version >= "4.10":
                                     if compression == 1:
@@ -9393,14 +12293,20 @@ class MDF4(MDF_Common):
                                         "data": data_,
                                         "zip_type": zip_type,
                                         "param": param,
+                                        "level": compression_level,
                                     }
-                                    block = DataZippedBlock(**kwargs)
+                                    return DataZippedBlock(**kwargs)
                                 else:
-                                    block = DataBlock(data=data_)
+                                    return DataBlock(data=data_)
+
+                            for i, block in enumerate(
+                                map_blocks(make_block, data, pool, max_pending)
+                            ):
                                 address = tell()
                                 block.address = address
 
                                 write(bytes(block))
+                                add_codec(block)
 
                                 align = block.block_len % 8
                                 if align:
@@ -9421,218 +12327,14 @@ class MDF4(MDF_Common):
                 else:
                     gp.data_group.data_block_addr = 0
 
-                if progress is not None:
-                    progress.signals.setValue.emit(int(50 * (gp_nr + 1) / groups_nr))
-
-                    if progress.stop:
-                        dst_.close()
-                        self.close()
-
-                        return TERMINATED
-
-            address = tell()
-
-            blocks = []
-
-            # file history blocks
-            for fh in self.file_history:
-                address = fh.to_blocks(address, blocks, defined_texts)
-
-            for i, fh in enumerate(self.file_history[:-1]):
-                fh.next_fh_addr = self.file_history[i + 1].address
-            self.file_history[-1].next_fh_addr = 0
-
-            # data groups
-            gp_rec_ids = []
-            valid_data_groups = []
-            for gp in self.groups:
-                if gp.channel_group.flags & v4c.FLAG_CG_VLSD:
-                    continue
-
-                valid_data_groups.append(gp.data_group)
-                gp_rec_ids.append(gp.data_group.record_id_len)
-
-                address = gp.data_group.to_blocks(address, blocks, defined_texts)
-
-            if valid_data_groups:
-                for i, dg in enumerate(valid_data_groups[:-1]):
-                    addr_ = valid_data_groups[i + 1].address
-                    dg.next_dg_addr = addr_
-                valid_data_groups[-1].next_dg_addr = 0
-
-            # go through each data group and append the rest of the blocks
-            for i, gp in enumerate(self.groups):
-                channels = gp.channels
-
-                for j, channel in enumerate(channels):
-                    if channel.attachment is not None:
-                        channel.attachment_addr = self.attachments[
-                            channel.attachment
-                        ].address
-                    elif channel.attachment_nr:
-                        channel.attachment_addr = 0
-
-                    address = channel.to_blocks(
-                        address, blocks, defined_texts, cc_map, si_map
+                if total_size and codecs:
+                    compression_info[gp_nr] = (
+                        ", ".join(codecs),
+                        (tell() - group_start) / total_size,
                     )
 
-                    if channel.channel_type == v4c.CHANNEL_TYPE_SYNC:
-                        if channel.attachment is not None:
-                            channel.data_block_addr = self.attachments[
-                                channel.attachment
-                            ].address
-                    else:
-                        sdata = self._load_signal_data(group=gp, index=j)
-                        if sdata:
-                            split_size = self._write_fragment_size
-                            if self._write_fragment_size:
-                                chunks = float(len(sdata)) / split_size
-                                chunks = int(ceil(chunks))
-                            else:
-                                chunks = 1
-
-                            if chunks == 1:
-                                if compression and self.version > "4.00":
-                                    signal_data = DataZippedBlock(
-                                        data=sdata,
-                                        zip_type=v4c.FLAG_DZ_DEFLATE,
-                                        original_type=b"SD",
-                                    )
-                                    signal_data.address = address
-                                    address += signal_data.block_len
-                                    blocks.append(signal_data)
-                                    align = signal_data.block_len % 8
-                                    if align:
-                                        blocks.append(b"\0" * (8 - align))
-                                        address += 8 - align
-                                else:
-                                    signal_data = DataBlock(data=sdata, type="SD")
-                                    signal_data.address = address
-                                    address += signal_data.block_len
-                                    blocks.append(signal_data)
-                                    align = signal_data.block_len % 8
-                                    if align:
-                                        blocks.append(b"\0" * (8 - align))
-                                        address += 8 - align
-
-                                channel.data_block_addr = signal_data.address
-                            else:
-                                kwargs = {
-                                    "flags": v4c.FLAG_DL_EQUAL_LENGHT,
-                                    "links_nr": chunks + 1,
-                                    "data_block_nr": chunks,
-                                    "data_block_len": self._write_fragment_size,
-                                }
-                                dl_block = DataList(**kwargs)
-
-                                for k in range(chunks):
-                                    data_ = sdata[k * split_size : (k + 1) * split_size]
-                                    if compression and self.version > "4.00":
-                                        zip_type = v4c.FLAG_DZ_DEFLATE
-                                        param = 0
-
-                                        kwargs = {
-                                            "data": data_,
-                                            "zip_type": zip_type,
-                                            "param": param,
-                                            "original_type": b"SD",
-                                        }
-                                        block = DataZippedBlock(**kwargs)
-                                    else:
-                                        block = DataBlock(data=data_, type="SD")
-                                    blocks.append(block)
-                                    block.address = address
-                                    address += block.block_len
-
-                                    align = block.block_len % 8
-                                    if align:
-                                        blocks.append(b"\0" * (8 - align))
-                                        address += 8 - align
-                                    dl_block[f"data_block_addr{k}"] = block.address
-
-                                dl_block.address = address
-                                blocks.append(dl_block)
-
-                                address += dl_block.block_len
-
-                                if compression and self.version > "4.00":
-                                    kwargs = {
-                                        "flags": v4c.FLAG_DL_EQUAL_LENGHT,
-                                        "zip_type": v4c.FLAG_DZ_DEFLATE,
-                                        "first_dl_addr": dl_block.address,
-                                    }
-                                    hl_block = HeaderList(**kwargs)
-                                    hl_block.address = address
-                                    address += hl_block.block_len
-
-                                    blocks.append(hl_block)
-
-                                    channel.data_block_addr = hl_block.address
-                                else:
-                                    channel.data_block_addr = dl_block.address
-
-                        else:
-                            channel.data_block_addr = 0
-
-                    dep_list = gp.channel_dependencies[j]
-                    if dep_list:
-                        if all(isinstance(dep, ChannelArrayBlock) for dep in dep_list):
-                            for dep in dep_list:
-                                dep.address = address
-                                address += dep.block_len
-                                blocks.append(dep)
-                            for k, dep in enumerate(dep_list[:-1]):
-                                dep.composition_addr = dep_list[k + 1].address
-                            dep_list[-1].composition_addr = 0
-
-                            channel.component_addr = dep_list[0].address
-
-                        else:
-                            index = dep_list[0][1]
-                            addr_ = gp.channels[index].address
-
-                group_channels = gp.channels
-                if group_channels:
-                    for j, channel in enumerate(group_channels[:-1]):
-                        channel.next_ch_addr = group_channels[j + 1].address
-                    group_channels[-1].next_ch_addr = 0
-
-                # channel dependecies
-                j = len(channels) - 1
-                while j >= 0:
-                    dep_list = gp.channel_dependencies[j]
-                    if dep_list and all(isinstance(dep, tuple) for dep in dep_list):
-                        index = dep_list[0][1]
-                        channels[j].component_addr = channels[index].address
-                        index = dep_list[-1][1]
-                        channels[j].next_ch_addr = channels[index].next_ch_addr
-                        channels[index].next_ch_addr = 0
-
-                        for _, ch_nr in dep_list:
-                            channels[ch_nr].source_addr = 0
-                    j -= 1
-
-                # channel group
-                if gp.channel_group.flags & v4c.FLAG_CG_VLSD:
-                    continue
-
-                gp.channel_group.first_sample_reduction_addr = 0
-
-                if channels:
-                    gp.channel_group.first_ch_addr = gp.channels[0].address
-                else:
-                    gp.channel_group.first_ch_addr = 0
-                gp.channel_group.next_cg_addr = 0
-
-                address = gp.channel_group.to_blocks(
-                    address, blocks, defined_texts, si_map
-                )
-                gp.data_group.first_cg_addr = gp.channel_group.address
-
-                cg_map[i] = gp.channel_group.address
-
                 if progress is not None:
-                    progress.signals.setValue.emit(int(50 * (i + 1) / groups_nr) + 25)
+                    progress.signals.setValue.emit(int(50 * (gp_nr + 1) / groups_nr))
 
                     if progress.stop:
                         dst_.close()
@@ -9640,239 +12342,24 @@ class MDF4(MDF_Common):
 
                         return TERMINATED
 
-            for gp in self.groups:
-                for dep_list in gp.channel_dependencies:
-                    if dep_list:
-                        if all(isinstance(dep, ChannelArrayBlock) for dep in dep_list):
-                            for dep in dep_list:
-                                for i, (gp_nr, ch_nr) in enumerate(
-                                    dep.dynamic_size_channels
-                                ):
-                                    grp = self.groups[gp_nr]
-                                    ch = grp.channels[ch_nr]
-                                    dep[
-                                        f"dynamic_size_{i}_dg_addr"
-                                    ] = grp.data_group.address
-                                    dep[
-                                        f"dynamic_size_{i}_cg_addr"
-                                    ] = grp.channel_group.address
-                                    dep[f"dynamic_size_{i}_ch_addr"] = ch.address
-
-                                for i, (gp_nr, ch_nr) in enumerate(
-                                    dep.input_quantity_channels
-                                ):
-                                    grp = self.groups[gp_nr]
-                                    ch = grp.channels[ch_nr]
-                                    dep[
-                                        f"input_quantity_{i}_dg_addr"
-                                    ] = grp.data_group.address
-                                    dep[
-                                        f"input_quantity_{i}_cg_addr"
-                                    ] = grp.channel_group.address
-                                    dep[f"input_quantity_{i}_ch_addr"] = ch.address
-
-                                for i, conversion in enumerate(dep.axis_conversions):
-                                    if conversion:
-                                        address = conversion.to_blocks(
-                                            address, blocks, defined_texts, cc_map
-                                        )
-                                        dep[f"axis_conversion_{i}"] = conversion.address
-                                    else:
-                                        dep[f"axis_conversion_{i}"] = 0
-
-                                if dep.output_quantity_channel:
-                                    gp_nr, ch_nr = dep.output_quantity_channel
-                                    grp = self.groups[gp_nr]
-                                    ch = grp.channels[ch_nr]
-                                    dep[
-                                        f"output_quantity_dg_addr"
-                                    ] = grp.data_group.address
-                                    dep[
-                                        f"output_quantity_cg_addr"
-                                    ] = grp.channel_group.address
-                                    dep[f"output_quantity_ch_addr"] = ch.address
-
-                                if dep.comparison_quantity_channel:
-                                    gp_nr, ch_nr = dep.comparison_quantity_channel
-                                    grp = self.groups[gp_nr]
-                                    ch = grp.channels[ch_nr]
-                                    dep[
-                                        f"comparison_quantity_dg_addr"
-                                    ] = grp.data_group.address
-                                    dep[
-                                        f"comparison_quantity_cg_addr"
-                                    ] = grp.channel_group.address
-                                    dep[f"comparison_quantity_ch_addr"] = ch.address
-
-                                for i, (gp_nr, ch_nr) in enumerate(dep.axis_channels):
-                                    grp = self.groups[gp_nr]
-                                    ch = grp.channels[ch_nr]
-                                    dep[
-                                        f"scale_axis_{i}_dg_addr"
-                                    ] = grp.data_group.address
-                                    dep[
-                                        f"scale_axis_{i}_cg_addr"
-                                    ] = grp.channel_group.address
-                                    dep[f"scale_axis_{i}_ch_addr"] = ch.address
-
-            position = tell()
-
-            for gp in self.groups:
-                gp.data_group.record_id_len = 0
-
-                cg_master_index = gp.channel_group.cg_master_index
-                if cg_master_index is not None:
-                    gp.channel_group.cg_master_addr = cg_map[cg_master_index]
-                    seek(gp.channel_group.address)
-                    write(bytes(gp.channel_group))
-
-            seek(position)
-
-            ev_map = []
-
-            if self.events:
-                for event in self.events:
-                    for i, ref in enumerate(event.scopes):
-                        try:
-                            dg_cntr, ch_cntr = ref
-                            event[f"scope_{i}_addr"] = (
-                                self.groups[dg_cntr].channels[ch_cntr].address
-                            )
-                        except TypeError:
-                            dg_cntr = ref
-                            event[f"scope_{i}_addr"] = self.groups[
-                                dg_cntr
-                            ].channel_group.address
-
-                    blocks.append(event)
-                    ev_map.append(address)
-                    event.address = address
-                    address += event.block_len
-
-                    if event.name:
-                        tx_block = TextBlock(text=event.name)
-                        tx_block.address = address
-                        blocks.append(tx_block)
-                        address += tx_block.block_len
-                        event.name_addr = tx_block.address
-                    else:
-                        event.name_addr = 0
-
-                    if event.comment:
-                        meta = event.comment.startswith("<EVcomment")
-                        tx_block = TextBlock(text=event.comment, meta=meta)
-                        tx_block.address = address
-                        blocks.append(tx_block)
-                        address += tx_block.block_len
-                        event.comment_addr = tx_block.address
-                    else:
-                        event.comment_addr = 0
-
-                    if event.parent is not None:
-                        event.parent_ev_addr = ev_map[event.parent]
-                    if event.range_start is not None:
-                        event.range_start_ev_addr = ev_map[event.range_start]
-
-                for i in range(len(self.events) - 1):
-                    self.events[i].next_ev_addr = self.events[i + 1].address
-                self.events[-1].next_ev_addr = 0
-
-                self.header.first_event_addr = self.events[0].address
-
-            if progress is not None and progress.stop:
-                dst_.close()
-                self.close()
+            if (
+                self._write_metadata_blocks(
+                    dst_, requested_compression, progress, stats, compression_level
+                )
+                is TERMINATED
+            ):
                 return TERMINATED
 
-            # attachments
-            at_map = {}
-            if self.attachments:
-                # put the attachment texts before the attachments
-                for at_block in self.attachments:
-                    for text in (at_block.file_name, at_block.mime, at_block.comment):
-                        if text not in defined_texts:
-                            tx_block = TextBlock(text=str(text))
-                            defined_texts[text] = address
-                            tx_block.address = address
-                            address += tx_block.block_len
-                            blocks.append(tx_block)
-
-                for at_block in self.attachments:
-                    address = at_block.to_blocks(address, blocks, defined_texts)
-
-                for i in range(len(self.attachments) - 1):
-                    at_block = self.attachments[i]
-                    at_block.next_at_addr = self.attachments[i + 1].address
-                self.attachments[-1].next_at_addr = 0
-
-                if self.events:
-                    for event in self.events:
-                        for i in range(event.attachment_nr):
-                            key = f"attachment_{i}_addr"
-                            addr = event[key]
-                            event[key] = at_map[addr]
-
-                for i, gp in enumerate(self.groups):
-                    for j, channel in enumerate(gp.channels):
-                        if channel.attachment is not None:
-                            channel.attachment_addr = self.attachments[
-                                channel.attachment
-                            ].address
-                        elif channel.attachment_nr:
-                            channel.attachment_addr = 0
-
-                        if (
-                            channel.channel_type == v4c.CHANNEL_TYPE_SYNC
-                            and channel.attachment is not None
-                        ):
-                            channel.data_block_addr = self.attachments[
-                                channel.attachment
-                            ].address
-
-            if progress is not None:
-                blocks_nr = len(blocks)
-                threshold = blocks_nr / 25
-                count = 1
-                for i, block in enumerate(blocks):
-                    write(bytes(block))
-                    if i >= threshold:
-                        progress.signals.setValue.emit(75 + count)
-
-                        count += 1
-                        threshold += blocks_nr / 25
-            else:
-                for block in blocks:
-                    write(bytes(block))
-
-            for gp, rec_id in zip(self.groups, gp_rec_ids):
-                gp.data_group.record_id_len = rec_id
-
-            if valid_data_groups:
-                addr_ = valid_data_groups[0].address
-                self.header.first_dg_addr = addr_
-            else:
-                self.header.first_dg_addr = 0
-            self.header.file_history_addr = self.file_history[0].address
-            if self.attachments:
-                first_attachment = self.attachments[0]
-                addr_ = first_attachment.address
-                self.header.first_attachment_addr = addr_
-            else:
-                self.header.first_attachment_addr = 0
-
-            seek(v4c.IDENTIFICATION_BLOCK_SIZE)
-            write(bytes(self.header))
+            self._compression_info = compression_info
 
             for orig_addr, gp in zip(original_data_addresses, self.groups):
                 gp.data_group.data_block_addr = orig_addr
 
-            at_map = {value: key for key, value in at_map.items()}
-
-            for event in self.events:
-                for i in range(event.attachment_nr):
-                    key = f"attachment_{i}_addr"
-                    addr = event[key]
-                    event[key] = at_map[addr]
+            self.last_call_info = stats
+            logger.debug(
+                f"{stats['passed_through_bytes']} bytes of data blocks copied "
+                f"verbatim and {stats['reencoded_bytes']} bytes encoded again"
+            )
 
         except:
             if not file_like:
@@ -9881,6 +12368,9 @@ class MDF4(MDF_Common):
         else:
             if not file_like:
                 dst_.close()
+        finally:
+            if pool is not None:
+                pool.shutdown()
 
         if suffix in (".zip", ".mf4z"):
             output_fname = dst.with_suffix(suffix)
@@ -9915,8 +12405,11 @@ class MDF4(MDF_Common):
             self.file_comment = None
 
             self._ch_map.clear()
+            self._transferred_groups.clear()
 
-            self._tempfile = TemporaryFile(dir=self.temporary_folder)
+            self._tempfile = temporary_file(
+                self.temporary_folder, self._temporary_spool_size
+            )
             self._file = open(self.name, "rb")
             self._read()
 
@@ -0,0 +1,477 @@
+# -*- coding: utf-8 -*-
+""" streaming writer for ASAM MDF version 4 files """
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+import logging
+from pathlib import Path
+from typing import Any
+
+from numpy import array_equal, concatenate, float64, unique
+from numpy.typing import NDArray
+
+from . import v4_constants as v4c
+from ..signal import Signal
+from ..types import CompressionType, StrPathType
+from ..version import __version__
+from .mdf_v4 import MDF4, select_compression
+from .source_utils import Source
+from .utils import MdfException, validate_version_argument
+from .v4_blocks import DataBlock, DataList, DataZippedBlock, FileHistory, HeaderList
+
+logger = logging.getLogger("asammdf")
+
+__all__ = ["MDF4Writer"]
+
+# number of data blocks referenced by each DL block of the chain
+DL_BLOCKS_NR = 256
+
+
+class _GroupStream:
+    """write state of a channel group: the records that do not fill a data
+    block yet and the addresses of the data blocks of the current DL block"""
+
+    __slots__ = (
+        "compression",
+        "record_size",
+        "split_size",
+        "buffer",
+        "block_addresses",
+        "first_block_address",
+        "first_dl_address",
+        "last_dl_address",
+        "cycles_nr",
+    )
+
+    def __init__(
+        self, record_size: int, split_size: int, compression: int | None
+    ) -> None:
+        self.compression = compression
+        self.record_size = record_size
+        self.split_size = split_size
+        self.buffer = bytearray()
+        self.block_addresses = []
+        self.first_block_address = 0
+        self.first_dl_address = 0
+        self.last_dl_address = 0
+        self.cycles_nr = 0
+
+
+class MDF4Writer:
+    """Streaming writer for MDF version 4 files.
+
+    The sample records are written as DT (or DZ) blocks and DL block chains
+    directly in the destination file while the data arrives, so the memory
+    usage does not grow with the length of the recording and no second copy
+    pass (like *MDF.save*) is needed. Each channel group keeps at most one
+    data block worth of records in memory.
+
+    The channel and channel group metadata blocks are written by *close*,
+    which also updates the cycle counters and the data links. The file is
+    not a valid MDF file until *close* is called.
+
+    The signal data of the variable length channels (VLSD) is kept in the
+    temporary file like for the *MDF* objects and it is written when the
+    writer is closed.
+
+    .. versionadded:: 7.4.0
+
+    Parameters
+    ----------
+    name : str | pathlib.Path
+        destination file name; an existing file is overwritten
+    version : str
+        can be one of the 4.xx versions lower than 4.20; the column oriented
+        storage of version 4.20 is not supported. Default '4.10'
+    compression : int | str
+        use compressed data blocks, default 0; valid since version 4.10
+
+        * 0 - no compression
+        * 1 - deflate
+        * 2 - transposition + deflate
+        * "auto" - choose one of the above for each channel group when its
+          first data block is written
+
+    header_comment : str
+        file comment; the HD comment is written when the writer is created
+        so it cannot be changed later. The other HD fields (like
+        *header.start_time*) can be changed until the writer is closed
+    compression_level : int | None
+        zlib compression level; default *None* uses the fastest level
+    **kwargs :
+        the *MDF* keyword arguments that are used when appending channel
+        groups (for example *compact_vlsd* or *temporary_folder*)
+
+    Examples
+    --------
+    >>> with MDF4Writer("out.mf4", compression=2) as writer:
+    ...     index = writer.append([s1, s2])
+    ...     for t, v1, v2 in acquisition():
+    ...         writer.extend(index, [(t, None), (v1, None), (v2, None)])
+
+    """
+
+    def __init__(
+        self,
+        name: StrPathType,
+        version: str = "4.10",
+        compression: CompressionType = 0,
+        header_comment: str | None = None,
+        compression_level: int | None = None,
+        **kwargs,
+    ) -> None:
+        version = validate_version_argument(version)
+        if not version.startswith("4") or version >= "4.20":
+            raise MdfException(
+                f"MDF4Writer supports only versions 4.00 and 4.10; got {version}"
+            )
+
+        kwargs["__internal__"] = True
+        kwargs["original_name"] = None
+        self._mdf = MDF4(version=version, **kwargs)
+        self._compression = compression if version >= "4.10" else 0
+        self._compression_level = compression_level
+        self._streams = {}
+        self._closed = False
+
+        self.name = Path(name).with_suffix(".mf4")
+        self.name.parent.mkdir(parents=True, exist_ok=True)
+
+        if header_comment is not None:
+            self._mdf.header.comment = header_comment
+
+        self._file = open(self.name, "wb+")
+        try:
+            self._file.write(bytes(self._mdf.identification))
+
+            blocks = []
+            self._mdf.header.to_blocks(self._file.tell(), blocks)
+            for block in blocks:
+                self._file.write(bytes(block))
+        except:
+            self._file.close()
+            self._mdf.close()
+            raise
+
+    @property
+    def header(self):
+        """HD block of the destination file"""
+        return self._mdf.header
+
+    @property
+    def version(self) -> str:
+        return self._mdf.version
+
+    def __enter__(self) -> MDF4Writer:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        self.close()
+
+    def append(
+        self,
+        signals: Sequence[Signal] | Signal,
+        acq_name: str | None = None,
+        acq_source: Source | None = None,
+        comment: str = "Python",
+        common_timebase: bool = False,
+    ) -> int:
+        """append a new channel group; the samples of the signals are written
+        like for *extend*
+
+        Parameters
+        ----------
+        signals : list | Signal
+            list of *Signal* objects, or a single *Signal* object
+        acq_name : str
+            channel group acquisition name
+        acq_source : Source
+            channel group acquisition source
+        comment : str
+            channel group comment; default 'Python'
+        common_timebase : bool
+            flag to hint that the signals have the same timebase
+
+        Returns
+        -------
+        index : int
+            the index of the new channel group; used for the *extend* calls
+
+        """
+        self._check_open()
+
+        if isinstance(signals, Signal):
+            signals = [signals]
+
+        if not signals:
+            raise MdfException('"append" requires a non-empty list of Signal objects')
+
+        mdf = self._mdf
+
+        t = signals[0].timestamps
+        if not common_timebase:
+            for s in signals[1:]:
+                if not array_equal(s.timestamps, t):
+                    t = unique(concatenate([s.timestamps for s in signals])).astype(
+                        float64
+                    )
+                    signals = [
+                        s.interp(
+                            t,
+                            integer_interpolation_mode=mdf._integer_interpolation,
+                            float_interpolation_mode=mdf._float_interpolation,
+                        )
+                        for s in signals
+                    ]
+                    break
+
+        # the channel group metadata is built from empty signals and the
+        # samples are written to the destination file by extend
+        empty = [
+            Signal(
+                samples=s.samples[:0],
+                timestamps=s.timestamps[:0],
+                unit=s.unit,
+                name=s.name,
+                conversion=s.conversion,
+                comment=s.comment,
+                raw=s.raw,
+                master_metadata=s.master_metadata,
+                display_names=s.display_names,
+                attachment=s.attachment,
+                source=s.source,
+                bit_count=s.bit_count,
+                invalidation_bits=(
+                    s.invalidation_bits[:0] if s.invalidation_bits is not None else None
+                ),
+                encoding=s.encoding,
+                flags=s.flags,
+            )
+            for s in signals
+        ]
+
+        index = len(mdf.groups)
+        try:
+            mdf.append(
+                empty,
+                acq_name=acq_name,
+                acq_source=acq_source,
+                comment=comment,
+                common_timebase=True,
+            )
+        except:
+            # drop the incomplete channel group so that close still works
+            del mdf.groups[index:]
+            raise
+
+        channel_group = mdf.groups[index].channel_group
+        record_size = (
+            channel_group.samples_byte_nr + channel_group.invalidation_bytes_nr
+        )
+
+        split_size = mdf._write_fragment_size // record_size * record_size
+        self._streams[index] = _GroupStream(
+            record_size,
+            split_size or record_size,
+            None if self._compression == "auto" else self._compression,
+        )
+
+        self.extend(
+            index,
+            [(t, None)] + [(s.samples, s.invalidation_bits) for s in signals],
+        )
+
+        return index
+
+    def extend(
+        self, index: int, signals: list[tuple[NDArray[Any], NDArray[Any] | None]]
+    ) -> None:
+        """extend a channel group with new samples; the complete data blocks
+        are written to the destination file right away
+
+        Parameters
+        ----------
+        index : int
+            channel group index returned by *append*
+        signals : list
+            list of (numpy.ndarray, numpy.ndarray) objects; the first pair is
+            the master channel's pair, and the next pairs must respect the
+            same order in which the signals were appended. See *MDF.extend*
+
+        """
+        self._check_open()
+
+        if not signals:
+            raise MdfException('"extend" requires a non-empty list of arrays')
+
+        try:
+            stream = self._streams[index]
+        except KeyError:
+            raise MdfException(f"Channel group index {index} was not appended")
+
+        records, _, cycles_nr = self._mdf._get_extend_records(
+            self._mdf.groups[index], signals
+        )
+
+        stream.cycles_nr += cycles_nr
+        buffer = stream.buffer
+        split_size = stream.split_size
+
+        if not buffer and len(records) >= split_size:
+            # write the complete blocks without copying them to the buffer
+            records = memoryview(records)
+            end = len(records) // split_size * split_size
+            for start in range(0, end, split_size):
+                self._write_block(stream, records[start : start + split_size])
+            buffer += records[end:]
+        else:
+            buffer += records
+            if len(buffer) >= split_size:
+                end = len(buffer) // split_size * split_size
+                for start in range(0, end, split_size):
+                    self._write_block(stream, buffer[start : start + split_size])
+                del buffer[:end]
+
+    def _write_block(self, stream: _GroupStream, data: bytes) -> None:
+        """write a DT or DZ block and chain a new DL block each time
+        *DL_BLOCKS_NR* blocks are written"""
+        file = self._file
+
+        if stream.compression is None:
+            stream.compression, _ = select_compression(
+                data, stream.record_size, self._compression_level
+            )
+
+        if stream.compression:
+            if stream.compression == 1:
+                block = DataZippedBlock(
+                    data=data,
+                    zip_type=v4c.FLAG_DZ_DEFLATE,
+                    param=0,
+                    level=self._compression_level,
+                )
+            else:
+                block = DataZippedBlock(
+                    data=data,
+                    zip_type=v4c.FLAG_DZ_TRANPOSED_DEFLATE,
+                    param=stream.record_size,
+                    level=self._compression_level,
+                )
+        else:
+            block = DataBlock(data=data)
+
+        address = file.tell()
+        file.write(bytes(block))
+        align = block.block_len % 8
+        if align:
+            file.write(b"\0" * (8 - align))
+
+        if not stream.first_block_address:
+            stream.first_block_address = address
+
+        stream.block_addresses.append(address)
+        if len(stream.block_addresses) == DL_BLOCKS_NR:
+            self._write_data_list(stream)
+
+    def _write_data_list(self, stream: _GroupStream) -> None:
+        """write the DL block of the pending data blocks and link it to the
+        previous DL block of the chain"""
+        file = self._file
+        addresses = stream.block_addresses
+
+        dl_block = DataList(
+            flags=v4c.FLAG_DL_EQUAL_LENGHT,
+            links_nr=len(addresses) + 1,
+            data_block_nr=len(addresses),
+            data_block_len=stream.split_size,
+        )
+        for i, addr in enumerate(addresses):
+            dl_block[f"data_block_addr{i}"] = addr
+
+        address = file.tell()
+        file.write(bytes(dl_block))
+
+        if stream.last_dl_address:
+            # next_dl_addr is the first link of the previous DL block
+            file.seek(stream.last_dl_address + 24)
+            file.write(address.to_bytes(8, "little"))
+            file.seek(0, 2)
+        else:
+            stream.first_dl_address = address
+
+        stream.last_dl_address = address
+        addresses.clear()
+
+    def _finalize_group(self, index: int, stream: _GroupStream) -> None:
+        """write the remaining records and set the group data link and cycle
+        counters"""
+        if stream.buffer:
+            self._write_block(stream, bytes(stream.buffer))
+            stream.buffer.clear()
+
+        gp = self._mdf.groups[index]
+
+        if not stream.first_block_address:
+            address = 0
+        elif not stream.first_dl_address and len(stream.block_addresses) == 1:
+            address = stream.first_block_address
+        else:
+            if stream.block_addresses:
+                self._write_data_list(stream)
+
+            address = stream.first_dl_address
+            if stream.compression:
+                hl_block = HeaderList(
+                    flags=v4c.FLAG_DL_EQUAL_LENGHT,
+                    zip_type=(
+                        v4c.FLAG_DZ_DEFLATE
+                        if stream.compression == 1
+                        else v4c.FLAG_DZ_TRANPOSED_DEFLATE
+                    ),
+                    first_dl_addr=address,
+                )
+                address = self._file.tell()
+                self._file.write(bytes(hl_block))
+
+        gp.data_group.data_block_addr = address
+        gp.channel_group.cycles_nr = stream.cycles_nr
+        self._mdf.virtual_groups[index].cycles_nr = stream.cycles_nr
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise MdfException(f'The writer of "{self.name}" is closed')
+
+    def close(self) -> None:
+        """write the pending data blocks and the metadata blocks and close the
+        destination file"""
+        if getattr(self, "_closed", True):
+            return
+        self._closed = True
+
+        mdf = self._mdf
+        try:
+            for index, stream in self._streams.items():
+                self._finalize_group(index, stream)
+
+            fh = FileHistory()
+            fh.comment = f"""<FHcomment>
+<TX>created</TX>
+<tool_id>asammdf</tool_id>
+<tool_vendor>asammdf</tool_vendor>
+<tool_version>{__version__}</tool_version>
+</FHcomment>"""
+            mdf.file_history.append(fh)
+
+            self._file.seek(0, 2)
+            mdf._write_metadata_blocks(
+                self._file,
+                self._compression,
+                compression_level=self._compression_level,
+            )
+        finally:
+            self._file.close()
+            mdf.close()
@@ -22,8 +22,14 @@ _GLOBAL_OPTIONS = {
     "float_interpolation": FloatInterpolation.LINEAR_INTERPOLATION,
     "copy_on_get": True,
     "temporary_folder": None,
+    "temporary_spool_size": 0,
     "raise_on_multiple_occurrences": True,
     "fill_0_for_missing_computation_channels": False,
+    "use_metadata_index": False,
+    "decompression_workers": 0,
+    "metadata": "full",
+    "zero_copy": False,
+    "buffered_extend": False,
 }
 
 
@@ -41,8 +47,16 @@ def set_global_option(opt, value):
         "copy_on_get",
         "raise_on_multiple_occurrences",
         "fill_0_for_missing_computation_channels",
+        "use_metadata_index",
+        "zero_copy",
+        "buffered_extend",
     ):
         value = bool(value)
+    elif opt in ("decompression_workers", "temporary_spool_size"):
+        value = max(int(value), 0)
+    elif opt == "metadata":
+        if value not in ("full", "lazy"):
+            raise ValueError(f'Unknown metadata mode "{value}"; use "full" or "lazy"')
     elif opt == "integer_interpolation":
         value = IntegerInterpolation(value)
     elif opt == "float_interpolation":
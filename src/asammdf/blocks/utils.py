@@ -5,7 +5,7 @@ asammdf utility functions and classes
 
 from __future__ import annotations
 
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator, Sequence
 from functools import lru_cache
 from io import StringIO
 import logging
@@ -16,8 +16,8 @@ import string
 from struct import Struct
 import subprocess
 import sys
-from tempfile import TemporaryDirectory
-from typing import Any, Dict, overload, Tuple
+from tempfile import SpooledTemporaryFile, TemporaryDirectory, TemporaryFile
+from typing import Any, Dict, IO, overload, Tuple
 import xml.etree.ElementTree as ET
 
 from typing_extensions import Literal, TypedDict
@@ -1117,6 +1117,35 @@ def is_file_like(obj: object) -> bool:
     return True
 
 
+def temporary_file(
+    dir: str | Path | None = None, spool_size: int = 0
+) -> IO[bytes] | SpooledTemporaryFile:
+    """create the temporary storage of the samples that are appended to a
+    measurement
+
+    Parameters
+    ----------
+    dir : str | pathlib.Path | None
+        folder of the temporary file; the system default is used if *None*
+    spool_size : int
+        the samples are kept in memory until they grow past *spool_size*
+        bytes and are then moved to the temporary file; a plain temporary
+        file is used if this is 0
+
+    Returns
+    -------
+    file : file-like
+        binary file open for reading and writing
+
+    .. versionadded:: 7.4.0
+
+    """
+    if spool_size > 0:
+        return SpooledTemporaryFile(max_size=spool_size, mode="w+b", dir=dir)
+    else:
+        return TemporaryFile(dir=dir)
+
+
 class UniqueDB(object):
     def __init__(self) -> None:
         self._db = {}
@@ -1241,6 +1270,8 @@ class Group:
         "single_channel_dtype",
         "uses_ld",
         "read_split_count",
+        "data_blocks_offsets",
+        "data_blocks_time_ranges",
     )
 
     def __init__(self, data_group: DataGroupType) -> None:
@@ -1256,6 +1287,8 @@ class Group:
         self.uses_ld = False
         self.read_split_count = 0
         self.data_blocks_info_generator = iter(EMPTY_TUPLE)
+        self.data_blocks_offsets = None
+        self.data_blocks_time_ranges = None
 
     def __getitem__(self, item: str) -> Any:
         return self.__getattribute__(item)
@@ -1275,33 +1308,55 @@ class Group:
         self.channel_dependencies.clear()
         self.signal_data.clear()
         self.data_blocks_info_generator = None
+        self.data_blocks_offsets = None
+        self.data_blocks_time_ranges = None
 
     def get_data_blocks(self) -> Iterator[DataBlockInfo]:
-        for blk in self.data_blocks:
-            yield blk
-
+        # the blocks are accessed by index because other iterators over the
+        # same group can pull new blocks from the generator in the meantime
+        data_blocks = self.data_blocks
+        index = 0
         while True:
-            try:
-                info = next(self.data_blocks_info_generator)
-                self.data_blocks.append(info)
-                yield info
-            except StopIteration:
-                break
+            if index < len(data_blocks):
+                yield data_blocks[index]
+                index += 1
+            else:
+                try:
+                    data_blocks.append(next(self.data_blocks_info_generator))
+                except StopIteration:
+                    break
 
     def get_signal_data_blocks(self, index: int) -> Iterator[SignalDataBlockInfo]:
         signal_data = self.signal_data[index]
         if signal_data is not None:
             signal_data, signal_generator = signal_data
-            for blk in signal_data:
-                yield blk
-
+            index = 0
             while True:
-                try:
-                    info = next(signal_generator)
-                    signal_data.append(info)
-                    yield info
-                except StopIteration:
-                    break
+                if index < len(signal_data):
+                    yield signal_data[index]
+                    index += 1
+                else:
+                    try:
+                        signal_data.append(next(signal_generator))
+                    except StopIteration:
+                        break
+
+
+class ExtendBuffer:
+    """preallocated buffer for the records of a channel group that are not
+    written as a data block yet; see the *buffered_extend* option"""
+
+    __slots__ = (
+        "data",
+        "position",
+    )
+
+    def __init__(self, capacity: int) -> None:
+        self.data = bytearray(capacity)
+        self.position = 0
+
+    def __repr__(self) -> str:
+        return f"ExtendBuffer(capacity={len(self.data)}, position={self.position})"
 
 
 class VirtualChannelGroup:
@@ -1618,8 +1673,49 @@ def downcast(array: NDArray[Any]) -> NDArray[Any]:
     return array
 
 
+def merge_timebases(timebases: Sequence[NDArray[Any]]) -> NDArray[Any]:
+    """get the sorted union of the *timebases*; this gives the same result as
+    ``functools.reduce(np.union1d, timebases)``
+
+    The timebases are concatenated and sorted once in place, instead of
+    sorting the growing union again for each timebase.
+
+    .. versionadded:: 7.4.0
+
+    Parameters
+    ----------
+    timebases : sequence
+        timebases arrays
+
+    Returns
+    -------
+    timebase : np.array
+        sorted unique timestamps
+
+    """
+    if not len(timebases):
+        return np.array([], dtype="<f8")
+
+    timebase = np.concatenate([np.ravel(timebase) for timebase in timebases])
+    timebase.sort()
+
+    if len(timebase):
+        mask = np.empty(len(timebase), dtype=bool)
+        mask[0] = True
+        np.not_equal(timebase[1:], timebase[:-1], out=mask[1:])
+        if timebase.dtype.kind in "fc" and np.isnan(timebase[-1]):
+            # keep a single NaN like np.unique does
+            mask[np.searchsorted(timebase, timebase[-1], side="left") + 1 :] = False
+        timebase = timebase[mask]
+
+    return timebase
+
+
 def master_using_raster(
-    mdf: MDF_v2_v3_v4, raster: RasterType, endpoint: bool = False
+    mdf: MDF_v2_v3_v4,
+    raster: RasterType,
+    endpoint: bool = False,
+    groups: Iterable[int] | None = None,
 ) -> NDArray[Any]:
     """get single master based on the raster
 
@@ -1631,6 +1727,11 @@ def master_using_raster(
         new raster
     endpoint=False : bool
         include maximum time stamp in the new master
+    groups=None : iterable
+        virtual channel group indexes used to compute the time range; by
+        default all the virtual channel groups are used
+
+        .. versionadded:: 7.4.0
 
     Returns
     -------
@@ -1643,7 +1744,10 @@ def master_using_raster(
     else:
         t_min = []
         t_max = []
-        for group_index in mdf.virtual_groups:
+        if groups is None:
+            groups = mdf.virtual_groups
+
+        for group_index in groups:
             group = mdf.groups[group_index]
             cycles_nr = group.channel_group.cycles_nr
             if cycles_nr:
@@ -2,7 +2,6 @@
 """
 classes that implement the blocks for MDF version 4
 """
-import re
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
@@ -23,11 +22,13 @@ try:
     from isal.isal_zlib import compress, decompress
 
     COMPRESSION_LEVEL = 2
+    MAX_COMPRESSION_LEVEL = 3
 
 except ImportError:
     from zlib import compress, decompress
 
     COMPRESSION_LEVEL = 1
+    MAX_COMPRESSION_LEVEL = 9
 
 
 from numexpr import evaluate
@@ -56,6 +57,7 @@ from .utils import (
 )
 
 if TYPE_CHECKING:
+    from ..types import ReadableBufferType
     from .source_utils import Source
 
 SEEK_START = v4c.SEEK_START
@@ -361,6 +363,86 @@ class AttachmentBlock:
 
 CN = b"##CN"
 
+# Channel attributes that can be read on first access for mapped files
+LAZY_CHANNEL_ATTRIBUTES = frozenset(
+    ("conversion", "source", "unit", "comment", "display_names")
+)
+
+
+def read_channel_conversion(
+    address: int,
+    stream: ReadableBufferType,
+    cc_map: dict,
+    tx_map: dict,
+) -> ChannelConversion | None:
+    """read the conversion block of a channel from a mapped file; the
+    conversions are cached by address and by block contents"""
+    if not address:
+        return None
+
+    try:
+        if address in cc_map:
+            conv = cc_map[address]
+        else:
+            (size,) = UINT64_uf(stream, address + 8)
+            raw_bytes = stream[address : address + size]
+
+            if raw_bytes in cc_map:
+                conv = cc_map[raw_bytes]
+            else:
+                conv = ChannelConversion(
+                    raw_bytes=raw_bytes,
+                    stream=stream,
+                    address=address,
+                    mapped=True,
+                    tx_map=tx_map,
+                )
+                cc_map[raw_bytes] = cc_map[address] = conv
+    except:
+        logger.warning(
+            f"Channel conversion parsing error: {format_exc()}. The error is ignored and the channel conversion is None"
+        )
+        conv = None
+
+    return conv
+
+
+def read_channel_source(
+    address: int,
+    stream: ReadableBufferType,
+    si_map: dict,
+    tx_map: dict,
+) -> SourceInformation | None:
+    """read the source information block of a channel from a mapped file;
+    the sources are cached by address and by block contents"""
+    if not address:
+        return None
+
+    try:
+        if address in si_map:
+            source = si_map[address]
+        else:
+            raw_bytes = stream[address : address + v4c.SI_BLOCK_SIZE]
+
+            if raw_bytes in si_map:
+                source = si_map[raw_bytes]
+            else:
+                source = SourceInformation(
+                    raw_bytes=raw_bytes,
+                    stream=stream,
+                    address=address,
+                    mapped=True,
+                    tx_map=tx_map,
+                )
+                si_map[raw_bytes] = si_map[address] = source
+    except:
+        logger.warning(
+            f"Channel source parsing error: {format_exc()}. The error is ignored and the channel source is None"
+        )
+        source = None
+
+    return source
+
 
 class Channel:
     """If the `load_metadata` keyword argument is not provided or is False,
@@ -445,6 +527,13 @@ class Channel:
     parse_xml_comment : bool
         option to parse XML channel comment to search for display name; default
         *True*
+    lazy_metadata : tuple
+        (stream, conversions map, sources map, texts map, use display names)
+        tuple used to read the channel conversion and source the first time
+        they are accessed; this is only supported for mapped files
+    lazy_strings : bool
+        only used together with *lazy_metadata*: the unit, comment and display
+        names are also read the first time they are accessed; default *False*
     for dynamically created objects :
         see the key-value pairs
 
@@ -457,6 +546,7 @@ class Channel:
         "display_names",
         "conversion",
         "source",
+        "_lazy_metadata",
         "attachment",
         "address",
         "dtype_fmt",
@@ -497,6 +587,8 @@ class Channel:
     )
 
     def __init__(self, **kwargs) -> None:
+        lazy_strings = False
+
         if "stream" in kwargs:
             self.address = address = kwargs["address"]
             self.dtype_fmt = self.attachment = None
@@ -642,9 +734,18 @@ class Channel:
                     ) = params
 
                 tx_map = kwargs["tx_map"]
+                lazy_metadata = kwargs.get("lazy_metadata", None)
+                lazy_strings = lazy_metadata is not None and kwargs.get(
+                    "lazy_strings", False
+                )
 
                 parsed_strings = kwargs["parsed_strings"]
-                if parsed_strings is None:
+                if lazy_strings:
+                    # only the name is needed to index the channel; the unit,
+                    # comment and display names are read on first access
+                    self.name = get_text_v4(self.name_addr, stream, mapped=mapped)
+
+                elif parsed_strings is None:
                     self.name = get_text_v4(self.name_addr, stream, mapped=mapped)
                     self.comment = get_text_v4(self.comment_addr, stream, mapped=mapped)
 
@@ -655,73 +756,24 @@ class Channel:
                 else:
                     self.name, self.display_names, self.comment = parsed_strings
 
-                addr = self.unit_addr
-                if addr in tx_map:
-                    self.unit = tx_map[addr]
-                else:
-                    self.unit = get_text_v4(addr, stream, mapped=mapped)
-                    tx_map[addr] = self.unit
-
-                address = self.conversion_addr
-                if address:
-                    cc_map = kwargs["cc_map"]
-                    try:
-                        if address in cc_map:
-                            conv = cc_map[address]
-                        else:
-                            (size,) = UINT64_uf(stream, address + 8)
-                            raw_bytes = stream[address : address + size]
-
-                            if raw_bytes in cc_map:
-                                conv = cc_map[raw_bytes]
-                            else:
-                                conv = ChannelConversion(
-                                    raw_bytes=raw_bytes,
-                                    stream=stream,
-                                    address=address,
-                                    mapped=mapped,
-                                    tx_map=tx_map,
-                                )
-                                cc_map[raw_bytes] = cc_map[address] = conv
-                    except:
-                        logger.warning(
-                            f"Channel conversion parsing error: {format_exc()}. The error is ignored and the channel conversion is None"
-                        )
-                        conv = None
-
-                    self.conversion = conv
-                else:
-                    self.conversion = None
-
-                address = self.source_addr
-                if address:
-                    si_map = kwargs["si_map"]
-                    try:
-                        if address in si_map:
-                            source = si_map[address]
-                        else:
-                            raw_bytes = stream[address : address + v4c.SI_BLOCK_SIZE]
-
-                            if raw_bytes in si_map:
-                                source = si_map[raw_bytes]
-                            else:
-                                source = SourceInformation(
-                                    raw_bytes=raw_bytes,
-                                    stream=stream,
-                                    address=address,
-                                    mapped=mapped,
-                                    tx_map=tx_map,
-                                )
-                                si_map[raw_bytes] = si_map[address] = source
-                    except:
-                        logger.warning(
-                            f"Channel source parsing error: {format_exc()}. The error is ignored and the channel source is None"
-                        )
-                        source = None
+                if not lazy_strings:
+                    addr = self.unit_addr
+                    if addr in tx_map:
+                        self.unit = tx_map[addr]
+                    else:
+                        self.unit = get_text_v4(addr, stream, mapped=mapped)
+                        tx_map[addr] = self.unit
 
-                    self.source = source
+                if lazy_metadata is None:
+                    self.conversion = read_channel_conversion(
+                        self.conversion_addr, stream, kwargs["cc_map"], tx_map
+                    )
+                    self.source = read_channel_source(
+                        self.source_addr, stream, kwargs["si_map"], tx_map
+                    )
                 else:
-                    self.source = None
+                    # the metadata is read on first access
+                    self._lazy_metadata = lazy_metadata
 
             else:
                 stream.seek(address)
@@ -1022,13 +1074,92 @@ class Channel:
             self.data_block_addr = 0
             self.channel_type = v4c.CHANNEL_TYPE_VALUE
 
-        if self.name in self.display_names:
+        if not lazy_strings and self.name in self.display_names:
             del self.display_names[self.name]
 
         self.standard_C_size = True
 
+    def __getattr__(self, item: str) -> Any:
+        # only called for the attributes that are not set yet
+        if item in LAZY_CHANNEL_ATTRIBUTES:
+            try:
+                (
+                    stream,
+                    cc_map,
+                    si_map,
+                    tx_map,
+                    use_display_names,
+                ) = self._lazy_metadata
+            except AttributeError:
+                raise AttributeError(item) from None
+
+            if item == "conversion":
+                value = self.conversion = read_channel_conversion(
+                    self.conversion_addr, stream, cc_map, tx_map
+                )
+            elif item == "source":
+                value = self.source = read_channel_source(
+                    self.source_addr, stream, si_map, tx_map
+                )
+            elif item == "unit":
+                addr = self.unit_addr
+                if addr in tx_map:
+                    value = tx_map[addr]
+                else:
+                    value = tx_map[addr] = get_text_v4(addr, stream, mapped=True)
+                self.unit = value
+            elif item == "comment":
+                value = self.comment = get_text_v4(
+                    self.comment_addr, stream, mapped=True
+                )
+            else:
+                if use_display_names:
+                    value = extract_display_names(self.comment)
+                    value.pop(self.name, None)
+                else:
+                    value = {}
+                self.display_names = value
+
+            return value
+
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{item}'"
+        )
+
+    def __getstate__(self) -> dict[str, Any]:
+        # the lazy metadata references the file stream so the lazy attributes
+        # are resolved before pickling or copying
+        return {
+            slot: getattr(self, slot)
+            for slot in self.__slots__
+            if slot != "_lazy_metadata" and hasattr(self, slot)
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    def _loaded_state(self) -> dict[str, Any]:
+        """the attributes that are already set; unlike *__getstate__* the lazy
+        attributes that were not accessed yet are left out instead of being
+        read from the file"""
+        state = {}
+        for slot in self.__slots__:
+            if slot != "_lazy_metadata":
+                try:
+                    # object.__getattribute__ does not fall back to __getattr__
+                    state[slot] = object.__getattribute__(self, slot)
+                except AttributeError:
+                    pass
+        return state
+
+    def _has_pending_metadata(self) -> bool:
+        """*True* if some lazy attributes were not read yet"""
+        state = self._loaded_state()
+        return any(item not in state for item in LAZY_CHANNEL_ATTRIBUTES)
+
     def __getitem__(self, item: str) -> Any:
-        return self.__getattribute__(item)
+        return getattr(self, item)
 
     def __setitem__(self, item: str, value: Any) -> None:
         self.__setattr__(item, value)
@@ -4174,6 +4305,10 @@ class DataZippedBlock(object):
     * ``return_unzipped`` - bool : decompress data when accessing the 'data'
       key
 
+    When a new block is created the *level* keyword argument sets the zlib
+    compression level; by default the fastest level is used. The level is
+    capped to 3 when the isal compressor is installed
+
     Parameters
     ----------
     address : int
@@ -4187,6 +4322,7 @@ class DataZippedBlock(object):
         "address",
         "_prevent_data_setitem",
         "_transposed",
+        "_level",
         "return_unzipped",
         "id",
         "reserved0",
@@ -4203,6 +4339,7 @@ class DataZippedBlock(object):
 
     def __init__(self, **kwargs) -> None:
         self._prevent_data_setitem = True
+        self._level = COMPRESSION_LEVEL
         self._transposed = False
         try:
             self.address = address = kwargs["address"]
@@ -4249,6 +4386,9 @@ class DataZippedBlock(object):
             else:
                 self.param = kwargs["param"]
 
+            level = kwargs.get("level", None)
+            if level is not None:
+                self._level = min(level, MAX_COMPRESSION_LEVEL)
             self._transposed = kwargs.get("transposed", False)
             self.data = data
 
@@ -4262,7 +4402,7 @@ class DataZippedBlock(object):
             self.original_size = original_size
 
             if self.zip_type == v4c.FLAG_DZ_DEFLATE:
-                data = compress(data, COMPRESSION_LEVEL)
+                data = compress(data, self._level)
             else:
                 if not self._transposed:
                     cols = self.param
@@ -4284,7 +4424,7 @@ class DataZippedBlock(object):
                             .T.ravel()
                             .tobytes()
                         )
-                data = compress(data, COMPRESSION_LEVEL)
+                data = compress(data, self._level)
 
             zipped_size = len(data)
             self.zip_size = zipped_size
@@ -93,6 +93,8 @@ SIGNAL_TYPE_CANOPEN = 2
 SIGNAL_TYPE_STRUCTURE_COMPOSITION = 3
 SIGNAL_TYPE_ARRAY = 4
 SIGNAL_TYPE_BYTEARRAY = 5
+# scalar that shares a record byte with the neighbouring bit fields
+SIGNAL_TYPE_BIT_FIELD = 6
 
 SIGNED_INT = {DATA_TYPE_SIGNED_INTEL, DATA_TYPE_SIGNED_MOTOROLA}
 FLOATS = {DATA_TYPE_REAL_INTEL, DATA_TYPE_REAL_MOTOROLA}
@@ -425,6 +427,13 @@ DZ_BLOCK_DEFLATE = 1
 DZ_BLOCK_TRANSPOSED = 2
 DZ_BLOCK_LZ = 3
 
+DATA_BLOCK_TYPE_TO_DESCRIPTION = {
+    DT_BLOCK: "none",
+    DZ_BLOCK_DEFLATE: "deflate",
+    DZ_BLOCK_TRANSPOSED: "transposed deflate",
+    DZ_BLOCK_LZ: "lz4",
+}
+
 FMT_CHANNEL = "<4sI2Q{}Q4B4I2BH6d"
 FMT_CHANNEL_PARAMS = "<4B4I2BH6d"
 
@@ -2,7 +2,6 @@
 from collections import defaultdict
 from copy import deepcopy
 from datetime import datetime
-from functools import reduce
 import inspect
 from io import StringIO
 import json
@@ -29,6 +28,7 @@ from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal, Slot
 from ..blocks import v4_constants as v4c
 from ..blocks.conversion_utils import from_dict
 from ..blocks.options import FloatInterpolation, IntegerInterpolation
+from ..blocks.utils import merge_timebases
 from ..mdf import MDF, MDF2, MDF3, MDF4
 from ..signal import Signal
 from .dialogs.error_dialog import ErrorDialog
@@ -851,7 +851,7 @@ def compute_signal(
                 timestamps = [sig.timestamps for sig in signals]
 
                 if timestamps:
-                    common_timebase = reduce(np.union1d, timestamps)
+                    common_timebase = merge_timebases(timestamps)
                 else:
                     common_timebase = all_timebase
                 signals = [sig.interp(common_timebase) for sig in signals]
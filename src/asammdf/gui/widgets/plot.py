@@ -2,7 +2,7 @@
 import bisect
 from collections import defaultdict
 from datetime import timedelta
-from functools import lru_cache, partial, reduce
+from functools import lru_cache, partial
 import os
 from pathlib import Path
 from tempfile import gettempdir
@@ -37,7 +37,7 @@ from PySide6 import QtCore, QtGui, QtWidgets
 PLOT_BUFFER_SIZE = 4000
 
 from ...blocks.conversion_utils import from_dict, to_dict
-from ...blocks.utils import target_byte_order
+from ...blocks.utils import merge_timebases, target_byte_order
 from ..utils import FONT_SIZE, timeit, value_as_str
 from .viewbox import ViewBoxWithCursor
 
@@ -4244,10 +4244,7 @@ class _Plot(pg.PlotWidget):
             elif count == 1:
                 new_timebase = timebases[0]
             else:
-                try:
-                    new_timebase = np.unique(np.concatenate(timebases))
-                except MemoryError:
-                    new_timebase = reduce(np.union1d, timebases)
+                new_timebase = merge_timebases(timebases)
 
             self.all_timebase = self.timebase = new_timebase
         else:
@@ -6,25 +6,34 @@ from __future__ import annotations
 import bz2
 from collections import defaultdict
 from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
 from copy import deepcopy
 import csv
 from datetime import datetime, timezone
 from enum import Enum
 import fnmatch
-from functools import reduce
 import gzip
 from io import BytesIO
+import json
 import logging
+from multiprocessing.util import Finalize
 import os
 from pathlib import Path
+from queue import Full, Queue
 import re
 from shutil import copy, move
 from struct import unpack
 import sys
 from tempfile import gettempdir, mkdtemp
+from threading import Event
 from traceback import format_exc
 from types import TracebackType
-from typing import Any, overload, Type
+from typing import Any, overload, Type, TYPE_CHECKING
 from warnings import warn
 import xml.etree.ElementTree as ET
 import zipfile
@@ -42,7 +51,11 @@ from .blocks.conversion_utils import from_dict
 from .blocks.mdf_v2 import MDF2
 from .blocks.mdf_v3 import MDF3
 from .blocks.mdf_v4 import MDF4
-from .blocks.options import FloatInterpolation, IntegerInterpolation
+from .blocks.options import (
+    FloatInterpolation,
+    get_global_option,
+    IntegerInterpolation,
+)
 from .blocks.source_utils import Source
 from .blocks.utils import (
     components,
@@ -57,6 +70,7 @@ from .blocks.utils import (
     MDF3_VERSIONS,
     MDF4_VERSIONS,
     MdfException,
+    merge_timebases,
     plausible_timestamps,
     randomized_string,
     SUPPORTED_VERSIONS,
@@ -91,6 +105,9 @@ from .types import (
 )
 from .version import __version__
 
+if TYPE_CHECKING:
+    import pyarrow as pa
+
 try:
     import fsspec
 
@@ -151,6 +168,95 @@ def get_temporary_filename(
     return tmp_path
 
 
+# MDF object opened once in each worker process of MDF.select
+_SELECT_WORKER_MDF = None
+
+# open arguments that are not sent to the worker processes of MDF.select
+_SELECT_WORKER_SKIPPED_KWARGS = (
+    "original_name",
+    "__internal__",
+    "progress",
+    "callback",
+)
+
+
+def _select_worker_init(name: Path, kwargs: dict[str, Any]) -> None:
+    global _SELECT_WORKER_MDF
+    _SELECT_WORKER_MDF = MDF(name, **kwargs)
+
+    # the worker processes don't run the atexit handlers
+    Finalize(None, _select_worker_close, exitpriority=0)
+
+
+def _select_worker_close() -> None:
+    global _SELECT_WORKER_MDF
+    if _SELECT_WORKER_MDF is not None:
+        _SELECT_WORKER_MDF.close()
+        _SELECT_WORKER_MDF = None
+
+
+def _select_worker_task(
+    groups: dict[int, list[int]],
+    record_offset: int,
+    record_count: int | None,
+) -> dict[tuple[int, int], Signal]:
+    pairs = [
+        (gp_index, ch_index)
+        for gp_index, channel_indexes in groups.items()
+        for ch_index in channel_indexes
+    ]
+    signals = _SELECT_WORKER_MDF.select(
+        [(None, gp_index, ch_index) for gp_index, ch_index in pairs],
+        record_offset=record_offset,
+        record_count=record_count,
+        raw=True,
+        copy_master=False,
+    )
+    return dict(zip(pairs, signals))
+
+
+def _hdf5_dataset_options(
+    shape: tuple[int, ...],
+    chunks: int | None = None,
+    compression: str = "",
+    compression_opts: Any = None,
+) -> dict[str, Any]:
+    """*create_dataset* keyword arguments for the HDF5 export; the datasets
+    are chunked and can be resized along the first axis"""
+    options = {
+        "maxshape": (None,) + tuple(shape[1:]),
+        "chunks": (int(chunks),) + tuple(shape[1:]) if chunks else True,
+    }
+    if compression:
+        options["compression"] = compression
+        if compression_opts is not None:
+            options["compression_opts"] = compression_opts
+
+    return options
+
+
+def _parquet_pandas_metadata(timestamps_type: Any) -> dict[bytes, bytes]:
+    """schema metadata of the parquet export written with *pyarrow*; pandas
+    uses it to restore the *timestamps* column as the dataframe index"""
+    dtype = np.dtype(timestamps_type.to_pandas_dtype()).name
+    metadata = {
+        "index_columns": ["timestamps"],
+        "column_indexes": [],
+        "columns": [
+            {
+                "name": "timestamps",
+                "field_name": "timestamps",
+                "pandas_type": dtype,
+                "numpy_type": dtype,
+                "metadata": None,
+            }
+        ],
+        "creator": {"library": "asammdf", "version": __version__},
+        "pandas_version": pd.__version__,
+    }
+    return {b"pandas": json.dumps(metadata).encode("utf-8")}
+
+
 class MDF:
     """Unified access to MDF v3 and v4 files. Underlying _mdf's attributes and
     methods are linked to the `MDF` object via *setattr*. This is done to expose
@@ -204,6 +310,72 @@ class MDF:
 
         .. versionadded:: 7.0.0
 
+    temporary_spool_size (\*\*kwargs) : int
+        the samples of new, appended or extended channel groups are kept in
+        memory until they use more than *temporary_spool_size* bytes and only
+        then they are moved to a temporary file in the *temporary_folder*;
+        0 always uses a temporary file. The measurements created by *convert*,
+        *filter*, *cut* and *resample* inherit the value; default 0
+
+        .. versionadded:: 7.4.0
+
+    use_metadata_index (\*\*kwargs) : bool
+        only for MDF4 files: cache the parsed metadata in a sidecar
+        *<file>.mf4.idx* file that is used instead of parsing the blocks the
+        next time the file is opened; the index is validated against the file
+        size, modification time and header and rebuilt if needed; default
+        *False*
+
+        .. versionadded:: 7.4.0
+
+        .. warning::
+
+            the index is a pickle file; loading it can execute arbitrary code,
+            so only enable this option for folders where untrusted users
+            cannot write files
+
+    zero_copy (\*\*kwargs) : bool
+        only for MDF4 files opened from a file path: the *get* and *select*
+        methods return read-only arrays over the memory mapped file instead of
+        copies for the byte aligned integer and float channels without
+        invalidation bits of the groups stored in a single uncompressed DT
+        block; the same applies for float64 master channels without
+        conversion. Use *copy_master=False* in *select* to keep the master
+        arrays as views. Default *False*
+
+        .. versionadded:: 7.4.0
+
+    metadata (\*\*kwargs) : str
+        only for MDF4 files opened from a file path: "full" parses all the
+        channel metadata when the file is opened; "lazy" only parses the channel
+        names and the record layout and reads the conversions, sources, units,
+        comments and display names of a channel the first time they are used
+        (for example by *get*, *get_channel_unit* or *get_channel_comment*).
+        In the "lazy" mode the display names are not indexed, so the channels
+        can only be selected by their names, and the metadata that was not
+        used before the file is closed can no longer be read; default "full"
+
+        .. versionadded:: 7.4.0
+
+    buffered_extend (\*\*kwargs) : bool
+        only for MDF4 versions lower than 4.20: *extend* copies the new records
+        in a preallocated buffer of each channel group and writes a data block
+        only when *write_fragment_size* bytes are buffered. The pending records
+        are written by *flush*, *save* or when the group is read. This avoids
+        the many small data blocks of frequent *extend* calls with few
+        samples; default *False*
+
+        .. versionadded:: 7.4.0
+
+    metadata_only (\*\*kwargs) : bool
+        only for MDF4 files: read the header, file history, attachments,
+        events, the channel tree and the cycles count of the channel groups
+        without reading the data blocks. Unsorted files are not sorted and no
+        temporary file is created; reading or saving the samples raises
+        *MdfException*. See also *MDF.peek*; default *False*
+
+        .. versionadded:: 7.4.0
+
     Examples
     --------
     >>> mdf = MDF(version='3.30') # new MDF object with version 3.30
@@ -228,6 +400,12 @@ class MDF:
             kwargs["progress"] = kwargs["callback"]
             del kwargs["callback"]
 
+        metadata = kwargs.get("metadata", get_global_option("metadata"))
+        if metadata not in ("full", "lazy"):
+            raise MdfException(
+                f'Unknown metadata mode "{metadata}"; use "full" or "lazy"'
+            )
+
         temporary_folder = kwargs.get("temporary_folder", None)
         if temporary_folder:
             try:
@@ -631,6 +809,48 @@ class MDF:
             if acq_source:
                 sgroup.acq_source = acq_source.copy()
 
+    def _transfer_group(
+        self, other: MDF, index: int, groups: dict[int, Sequence[int]]
+    ) -> int | None:
+        """add the *index* virtual channel group of *other* without decoding
+        its samples if *groups* selects all its channels; the data blocks are
+        copied verbatim by *save*
+
+        Returns the new group index or *None* if the channels must be copied
+        one by one
+        """
+        if not isinstance(self._mdf, MDF4) or not isinstance(other._mdf, MDF4):
+            return None
+
+        if groups != other.included_channels(index)[index]:
+            return None
+
+        if not self._mdf._can_transfer_group(other._mdf, index):
+            return None
+
+        return self._mdf._transfer_group(other._mdf, index)
+
+    def _transpose_group(
+        self, other: MDF, index: int, groups: dict[int, Sequence[int]]
+    ) -> int | None:
+        """add the *index* virtual channel group of *other* as column oriented
+        channel groups by transposing its records block by block, without
+        decoding the samples
+
+        Returns the new master group index or *None* if the channels must be
+        copied one by one
+        """
+        if not isinstance(self._mdf, MDF4) or not isinstance(other._mdf, MDF4):
+            return None
+
+        if list(groups) != [index]:
+            return None
+
+        if not self._mdf._can_transpose_group(other._mdf, index):
+            return None
+
+        return self._mdf._transpose_group(other._mdf, index, groups[index])
+
     def _transfer_metadata(self, other: MDF, message: str = "") -> None:
         self._transfer_events(other)
         self._transfer_header_data(other, message)
@@ -783,7 +1003,7 @@ class MDF:
         if raise_on_multiple_occurrences is not None:
             self._raise_on_multiple_occurrences = bool(raise_on_multiple_occurrences)
 
-    def convert(self, version: str, progress=None) -> MDF:
+    def convert(self, version: str, progress=None, column_storage: bool = True) -> MDF:
         """convert *MDF* to other version
 
         Parameters
@@ -791,6 +1011,12 @@ class MDF:
         version : str
             new mdf file version from ('2.00', '2.10', '2.14', '3.00', '3.10',
             '3.20', '3.30', '4.00', '4.10', '4.11', '4.20'); default '4.10'
+        column_storage : bool
+            for version 4.20 the record oriented channel groups are transposed
+            block by block into a master group and one column group for each
+            channel, without building the *Signal* objects; default *True*
+
+            .. versionadded:: 7.4.0
 
         Returns
         -------
@@ -800,7 +1026,13 @@ class MDF:
         """
         version = validate_version_argument(version)
 
-        out = MDF(version=version, **self._kwargs)
+        if version >= "4.20":
+            out = MDF(
+                version=version,
+                **{**self._kwargs, "column_storage": column_storage},
+            )
+        else:
+            out = MDF(version=version, **self._kwargs)
 
         out.configure(from_other=self)
 
@@ -822,26 +1054,44 @@ class MDF:
 
         self.configure(copy_on_get=False)
 
+        transferred = transposed = 0
+
         # walk through all groups and get all channels
         for i, virtual_group in enumerate(self.virtual_groups):
-            for idx, sigs in enumerate(
-                self._yield_selected_signals(virtual_group, version=version)
+            included_channels = self.included_channels(virtual_group)[virtual_group]
+
+            if (
+                column_storage
+                and version >= "4.20"
+                and out._transpose_group(self, virtual_group, included_channels)
+                is not None
             ):
-                if idx == 0:
-                    if sigs:
-                        cg = self.groups[virtual_group].channel_group
-                        cg_nr = out.append(
-                            sigs,
-                            common_timebase=True,
-                            comment=cg.comment,
-                        )
-                        MDF._transfer_channel_group_data(
-                            out.groups[cg_nr].channel_group, cg
-                        )
+                transposed += 1
+
+            elif (
+                out._transfer_group(self, virtual_group, included_channels) is not None
+            ):
+                transferred += 1
+
+            else:
+                for idx, sigs in enumerate(
+                    self._yield_selected_signals(virtual_group, version=version)
+                ):
+                    if idx == 0:
+                        if sigs:
+                            cg = self.groups[virtual_group].channel_group
+                            cg_nr = out.append(
+                                sigs,
+                                common_timebase=True,
+                                comment=cg.comment,
+                            )
+                            MDF._transfer_channel_group_data(
+                                out.groups[cg_nr].channel_group, cg
+                            )
+                        else:
+                            break
                     else:
-                        break
-                else:
-                    out.extend(cg_nr, sigs)
+                        out.extend(cg_nr, sigs)
 
             if progress is not None:
                 if callable(progress):
@@ -856,6 +1106,11 @@ class MDF:
         out._transfer_metadata(self, message=f"Converted from {self.name}")
         self.configure(copy_on_get=True)
 
+        logger.debug(
+            f"{transferred} of {groups_nr} channel groups transferred and "
+            f"{transposed} transposed without decoding the samples"
+        )
+
         return out
 
     def cut(
@@ -960,10 +1215,29 @@ class MDF:
             if not included_channels:
                 continue
 
+            if start is None and stop is None:
+                record_offset, record_count = 0, None
+            else:
+                # only load the records inside the time window and keep one
+                # extra record on each side for the interpolation of the ends
+                record_offset, record_count = self._get_records_range(
+                    group_index, start, stop
+                )
+                record_stop = min(
+                    record_offset + record_count + 1, virtual_group.cycles_nr
+                )
+                record_offset = max(record_offset - 1, 0)
+                record_count = max(record_stop - record_offset, 0)
+
             idx = 0
             signals = []
             for j, sigs in enumerate(
-                self._yield_selected_signals(group_index, groups=included_channels)
+                self._yield_selected_signals(
+                    group_index,
+                    groups=included_channels,
+                    record_offset=record_offset,
+                    record_count=record_count,
+                )
             ):
                 if not sigs:
                     break
@@ -1124,14 +1398,12 @@ class MDF:
                     progress.signals.setValue.emit(i + 1)
 
                     if progress.stop:
-                        print("return terminated")
                         return TERMINATED
 
         self.configure(copy_on_get=True)
 
         out._transfer_metadata(self, message=f"Cut from {start_} to {stop_}")
 
-        print("retuirn out")
         return out
 
     def export(
@@ -1158,7 +1430,13 @@ class MDF:
 
             * `hdf5` : HDF5 file output; each *MDF* data group is mapped to
               a *HDF5* group with the name 'DataGroup_<cntr>'
-              (where <cntr> is the index)
+              (where <cntr> is the index). If *single_time_base* is *False*
+              the datasets are chunked and they are written fragment by
+              fragment (see the *read_fragment_size* option of *configure*),
+              so the channel groups are not fully loaded in memory; the
+              string channels are stored as variable length strings
+
+              .. versionchanged:: 7.4.0
 
             * `mat` : Matlab .mat version 4, 5 or 7.3 export. If
               *single_time_base==False* the channels will be renamed in the mat
@@ -1166,7 +1444,19 @@ class MDF:
               master will be renamed to 'DM<cntr>_<channel name>'
               ( *<cntr>* is the data group index starting from 0)
 
-            * `parquet` : export to Apache parquet format
+            * `parquet` : export to Apache parquet format. If *pyarrow* is
+              available the channels are written in chunks; each chunk is a
+              row group, and the next chunk is decoded while the current row
+              group is encoded and compressed. Otherwise *fastparquet* is used
+              to write the whole dataframe. With *reduce_memory_usage* the
+              whole dataframe is also written when *pyarrow* is used
+
+              .. versionchanged:: 7.4.0 *pyarrow* is used instead of
+                *fastparquet* if both are installed. The *timestamps* column
+                is still read as the index by *pandas.read_parquet*, but the
+                invalid samples are written as nulls. When the chunks are
+                written the value to text conversions are also exported, as
+                dictionary encoded columns (categorical columns in pandas)
 
         filename : string | pathlib.Path
             export file name
@@ -1196,10 +1486,31 @@ class MDF:
             * `compression` : str
               compression to be used
 
-              * for ``parquet`` : "GZIP" or "SNAPPY"
+              * for ``parquet`` : "GZIP" or "SNAPPY"; also "ZSTD", "LZ4" or
+                "BROTLI" if *pyarrow* is used
               * for ``hfd5`` : "gzip", "lzf" or "szip"
               * for ``mat`` : bool
 
+            * `compression_opts` : Any
+              only valid for HDF5: options of the compression filter, for
+              example the "gzip" compression level
+
+              .. versionadded:: 7.4.0
+
+            * `chunks` : int
+              only valid for HDF5: number of samples in each chunk of the
+              datasets; by default the chunk shape is guessed by *h5py*
+
+              .. versionadded:: 7.4.0
+
+            * `workers` (0) : int
+              only valid for HDF5 if *single_time_base* is *False*: number of
+              threads that decode the channel groups while the calling thread
+              writes the HDF5 file. MDF version 2 and 3 files are always
+              decoded in the calling thread
+
+              .. versionadded:: 7.4.0
+
             * `time_as_date` (False) : bool
               export time as local timezone datetimee; only valid for CSV export
 
@@ -1253,6 +1564,12 @@ class MDF:
 
               .. versionadded:: 7.1.0
 
+            * chunk_ram_size (200MB) : int
+              only valid for parquet with *pyarrow*: desired RAM usage in bytes
+              of each row group
+
+              .. versionadded:: 7.4.0
+
 
         """
 
@@ -1287,26 +1604,40 @@ class MDF:
             "ignore_value2text_conversions", False
         )
         raw = bool(kwargs.get("raw", False))
-
-        if compression == "SNAPPY":
-            try:
-                import snappy
-            except ImportError:
-                logger.warning(
-                    "snappy compressor is not installed; compression will be set to GZIP"
-                )
-                compression = "GZIP"
+        chunk_ram_size = kwargs.get("chunk_ram_size", 200 * 1024 * 1024)
+        compression_opts = kwargs.get("compression_opts", None)
+        chunks = kwargs.get("chunks", None)
+        workers = int(kwargs.get("workers", 0) or 0)
+        parquet_engine = None
 
         filename = Path(filename) if filename else self.name
 
         if fmt == "parquet":
             try:
-                from fastparquet import write as write_parquet
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                parquet_engine = "pyarrow"
             except ImportError:
-                logger.warning(
-                    "fastparquet not found; export to parquet is unavailable"
-                )
-                return
+                try:
+                    from fastparquet import write as write_parquet
+
+                    parquet_engine = "fastparquet"
+                except ImportError:
+                    logger.warning(
+                        "pyarrow and fastparquet not found; export to parquet is unavailable"
+                    )
+                    return
+
+                # fastparquet needs python-snappy; pyarrow has a built-in codec
+                if compression == "SNAPPY":
+                    try:
+                        import snappy
+                    except ImportError:
+                        logger.warning(
+                            "snappy compressor is not installed; compression will be set to GZIP"
+                        )
+                        compression = "GZIP"
 
         elif fmt == "hdf5":
             try:
@@ -1346,7 +1677,11 @@ class MDF:
                 if progress.stop:
                     return TERMINATED
 
-        if single_time_base or fmt == "parquet":
+        # the minimum integer dtypes of *reduce_memory_usage* depend on all
+        # the samples, so in this case the dataframe is written
+        parquet_stream = parquet_engine == "pyarrow" and not reduce_memory_usage
+
+        if (single_time_base or fmt == "parquet") and not parquet_stream:
             df = self.to_dataframe(
                 raster=raster,
                 time_from_zero=time_from_zero,
@@ -1445,12 +1780,13 @@ class MDF:
                             else:
                                 continue
 
-                        if compression:
-                            dataset = group.create_dataset(
-                                channel, data=samples, compression=compression
-                            )
-                        else:
-                            dataset = group.create_dataset(channel, data=samples)
+                        dataset = group.create_dataset(
+                            channel,
+                            data=samples,
+                            **_hdf5_dataset_options(
+                                samples.shape, chunks, compression, compression_opts
+                            ),
+                        )
                         unit = unit.replace("\0", "")
                         if unit:
                             dataset.attrs["unit"] = unit
@@ -1468,6 +1804,15 @@ class MDF:
                                     return TERMINATED
 
             else:
+                groups_nr = len(self.virtual_groups)
+                tasks = []
+                for i, (group_index, virtual_group) in enumerate(
+                    self.virtual_groups.items()
+                ):
+                    channels = self.included_channels(group_index)[group_index]
+                    if channels:
+                        tasks.append((i, group_index, channels))
+
                 with HDF5(str(filename), "w") as hdf:
                     # header information
                     group = hdf.create_group(str(filename))
@@ -1477,12 +1822,10 @@ class MDF:
                             group.attrs[item] = self.header[item].replace(b"\0", b"")
 
                     # save each data group in a HDF5 group called
-                    # "DataGroup_<cntr>" with the index starting from 1
+                    # "ChannelGroup_<cntr>" with the index starting from 0
                     # each HDF5 group will have a string attribute "master"
                     # that will hold the name of the master channel
 
-                    groups_nr = len(self.virtual_groups)
-
                     if progress is not None:
                         if callable(progress):
                             progress(0, groups_nr)
@@ -1493,105 +1836,74 @@ class MDF:
                             if progress.stop:
                                 return TERMINATED
 
-                    for i, (group_index, virtual_group) in enumerate(
-                        self.virtual_groups.items()
-                    ):
-                        channels = self.included_channels(group_index)[group_index]
-
-                        if not channels:
-                            continue
-
-                        names = UniqueDB()
-                        if progress is not None and progress.stop:
-                            return TERMINATED
-
-                        if len(virtual_group.groups) == 1:
-                            comment = self.groups[
-                                virtual_group.groups[0]
-                            ].channel_group.comment
-                        else:
-                            comment = "Virtual group i"
-
-                        group_name = r"/" + f"ChannelGroup_{i}"
-                        group = hdf.create_group(group_name)
+                    # the datasets are written fragment by fragment as the
+                    # channel groups are decoded, so only a few fragments are
+                    # kept in memory instead of the complete channel groups
+                    group_indexes = {i: group_index for i, group_index, _ in tasks}
+                    datasets = {}
+                    done = 0
 
-                        group.attrs["comment"] = comment
+                    fragments = self._yield_hdf5_fragments(
+                        tasks, raw=raw, workers=workers
+                    )
+                    try:
+                        for i, fragment in fragments:
+                            if fragment is None:
+                                # all the fragments of the channel group were
+                                # written; trim the datasets if there were fewer
+                                # records than expected
+                                group_datasets, position = datasets.pop(i, ([], 0))
+                                for dataset in group_datasets:
+                                    if dataset is not None and len(dataset) != position:
+                                        dataset.resize(position, axis=0)
+
+                                done += 1
+                                if progress is not None:
+                                    if callable(progress):
+                                        progress(done, groups_nr)
+                                    else:
+                                        progress.signals.setValue.emit(done)
 
-                        master_index = self.masters_db.get(group_index, -1)
+                                        if progress.stop:
+                                            return TERMINATED
+                                continue
 
-                        if master_index >= 0:
-                            group.attrs["master"] = (
-                                self.groups[group_index].channels[master_index].name
-                            )
-                            master = self.get(group.attrs["master"], group_index)
-                            if reduce_memory_usage:
-                                master.timestamps = downcast(master.timestamps)
-                            if compression:
-                                dataset = group.create_dataset(
-                                    group.attrs["master"],
-                                    data=master.timestamps,
-                                    compression=compression,
-                                )
-                            else:
-                                dataset = group.create_dataset(
-                                    group.attrs["master"],
-                                    data=master.timestamps,
-                                    dtype=master.timestamps.dtype,
+                            master, samples, signals = fragment
+
+                            if signals is not None:
+                                datasets[i] = (
+                                    self._create_hdf5_datasets(
+                                        hdf,
+                                        i,
+                                        group_indexes[i],
+                                        master,
+                                        samples,
+                                        signals,
+                                        use_display_names=use_display_names,
+                                        reduce_memory_usage=reduce_memory_usage,
+                                        chunks=chunks,
+                                        compression=compression,
+                                        compression_opts=compression_opts,
+                                    ),
+                                    0,
                                 )
-                            unit = master.unit.replace("\0", "")
-                            if unit:
-                                dataset.attrs["unit"] = unit
-                            comment = master.comment.replace("\0", "")
-                            if comment:
-                                dataset.attrs["comment"] = comment
-
-                        channels = [
-                            (None, gp_index, ch_index)
-                            for gp_index, channel_indexes in channels.items()
-                            for ch_index in channel_indexes
-                        ]
-
-                        if not channels:
-                            continue
 
-                        channels = self.select(channels, raw=raw)
-
-                        for j, sig in enumerate(channels):
-                            if use_display_names:
-                                name = (
-                                    list(sig.display_names)[0]
-                                    if sig.display_names
-                                    else sig.name
-                                )
-                            else:
-                                name = sig.name
-                            name = name.replace("\\", "_").replace("/", "_")
-                            name = names.get_unique_name(name)
-                            if reduce_memory_usage:
-                                sig.samples = downcast(sig.samples)
-                            if compression:
-                                dataset = group.create_dataset(
-                                    name, data=sig.samples, compression=compression
-                                )
-                            else:
-                                dataset = group.create_dataset(
-                                    name, data=sig.samples, dtype=sig.samples.dtype
-                                )
-                            unit = sig.unit.replace("\0", "")
-                            if unit:
-                                dataset.attrs["unit"] = unit
-                            comment = sig.comment.replace("\0", "")
-                            if comment:
-                                dataset.attrs["comment"] = comment
+                            group_datasets, position = datasets[i]
+                            end = position + len(master)
 
-                        if progress is not None:
-                            if callable(progress):
-                                progress(i + 1, groups_nr)
-                            else:
-                                progress.signals.setValue.emit(i + 1)
+                            for dataset, values in zip(
+                                group_datasets, [master, *samples]
+                            ):
+                                if dataset is None:
+                                    continue
+                                if len(dataset) < end:
+                                    dataset.resize(end, axis=0)
+                                dataset[position:end] = values
 
-                                if progress.stop:
-                                    return TERMINATED
+                            datasets[i] = (group_datasets, end)
+                    finally:
+                        # stops the decoding threads
+                        fragments.close()
 
         elif fmt == "csv":
             fmtparams = {
@@ -2049,10 +2361,94 @@ class MDF:
 
         elif fmt == "parquet":
             filename = filename.with_suffix(".parquet")
-            if compression:
-                write_parquet(filename, df, compression=compression)
+
+            if parquet_engine == "fastparquet":
+                if compression:
+                    write_parquet(filename, df, compression=compression)
+                else:
+                    write_parquet(filename, df)
+
+            elif not parquet_stream:
+                pq.write_table(
+                    pa.Table.from_pandas(df),
+                    filename,
+                    compression=compression or "NONE",
+                )
+
             else:
-                write_parquet(filename, df)
+                batches = self.iter_to_arrow(
+                    raster=raster,
+                    time_from_zero=time_from_zero,
+                    use_display_names=use_display_names,
+                    empty_channels=empty_channels,
+                    ignore_value2text_conversions=ignore_value2text_conversions,
+                    raw=raw,
+                    chunk_ram_size=chunk_ram_size,
+                    progress=progress,
+                )
+
+                writer = None
+                try:
+                    # the next record batch is decoded in the worker thread
+                    # while the writer encodes and compresses the current one,
+                    # so at most two row groups are kept in memory
+                    with ThreadPoolExecutor(max_workers=1) as executor:
+                        future = executor.submit(next, batches, None)
+
+                        while True:
+                            batch = future.result()
+                            if batch is None:
+                                break
+
+                            future = executor.submit(next, batches, None)
+
+                            # the numeric 1D columns and the value to text
+                            # conversions dictionary columns are exported
+                            batch = batch.select(
+                                [
+                                    name
+                                    for name, type in zip(
+                                        batch.schema.names, batch.schema.types
+                                    )
+                                    if pa.types.is_integer(type)
+                                    or pa.types.is_floating(type)
+                                    or pa.types.is_dictionary(type)
+                                ]
+                            )
+
+                            if writer is None:
+                                writer = pq.ParquetWriter(
+                                    filename,
+                                    batch.schema.with_metadata(
+                                        _parquet_pandas_metadata(
+                                            batch.schema.field("timestamps").type
+                                        )
+                                    ),
+                                    compression=compression or "NONE",
+                                )
+                            elif batch.schema != writer.schema:
+                                batch = pa.Table.from_batches([batch]).cast(
+                                    writer.schema
+                                )
+
+                            writer.write(batch, row_group_size=batch.num_rows)
+                            del batch
+
+                    if writer is None:
+                        pq.write_table(
+                            pa.table(
+                                {"timestamps": pa.array([], type=pa.float64())},
+                                metadata=_parquet_pandas_metadata(pa.float64()),
+                            ),
+                            filename,
+                            compression=compression or "NONE",
+                        )
+                finally:
+                    if writer is not None:
+                        writer.close()
+
+                if progress is not None and not callable(progress) and progress.stop:
+                    return TERMINATED
 
         else:
             message = (
@@ -2062,6 +2458,233 @@ class MDF:
             message.format(fmt)
             logger.warning(message)
 
+    def _yield_hdf5_fragments(
+        self,
+        tasks: list[tuple[int, int, dict[int, list[int]]]],
+        raw: bool = False,
+        workers: int = 0,
+    ) -> Iterator[
+        tuple[int, tuple[NDArray[Any], list[NDArray[Any]], list[Signal] | None] | None]
+    ]:
+        """yield the fragments of the selected channels of each channel group
+        for the HDF5 export. Each item is the channel group counter and the
+        (master, samples, signals) tuple; the signals, that give the channel
+        metadata, are only set for the first fragment of the channel group.
+        *None* is yielded instead of the tuple after the last fragment.
+
+        If *workers* is larger than 0 the channel groups are decoded in worker
+        threads and the fragments are handed over through a bounded queue, so
+        that the calling thread is the only one that writes to the HDF5 file.
+
+        Parameters
+        ----------
+        tasks : list
+            (channel group counter, virtual group index, included channels)
+            tuples
+        raw : bool
+            keep the raw samples
+        workers : int
+            number of worker threads; MDF version 2 and 3 files are always
+            decoded in the calling thread
+
+        """
+
+        def fragments(virtual_group, groups):
+            conversions = []
+            for idx, sigs in enumerate(
+                self._yield_selected_signals(virtual_group, groups=groups)
+            ):
+                if not sigs:
+                    break
+
+                if idx == 0:
+                    signals = sigs
+                    master = sigs[0].timestamps
+                    samples = [sig.samples for sig in sigs]
+                    if not raw:
+                        conversions = [sig.conversion for sig in sigs]
+                else:
+                    signals = None
+                    master = sigs[0][0]
+                    samples = [sig for sig, _ in sigs[1:]]
+
+                for j, conversion in enumerate(conversions):
+                    if conversion is not None:
+                        samples[j] = conversion.convert(samples[j])
+
+                yield master, samples, signals
+
+        if workers <= 0 or self.version < "4.00":
+            for i, virtual_group, groups in tasks:
+                for fragment in fragments(virtual_group, groups):
+                    yield i, fragment
+                yield i, None
+            return
+
+        for i, virtual_group, groups in tasks:
+            for gp_index, channel_indexes in groups.items():
+                self._mdf._load_blocks_info(gp_index, channel_indexes)
+
+        # at most one fragment per worker waits in the queue
+        queue = Queue(maxsize=workers)
+        stop = Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    queue.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    pass
+            return False
+
+        def decode(i, virtual_group, groups):
+            try:
+                for fragment in fragments(virtual_group, groups):
+                    if not put((i, fragment)):
+                        return
+            except BaseException as exc:
+                put((i, exc))
+            else:
+                put((i, None))
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="asammdf_export"
+        ) as executor:
+            try:
+                for task in tasks:
+                    executor.submit(decode, *task)
+
+                for _ in range(len(tasks)):
+                    while True:
+                        i, fragment = queue.get()
+                        if isinstance(fragment, BaseException):
+                            raise fragment
+                        yield i, fragment
+                        if fragment is None:
+                            break
+            finally:
+                # release the workers that wait for free queue slots
+                stop.set()
+
+    def _create_hdf5_datasets(
+        self,
+        hdf: Any,
+        i: int,
+        index: int,
+        master: NDArray[Any],
+        samples: list[NDArray[Any]],
+        signals: list[Signal],
+        use_display_names: bool = True,
+        reduce_memory_usage: bool = False,
+        chunks: int | None = None,
+        compression: str = "",
+        compression_opts: Any = None,
+    ) -> list[Any]:
+        """create the HDF5 group and the datasets of a channel group using the
+        first fragment; the datasets are sized for all the channel group
+        records and they are filled fragment by fragment
+
+        Parameters
+        ----------
+        hdf : h5py.File
+            HDF5 file
+        i : int
+            channel group counter
+        index : int
+            virtual group index
+        master : np.array
+            master samples of the first fragment
+        samples : list
+            channels samples of the first fragment
+        signals : list
+            signals of the first fragment
+        use_display_names : bool
+            use the display names as dataset names
+        reduce_memory_usage : bool
+            store the float channels as float32
+        chunks : int
+            number of samples in each HDF5 chunk; by default the chunk shape is
+            guessed by h5py
+        compression : str
+            HDF5 compression filter
+        compression_opts : Any
+            compression filter options
+
+        Returns
+        -------
+        datasets : list
+            master dataset (*None* if the group has no master channel) followed
+            by the channel datasets
+
+        """
+        from h5py import string_dtype
+
+        virtual_group = self.virtual_groups[index]
+        size = virtual_group.cycles_nr
+
+        if len(virtual_group.groups) == 1:
+            comment = self.groups[virtual_group.groups[0]].channel_group.comment
+        else:
+            comment = "Virtual group i"
+
+        group = hdf.create_group(r"/" + f"ChannelGroup_{i}")
+        group.attrs["comment"] = comment
+
+        def create(name, values, unit, comment):
+            if values.dtype.kind == "S":
+                # the size of the strings can change from one fragment to the
+                # next one so variable length strings are used
+                dtype = string_dtype("ascii")
+            elif reduce_memory_usage and values.dtype.kind == "f":
+                dtype = np.float32
+            else:
+                dtype = values.dtype
+
+            shape = (size,) + values.shape[1:]
+            dataset = group.create_dataset(
+                name,
+                shape=shape,
+                dtype=dtype,
+                **_hdf5_dataset_options(shape, chunks, compression, compression_opts),
+            )
+            unit = unit.replace("\0", "")
+            if unit:
+                dataset.attrs["unit"] = unit
+            comment = comment.replace("\0", "")
+            if comment:
+                dataset.attrs["comment"] = comment
+
+            return dataset
+
+        master_index = self.masters_db.get(index, -1)
+
+        if master_index >= 0:
+            group.attrs["master"] = self.groups[index].channels[master_index].name
+            datasets = [
+                create(
+                    group.attrs["master"],
+                    master,
+                    self.get_channel_unit(group=index, index=master_index),
+                    self.get_channel_comment(group=index, index=master_index),
+                )
+            ]
+        else:
+            datasets = [None]
+
+        names = UniqueDB()
+        for sig, values in zip(signals, samples):
+            if use_display_names:
+                name = list(sig.display_names)[0] if sig.display_names else sig.name
+            else:
+                name = sig.name
+            name = name.replace("\\", "_").replace("/", "_")
+            name = names.get_unique_name(name)
+
+            datasets.append(create(name, values, sig.unit, sig.comment))
+
+        return datasets
+
     def filter(
         self, channels: ChannelsType, version: str | None = None, progress=None
     ) -> MDF:
@@ -2166,31 +2789,37 @@ class MDF:
                 if progress.stop:
                     return TERMINATED
 
+        transferred = 0
+
         for i, (group_index, groups) in enumerate(gps.items()):
-            for idx, sigs in enumerate(
-                self._yield_selected_signals(
-                    group_index, groups=groups, version=version
-                )
-            ):
-                if not sigs:
-                    break
+            if mdf._transfer_group(self, group_index, groups) is not None:
+                transferred += 1
 
-                if idx == 0:
-                    if sigs:
-                        cg = self.groups[group_index].channel_group
-                        cg_nr = mdf.append(
-                            sigs,
-                            common_timebase=True,
-                            comment=cg.comment,
-                        )
-                        MDF._transfer_channel_group_data(
-                            mdf.groups[cg_nr].channel_group, cg
-                        )
-                    else:
+            else:
+                for idx, sigs in enumerate(
+                    self._yield_selected_signals(
+                        group_index, groups=groups, version=version
+                    )
+                ):
+                    if not sigs:
                         break
 
-                else:
-                    mdf.extend(cg_nr, sigs)
+                    if idx == 0:
+                        if sigs:
+                            cg = self.groups[group_index].channel_group
+                            cg_nr = mdf.append(
+                                sigs,
+                                common_timebase=True,
+                                comment=cg.comment,
+                            )
+                            MDF._transfer_channel_group_data(
+                                mdf.groups[cg_nr].channel_group, cg
+                            )
+                        else:
+                            break
+
+                    else:
+                        mdf.extend(cg_nr, sigs)
 
             if progress is not None:
                 if callable(progress):
@@ -2205,6 +2834,11 @@ class MDF:
 
         mdf._transfer_metadata(self, message=f"Filtered from {self.name}")
 
+        logger.debug(
+            f"{transferred} of {groups_nr} channel groups transferred without "
+            "decoding the samples"
+        )
+
         return mdf
 
     @overload
@@ -2216,6 +2850,8 @@ class MDF:
         raster: float | None = ...,
         samples_only: Literal[False] = ...,
         raw: bool = ...,
+        start: float | None = ...,
+        stop: float | None = ...,
     ) -> Iterator[Signal]:
         ...
 
@@ -2228,6 +2864,8 @@ class MDF:
         raster: float | None = ...,
         samples_only: Literal[True] = ...,
         raw: bool = ...,
+        start: float | None = ...,
+        stop: float | None = ...,
     ) -> Iterator[tuple[NDArray[Any], NDArray[Any] | None]]:
         ...
 
@@ -2239,6 +2877,8 @@ class MDF:
         raster: float | None = None,
         samples_only: bool = False,
         raw: bool = False,
+        start: float | None = None,
+        stop: float | None = None,
     ) -> Iterator[Signal] | Iterator[tuple[NDArray[Any], NDArray[Any] | None]]:
         """iterator over a channel
 
@@ -2263,6 +2903,17 @@ class MDF:
         raw : bool
             return channel samples without appling the conversion rule; default
             `False`
+        start : float
+            only iterate over the samples with timestamps greater or equal to
+            *start*; default *None*
+
+            .. versionadded:: 7.4.0
+
+        stop : float
+            only iterate over the samples with timestamps lower or equal to
+            *stop*; default *None*
+
+            .. versionadded:: 7.4.0
 
         """
 
@@ -2270,7 +2921,13 @@ class MDF:
 
         grp = self.groups[gp_nr]
 
-        data = self._load_data(grp)
+        if start is not None or stop is not None:
+            record_offset, record_count = self._get_records_range(gp_nr, start, stop)
+            data = self._load_data(
+                grp, record_offset=record_offset, record_count=record_count
+            )
+        else:
+            data = self._load_data(grp)
 
         for fragment in data:
             yield self.get(
@@ -3277,6 +3934,11 @@ class MDF:
         ignore_value2text_conversions: bool = False,
         record_count: int | None = None,
         validate: bool = False,
+        start: float | None = None,
+        stop: float | None = None,
+        workers: int = 0,
+        use_processes: bool = False,
+        memory_budget: int | None = None,
     ) -> list[Signal]:
         """retrieve the channels listed in *channels* argument as *Signal*
         objects
@@ -3313,6 +3975,43 @@ class MDF:
 
             .. versionadded:: 5.16.0
 
+        start : float
+            only select the samples with timestamps greater or equal to *start*;
+            this is used instead of *record_offset* and *record_count*. Default
+            *None*
+
+            .. versionadded:: 7.4.0
+
+        stop : float
+            only select the samples with timestamps lower or equal to *stop*;
+            this is used instead of *record_offset* and *record_count*. Default
+            *None*
+
+            .. versionadded:: 7.4.0
+
+        workers : int
+            number of workers used to load the channel groups concurrently;
+            default 0 and in this case the groups are loaded one after another.
+            The concurrent loading with threads is used only for MDF version 4
+            files
+
+            .. versionadded:: 7.4.0
+
+        use_processes : bool
+            use a pool of processes instead of a pool of threads; each worker
+            process opens the file again so this is possible only if all the
+            selected groups are stored in the original file. Default *False*
+
+            .. versionadded:: 7.4.0
+
+        memory_budget : int
+            maximum estimated size in bytes of the channel groups that are
+            loaded at the same time; a group larger than the budget is still
+            loaded, but alone. Default *None* and in this case only the number
+            of workers limits the concurrent loading
+
+            .. versionadded:: 7.4.0
+
         Returns
         -------
         signals : list
@@ -3366,69 +4065,78 @@ class MDF:
 
         output_signals = {}
 
-        for virtual_group, groups in virtual_groups.items():
-            cycles_nr = self._mdf.virtual_groups[virtual_group].cycles_nr
-            pairs = [
-                (gp_index, ch_index)
-                for gp_index, channel_indexes in groups.items()
-                for ch_index in channel_indexes
-            ]
+        use_time_window = start is not None or stop is not None
 
-            if record_count is None:
-                cycles = cycles_nr - record_offset
-            else:
-                if cycles_nr < record_count + record_offset:
-                    cycles = cycles_nr - record_offset
-                else:
-                    cycles = record_count
+        tasks = []
+        for virtual_group, groups in virtual_groups.items():
+            if use_time_window:
+                record_offset, record_count = self._get_records_range(
+                    virtual_group, start, stop
+                )
+            tasks.append((virtual_group, groups, record_offset, record_count))
 
-            signals = []
+        workers = int(workers or 0)
+        if workers > 1 and len(tasks) > 1:
+            if use_processes and not self._can_select_in_processes(virtual_groups):
+                logger.warning(
+                    "The selected channels cannot be loaded in separate "
+                    "processes because they are not stored in a file on disk; "
+                    "threads will be used instead"
+                )
+                use_processes = False
 
-            current_pos = 0
+            if not use_processes and self.version < "4.00":
+                workers = 0
 
-            for idx, sigs in enumerate(
-                self._yield_selected_signals(
-                    virtual_group,
-                    groups=groups,
-                    record_offset=record_offset,
-                    record_count=record_count,
+        if workers > 1 and len(tasks) > 1:
+            if use_processes:
+                executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_select_worker_init,
+                    initargs=(self.name, self._select_worker_kwargs()),
                 )
-            ):
-                if not sigs:
-                    break
-                if idx == 0:
-                    next_pos = current_pos + len(sigs[0])
+            else:
+                for groups in virtual_groups.values():
+                    for gp_index, channel_indexes in groups.items():
+                        self._mdf._load_blocks_info(gp_index, channel_indexes)
 
-                    master = np.empty(cycles, dtype=sigs[0].timestamps.dtype)
-                    master[current_pos:next_pos] = sigs[0].timestamps
+                executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="asammdf_select"
+                )
 
-                    for sig in sigs:
-                        shape = (cycles,) + sig.samples.shape[1:]
-                        signal = np.empty(shape, dtype=sig.samples.dtype)
-                        signal[current_pos:next_pos] = sig.samples
-                        sig.samples = signal
-                        signals.append(sig)
+            with executor:
+                pending = {}
+                pending_size = 0
 
-                        if sig.invalidation_bits is not None:
-                            inval = np.empty(cycles, dtype=sig.invalidation_bits.dtype)
-                            inval[current_pos:next_pos] = sig.invalidation_bits
-                            sig.invalidation_bits = inval
+                for task in tasks:
+                    virtual_group, groups, record_offset, record_count = task
 
-                else:
-                    sig, _ = sigs[0]
-                    next_pos = current_pos + len(sig)
-                    master[current_pos:next_pos] = sig
+                    size = self._estimate_selection_size(
+                        virtual_group, record_offset, record_count
+                    )
+                    if memory_budget is not None:
+                        while pending and pending_size + size > memory_budget:
+                            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                pending_size -= pending.pop(future)
+                                output_signals.update(future.result())
+
+                    if use_processes:
+                        future = executor.submit(
+                            _select_worker_task, groups, record_offset, record_count
+                        )
+                    else:
+                        future = executor.submit(self._select_virtual_group, *task)
 
-                    for signal, (sig, inval) in zip(signals, sigs[1:]):
-                        signal.samples[current_pos:next_pos] = sig
-                        if signal.invalidation_bits is not None:
-                            signal.invalidation_bits[current_pos:next_pos] = inval
+                    pending[future] = size
+                    pending_size += size
 
-                current_pos = next_pos
+                for future in pending:
+                    output_signals.update(future.result())
 
-            for signal, pair in zip(signals, pairs):
-                signal.timestamps = master
-                output_signals[pair] = signal
+        else:
+            for task in tasks:
+                output_signals.update(self._select_virtual_group(*task))
 
         indexes = []
 
@@ -3485,6 +4193,250 @@ class MDF:
 
         return signals
 
+    def _select_virtual_group(
+        self,
+        virtual_group: int,
+        groups: dict[int, list[int]],
+        record_offset: int = 0,
+        record_count: int | None = None,
+    ) -> dict[tuple[int, int], Signal]:
+        """load the raw signals of the selected channels from a virtual group
+
+        Parameters
+        ----------
+        virtual_group : int
+            virtual group index
+        groups : dict
+            selected channel indexes for each group of the virtual group
+        record_offset : int
+            record number offset
+        record_count : int
+            number of records to read; default *None* and in this case all
+            available records are used
+
+        Returns
+        -------
+        signals : dict
+            raw *Signal* objects with the (group index, channel index) keys
+
+        """
+        views = self._select_views(groups, record_offset, record_count)
+        if views is not None:
+            return views
+
+        cycles_nr = self._mdf.virtual_groups[virtual_group].cycles_nr
+
+        pairs = [
+            (gp_index, ch_index)
+            for gp_index, channel_indexes in groups.items()
+            for ch_index in channel_indexes
+        ]
+
+        if record_count is None:
+            cycles = cycles_nr - record_offset
+        else:
+            if cycles_nr < record_count + record_offset:
+                cycles = cycles_nr - record_offset
+            else:
+                cycles = record_count
+
+        signals = []
+
+        current_pos = 0
+
+        for idx, sigs in enumerate(
+            self._yield_selected_signals(
+                virtual_group,
+                groups=groups,
+                record_offset=record_offset,
+                record_count=record_count,
+            )
+        ):
+            if not sigs:
+                break
+            if idx == 0:
+                next_pos = current_pos + len(sigs[0])
+
+                master = np.empty(cycles, dtype=sigs[0].timestamps.dtype)
+                master[current_pos:next_pos] = sigs[0].timestamps
+
+                for sig in sigs:
+                    shape = (cycles,) + sig.samples.shape[1:]
+                    signal = np.empty(shape, dtype=sig.samples.dtype)
+                    signal[current_pos:next_pos] = sig.samples
+                    sig.samples = signal
+                    signals.append(sig)
+
+                    if sig.invalidation_bits is not None:
+                        inval = np.empty(cycles, dtype=sig.invalidation_bits.dtype)
+                        inval[current_pos:next_pos] = sig.invalidation_bits
+                        sig.invalidation_bits = inval
+
+            else:
+                sig, _ = sigs[0]
+                next_pos = current_pos + len(sig)
+                master[current_pos:next_pos] = sig
+
+                for signal, (sig, inval) in zip(signals, sigs[1:]):
+                    signal.samples[current_pos:next_pos] = sig
+                    if signal.invalidation_bits is not None:
+                        signal.invalidation_bits[current_pos:next_pos] = inval
+
+            current_pos = next_pos
+
+        output_signals = {}
+        for signal, pair in zip(signals, pairs):
+            signal.timestamps = master
+            output_signals[pair] = signal
+
+        return output_signals
+
+    def _select_views(
+        self,
+        groups: dict[int, list[int]],
+        record_offset: int = 0,
+        record_count: int | None = None,
+    ) -> dict[tuple[int, int], Signal] | None:
+        """in the zero copy mode return the raw signals as read-only arrays
+        over the mapped file, if all the selected channels and their master
+        can be accessed in place
+
+        Parameters
+        ----------
+        groups : dict
+            selected channel indexes for each group of the virtual group
+        record_offset : int
+            record number offset
+        record_count : int
+            number of records to read; default *None* and in this case all
+            available records are used
+
+        Returns
+        -------
+        signals : dict | None
+            raw *Signal* objects with the (group index, channel index) keys or
+            *None* if the signals have to be loaded from the data blocks
+
+        """
+        mdf = self._mdf
+        if self.version < "4.00" or not mdf._zero_copy or len(groups) != 1:
+            return None
+
+        ((gp_index, channel_indexes),) = groups.items()
+        group = mdf.groups[gp_index]
+        block = mdf._get_view_data_block(group)
+
+        if (
+            block is None
+            or mdf._get_master_view(gp_index, block, 0, 0) is None
+            or any(
+                mdf._get_channel_view(group, ch_index, block, 0, 0) is None
+                for ch_index in channel_indexes
+            )
+        ):
+            return None
+
+        return {
+            (gp_index, ch_index): mdf.get(
+                group=gp_index,
+                index=ch_index,
+                raw=True,
+                ignore_invalidation_bits=True,
+                record_offset=record_offset,
+                record_count=record_count,
+                skip_channel_validation=True,
+            )
+            for ch_index in channel_indexes
+        }
+
+    def _estimate_selection_size(
+        self,
+        virtual_group: int,
+        record_offset: int = 0,
+        record_count: int | None = None,
+    ) -> int:
+        """estimated number of bytes needed to load the virtual group records"""
+        virtual_channel_group = self._mdf.virtual_groups[virtual_group]
+
+        cycles = max(virtual_channel_group.cycles_nr - record_offset, 0)
+        if record_count is not None:
+            cycles = min(cycles, record_count)
+
+        # the records bytes and the float64 timestamps
+        return cycles * (virtual_channel_group.record_size + 8)
+
+    def _select_worker_kwargs(self) -> dict[str, Any]:
+        """the arguments used to open the file again in the worker processes;
+        the same load filter must be used so that the group and channel
+        indexes point to the same channels"""
+        kwargs = {
+            key: value
+            for key, value in self._kwargs.items()
+            if key not in _SELECT_WORKER_SKIPPED_KWARGS
+        }
+        kwargs["use_display_names"] = self._use_display_names
+        kwargs[
+            "remove_source_from_channel_names"
+        ] = self._remove_source_from_channel_names
+        if self.use_load_filter:
+            kwargs["channels"] = sorted(self.load_filter)
+
+        return kwargs
+
+    def _can_select_in_processes(self, virtual_groups: dict[int, Any]) -> bool:
+        """the worker processes can only load the data that is found in the
+        file on disk"""
+        mdf = self._mdf
+        if mdf._from_filelike or getattr(mdf, "_delete_on_close", False):
+            return False
+
+        if not Path(self.name).is_file():
+            return False
+
+        if self.version >= "4.00":
+            location = v4c.LOCATION_ORIGINAL_FILE
+        else:
+            location = v23c.LOCATION_ORIGINAL_FILE
+
+        return all(
+            self.groups[gp_index].data_location == location
+            for groups in virtual_groups.values()
+            for gp_index in groups
+        )
+
+    @staticmethod
+    def peek(name: InputType, **kwargs) -> MDF:
+        """open a measurement only to inspect its metadata: the header, start
+        time, file history, attachments, events, channel names and the cycles
+        count of the channel groups. The data blocks are never read, unsorted
+        files are not sorted and no temporary file is created. This is the
+        same as using *metadata_only=True*; for MDF4 files the channel metadata
+        is parsed in the "lazy" mode unless the *metadata* argument is given.
+
+        .. versionadded:: 7.4.0
+
+        Parameters
+        ----------
+        name : str | pathlib.Path | BytesIO
+            mdf file name or file-like object
+        kwargs :
+            the other keyword arguments of the *MDF* class
+
+        Returns
+        -------
+        mdf : MDF
+            *MDF* object; the samples of the channels cannot be read
+
+        Examples
+        --------
+        >>> with MDF.peek('path/to/file.mf4') as mdf:
+        ...     print(mdf.start_time, [group.channel_group.cycles_nr for group in mdf.groups])
+
+        """
+        kwargs["metadata_only"] = True
+        kwargs.setdefault("metadata", "lazy")
+        return MDF(name, **kwargs)
+
     @staticmethod
     def scramble(
         name: StrPathType, skip_attachments: bool = False, progress=None, **kwargs
@@ -4031,35 +4983,19 @@ class MDF:
 
         """
 
+        # the selected channels are read group by group from this measurement
         if channels:
-            mdf = self.filter(channels)
-
-            result = mdf.iter_to_dataframe(
-                raster=raster,
-                time_from_zero=time_from_zero,
-                empty_channels=empty_channels,
-                keep_arrays=keep_arrays,
-                use_display_names=use_display_names,
-                time_as_date=time_as_date,
-                reduce_memory_usage=reduce_memory_usage,
-                raw=raw,
-                ignore_value2text_conversions=ignore_value2text_conversions,
-                use_interpolation=use_interpolation,
-                only_basenames=only_basenames,
-                chunk_ram_size=chunk_ram_size,
-                interpolate_outwards_with_nan=interpolate_outwards_with_nan,
-                numeric_1D_only=numeric_1D_only,
-            )
-
-            for df in result:
-                yield df
-
-            mdf.close()
+            selection = self.included_channels(channels=channels)
+        else:
+            selection = {
+                index: self.included_channels(index)[index]
+                for index in self.virtual_groups
+            }
 
         df = {}
         self._set_temporary_master(None)
 
-        masters = {index: self.get_master(index) for index in self.virtual_groups}
+        masters = {index: self.get_master(index) for index in selection}
 
         if raster is not None:
             try:
@@ -4073,16 +5009,26 @@ class MDF:
                 else:
                     raster = np.array(raster)
             else:
-                raster = master_using_raster(self, raster)
+                raster = master_using_raster(self, raster, groups=selection)
             master = raster
         else:
             if masters:
-                master = reduce(np.union1d, masters.values())
+                master = merge_timebases(list(masters.values()))
             else:
                 master = np.array([], dtype="<f4")
 
         master_ = master
-        channel_count = sum(len(gp.channels) - 1 for gp in self.groups) + 1
+        if channels:
+            channel_count = (
+                sum(
+                    len(channel_indexes)
+                    for groups in selection.values()
+                    for channel_indexes in groups.values()
+                )
+                + 1
+            )
+        else:
+            channel_count = sum(len(gp.channels) - 1 for gp in self.groups) + 1
         # approximation with all float64 dtype
         itemsize = channel_count * 8
         # use 200MB DataFrame chunks
@@ -4103,7 +5049,7 @@ class MDF:
             used_names = UniqueDB()
             used_names.get_unique_name("timestamps")
 
-            groups_nr = len(self.virtual_groups)
+            groups_nr = len(selection)
 
             if progress is not None:
                 if callable(progress):
@@ -4115,7 +5061,8 @@ class MDF:
                     if progress.stop:
                         return TERMINATED
 
-            for group_index, virtual_group in self.virtual_groups.items():
+            for group_index, groups in selection.items():
+                virtual_group = self.virtual_groups[group_index]
                 group_cycles = virtual_group.cycles_nr
                 if group_cycles == 0 and empty_channels == "skip":
                     continue
@@ -4126,17 +5073,16 @@ class MDF:
                 stop = np.searchsorted(masters[group_index], end).flatten()[0]
                 record_count = min(stop - record_offset + 1, group_cycles)
 
-                channels = [
+                group_channels = [
                     (None, gp_index, ch_index)
-                    for gp_index, channel_indexes in self.included_channels(
-                        group_index
-                    )[group_index].items()
+                    for gp_index, channel_indexes in groups.items()
                     for ch_index in channel_indexes
+                    if ch_index != self.masters_db.get(gp_index, None)
                 ]
                 signals = [
                     signal
                     for signal in self.select(
-                        channels,
+                        group_channels,
                         raw=True,
                         copy_master=False,
                         record_offset=record_offset,
@@ -4477,27 +5423,14 @@ class MDF:
         dataframe : pandas.DataFrame
 
         """
+        # the selected channels are read group by group from this measurement
         if channels is not None:
-            mdf = self.filter(channels)
-
-            result = mdf.to_dataframe(
-                raster=raster,
-                time_from_zero=time_from_zero,
-                empty_channels=empty_channels,
-                keep_arrays=keep_arrays,
-                use_display_names=use_display_names,
-                time_as_date=time_as_date,
-                reduce_memory_usage=reduce_memory_usage,
-                raw=raw,
-                ignore_value2text_conversions=ignore_value2text_conversions,
-                use_interpolation=use_interpolation,
-                only_basenames=only_basenames,
-                interpolate_outwards_with_nan=interpolate_outwards_with_nan,
-                numeric_1D_only=numeric_1D_only,
-            )
-
-            mdf.close()
-            return result
+            selection = self.included_channels(channels=channels)
+        else:
+            selection = {
+                index: self.included_channels(index)[index]
+                for index in self.virtual_groups
+            }
 
         target_byte_order = "<=" if sys.byteorder == "little" else ">="
 
@@ -4515,13 +5448,13 @@ class MDF:
                 else:
                     raster = np.array(raster)
             else:
-                raster = master_using_raster(self, raster)
+                raster = master_using_raster(self, raster, groups=selection)
             master = raster
         else:
-            masters = {index: self.get_master(index) for index in self.virtual_groups}
+            masters = {index: self.get_master(index) for index in selection}
 
             if masters:
-                master = reduce(np.union1d, masters.values())
+                master = merge_timebases(list(masters.values()))
             else:
                 master = np.array([], dtype="<f4")
 
@@ -4533,7 +5466,7 @@ class MDF:
         used_names = UniqueDB()
         used_names.get_unique_name("timestamps")
 
-        groups_nr = len(self.virtual_groups)
+        groups_nr = len(selection)
 
         if progress is not None:
             if callable(progress):
@@ -4545,17 +5478,14 @@ class MDF:
                 if progress.stop:
                     return TERMINATED
 
-        for group_index, (virtual_group_index, virtual_group) in enumerate(
-            self.virtual_groups.items()
-        ):
+        for group_index, (virtual_group_index, groups) in enumerate(selection.items()):
+            virtual_group = self.virtual_groups[virtual_group_index]
             if virtual_group.cycles_nr == 0 and empty_channels == "skip":
                 continue
 
-            channels = [
+            group_channels = [
                 (None, gp_index, ch_index)
-                for gp_index, channel_indexes in self.included_channels(
-                    virtual_group_index
-                )[virtual_group_index].items()
+                for gp_index, channel_indexes in groups.items()
                 for ch_index in channel_indexes
                 if ch_index != self.masters_db.get(gp_index, None)
             ]
@@ -4563,7 +5493,7 @@ class MDF:
             signals = [
                 signal
                 for signal in self.select(
-                    channels, raw=True, copy_master=False, validate=False
+                    group_channels, raw=True, copy_master=False, validate=False
                 )
             ]
 
@@ -4776,6 +5706,543 @@ class MDF:
 
         return df
 
+    def iter_to_arrow(
+        self,
+        channels: ChannelsType | None = None,
+        raster: RasterType | None = None,
+        time_from_zero: bool = True,
+        empty_channels: EmptyChannelsType = "skip",
+        use_display_names: bool = False,
+        time_as_date: bool = False,
+        raw: bool = False,
+        ignore_value2text_conversions: bool = False,
+        use_interpolation: bool = True,
+        only_basenames: bool = False,
+        chunk_ram_size: int = 200 * 1024 * 1024,
+        interpolate_outwards_with_nan: bool = False,
+        numeric_1D_only: bool = False,
+        progress=None,
+    ) -> Iterator[pa.RecordBatch]:
+        """generator that yields Apache Arrow record batches that should not
+        exceed 200MB of RAM; the timestamps and the columns are the same as
+        the ones of *to_dataframe*, but the arrays are built directly from the
+        channels samples:
+
+        * the numeric samples buffers are used without copy
+        * the string channels give string arrays built from offsets and data
+          buffers
+        * the value to text conversions give dictionary arrays
+        * the invalidation bits give the arrays validity bitmaps, so the
+          invalid samples are nulls instead of being removed
+        * the channel arrays give fixed size list arrays
+
+        All the record batches have the same schema and the timestamps are
+        relative to the first timestamp of the measurement if
+        *time_from_zero* is used.
+
+        .. versionadded:: 7.4.0
+
+        Parameters
+        ----------
+        channels : list
+            list of items to be filtered (default None); each item can be :
+
+                * a channel name string
+                * (channel name, group index, channel index) list or tuple
+                * (channel name, group index) list or tuple
+                * (None, group index, channel index) list or tuple
+
+        raster : float | np.array | str
+            new raster that can be
+
+            * a float step value
+            * a channel name who's timestamps will be used as raster
+            * an array
+
+            see `resample` for examples of using this argument
+
+        time_from_zero : bool
+            adjust time channel to start from 0; default *True*
+        empty_channels : str
+            behaviour for channels without samples; the options are *skip* or
+            *zeros*; default is *skip*
+        use_display_names : bool
+            use display name instead of standard channel name, if available.
+        time_as_date : bool
+            the timestamps column will contain the datetime timestamps
+            according to the measurement start time; default *False*. If
+            *True* then the argument ``time_from_zero`` will be ignored.
+        raw (False) : bool
+            the columns will contain the raw values
+        ignore_value2text_conversions (False) : bool
+            valid only for the channels that have value to text conversions and
+            if *raw=False*. If this is True then the raw numeric values will be
+            used, and the conversion will not be applied.
+        use_interpolation (True) : bool
+            option to perform interpoaltions when multiple timestamp raster are
+            present. If *False* then the columns will contain nulls were the
+            timestamps are not found in the channel timestamps
+        only_basenames (False) : bool
+            use just the field names, without prefix, for structures and channel
+            arrays
+        chunk_ram_size : int
+            desired record batch RAM usage in bytes; default 200 MB
+        interpolate_outwards_with_nan : bool
+            use nulls for the samples that lie outside of the original
+            signal's timestamps
+        numeric_1D_only (False) : bool
+            only keep the 1D-columns that have numeric values
+
+        Returns
+        -------
+        batch : pyarrow.RecordBatch
+            yields record batches that should not exceed 200MB of RAM
+
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise MdfException("pyarrow not found; export to Arrow is unavailable")
+
+        from .blocks.arrow_utils import (
+            arrow_array,
+            arrow_components,
+            dictionary_array,
+        )
+
+        # the selected channels are read group by group from this measurement
+        if channels:
+            selection = self.included_channels(channels=channels)
+        else:
+            selection = {
+                index: self.included_channels(index)[index]
+                for index in self.virtual_groups
+            }
+
+        self._set_temporary_master(None)
+
+        masters = {index: self.get_master(index) for index in selection}
+
+        if raster is not None:
+            try:
+                raster = float(raster)
+                assert raster > 0
+            except (TypeError, ValueError):
+                if isinstance(raster, str):
+                    raster = self.get(
+                        raster, raw=True, ignore_invalidation_bits=True
+                    ).timestamps
+                else:
+                    raster = np.array(raster)
+            else:
+                raster = master_using_raster(self, raster, groups=selection)
+            master = raster
+        else:
+            if masters:
+                master = merge_timebases(list(masters.values()))
+            else:
+                master = np.array([], dtype="<f8")
+
+        idx = np.argwhere(np.diff(master, prepend=-np.inf) > 0).flatten()
+        master_ = master[idx].astype(np.float64, copy=False)
+
+        if time_as_date or not time_from_zero or not len(master_):
+            time_offset = 0
+        else:
+            time_offset = master_[0]
+
+        if channels:
+            channel_count = (
+                sum(
+                    len(channel_indexes)
+                    for groups in selection.values()
+                    for channel_indexes in groups.values()
+                )
+                + 1
+            )
+        else:
+            channel_count = sum(len(gp.channels) - 1 for gp in self.groups) + 1
+        # approximation with all float64 dtype
+        itemsize = channel_count * 8
+        chunk_count = chunk_ram_size // itemsize or 1
+
+        chunks, r = divmod(len(master_), chunk_count)
+        if r:
+            chunks += 1
+
+        if self.version < "4.00":
+            text_conversions = (
+                v23c.CONVERSION_TYPE_TABX,
+                v23c.CONVERSION_TYPE_RTABX,
+            )
+            text_encoding = "latin-1"
+        else:
+            text_conversions = (
+                v4c.CONVERSION_TYPE_TABX,
+                v4c.CONVERSION_TYPE_RTABX,
+                v4c.CONVERSION_TYPE_TRANS,
+                v4c.CONVERSION_TYPE_BITFIELD,
+            )
+            text_encoding = "utf-8"
+
+        groups_nr = len(selection)
+
+        for i in range(chunks):
+            master = master_[chunk_count * i : chunk_count * (i + 1)]
+            start = master[0]
+            end = master[-1]
+            size = len(master)
+
+            columns, strings = {}, {}
+            self._set_temporary_master(None)
+
+            used_names = UniqueDB()
+            used_names.get_unique_name("timestamps")
+
+            if progress is not None:
+                if callable(progress):
+                    progress(0, groups_nr)
+                else:
+                    progress.signals.setValue.emit(0)
+                    progress.signals.setMaximum.emit(groups_nr)
+
+                    if progress.stop:
+                        return TERMINATED
+
+            for group_index, groups in selection.items():
+                virtual_group = self.virtual_groups[group_index]
+                group_cycles = virtual_group.cycles_nr
+                if group_cycles == 0 and empty_channels == "skip":
+                    continue
+
+                record_offset = max(
+                    np.searchsorted(masters[group_index], start).flatten()[0] - 1, 0
+                )
+                stop = np.searchsorted(masters[group_index], end).flatten()[0]
+                record_count = min(stop - record_offset + 1, group_cycles)
+
+                group_channels = [
+                    (None, gp_index, ch_index)
+                    for gp_index, channel_indexes in groups.items()
+                    for ch_index in channel_indexes
+                    if ch_index != self.masters_db.get(gp_index, None)
+                ]
+                signals = [
+                    signal
+                    for signal in self.select(
+                        group_channels,
+                        raw=True,
+                        copy_master=False,
+                        record_offset=record_offset,
+                        record_count=record_count,
+                        validate=False,
+                    )
+                ]
+
+                if not signals:
+                    continue
+
+                group_master = signals[0].timestamps
+
+                for sig in signals:
+                    if len(sig) == 0:
+                        if empty_channels == "zeros":
+                            sig.samples = np.zeros(
+                                size if group_cycles == 0 else group_cycles,
+                                dtype=sig.samples.dtype,
+                            )
+                            sig.timestamps = (
+                                master if group_cycles == 0 else group_master
+                            )
+
+                # the value to text conversions are applied to the unique raw
+                # values and the raw samples are replaced by the text indexes
+                texts = []
+                for sig in signals:
+                    conversion = sig.conversion
+                    sig_texts = None
+
+                    if not raw and conversion:
+                        if (
+                            conversion.conversion_type in text_conversions
+                            and sig.samples.ndim == 1
+                            and not sig.samples.dtype.names
+                        ):
+                            unique, indexes = np.unique(
+                                sig.samples, return_inverse=True
+                            )
+                            converted = conversion.convert(unique)
+
+                            if converted.dtype.kind in "SU":
+                                if not ignore_value2text_conversions:
+                                    sig_texts = converted
+                                    sig.samples = indexes
+                            else:
+                                sig.samples = converted[indexes]
+                        else:
+                            sig.samples = conversion.convert(sig.samples)
+
+                    texts.append(sig_texts)
+
+                if use_interpolation:
+                    same_master = np.array_equal(master, group_master)
+
+                    if (
+                        not same_master
+                        and interpolate_outwards_with_nan
+                        and len(group_master)
+                    ):
+                        outwards = (master < group_master[0]) | (
+                            master > group_master[-1]
+                        )
+                        if not outwards.any():
+                            outwards = None
+                    else:
+                        outwards = None
+
+                    cycles = len(group_master)
+
+                    for s_index, (sig, sig_texts) in enumerate(zip(signals, texts)):
+                        if same_master and len(sig) == cycles:
+                            continue
+
+                        # the values are interpolated from the valid samples
+                        # like for the dataframes, and the new samples are
+                        # invalid if the previous original sample is invalid
+                        invalidation_bits = sig.invalidation_bits
+                        if invalidation_bits is not None and len(sig):
+                            idx = np.searchsorted(sig.timestamps, master, side="right")
+                            idx -= 1
+                            idx[idx < 0] = 0
+                            invalidation_bits = invalidation_bits[idx]
+                            sig = sig.validate(copy=False)
+
+                        sig = sig.interp(
+                            master,
+                            integer_interpolation_mode=(
+                                IntegerInterpolation.REPEAT_PREVIOUS_SAMPLE
+                                if sig_texts is not None
+                                else self._integer_interpolation
+                            ),
+                            float_interpolation_mode=self._float_interpolation,
+                        )
+
+                        if outwards is not None:
+                            if invalidation_bits is None:
+                                invalidation_bits = outwards
+                            else:
+                                invalidation_bits = invalidation_bits | outwards
+
+                        if len(sig):
+                            sig.invalidation_bits = invalidation_bits
+
+                        signals[s_index] = sig
+
+                else:
+                    # the samples are placed at their timestamps and the
+                    # missing samples are nulls
+                    for sig in signals:
+                        timestamps = sig.timestamps
+                        positions = np.searchsorted(master, timestamps)
+                        found = positions < size
+                        found[found] = master[positions[found]] == timestamps[found]
+                        found &= np.diff(timestamps, prepend=-np.inf) > 0
+                        positions = positions[found]
+
+                        samples = np.zeros(
+                            (size,) + sig.samples.shape[1:],
+                            dtype=sig.samples.dtype,
+                        )
+                        samples[positions] = sig.samples[found]
+
+                        invalidation_bits = np.ones(size, dtype=bool)
+                        if sig.invalidation_bits is None:
+                            invalidation_bits[positions] = False
+                        else:
+                            invalidation_bits[positions] = sig.invalidation_bits[found]
+
+                        sig.samples = samples
+                        sig.timestamps = master
+                        sig.invalidation_bits = invalidation_bits
+
+                for sig, sig_texts in zip(signals, texts):
+                    if not len(sig):
+                        continue
+
+                    invalidation_bits = sig.invalidation_bits
+
+                    # arrays and structures
+                    if sig.samples.dtype.names:
+                        for name, array in arrow_components(
+                            sig.samples,
+                            sig.name,
+                            used_names,
+                            only_basenames=only_basenames,
+                            invalidation_bits=invalidation_bits,
+                        ):
+                            columns[name] = array
+                        continue
+
+                    if use_display_names:
+                        channel_name = (
+                            list(sig.display_names)[0]
+                            if sig.display_names
+                            else sig.name
+                        )
+                    else:
+                        channel_name = sig.name
+
+                    channel_name = used_names.get_unique_name(channel_name)
+
+                    if sig_texts is not None:
+                        strings[channel_name] = dictionary_array(
+                            sig.samples, sig_texts, text_encoding, invalidation_bits
+                        )
+                    else:
+                        array = arrow_array(
+                            sig.samples, sig.encoding, invalidation_bits
+                        )
+                        if sig.samples.ndim == 1 and sig.samples.dtype.kind == "S":
+                            strings[channel_name] = array
+                        else:
+                            columns[channel_name] = array
+
+                if progress is not None:
+                    if callable(progress):
+                        progress(group_index + 1, groups_nr)
+                    else:
+                        progress.signals.setValue.emit(group_index + 1)
+
+                        if progress.stop:
+                            return TERMINATED
+
+            if numeric_1D_only:
+                columns = {
+                    name: array
+                    for name, array in columns.items()
+                    if pa.types.is_integer(array.type)
+                    or pa.types.is_floating(array.type)
+                }
+                strings = {}
+
+            if time_as_date:
+                timestamps = pa.array(
+                    self.header.start_time + pd.to_timedelta(master, unit="s")
+                )
+            else:
+                timestamps = pa.array(master - time_offset if time_offset else master)
+
+            columns.update(strings)
+
+            yield pa.RecordBatch.from_arrays(
+                [timestamps, *columns.values()],
+                names=["timestamps", *columns],
+            )
+
+    def to_arrow(
+        self,
+        channels: ChannelsType | None = None,
+        raster: RasterType | None = None,
+        time_from_zero: bool = True,
+        empty_channels: EmptyChannelsType = "skip",
+        use_display_names: bool = False,
+        time_as_date: bool = False,
+        raw: bool = False,
+        ignore_value2text_conversions: bool = False,
+        use_interpolation: bool = True,
+        only_basenames: bool = False,
+        interpolate_outwards_with_nan: bool = False,
+        numeric_1D_only: bool = False,
+        progress=None,
+    ) -> pa.Table:
+        """generate Apache Arrow Table; see *iter_to_arrow* for the arrays
+        that are used for the channels
+
+        .. versionadded:: 7.4.0
+
+        Parameters
+        ----------
+        channels : list
+            list of items to be filtered (default None); each item can be :
+
+                * a channel name string
+                * (channel name, group index, channel index) list or tuple
+                * (channel name, group index) list or tuple
+                * (None, group index, channel index) list or tuple
+
+        raster : float | np.array | str
+            new raster that can be
+
+            * a float step value
+            * a channel name who's timestamps will be used as raster
+            * an array
+
+            see `resample` for examples of using this argument
+
+        time_from_zero : bool
+            adjust time channel to start from 0; default *True*
+        empty_channels : str
+            behaviour for channels without samples; the options are *skip* or
+            *zeros*; default is *skip*
+        use_display_names : bool
+            use display name instead of standard channel name, if available.
+        time_as_date : bool
+            the timestamps column will contain the datetime timestamps
+            according to the measurement start time; default *False*. If
+            *True* then the argument ``time_from_zero`` will be ignored.
+        raw (False) : bool
+            the columns will contain the raw values
+        ignore_value2text_conversions (False) : bool
+            valid only for the channels that have value to text conversions and
+            if *raw=False*. If this is True then the raw numeric values will be
+            used, and the conversion will not be applied.
+        use_interpolation (True) : bool
+            option to perform interpoaltions when multiple timestamp raster are
+            present. If *False* then the columns will contain nulls were the
+            timestamps are not found in the channel timestamps
+        only_basenames (False) : bool
+            use just the field names, without prefix, for structures and channel
+            arrays
+        interpolate_outwards_with_nan : bool
+            use nulls for the samples that lie outside of the original
+            signal's timestamps
+        numeric_1D_only (False) : bool
+            only keep the 1D-columns that have numeric values
+
+        Returns
+        -------
+        table : pyarrow.Table
+
+        """
+        batches = list(
+            self.iter_to_arrow(
+                channels=channels,
+                raster=raster,
+                time_from_zero=time_from_zero,
+                empty_channels=empty_channels,
+                use_display_names=use_display_names,
+                time_as_date=time_as_date,
+                raw=raw,
+                ignore_value2text_conversions=ignore_value2text_conversions,
+                use_interpolation=use_interpolation,
+                only_basenames=only_basenames,
+                chunk_ram_size=sys.maxsize,
+                interpolate_outwards_with_nan=interpolate_outwards_with_nan,
+                numeric_1D_only=numeric_1D_only,
+                progress=progress,
+            )
+        )
+
+        import pyarrow as pa
+
+        if progress is not None and not callable(progress) and progress.stop:
+            return TERMINATED
+
+        if batches:
+            return pa.Table.from_batches(batches)
+        else:
+            return pa.table({"timestamps": pa.array([], type=pa.float64())})
+
     def extract_bus_logging(
         self,
         database_files: dict[BusType, Iterable[DbcFileType]],
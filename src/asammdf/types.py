@@ -34,7 +34,7 @@ ChannelsType = Union[
     Sequence[str], Sequence[Tuple[Optional[str], int, int]], Sequence[Tuple[str, int]]
 ]
 ChannelType = Union["v2_v3_blocks.Channel", "v4_blocks.Channel"]
-CompressionType = Literal[0, 1, 2]
+CompressionType = Literal[0, 1, 2, "auto"]
 DataGroupType = Union["v2_v3_blocks.DataGroup", "v4_blocks.DataGroup"]
 DbcFileType = Tuple[Union[StrPathType, CanMatrix], int]
 EmptyChannelsType = Literal["skip", "zeros"]
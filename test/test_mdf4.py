@@ -1,12 +1,23 @@
 #!/usr/bin/env python
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import reduce
+from io import BytesIO
 from pathlib import Path
+import pickle
 import tempfile
 import unittest
+from unittest import mock
 
 import numpy as np
+import pandas as pd
+import pyarrow as pa
 
-from asammdf import MDF, Signal
+from asammdf import get_global_option, MDF, MDF4Writer, set_global_option, Signal
+from asammdf.blocks.conversion_utils import from_dict
 from asammdf.blocks.mdf_v4 import MDF4
+from asammdf.blocks.source_utils import Source
+from asammdf.blocks.utils import MdfException, merge_timebases
 
 CHANNEL_LEN = 100000
 
@@ -129,6 +140,1501 @@ class TestMDF4(unittest.TestCase):
 
         mdf.close()
 
+    def test_metadata_index(self):
+        sig_int = Signal(
+            np.random.randint(-(2**31), 2**31, CHANNEL_LEN),
+            np.arange(CHANNEL_LEN),
+            name="Integer Channel",
+            unit="unit1",
+        )
+
+        sig_float = Signal(
+            np.random.random(CHANNEL_LEN),
+            np.arange(CHANNEL_LEN),
+            name="Float Channel",
+            unit="unit2",
+        )
+
+        with MDF(version="4.10") as mdf:
+            mdf.append([sig_int, sig_float], common_timebase=True)
+            outfile = mdf.save(
+                Path(TestMDF4.tempdir.name) / "indexed.mf4",
+                overwrite=True,
+                compression=2,
+            )
+
+        index = outfile.with_name(outfile.name + ".idx")
+        self.assertFalse(index.exists())
+
+        with MDF(outfile, use_metadata_index=True) as mdf:
+            info = mdf.info()["metadata index"]
+            self.assertFalse(info["loaded"])
+            self.assertIsNotNone(info["save time"])
+        self.assertTrue(index.exists())
+
+        with MDF(outfile, use_metadata_index=True) as mdf:
+            info = mdf.info()["metadata index"]
+            self.assertTrue(info["loaded"])
+            self.assertIsNotNone(info["load time"])
+
+            self.assertEqual(mdf.groups[0].channel_group.cycles_nr, CHANNEL_LEN)
+            self.assertIn(sig_int.name, mdf.channels_db)
+            self.assertTrue(
+                np.array_equal(mdf.get(sig_int.name).samples, sig_int.samples)
+            )
+            self.assertTrue(
+                np.array_equal(mdf.get(sig_float.name).samples, sig_float.samples)
+            )
+
+        # a modified file must invalidate the index
+        with MDF(outfile) as mdf:
+            mdf.append([sig_int.copy()])
+            mdf.save(outfile, overwrite=True)
+
+        # the outdated index is rejected by its plain header, before unpickling
+        with mock.patch("pickle.load", side_effect=AssertionError) as load:
+            with MDF(outfile, use_metadata_index=True) as mdf:
+                self.assertFalse(mdf.info()["metadata index"]["loaded"])
+            load.assert_not_called()
+
+        index.write_bytes(pickle.dumps("not an index"))
+        with MDF(outfile, use_metadata_index=True) as mdf:
+            self.assertFalse(mdf.info()["metadata index"]["loaded"])
+            self.assertEqual(len(mdf.groups), 2)
+
+    def test_record_offset_multiple_blocks(self):
+        cycles = 1000
+        invalidation_bits = np.zeros(cycles, dtype=bool)
+        invalidation_bits[::7] = True
+
+        for version in ("4.10", "4.20"):
+            with MDF(version=version) as mdf:
+                mdf.append(
+                    [
+                        Signal(
+                            np.arange(cycles, dtype="<i4"),
+                            np.arange(cycles, dtype="<f8"),
+                            name="Integer Channel",
+                            invalidation_bits=invalidation_bits,
+                        )
+                    ]
+                )
+                for i in range(1, 20):
+                    values = np.arange(cycles) + i * cycles
+                    mdf.extend(
+                        0,
+                        [
+                            (values.astype("<f8"), None),
+                            (values.astype("<i4"), invalidation_bits),
+                        ],
+                    )
+
+                self.assertEqual(len(list(mdf.groups[0].get_data_blocks())), 20)
+                self.assertEqual(mdf.groups[0].uses_ld, version == "4.20")
+
+                target = mdf.get("Integer Channel", ignore_invalidation_bits=True)
+
+                for record_offset in (1, 999, 1000, 1001, 5555, 19999, 20000):
+                    for record_count in (None, 1, 1500):
+                        end = record_offset + record_count if record_count else None
+                        sig = mdf.get(
+                            "Integer Channel",
+                            record_offset=record_offset,
+                            record_count=record_count,
+                            ignore_invalidation_bits=True,
+                        )
+                        self.assertTrue(
+                            np.array_equal(
+                                sig.samples, target.samples[record_offset:end]
+                            )
+                        )
+                        self.assertTrue(
+                            np.array_equal(
+                                sig.invalidation_bits,
+                                target.invalidation_bits[record_offset:end],
+                            )
+                        )
+
+    def test_time_window(self):
+        cycles = 1000
+        with MDF(version="4.10") as mdf:
+            timestamps = np.arange(cycles) * 0.01
+            mdf.append(
+                [
+                    Signal(
+                        np.arange(cycles, dtype="<i4"),
+                        timestamps,
+                        name="Integer Channel",
+                    )
+                ]
+            )
+            for i in range(1, 20):
+                values = np.arange(cycles) + i * cycles
+                mdf.extend(0, [(values * 0.01, None), (values.astype("<i4"), None)])
+
+            target = mdf.get("Integer Channel")
+
+            for start, stop in (
+                (None, None),
+                (5.0, 5.0),
+                (5.005, 5.005),
+                (-3, 1),
+                (33.3, 150.2),
+                (199.99, None),
+                (None, 0.015),
+                (300, 400),
+            ):
+                mask = np.ones(len(target), dtype=bool)
+                if start is not None:
+                    mask &= target.timestamps >= start
+                if stop is not None:
+                    mask &= target.timestamps <= stop
+
+                sig = mdf.get("Integer Channel", start=start, stop=stop)
+                self.assertTrue(np.array_equal(sig.samples, target.samples[mask]))
+                self.assertTrue(np.array_equal(sig.timestamps, target.timestamps[mask]))
+
+                sig = mdf.select(["Integer Channel"], start=start, stop=stop)[0]
+                self.assertTrue(np.array_equal(sig.samples, target.samples[mask]))
+
+                samples = [
+                    sig.samples
+                    for sig in mdf.iter_get("Integer Channel", start=start, stop=stop)
+                ]
+                self.assertTrue(
+                    np.array_equal(np.concatenate(samples), target.samples[mask])
+                )
+
+                for include_ends in (True, False):
+                    expected = target.cut(start, stop, include_ends=include_ends)
+                    with mdf.cut(start, stop, include_ends=include_ends) as cut:
+                        sig = cut.get("Integer Channel")
+                    self.assertTrue(np.array_equal(sig.samples, expected.samples))
+                    self.assertTrue(np.array_equal(sig.timestamps, expected.timestamps))
+
+    def test_decompression_pool_threads(self):
+        with MDF(version="4.10") as mdf:
+            mdf.append([Signal(np.arange(10), np.arange(10), name="Channel")])
+            outfile = mdf.save(
+                Path(TestMDF4.tempdir.name) / "decompression_pool.mf4",
+                overwrite=True,
+                compression=2,
+            )
+
+        # the concurrent readers of select must share a single pool
+        with MDF(outfile, decompression_workers=2) as mdf:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                pools = list(
+                    executor.map(
+                        lambda _: mdf._mdf._get_decompression_pool(), range(64)
+                    )
+                )
+            self.assertEqual(len({id(pool) for pool in pools}), 1)
+
+            # a new worker count gives a new pool, but the pool that is still
+            # used by another select keeps accepting blocks
+            mdf._mdf._decompression_workers = 3
+            pool = mdf._mdf._get_decompression_pool()
+            self.assertIsNot(pool, pools[0])
+            self.assertEqual(pools[0].submit(sum, [1, 2]).result(), 3)
+            self.assertIs(mdf._mdf._get_decompression_pool(), pool)
+
+    def test_decompression_workers(self):
+        timestamps = np.arange(CHANNEL_LEN) * 0.001
+        signals = [
+            Signal(
+                np.random.random(CHANNEL_LEN),
+                timestamps,
+                name="Float Channel",
+            ),
+            Signal(
+                np.array([b"x" * (i % 20) for i in range(CHANNEL_LEN)]),
+                timestamps,
+                name="String Channel",
+                encoding="utf-8",
+            ),
+        ]
+        names = [sig.name for sig in signals]
+
+        with MDF(version="4.10") as mdf:
+            mdf.append(signals, common_timebase=True)
+            mdf.configure(write_fragment_size=64 * 1024)
+
+            for compression in (1, 2):
+                outfile = mdf.save(
+                    Path(TestMDF4.tempdir.name) / f"compressed_{compression}.mf4",
+                    overwrite=True,
+                    compression=compression,
+                )
+
+                for workers in (0, 4):
+                    with MDF(outfile, decompression_workers=workers) as compressed:
+                        self.assertGreater(
+                            len(list(compressed.groups[0].get_data_blocks())), 1
+                        )
+
+                        for sig, target in zip(compressed.select(names), signals):
+                            self.assertTrue(np.array_equal(sig.samples, target.samples))
+
+                        sig = compressed.get(
+                            "Float Channel", record_offset=12345, record_count=54321
+                        )
+                        self.assertTrue(
+                            np.array_equal(
+                                sig.samples, signals[0].samples[12345 : 12345 + 54321]
+                            )
+                        )
+
+    def test_select_workers(self):
+        timestamps = np.arange(10000) * 0.01
+        with MDF(version="4.10") as mdf:
+            for i in range(4):
+                mdf.append(
+                    [
+                        Signal(
+                            np.arange(10000, dtype="<i4") * (i + 1),
+                            timestamps + i,
+                            name=f"Int_{i}",
+                            conversion={"a": 0.5, "b": i},
+                        ),
+                        Signal(
+                            np.array([b"v" * (j % 7) for j in range(10000)]),
+                            timestamps + i,
+                            name=f"String_{i}",
+                            encoding="utf-8",
+                        ),
+                    ]
+                )
+            mdf.configure(write_fragment_size=16 * 1024)
+            outfile = mdf.save(
+                Path(TestMDF4.tempdir.name) / "select_workers.mf4",
+                overwrite=True,
+                compression=2,
+            )
+
+        channels = ["String_2", ("Int_1", 1), (None, 3, 1), "Int_0", "String_2"]
+
+        with MDF(outfile) as mdf:
+            target = mdf.select(channels)
+
+            for kwargs in (
+                {"workers": 3},
+                {"workers": 2, "memory_budget": 1},
+                {"workers": 2, "use_processes": True},
+                {"workers": 2, "start": 1.5, "stop": 50},
+            ):
+                if "start" in kwargs:
+                    expected = mdf.select(channels, start=1.5, stop=50)
+                else:
+                    expected = target
+                signals = mdf.select(channels, **kwargs)
+
+                self.assertEqual(len(signals), len(expected))
+                for sig, exp in zip(signals, expected):
+                    self.assertEqual(sig.name, exp.name)
+                    self.assertTrue(np.array_equal(sig.samples, exp.samples))
+                    self.assertTrue(np.array_equal(sig.timestamps, exp.timestamps))
+
+        # the worker processes use the same load filter, so the channel
+        # indexes point to the same channels
+        channels = ["String_2", "Int_3", "String_1"]
+        with MDF(outfile, channels=channels) as mdf:
+            expected = mdf.select(channels)
+            signals = mdf.select(channels, workers=2, use_processes=True)
+
+            for sig, exp in zip(signals, expected):
+                self.assertEqual(sig.name, exp.name)
+                self.assertEqual(list(sig.samples), list(exp.samples))
+
+    def test_get_channels_raw_bytes_buffers(self):
+        from asammdf.blocks.cutils import get_channels_raw_bytes
+
+        records = bytes(range(12))
+        expected = [bytearray(b"\x00\x01\x04\x05\x08\x09"), bytearray(b"\x03\x07\x0b")]
+
+        # the fragments of _load_data can be any bytes-like object
+        for data in (records, bytearray(records), memoryview(records)):
+            self.assertEqual(
+                get_channels_raw_bytes(data, 4, [(0, 2), (3, 1)]), expected
+            )
+
+        self.assertEqual(
+            get_channels_raw_bytes(memoryview(records)[4:], 4, [(0, 2), (3, 1)]),
+            [bytearray(b"\x04\x05\x08\x09"), bytearray(b"\x07\x0b")],
+        )
+
+        with self.assertRaises(TypeError):
+            get_channels_raw_bytes(12, 4, [(0, 2)])
+
+    def test_select_single_pass_extraction(self):
+        timestamps = np.arange(1000) * 0.01
+        invalidation_bits = np.arange(1000) % 3 == 0
+        signals = [
+            Signal(np.arange(1000, dtype="<u1"), timestamps, name="UInt8"),
+            Signal(np.arange(1000, dtype=">i2"), timestamps, name="Int16 Motorola"),
+            Signal(np.random.random(1000), timestamps, name="Float64"),
+            Signal(
+                np.arange(1000, dtype="<u2") % 4096,
+                timestamps,
+                name="UInt12",
+                bit_count=12,
+            ),
+            Signal(
+                np.arange(1000, dtype="<i4") - 500,
+                timestamps,
+                name="Invalidated",
+                invalidation_bits=invalidation_bits,
+            ),
+        ]
+        names = [sig.name for sig in signals]
+
+        with MDF(version="4.10") as mdf:
+            mdf.append(signals)
+            outfile = mdf.save(
+                Path(TestMDF4.tempdir.name) / "single_pass.mf4", overwrite=True
+            )
+
+        with MDF(outfile) as mdf:
+            selected = mdf.select(names)
+            for sig, target in zip(selected, signals):
+                expected = mdf.get(sig.name, ignore_invalidation_bits=True)
+                self.assertTrue(np.array_equal(sig.samples, target.samples))
+                self.assertTrue(np.array_equal(sig.samples, expected.samples))
+
+            self.assertTrue(
+                np.array_equal(selected[-1].invalidation_bits, invalidation_bits)
+            )
+
+            df = mdf.to_dataframe(channels=names[:-1])
+            for sig in signals[:-1]:
+                self.assertTrue(np.array_equal(df[sig.name].values, sig.samples))
+
+    def test_mapped_channel_metadata(self):
+        timestamps = np.arange(100) * 0.01
+
+        with MDF(version="4.10") as mdf:
+            for group in range(2):
+                mdf.append(
+                    [
+                        Signal(
+                            np.arange(100, dtype="<i4"),
+                            timestamps,
+                            name=f"Sig_{group}_{i}",
+                            unit="V",
+                            comment=f"comment {i}",
+                            conversion={"a": 2.0 + i, "b": float(group)},
+                            source=Source(f"ECU{i % 3}", "path", "source", 0, 0),
+                        )
+                        for i in range(20)
+                    ]
+                )
+            outfile = mdf.save(
+                Path(TestMDF4.tempdir.name) / "mapped_channels.mf4", overwrite=True
+            )
+
+        with MDF(outfile) as mdf, MDF(BytesIO(outfile.read_bytes())) as reference:
+            for group, target_group in zip(mdf.groups, reference.groups):
+                for channel, target in zip(group.channels, target_group.channels):
+                    # the conversions and sources are only lazy with
+                    # metadata="lazy"
+                    self.assertFalse(channel._has_pending_metadata())
+
+                    self.assertEqual(channel.name, target.name)
+                    self.assertEqual(channel.unit, target.unit)
+                    self.assertEqual(channel.byte_offset, target.byte_offset)
+                    self.assertEqual(channel.data_type, target.data_type)
+                    if target.conversion is None:
+                        self.assertIsNone(channel.conversion)
+                    else:
+                        self.assertEqual(channel.conversion.a, target.conversion.a)
+                        self.assertEqual(channel.conversion.b, target.conversion.b)
+                    if target.source is None:
+                        self.assertIsNone(channel.source)
+                    else:
+                        self.assertEqual(channel.source.name, target.source.name)
+
+                    channel = pickle.loads(pickle.dumps(channel))
+                    self.assertEqual(channel.name, target.name)
+                    self.assertEqual(
+                        channel.conversion is None, target.conversion is None
+                    )
+
+            for i in range(20):
+                name = f"Sig_1_{i}"
+                self.assertTrue(
+                    np.array_equal(mdf.get(name).samples, reference.get(name).samples)
+                )
+
+            channel = mdf.groups[1].channels[3]
+
+        # the metadata is still available after the file is closed
+        self.assertEqual(channel.conversion.a, 4.0)
+        self.assertEqual(channel.source.name, "ECU2")
+
+    def test_lazy_metadata(self):
+        timestamps = np.arange(100) * 0.01
+
+        with MDF(version="4.10") as mdf:
+            mdf.append(
+                [
+                    Signal(
+                        np.arange(100, dtype="<i4"),
+                        timestamps,
+                        name=f"Sig_{i}",
+                        unit=f"unit {i}",
+                        conversion={"a": 2.0 + i, "b": 1.0},
+                        source=Source(f"ECU{i}", "path", "source", 0, 0),
+                        comment=(
+                            f"<CNcomment><TX>comment {i}</TX><names>"
+                            f"<display>Display_{i}</display></names></CNcomment>"
+                        ),
+                    )
+                    for i in range(10)
+                ]
+            )
+            outfile = mdf.save(
+                Path(TestMDF4.tempdir.name) / "lazy_metadata.mf4", overwrite=True
+            )
+
+        with self.assertRaises(MdfException):
+            MDF(outfile, metadata="partial")
+
+        with MDF(outfile) as full, MDF(outfile, metadata="lazy") as lazy:
+            self.assertIn("Display_3", full.channels_db)
+            self.assertNotIn("Display_3", lazy.channels_db)
+
+            for i in range(10):
+                name = f"Sig_{i}"
+                self.assertEqual(
+                    lazy.get_channel_unit(name), full.get_channel_unit(name)
+                )
+                self.assertEqual(
+                    lazy.get_channel_comment(name), full.get_channel_comment(name)
+                )
+
+                sig = lazy.get(name)
+                target = full.get(name)
+                self.assertTrue(np.array_equal(sig.samples, target.samples))
+                self.assertEqual(sig.unit, target.unit)
+                self.assertEqual(sig.source.name, target.source.name)
+                self.assertEqual(sig.display_names, target.display_names)
+
+            channel = lazy.groups[0].channels[5]
+            target = full.groups[0].channels[5]
+            self.assertEqual(channel.display_names, target.display_names)
+
+            channel = pickle.loads(pickle.dumps(lazy.groups[0].channels[6]))
+            self.assertEqual(channel.comment, full.groups[0].channels[6].comment)
+
+        # writing the metadata index does not resolve the lazy attributes, and
+        # they are still read on first access after loading the index
+        for loaded in (False, True):
+            with MDF(outfile, metadata="lazy", use_metadata_index=True) as lazy:
+                self.assertEqual(lazy.info()["metadata index"]["loaded"], loaded)
+                channel = lazy.groups[0].channels[4]
+                self.assertTrue(channel._has_pending_metadata())
+
+                sig = lazy.get("Sig_4")
+                self.assertEqual(sig.unit, "unit 4")
+                self.assertEqual(sig.source.name, "ECU4")
+                self.assertTrue(np.array_equal(sig.samples, np.arange(100) * 6.0 + 1.0))
+
+    def test_zero_copy_get(self):
+        timestamps = np.arange(1000) * 0.01
+        signals = [
+            Signal(np.arange(1000, dtype="<i4"), timestamps, name="Int32"),
+            Signal(np.arange(1000, dtype=">u2"), timestamps, name="UInt16 Motorola"),
+            Signal(
+                np.random.random(1000),
+                timestamps,
+                name="Float64",
+                conversion={"a": 2.0, "b": 1.0},
+            ),
+            Signal(
+                np.arange(1000, dtype="<i2"),
+                timestamps,
+                name="Invalidated",
+                invalidation_bits=np.arange(1000) % 3 == 0,
+            ),
+        ]
+        names = [sig.name for sig in signals]
+
+        with MDF(version="4.10") as mdf:
+            mdf.append(signals)
+            outfile = mdf.save(
+                Path(TestMDF4.tempdir.name) / "zero_copy.mf4", overwrite=True
+            )
+
+        with MDF(outfile) as reference, MDF(outfile, zero_copy=True) as mdf:
+            for name in names:
+                for kwargs in ({}, {"record_offset": 10, "record_count": 50}):
+                    sig = mdf.get(name, raw=True, **kwargs)
+                    target = reference.get(name, raw=True, **kwargs)
+                    self.assertTrue(np.array_equal(sig.samples, target.samples))
+                    self.assertTrue(np.array_equal(sig.timestamps, target.timestamps))
+
+                    view = name != "Invalidated"
+                    self.assertEqual(sig.samples.flags.writeable, not view)
+                    self.assertEqual(sig.timestamps.flags.writeable, not view)
+
+            selected = mdf.select(names[:3], copy_master=False)
+            for sig, target in zip(selected, reference.select(names[:3])):
+                self.assertTrue(np.array_equal(sig.samples, target.samples))
+                self.assertTrue(np.array_equal(sig.timestamps, target.timestamps))
+                self.assertFalse(sig.timestamps.flags.writeable)
+            self.assertFalse(selected[0].samples.flags.writeable)
+
+            samples = mdf.get("Int32").samples
+
+        # the arrays stay valid after the file is closed
+        self.assertTrue(np.array_equal(samples, signals[0].samples))
+
+    def test_streaming_writer(self):
+        cycles = 100
+        invalidation_bits = np.arange(cycles) % 3 == 0
+        strings = np.array([f"value {i}".encode("utf-8") for i in range(cycles)])
+
+        # small data blocks so that the groups use chained DL blocks
+        fragment_size = get_global_option("write_fragment_size")
+        set_global_option("write_fragment_size", 1024)
+
+        try:
+            for compression in (0, 2):
+                outfile = Path(TestMDF4.tempdir.name) / f"writer_{compression}.mf4"
+
+                timestamps = []
+                with MDF4Writer(outfile, compression=compression) as writer:
+                    for i in range(400):
+                        t = np.arange(i * cycles, (i + 1) * cycles, dtype="<f8")
+                        values = np.arange(cycles, dtype="<i4") + i
+                        timestamps.append(t)
+                        if i == 0:
+                            index = writer.append(
+                                [
+                                    Signal(values, t, name="Int32", unit="V"),
+                                    Signal(
+                                        values.astype("<f8"),
+                                        t,
+                                        name="Float64",
+                                        invalidation_bits=invalidation_bits,
+                                    ),
+                                    Signal(strings, t, name="String", encoding="utf-8"),
+                                ]
+                            )
+                            writer.append(
+                                Signal(
+                                    np.ones(3, dtype="u1"), np.arange(3), name="Short"
+                                )
+                            )
+                        else:
+                            writer.extend(
+                                index,
+                                [
+                                    (t, None),
+                                    (values, None),
+                                    (values.astype("<f8"), invalidation_bits),
+                                    (strings, None),
+                                ],
+                            )
+
+                with MDF(outfile) as mdf:
+                    self.assertEqual(
+                        mdf.groups[0].channel_group.cycles_nr, 400 * cycles
+                    )
+                    self.assertGreater(len(list(mdf.groups[0].get_data_blocks())), 256)
+
+                    timestamps = np.concatenate(timestamps)
+                    values = np.concatenate(
+                        [np.arange(cycles, dtype="<i4") + i for i in range(400)]
+                    )
+
+                    sig = mdf.get("Int32")
+                    self.assertEqual(sig.unit, "V")
+                    self.assertTrue(np.array_equal(sig.timestamps, timestamps))
+                    self.assertTrue(np.array_equal(sig.samples, values))
+
+                    sig = mdf.get("Float64", ignore_invalidation_bits=True)
+                    self.assertTrue(np.array_equal(sig.samples, values))
+                    self.assertTrue(
+                        np.array_equal(
+                            sig.invalidation_bits, np.tile(invalidation_bits, 400)
+                        )
+                    )
+
+                    sig = mdf.get("String")
+                    self.assertTrue(np.array_equal(sig.samples, np.tile(strings, 400)))
+
+                    self.assertTrue(np.array_equal(mdf.get("Short").samples, [1, 1, 1]))
+        finally:
+            set_global_option("write_fragment_size", fragment_size)
+
+        with self.assertRaises(MdfException):
+            MDF4Writer(Path(TestMDF4.tempdir.name) / "writer.mf4", version="4.20")
+
+    def test_save_compression_workers(self):
+        cycles = 20000
+        timestamps = np.arange(cycles, dtype="<f8")
+        signals = [
+            Signal(np.arange(cycles, dtype="<i4"), timestamps, name="Int32"),
+            Signal(
+                np.sin(timestamps),
+                timestamps,
+                name="Float64",
+                invalidation_bits=np.arange(cycles) % 5 == 0,
+            ),
+        ]
+
+        start_time = datetime(2020, 1, 1, 12, 0, 0)
+
+        # small data blocks so that each group is compressed in many blocks
+        fragment_size = get_global_option("write_fragment_size")
+        set_global_option("write_fragment_size", 16 * 1024)
+
+        def content(path):
+            # mask the file history time stamp of the save call
+            data = bytearray(path.read_bytes())
+            with MDF(path) as mdf:
+                address = mdf.header.file_history_addr
+            data[address + 40 : address + 48] = bytes(8)
+            return data
+
+        try:
+            for version in ("4.10", "4.20"):
+                for compression in (1, 2):
+                    outputs = []
+                    for workers in (0, 3):
+                        with MDF(version=version) as mdf:
+                            mdf.header.start_time = start_time
+                            mdf.append(signals)
+                            mdf.append(signals[:1])
+                            outputs.append(
+                                mdf.save(
+                                    Path(TestMDF4.tempdir.name)
+                                    / f"workers_{version}_{compression}_{workers}.mf4",
+                                    overwrite=True,
+                                    compression=compression,
+                                    workers=workers,
+                                )
+                            )
+
+                    self.assertEqual(content(outputs[0]), content(outputs[1]))
+
+                    with MDF(outputs[1]) as mdf:
+                        self.assertGreater(
+                            len(list(mdf.groups[0].get_data_blocks())), 1
+                        )
+                        sig = mdf.get("Float64", ignore_invalidation_bits=True)
+                        self.assertTrue(np.array_equal(sig.samples, signals[1].samples))
+                        self.assertTrue(
+                            np.array_equal(
+                                sig.invalidation_bits, signals[1].invalidation_bits
+                            )
+                        )
+        finally:
+            set_global_option("write_fragment_size", fragment_size)
+
+    def test_verbatim_block_copy(self):
+        cycles = 20000
+        timestamps = np.arange(cycles, dtype="<f8")
+        samples = {
+            "Int32": np.arange(cycles, dtype="<i4"),
+            "Float64": np.sin(timestamps),
+            "String": np.array([b"x" * (i % 7) for i in range(cycles)]),
+            "UInt8": np.arange(cycles, dtype="u1"),
+        }
+
+        fragment_size = get_global_option("write_fragment_size")
+        set_global_option("write_fragment_size", 16 * 1024)
+
+        try:
+            with MDF(version="4.10") as mdf:
+                mdf.append(
+                    [
+                        Signal(samples["Int32"], timestamps, name="Int32"),
+                        Signal(samples["Float64"], timestamps, name="Float64"),
+                    ]
+                )
+                mdf.append(
+                    [
+                        Signal(
+                            samples["String"],
+                            timestamps,
+                            name="String",
+                            encoding="utf-8",
+                        )
+                    ]
+                )
+                mdf.append([Signal(samples["UInt8"], timestamps, name="UInt8")])
+                source = mdf.save(
+                    Path(TestMDF4.tempdir.name) / "verbatim_source.mf4",
+                    overwrite=True,
+                    compression=2,
+                )
+        finally:
+            set_global_option("write_fragment_size", fragment_size)
+
+        output = Path(TestMDF4.tempdir.name) / "verbatim.mf4"
+
+        with MDF(source) as mdf:
+            mdf.save(output, overwrite=True, compression=2)
+            self.assertEqual(mdf.last_call_info["reencoded_bytes"], 0)
+            self.assertGreater(mdf.last_call_info["passed_through_bytes"], 0)
+
+            # the first group is only partially selected
+            filtered = mdf.filter(["Int32", "String", "UInt8"])
+            filtered.save(output, overwrite=True, compression=2)
+            stats = filtered.last_call_info
+            self.assertEqual(stats["reencoded_bytes"], 12 * cycles)
+            self.assertGreater(stats["passed_through_bytes"], 0)
+            filtered.close()
+
+            with MDF(output) as copied:
+                self.assertNotIn("Float64", copied)
+                for name in ("Int32", "String", "UInt8"):
+                    self.assertTrue(
+                        np.array_equal(copied.get(name).samples, samples[name])
+                    )
+
+            converted = mdf.convert("4.11")
+            converted.save(output, overwrite=True, compression=0)
+            self.assertGreater(converted.last_call_info["reencoded_bytes"], 0)
+            converted.close()
+
+            with MDF(output) as copied:
+                for name, values in samples.items():
+                    self.assertTrue(np.array_equal(copied.get(name).samples, values))
+
+        # the transferred groups don't depend on the source file
+        with MDF(source) as mdf:
+            filtered = mdf.filter(["Int32", "Float64", "String"])
+        source.write_bytes(b"\0" * 1024)
+
+        with filtered:
+            for name in ("Int32", "Float64", "String"):
+                self.assertTrue(
+                    np.array_equal(filtered.get(name).samples, samples[name])
+                )
+
+            filtered.save(output, overwrite=True, compression=2)
+            self.assertEqual(filtered.last_call_info["reencoded_bytes"], 0)
+            self.assertGreater(filtered.last_call_info["passed_through_bytes"], 0)
+
+        with MDF(output) as copied:
+            for name in ("Int32", "Float64", "String"):
+                self.assertTrue(np.array_equal(copied.get(name).samples, samples[name]))
+
+    def test_auto_compression(self):
+        cycles = 20000
+        timestamps = np.arange(cycles, dtype="<f8")
+        slow = np.arange(cycles, dtype="<u4") // 100
+        # the random samples outweigh the compressible time stamps
+        noise = [
+            np.frombuffer(np.random.bytes(cycles * 8), dtype="<u8") for _ in range(16)
+        ]
+
+        def check(path):
+            with MDF(path) as mdf:
+                info = mdf.info()
+                self.assertEqual(info["group 0"]["compression"], "transposed deflate")
+                self.assertLess(info["group 0"]["compression ratio"], 0.1)
+                self.assertEqual(info["group 1"]["compression"], "none")
+                self.assertEqual(info["group 1"]["compression ratio"], 1.0)
+
+                self.assertTrue(np.array_equal(mdf.get("Slow").samples, slow))
+                self.assertTrue(np.array_equal(mdf.get("Noise_15").samples, noise[15]))
+
+        with MDF(version="4.10") as mdf:
+            mdf.append([Signal(slow, timestamps, name="Slow")])
+            mdf.append(
+                [
+                    Signal(samples, timestamps, name=f"Noise_{i}")
+                    for i, samples in enumerate(noise)
+                ]
+            )
+            output = mdf.save(
+                Path(TestMDF4.tempdir.name) / "auto_compression.mf4",
+                overwrite=True,
+                compression="auto",
+                compression_level=6,
+            )
+            self.assertEqual(mdf.info()["group 1"]["compression"], "none")
+
+        check(output)
+
+        output = Path(TestMDF4.tempdir.name) / "auto_compression_writer.mf4"
+        with MDF4Writer(output, compression="auto") as writer:
+            writer.append([Signal(slow, timestamps, name="Slow")])
+            writer.append(
+                [
+                    Signal(samples, timestamps, name=f"Noise_{i}")
+                    for i, samples in enumerate(noise)
+                ]
+            )
+
+        check(output)
+
+    def test_compression_info(self):
+        cycles = 5000
+        timestamps = np.arange(cycles, dtype="<f8")
+
+        with MDF(version="4.20") as mdf:
+            mdf.append(
+                [
+                    Signal(np.arange(cycles, dtype="<u1"), timestamps, name="Byte"),
+                    Signal(np.arange(cycles, dtype="<f8"), timestamps, name="Float"),
+                ]
+            )
+            self.assertTrue(all(group.uses_ld for group in mdf.groups))
+            mdf.save(
+                Path(TestMDF4.tempdir.name) / "compression_info_ld.mf4",
+                overwrite=True,
+                compression=2,
+            )
+
+            # the single byte records are written with plain deflate
+            info = mdf.info()
+            self.assertEqual(info["group 0"]["compression"], "transposed deflate")
+            self.assertEqual(info["group 1"]["compression"], "deflate")
+            self.assertEqual(info["group 2"]["compression"], "transposed deflate")
+
+        with MDF(version="4.10") as mdf:
+            mdf.append([Signal(np.arange(cycles, dtype="<u4"), timestamps, name="Int")])
+            output = mdf.save(
+                Path(TestMDF4.tempdir.name) / "compression_info.mf4",
+                overwrite=True,
+                compression=1,
+            )
+
+        with MDF(output) as mdf:
+            # the deflate blocks are copied verbatim for compression "auto"
+            mdf.save(
+                Path(TestMDF4.tempdir.name) / "compression_info_copy.mf4",
+                overwrite=True,
+                compression="auto",
+            )
+            self.assertEqual(mdf.info()["group 0"]["compression"], "deflate")
+
+    def test_buffered_extend(self):
+        batch = 10
+        calls = 500
+        timestamps = np.arange(batch, dtype="<f8")
+        samples = np.arange(batch, dtype="<i4")
+
+        with MDF(version="4.10", buffered_extend=True) as mdf:
+            mdf.append(
+                [Signal(samples, timestamps, name=f"Channel_{i}") for i in range(4)],
+                common_timebase=True,
+            )
+            for cycle in range(1, calls):
+                mdf.extend(
+                    0,
+                    [(timestamps + cycle * batch, None)]
+                    + [(samples + cycle, None) for _ in range(4)],
+                )
+
+            self.assertLess(len(mdf.groups[0].data_blocks), 10)
+
+            expected = np.concatenate([samples + cycle for cycle in range(calls)])
+            self.assertTrue(np.array_equal(mdf.get("Channel_3").samples, expected))
+
+            mdf.flush()
+            output = mdf.save(
+                Path(TestMDF4.tempdir.name) / "buffered_extend.mf4", overwrite=True
+            )
+
+        with MDF(output) as mdf:
+            signal = mdf.get("Channel_3")
+            self.assertTrue(np.array_equal(signal.samples, expected))
+            self.assertTrue(
+                np.array_equal(signal.timestamps, np.arange(batch * calls, dtype="<f8"))
+            )
+
+    def test_append_columns(self):
+        cycles = 1000
+        timestamps = np.arange(cycles, dtype="<f8") * 0.01
+
+        records = np.zeros(
+            cycles,
+            dtype=[("time", "<f8"), ("Speed", ">i4"), ("Flag", "u1"), ("Gain", "<f4")],
+        )
+        records["time"] = timestamps
+        records["Speed"] = np.arange(cycles)
+        records["Flag"] = np.arange(cycles) % 2
+        records["Gain"] = np.arange(cycles) / 4
+
+        df = pd.DataFrame(
+            {"Voltage": np.arange(cycles, dtype="<f8"), "Current": -np.arange(cycles)},
+            index=pd.Index(timestamps, name="time"),
+        )
+
+        for version in ("4.10", "4.20"):
+            with MDF(version=version) as mdf:
+                mdf.append(records, units={"Speed": "km/h"})
+                mdf.append(df)
+
+                if version >= "4.20":
+                    # the data frame columns are stored in column oriented groups
+                    self.assertEqual(len(mdf.groups), 4)
+
+                output = mdf.save(
+                    Path(TestMDF4.tempdir.name) / f"append_columns_{version}.mf4",
+                    overwrite=True,
+                )
+
+            with MDF(output) as mdf:
+                for name in ("Speed", "Flag", "Gain"):
+                    signal = mdf.get(name)
+                    self.assertTrue(np.array_equal(signal.samples, records[name]))
+                    self.assertTrue(np.array_equal(signal.timestamps, timestamps))
+                self.assertEqual(mdf.get("Speed").unit, "km/h")
+
+                for name in df:
+                    signal = mdf.get(name)
+                    self.assertTrue(np.array_equal(signal.samples, df[name].values))
+                    self.assertTrue(np.array_equal(signal.timestamps, timestamps))
+
+        with self.assertRaises(MdfException):
+            MDF(version="4.10").append(
+                np.zeros(3, dtype=[("time", "<f8"), ("Name", "S4")])
+            )
+
+    def test_bit_field_records(self):
+        cycles = 100
+        timestamps = np.arange(cycles, dtype="<f8")
+        flags = [(np.arange(cycles) >> i) % 2 == 1 for i in range(10)]
+        invalidation_bits = np.arange(cycles) % 3 == 0
+        nibble = (np.arange(cycles) % 16).astype("u1")
+
+        def samples():
+            return [
+                (flag, invalidation_bits if i == 9 else None)
+                for i, flag in enumerate(flags)
+            ] + [(nibble, None)]
+
+        with MDF(version="4.10") as mdf:
+            mdf.append(
+                [
+                    Signal(
+                        flag,
+                        timestamps,
+                        name=f"Flag_{i}",
+                        invalidation_bits=invalidation,
+                    )
+                    for i, (flag, invalidation) in enumerate(samples()[:-1])
+                ]
+                + [Signal(nibble, timestamps, name="Nibble", bit_count=4)]
+            )
+            mdf.extend(0, [(timestamps + cycles, None)] + samples())
+
+            # 8 flags in the first byte, 2 flags and the nibble in the second
+            channel_group = mdf.groups[0].channel_group
+            self.assertEqual(channel_group.samples_byte_nr, 10)
+            self.assertEqual(channel_group.invalidation_bytes_nr, 1)
+
+            self.assertEqual(mdf.get("Flag_3").samples.dtype, bool)
+
+            output = mdf.save(
+                Path(TestMDF4.tempdir.name) / "bit_field_records.mf4", overwrite=True
+            )
+
+        with MDF(output) as mdf:
+            for i, flag in enumerate(flags):
+                signal = mdf.get(f"Flag_{i}", ignore_invalidation_bits=True)
+                self.assertTrue(np.array_equal(signal.samples, np.tile(flag, 2)))
+
+            signal = mdf.get("Flag_9", ignore_invalidation_bits=True)
+            self.assertTrue(
+                np.array_equal(signal.invalidation_bits, np.tile(invalidation_bits, 2))
+            )
+            self.assertTrue(
+                np.array_equal(mdf.get("Nibble").samples, np.tile(nibble, 2))
+            )
+
+    def test_temporary_spool_size(self):
+        cycles = 1000
+        timestamps = np.arange(cycles, dtype="<f8")
+        signals = [
+            Signal(np.arange(cycles, dtype="<f8") * i, timestamps, name=f"Channel_{i}")
+            for i in range(4)
+        ] + [
+            Signal(
+                np.array([b"text"] * cycles),
+                timestamps,
+                name="Text",
+                encoding="utf-8",
+            )
+        ]
+
+        with MDF(version="4.10", temporary_spool_size=2**20) as mdf:
+            mdf.append(signals)
+            mdf.extend(
+                0,
+                [(timestamps + cycles, None)]
+                + [(signal.samples, None) for signal in signals],
+            )
+
+            # everything fits in the memory buffer
+            self.assertFalse(mdf._tempfile._rolled)
+
+            filtered = mdf.filter(["Channel_3", "Text"])
+            self.assertFalse(filtered._tempfile._rolled)
+            self.assertTrue(
+                np.array_equal(
+                    filtered.get("Channel_3").samples, np.tile(signals[3].samples, 2)
+                )
+            )
+            self.assertTrue(
+                np.array_equal(
+                    filtered.get("Text").samples, np.tile(signals[4].samples, 2)
+                )
+            )
+            filtered.close()
+
+        with MDF(version="4.10", temporary_spool_size=1024) as mdf:
+            mdf.append(signals)
+
+            # the samples are moved to the temporary file
+            self.assertTrue(mdf._tempfile._rolled)
+            self.assertTrue(
+                np.array_equal(mdf.get("Channel_2").samples, signals[2].samples)
+            )
+
+    def test_convert_column_storage(self):
+        cycles = 20000
+        timestamps = np.arange(cycles, dtype="<f8") * 0.01
+        invalidation_bits = np.arange(cycles) % 3 == 0
+        signals = [
+            Signal(
+                np.arange(cycles, dtype="<i4"),
+                timestamps,
+                name="Int32",
+                unit="V",
+                conversion={"a": 0.5, "b": 1.0},
+            ),
+            Signal(
+                np.cos(timestamps),
+                timestamps,
+                name="Float64",
+                invalidation_bits=invalidation_bits,
+            ),
+            Signal(np.arange(cycles) % 2 == 0, timestamps, name="Flag"),
+            Signal(
+                (np.arange(cycles) % 8).astype("u1"),
+                timestamps,
+                name="Nibble",
+                bit_count=3,
+            ),
+        ]
+
+        with MDF(version="4.10") as mdf:
+            mdf.append(signals, common_timebase=True, comment="records")
+            mdf.append(
+                [
+                    Signal(
+                        np.array([b"text"] * cycles),
+                        timestamps,
+                        name="Text",
+                        encoding="utf-8",
+                    )
+                ],
+                common_timebase=True,
+            )
+            source = mdf.save(
+                Path(TestMDF4.tempdir.name) / "column_storage_source.mf4",
+                overwrite=True,
+            )
+
+        output = Path(TestMDF4.tempdir.name) / "column_storage.mf4"
+
+        with MDF(source) as mdf:
+            mdf.configure(read_fragment_size=16 * 1024, write_fragment_size=16 * 1024)
+            converted = mdf.convert("4.20", column_storage=True)
+
+            # master group and one column group for each channel
+            self.assertEqual(len(converted.virtual_groups), 2)
+            self.assertEqual(converted.virtual_groups[0].groups, [0, 1, 2, 3, 4])
+            for group in converted.groups[1:5]:
+                self.assertTrue(group.uses_ld)
+                self.assertEqual(len(group.channels), 1)
+                self.assertGreater(len(group.data_blocks), 1)
+                self.assertEqual(group.channel_group.cg_master_index, 0)
+                self.assertEqual(group.channel_group.comment, "records")
+
+            converted.save(output, overwrite=True)
+            converted.close()
+
+            with MDF(output) as copied:
+                self.assertEqual(copied.version, "4.20")
+                for signal in signals + [mdf.get("Text")]:
+                    original = mdf.get(signal.name, ignore_invalidation_bits=True)
+                    target = copied.get(signal.name, ignore_invalidation_bits=True)
+                    self.assertTrue(np.array_equal(original.samples, target.samples))
+                    self.assertTrue(
+                        np.array_equal(original.timestamps, target.timestamps)
+                    )
+                    self.assertEqual(original.unit, target.unit)
+
+                self.assertTrue(
+                    np.array_equal(
+                        copied.get(
+                            "Float64", ignore_invalidation_bits=True
+                        ).invalidation_bits,
+                        invalidation_bits,
+                    )
+                )
+                self.assertTrue(
+                    np.array_equal(
+                        copied.get("Int32", raw=True).samples, signals[0].samples
+                    )
+                )
+
+    def test_metadata_only(self):
+        cycles = 500
+        timestamps = np.arange(cycles, dtype="<f8")
+
+        with MDF(version="4.10") as mdf:
+            mdf.append(
+                [
+                    Signal(timestamps * i, timestamps, name=f"Channel_{i}", unit="V")
+                    for i in range(5)
+                ]
+            )
+            mdf.append(
+                [Signal(np.arange(cycles // 2), timestamps[: cycles // 2], name="Int")]
+            )
+            mdf.attach(b"catalog", "catalog.txt")
+            source = mdf.save(
+                Path(TestMDF4.tempdir.name) / "metadata_only.mf4",
+                overwrite=True,
+                compression=2,
+            )
+
+        with MDF(source) as reference, MDF.peek(source) as mdf:
+            self.assertIsNone(mdf._tempfile)
+            self.assertEqual(mdf.start_time, reference.start_time)
+            self.assertEqual(set(mdf.channels_db), set(reference.channels_db))
+            self.assertEqual(
+                [group.channel_group.cycles_nr for group in mdf.groups],
+                [cycles, cycles // 2],
+            )
+            self.assertEqual(len(mdf.attachments), 1)
+            self.assertEqual(mdf.get_channel_unit("Channel_3"), "V")
+
+            # the data blocks were not read
+            self.assertEqual(list(mdf.groups[0].get_data_blocks()), [])
+
+            with self.assertRaises(MdfException):
+                mdf.get("Channel_3")
+            with self.assertRaises(MdfException):
+                mdf.get_master(1)
+            with self.assertRaises(MdfException):
+                mdf.append([Signal(timestamps, timestamps, name="New")])
+            with self.assertRaises(MdfException):
+                mdf.save(Path(TestMDF4.tempdir.name) / "metadata_only_copy.mf4")
+
+        with MDF(source, metadata_only=True) as mdf:
+            self.assertIsNone(mdf._tempfile)
+            self.assertEqual(mdf.get_channel_unit("Channel_1"), "V")
+
+    def test_to_dataframe_channels(self):
+        fast = np.arange(1000) * 0.01
+        slow = np.arange(300) * 0.033 + 0.005
+
+        with MDF(version="4.10") as mdf:
+            mdf.append(
+                [
+                    Signal(np.sin(fast), fast, name="Sin"),
+                    Signal(
+                        np.arange(1000, dtype="u2"),
+                        fast,
+                        name="Counter",
+                        conversion={"a": 2.0, "b": 1.0},
+                    ),
+                ],
+                common_timebase=True,
+            )
+            mdf.append(
+                [
+                    Signal(np.cos(slow), slow, name="Cos"),
+                    Signal(np.arange(300, dtype="i4"), slow, name="Index"),
+                ],
+                common_timebase=True,
+            )
+
+            cases = (
+                (["Sin"], {}),
+                (["Counter", "Cos"], {}),
+                (["Counter", "Cos"], {"raster": 0.02}),
+                (["Index", "Sin"], {"use_interpolation": False, "raw": True}),
+            )
+
+            expected = []
+            for channels, kwargs in cases:
+                filtered = mdf.filter(channels)
+                expected.append(
+                    (
+                        filtered.to_dataframe(**kwargs),
+                        list(filtered.iter_to_dataframe(chunk_ram_size=1000, **kwargs)),
+                    )
+                )
+                filtered.close()
+
+            # the channels are read from the measurement without a filtered copy
+            with mock.patch.object(MDF, "filter", side_effect=AssertionError):
+                for (channels, kwargs), (df, chunks) in zip(cases, expected):
+                    result = mdf.to_dataframe(channels=channels, **kwargs)
+                    self.assertTrue(result.equals(df))
+                    self.assertEqual(list(result.columns), list(df.columns))
+
+                    result = list(
+                        mdf.iter_to_dataframe(
+                            channels=channels, chunk_ram_size=1000, **kwargs
+                        )
+                    )
+                    self.assertEqual(len(result), len(chunks))
+                    for result_chunk, chunk in zip(result, chunks):
+                        self.assertTrue(result_chunk.equals(chunk))
+
+    def test_merge_timebases(self):
+        rng = np.random.default_rng(0)
+
+        cases = (
+            [np.sort(rng.random(1000)) for _ in range(20)],
+            [np.arange(10.0), np.arange(5.0, 15.0), np.array([]), np.arange(3.0)],
+            [np.array([1.0, 1.0, 2.0]), np.array([2.0, 2.0, 3.0])],
+            [np.array([1.0, np.nan, np.nan]), np.array([np.nan, 0.5])],
+            [np.arange(5, dtype=">f8"), np.arange(3, dtype="<i8")],
+        )
+
+        for timebases in cases:
+            expected = reduce(np.union1d, timebases)
+            result = merge_timebases(timebases)
+            self.assertEqual(result.dtype, expected.dtype)
+            self.assertTrue(np.array_equal(result, expected, equal_nan=True))
+
+        self.assertEqual(len(merge_timebases([])), 0)
+
+        timestamps = [np.arange(100) * 0.01, np.arange(30) * 0.033 + 0.005]
+        with MDF(version="4.10") as mdf:
+            for i, t in enumerate(timestamps):
+                mdf.append([Signal(np.ones(len(t)), t, name=f"Sig{i}")])
+
+            df = mdf.to_dataframe(time_from_zero=False)
+            self.assertTrue(np.array_equal(df.index, reduce(np.union1d, timestamps)))
+
+    def test_to_arrow(self):
+        fast = np.arange(1000) * 0.01
+        slow = np.arange(300) * 0.033 + 0.005
+        invalidation_bits = np.zeros(300, dtype=bool)
+        invalidation_bits[::7] = True
+
+        with MDF(version="4.10") as mdf:
+            mdf.append(
+                [
+                    Signal(np.sin(fast), fast, name="Sin"),
+                    Signal(
+                        np.arange(1000, dtype="u1") % 3,
+                        fast,
+                        name="State",
+                        conversion={
+                            "val_0": 0,
+                            "text_0": b"Off",
+                            "val_1": 1,
+                            "text_1": b"On",
+                            "default": b"Error",
+                        },
+                    ),
+                    Signal(
+                        np.array([f"text {i % 10}".encode() for i in range(1000)]),
+                        fast,
+                        name="Text",
+                        encoding="utf-8",
+                    ),
+                ],
+                common_timebase=True,
+            )
+            mdf.append(
+                [
+                    Signal(
+                        np.cos(slow),
+                        slow,
+                        name="Cos",
+                        invalidation_bits=invalidation_bits,
+                    ),
+                    Signal(np.arange(300, dtype="i4"), slow, name="Index"),
+                ],
+                common_timebase=True,
+            )
+
+            for kwargs in ({}, {"raster": 0.02}, {"use_interpolation": False}):
+                table = mdf.to_arrow(**kwargs)
+                df = mdf.to_dataframe(**kwargs)
+
+                self.assertEqual(table.column_names, ["timestamps", *df.columns])
+                self.assertTrue(
+                    np.array_equal(table["timestamps"].to_numpy(), df.index.values)
+                )
+
+                self.assertEqual(
+                    table.schema.field("State").type,
+                    pa.dictionary(pa.int32(), pa.string()),
+                )
+                self.assertEqual(table.schema.field("Text").type, pa.string())
+                self.assertEqual(
+                    table["State"].to_pylist(),
+                    [
+                        None if isinstance(value, float) else value.decode()
+                        for value in df["State"]
+                    ],
+                )
+                self.assertEqual(
+                    table["Text"].to_pylist(),
+                    [
+                        None if isinstance(value, float) else value.decode()
+                        for value in df["Text"]
+                    ],
+                )
+
+                # the invalid samples are nulls
+                cos = table["Cos"].to_numpy(zero_copy_only=False)
+                valid = table["Cos"].is_valid().to_numpy(zero_copy_only=False)
+                self.assertGreater(table["Cos"].null_count, 0)
+                self.assertTrue(np.allclose(cos[valid], df["Cos"].values[valid]))
+
+                if kwargs.get("use_interpolation", True):
+                    self.assertEqual(table["Index"].type, pa.int32())
+                    self.assertTrue(
+                        np.array_equal(table["Index"].to_numpy(), df["Index"].values)
+                    )
+
+            # the record batches have the same schema and rows as the table
+            table = mdf.to_arrow(channels=["Sin", "State", "Text", "Index"])
+            batches = list(
+                mdf.iter_to_arrow(
+                    channels=["Sin", "State", "Text", "Index"], chunk_ram_size=4000
+                )
+            )
+            self.assertGreater(len(batches), 1)
+            for batch in batches:
+                self.assertEqual(batch.schema, table.schema)
+            self.assertEqual(
+                pa.Table.from_batches(batches).to_pylist(), table.to_pylist()
+            )
+
+    def test_export_parquet(self):
+        import pyarrow.parquet as pq
+
+        t = np.arange(2000) * 0.01
+        states = from_dict(
+            {"val_0": 0, "text_0": "Off", "val_1": 1, "text_1": "On", "default": b""}
+        )
+
+        with MDF(version="4.10") as mdf:
+            mdf.append(
+                [
+                    Signal(np.sin(t), t, name="Sin"),
+                    Signal(np.arange(2000, dtype="u2"), t, name="Counter"),
+                    Signal(
+                        np.arange(2000, dtype="u1") % 2,
+                        t,
+                        name="State",
+                        conversion=states,
+                    ),
+                ],
+                common_timebase=True,
+            )
+            mdf.append(
+                [Signal(np.cos(t[::3]), t[::3] + 0.005, name="Cos")],
+                common_timebase=True,
+            )
+
+            output = Path(self.tempdir.name) / "test_export_parquet.parquet"
+            mdf.export("parquet", output, compression="SNAPPY", chunk_ram_size=20_000)
+
+            # each chunk is a row group
+            parquet_file = pq.ParquetFile(output)
+            self.assertGreater(parquet_file.metadata.num_row_groups, 1)
+            self.assertEqual(
+                parquet_file.metadata.row_group(0).column(0).compression, "SNAPPY"
+            )
+
+            df = mdf.to_dataframe(numeric_1D_only=True)
+            table = parquet_file.read()
+            self.assertEqual(table.column_names, ["timestamps", *df.columns, "State"])
+            self.assertTrue(
+                np.array_equal(table["timestamps"].to_numpy(), df.index.values)
+            )
+            for name in df.columns:
+                self.assertTrue(np.array_equal(table[name].to_numpy(), df[name].values))
+
+            # the timestamps are restored as the dataframe index and the value
+            # to text conversion as a categorical column
+            exported = pd.read_parquet(output)
+            pd.testing.assert_frame_equal(exported.drop(columns="State"), df)
+            self.assertIsInstance(exported["State"].dtype, pd.CategoricalDtype)
+            self.assertEqual(list(exported["State"]), list(mdf.to_dataframe()["State"]))
+
+            output = Path(self.tempdir.name) / "test_export_parquet_reduced.parquet"
+            mdf.export("parquet", output, reduce_memory_usage=True)
+
+            df = mdf.to_dataframe(numeric_1D_only=True, reduce_memory_usage=True)
+            self.assertEqual(df["Sin"].dtype, np.float32)
+            pd.testing.assert_frame_equal(pd.read_parquet(output), df)
+
+    def test_export_hdf5(self):
+        import h5py
+
+        t = np.arange(3000) * 0.01
+
+        with MDF(version="4.10") as mdf:
+            mdf.append(
+                [
+                    Signal(np.sin(t), t, name="Sin", unit="V"),
+                    Signal(
+                        np.array([b"x" * (i % 30) for i in range(3000)]),
+                        t,
+                        name="Text",
+                        encoding="utf-8",
+                    ),
+                ],
+                common_timebase=True,
+            )
+            mdf.append(
+                [Signal(np.arange(1000, dtype="i4"), t[::3], name="Index")],
+                common_timebase=True,
+            )
+
+            # small fragments so that each group is written in several steps
+            mdf.configure(read_fragment_size=4096)
+
+            for workers in (0, 2):
+                output = Path(self.tempdir.name) / "test_export_hdf5.hdf"
+                mdf.export(
+                    "hdf5",
+                    output,
+                    compression="gzip",
+                    compression_opts=1,
+                    chunks=100,
+                    workers=workers,
+                )
+
+                with h5py.File(output) as hdf:
+                    sin = hdf["ChannelGroup_0"]["Sin"]
+                    self.assertEqual(sin.chunks, (100,))
+                    self.assertEqual(sin.compression, "gzip")
+                    self.assertEqual(sin.attrs["unit"], "V")
+                    self.assertTrue(np.array_equal(sin[:], mdf.get("Sin").samples))
+                    self.assertEqual(
+                        list(hdf["ChannelGroup_0"]["Text"][:]),
+                        list(mdf.get("Text").samples),
+                    )
+
+                    group = hdf["ChannelGroup_1"]
+                    self.assertTrue(
+                        np.array_equal(group[group.attrs["master"]][:], t[::3])
+                    )
+                    self.assertTrue(np.array_equal(group["Index"][:], np.arange(1000)))
+
 
 if __name__ == "__main__":
     unittest.main()